@@ -6,11 +6,13 @@ is the preferred implementation for fetching API documentation. This class is ke
 potential future use with alternative documentation sources.
 """
 
+from pathlib import Path
 from typing import Dict, List, Optional
 import httpx
 from loguru import logger
 
 from src.config.settings import settings
+from src.external.http_cache import HTTPCache, content_hash
 
 
 class APIDocsClient:
@@ -26,6 +28,8 @@ class APIDocsClient:
     
     def __init__(self):
         self.doc_cache: Dict[str, str] = {}
+        # Validators + formatted docs per URL, for conditional re-fetches
+        self.http_cache = HTTPCache(Path(settings.http_cache_dir) / "api_docs.json")
     
     async def get_api_docs_for_project(self, project_key: str) -> Optional[str]:
         """
@@ -93,29 +97,45 @@ class APIDocsClient:
         - HTML documentation pages
         - OpenAPI JSON/YAML
         - Markdown files
+        
+        Sends If-None-Match / If-Modified-Since for URLs fetched before; a
+        304 or an identical body reuses the previously formatted docs.
         """
         try:
+            entry = self.http_cache.get(url)
             async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
+                response = await client.get(url, headers=self.http_cache.conditional_headers(url))
+                if response.status_code == 304 and entry:
+                    logger.debug(f"API docs unchanged (304): {url}")
+                    return entry.get("content")
                 response.raise_for_status()
                 
+                body_hash = content_hash(response.text)
+                if entry and entry.get("content_hash") == body_hash:
+                    logger.debug(f"API docs unchanged (same content): {url}")
+                    return entry.get("content")
+                
                 content_type = response.headers.get('content-type', '')
                 
                 if 'json' in content_type:
                     # OpenAPI JSON
                     data = response.json()
-                    return self._format_openapi_spec(data)
+                    docs = self._format_openapi_spec(data)
                 elif 'yaml' in content_type or 'yml' in url:
                     # OpenAPI YAML
                     import yaml
                     data = yaml.safe_load(response.text)
-                    return self._format_openapi_spec(data)
+                    docs = self._format_openapi_spec(data)
                 elif 'html' in content_type:
                     # HTML page - extract text
-                    return self._extract_text_from_html(response.text)
+                    docs = self._extract_text_from_html(response.text)
                 else:
                     # Markdown or plain text
-                    return response.text[:10000]  # Limit to 10k chars
+                    docs = response.text[:10000]  # Limit to 10k chars
+                
+                self.http_cache.store(url, response.headers, body_hash, content=docs)
+                self.http_cache.save()
+                return docs
                     
         except Exception as e:
             logger.error(f"Failed to fetch API docs from {url}: {e}")
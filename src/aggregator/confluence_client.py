@@ -3,13 +3,16 @@ Confluence client for fetching PRDs and technical documentation.
 """
 
 import asyncio
+import re
 from typing import Dict, List, Optional, Tuple, Any
 
 import httpx
 from loguru import logger
 from urllib.parse import urlparse, parse_qs, urljoin
 
+from src.config.settings import settings
 from src.core.atlassian_client import AtlassianClient
+from src.infrastructure.html_parser import strip_html_batch, strip_html_tags
 
 
 class ConfluenceClient(AtlassianClient):
@@ -268,24 +271,42 @@ class ConfluenceClient(AtlassianClient):
             Plain text content
         """
         try:
-            import re
-            
-            storage = page_data.get("body", {}).get("storage", {})
-            html_content = storage.get("value", "")
-            
+            html_content = self._storage_html(page_data)
             if not html_content:
                 return ""
-
-            # Remove HTML tags
-            text = re.sub(r"<[^>]+>", " ", html_content)
-            # Clean up whitespace
-            text = re.sub(r"\s+", " ", text).strip()
-
-            return text
+            return self._collapse_whitespace(strip_html_tags(html_content))
         except Exception as e:
             logger.error(f"Error extracting page content: {e}")
             return ""
 
+    def extract_page_contents(self, pages: List[Dict]) -> List[str]:
+        """
+        Extract plain text content from many Confluence pages.
+
+        Same output as extract_page_content() per page; large batches are
+        cleaned in a process pool.
+
+        Args:
+            pages: Raw page data from API
+
+        Returns:
+            Plain text content per page, in input order
+        """
+        htmls = [self._storage_html(page) for page in pages]
+        texts = strip_html_batch(
+            htmls, max_workers=settings.html_clean_max_workers, min_batch=settings.html_clean_min_batch
+        )
+        return [self._collapse_whitespace(text) for text in texts]
+
+    @staticmethod
+    def _storage_html(page_data: Dict) -> str:
+        storage = (page_data.get("body") or {}).get("storage") or {}
+        return storage.get("value") or ""
+
+    @staticmethod
+    def _collapse_whitespace(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip()
+
     async def get_page_by_title(self, space_key: str, title: str) -> Optional[Dict]:
         """
         Get page by title in a specific space.
@@ -508,6 +508,30 @@ class JiraClient(AtlassianClient):
             logger.error(f"Error fetching linked issues with SDK: {e}")
             return []
 
+    def get_latest_update(self, issue_keys: List[str]) -> Optional[datetime]:
+        """
+        Get the most recent `updated` timestamp across issues with one JQL probe.
+        
+        Args:
+            issue_keys: Issue keys to check
+            
+        Returns:
+            Latest update time, or None if the probe failed (e.g. a deleted issue)
+        """
+        jira = self._get_jira_sdk_client()
+        if not jira or not issue_keys:
+            return None
+        
+        jql = f"key in ({', '.join(dict.fromkeys(issue_keys))}) ORDER BY updated DESC"
+        try:
+            issues = jira.search_issues(jql_str=jql, maxResults=1, fields='updated')
+        except Exception as e:
+            logger.debug(f"Update probe failed for {len(issue_keys)} issues: {e}")
+            return None
+        if not issues:
+            return None
+        return self._parse_datetime(issues[0].fields.updated)
+
     def search_all_issues(self, jql: str) -> List[JiraStory]:
         """
         Search for ALL issues using JQL with automatic pagination.
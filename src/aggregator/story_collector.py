@@ -6,10 +6,12 @@ from typing import Dict, List, Optional
 
 from loguru import logger
 
+from src.config.settings import settings
 from src.models.story import JiraStory
 
 from .confluence_client import ConfluenceClient
 from .jira_client import JiraClient
+from .story_context_cache import StoryContextCache
 
 
 class StoryContext(dict):
@@ -39,6 +41,7 @@ class StoryCollector:
         self,
         jira_client: Optional[JiraClient] = None,
         confluence_client: Optional[ConfluenceClient] = None,
+        context_cache: Optional[StoryContextCache] = None,
     ):
         """
         Initialize story collector.
@@ -46,21 +49,66 @@ class StoryCollector:
         Args:
             jira_client: Jira client instance (creates new if None)
             confluence_client: Confluence client instance (creates new if None)
+            context_cache: Snapshot cache (defaults to the settings-configured one)
         """
         self.jira_client = jira_client or JiraClient()
         self.confluence_client = confluence_client or ConfluenceClient()
+        if context_cache is None and settings.story_context_cache_enabled:
+            context_cache = StoryContextCache()
+        self.context_cache = context_cache
 
-    async def collect_story_context(self, issue_key: str, include_subtasks: bool = True) -> StoryContext:
+    async def collect_story_context(
+        self, issue_key: str, include_subtasks: bool = True, use_cache: bool = True
+    ) -> StoryContext:
         """
         Collect comprehensive context for a story from all available sources.
 
+        A cached snapshot is reused when one JQL probe shows that neither the
+        story nor its subtasks or linked issues changed since it was taken.
+
         Args:
             issue_key: Jira issue key (e.g., PROJ-123)
             include_subtasks: Whether to include subtasks/engineering tasks
+            use_cache: Whether to reuse a current snapshot
 
         Returns:
             StoryContext with all aggregated information
         """
+        if use_cache and self.context_cache:
+            cached = self._load_cached_context(issue_key, include_subtasks)
+            if cached is not None:
+                return cached
+
+        context = await self._collect_story_context(issue_key, include_subtasks)
+
+        if self.context_cache:
+            self.context_cache.save(issue_key, context, include_subtasks)
+        return context
+
+    def _load_cached_context(self, issue_key: str, include_subtasks: bool) -> Optional[StoryContext]:
+        """Return the cached context if no covered issue was updated since it was saved."""
+        snapshot = self.context_cache.load(issue_key, include_subtasks)
+        if snapshot is None:
+            return None
+
+        try:
+            latest_update = self.jira_client.get_latest_update(snapshot["keys"])
+            if not self.context_cache.is_current(snapshot, latest_update):
+                logger.info(f"Story context snapshot for {issue_key} is stale, re-collecting")
+                return None
+        except Exception as e:
+            logger.warning(f"Could not validate story context snapshot for {issue_key}, re-collecting: {e}")
+            return None
+
+        data = snapshot["context"]
+        context = StoryContext(data["main_story"])
+        context.update(data)
+        self.context_cache.touch(issue_key, include_subtasks)
+        logger.info(f"Using cached story context for {issue_key} ({len(snapshot['keys'])} issues unchanged)")
+        return context
+
+    async def _collect_story_context(self, issue_key: str, include_subtasks: bool) -> StoryContext:
+        """Collect a story's context from Jira and Confluence."""
         # 1. Fetch main story AND subtasks using SDK (avoids 410 Gone errors)
         main_story, subtasks = await self.jira_client.get_issue_with_subtasks(issue_key)
         logger.info(f"Collecting comprehensive context for story: {issue_key}")
@@ -0,0 +1,176 @@
+"""
+Persistent cache of collected StoryContext snapshots.
+
+A snapshot is versioned by the latest `updated` timestamp across the main
+story, its subtasks and its linked issues. Validating a snapshot costs one
+JQL probe for that timestamp instead of re-fetching the issues, comments,
+links, related bugs and Confluence pages.
+
+Snapshots are stored in a GzipFileCache: hits mark a snapshot as used and
+saves evict the least recently used snapshots beyond max_entries.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from src.config.settings import settings
+from src.models.story import JiraStory
+from src.utils.file_cache import GzipFileCache
+
+_STORY_MARKER = "__jira_story__"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, JiraStory):
+        return {_STORY_MARKER: value.model_dump()}
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and _STORY_MARKER in value:
+            return JiraStory(**value[_STORY_MARKER])
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def _timestamp(value: datetime) -> float:
+    """POSIX timestamp; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def snapshot_keys(context: Dict[str, Any]) -> List[str]:
+    """Keys of the issues whose updates invalidate a snapshot (main, subtasks, links)."""
+    stories = [context["main_story"], *context.get("subtasks", []), *context.get("linked_stories", [])]
+    return list(dict.fromkeys(story.key for story in stories))
+
+
+def snapshot_version(context: Dict[str, Any]) -> datetime:
+    """Latest `updated` across the main story, subtasks and linked issues."""
+    stories = [context["main_story"], *context.get("subtasks", []), *context.get("linked_stories", [])]
+    return max((story.updated for story in stories), key=_timestamp)
+
+
+class StoryContextCache:
+    """
+    File-based cache of StoryContext snapshots.
+
+    File format: {issue_key}[_nosubtasks].json.gz
+    Invalidation: a newer `updated` on any covered issue, or age > TTL
+    (related bugs and Confluence pages are not covered by the probe)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl_hours: Optional[float] = None,
+    ):
+        """
+        Initialize the snapshot cache.
+
+        Args:
+            cache_dir: Directory for snapshots (defaults to settings)
+            max_entries: Snapshots kept before LRU eviction (defaults to settings)
+            ttl_hours: Maximum snapshot age (defaults to settings)
+        """
+        self.cache_dir = Path(cache_dir or settings.story_context_cache_dir)
+        self.max_entries = max_entries if max_entries is not None else settings.story_context_cache_max_entries
+        self.ttl_hours = ttl_hours if ttl_hours is not None else settings.story_context_cache_ttl_hours
+        self.files = GzipFileCache(self.cache_dir, self.max_entries, label="story context snapshot")
+
+    @staticmethod
+    def _entry_name(issue_key: str, include_subtasks: bool = True) -> str:
+        return issue_key if include_subtasks else f"{issue_key}_nosubtasks"
+
+    def _get_cache_path(self, issue_key: str, include_subtasks: bool = True) -> Path:
+        return self.files.path(self._entry_name(issue_key, include_subtasks))
+
+    def load(self, issue_key: str, include_subtasks: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Read a snapshot without validating it against Jira.
+
+        Args:
+            issue_key: Main story key
+            include_subtasks: Variant of the snapshot
+
+        Returns:
+            Snapshot dict with 'version' (datetime), 'keys' and 'context'
+            (decoded dict), or None if missing, expired or unreadable
+        """
+        try:
+            data = self.files.read(self._entry_name(issue_key, include_subtasks), self.ttl_hours)
+            if data is None:
+                return None
+            return {
+                "version": datetime.fromisoformat(data["version"]),
+                "keys": data["keys"],
+                "context": _decode(data["context"]),
+            }
+        except Exception as e:
+            logger.warning(f"Failed to read story context snapshot for {issue_key}: {e}")
+            return None
+
+    def touch(self, issue_key: str, include_subtasks: bool = True) -> None:
+        """Mark a snapshot as recently used."""
+        self.files.touch(self._entry_name(issue_key, include_subtasks))
+
+    def is_current(self, snapshot: Dict[str, Any], latest_update: Optional[datetime]) -> bool:
+        """
+        Check a snapshot against the latest `updated` reported by Jira.
+
+        Args:
+            snapshot: Snapshot from load()
+            latest_update: Result of the JQL probe (None if it failed)
+
+        Returns:
+            True if no covered issue changed since the snapshot
+        """
+        if latest_update is None:
+            return False
+        return _timestamp(latest_update) <= _timestamp(snapshot["version"])
+
+    def save(self, issue_key: str, context: Dict[str, Any], include_subtasks: bool = True) -> None:
+        """
+        Store a collected context and evict least recently used snapshots.
+
+        Args:
+            issue_key: Main story key
+            context: Collected StoryContext
+            include_subtasks: Variant of the snapshot
+        """
+        try:
+            payload = {
+                "version": snapshot_version(context).isoformat(),
+                "keys": snapshot_keys(context),
+                "context": _encode(dict(context)),
+            }
+            path = self.files.write(self._entry_name(issue_key, include_subtasks), payload)
+            logger.debug(f"Saved story context snapshot for {issue_key} ({path.stat().st_size / 1024:.1f} KB)")
+        except Exception as e:
+            logger.warning(f"Failed to save story context snapshot for {issue_key}: {e}")
+
+    def clear(self, issue_key: Optional[str] = None) -> int:
+        """
+        Delete snapshots for one story or all stories.
+
+        Args:
+            issue_key: Optional story key (if None, clears all)
+
+        Returns:
+            Number of snapshots deleted
+        """
+        if issue_key:
+            return self.files.delete([self._entry_name(issue_key, True), self._entry_name(issue_key, False)])
+        return self.files.clear()
@@ -10,7 +10,7 @@ This keeps the enriched story focused on Jira-native data while building
 comprehensive API/UI specs separately for use in prompts.
 """
 
-from typing import List
+from typing import List, Optional
 from loguru import logger
 
 from src.models.story import JiraStory
@@ -19,6 +19,7 @@ from src.aggregator.story_collector import StoryContext
 from src.ai.swagger_extractor import SwaggerExtractor
 from src.ai.rag_store import RAGVectorStore
 from src.config.settings import settings
+from src.utils.near_duplicates import max_cosine_similarity
 import re
 
 
@@ -104,9 +105,8 @@ class APIContextBuilder:
         if not api_specs and swagger_rag_docs:
             logger.info(f"Step 2: Using {len(swagger_rag_docs)} Swagger docs from RAGRetriever (no duplicate query)")
             for result in swagger_rag_docs:
-                content = result.get("document", "") or result.get("content", "")
-                # Extract endpoints from swagger content
-                specs = self._parse_swagger_content(content)
+                # Endpoints from the endpoint index (regex over the content for unindexed specs)
+                specs = self._specs_from_swagger_result(result)
                 if specs:
                     api_specs.extend(specs)
                     logger.debug(f"  Extracted {len(specs)} endpoints from Swagger RAG")
@@ -383,16 +383,21 @@ Be strict: Only mark endpoints as RELEVANT if they directly implement the story
     async def _deduplicate_scenarios(
         self,
         story_scenarios: List[str],
-        code_scenarios: List[str]
+        code_scenarios: List[str],
+        story_embeddings: Optional[List[List[float]]] = None,
+        embedding_service=None
     ) -> List[str]:
         """
         Remove redundant code-based scenarios that are already covered by story-based scenarios.
         
-        Uses semantic similarity to identify duplicates.
+        Uses semantic similarity to identify duplicates: all code x story cosine
+        similarities are computed as one normalized matrix product.
         
         Args:
             story_scenarios: Scenarios derived from story requirements, AC, functional points
             code_scenarios: Scenarios found in codebase analysis
+            story_embeddings: Precomputed embeddings of story_scenarios (embedded here if not given)
+            embedding_service: Optional EmbeddingService to reuse
             
         Returns:
             List of unique code-based scenarios (duplicates removed)
@@ -405,12 +410,13 @@ Be strict: Only mark endpoints as RELEVANT if they directly implement the story
             return code_scenarios
         
         try:
-            from src.ai.embedding_service import EmbeddingService
+            if embedding_service is None:
+                from src.ai.embedding_service import EmbeddingService
+                embedding_service = EmbeddingService()
             
-            embedding_service = EmbeddingService()
-            
-            # Generate embeddings for story scenarios
-            story_embeddings = await embedding_service.embed_texts(story_scenarios)
+            # Generate embeddings for story scenarios (once per story when the caller passes them)
+            if story_embeddings is None:
+                story_embeddings = await embedding_service.embed_texts(story_scenarios)
             if not story_embeddings:
                 logger.warning("Failed to generate embeddings for story scenarios")
                 return code_scenarios
@@ -421,32 +427,15 @@ Be strict: Only mark endpoints as RELEVANT if they directly implement the story
                 logger.warning("Failed to generate embeddings for code scenarios")
                 return code_scenarios
             
-            # Calculate similarity between each code scenario and all story scenarios
-            unique_scenarios = []
+            # Highest similarity of each code scenario to any story scenario
             threshold = 0.85  # Similarity threshold for duplicates
+            max_similarities = max_cosine_similarity(code_embeddings, story_embeddings)
             
-            import numpy as np
-            
-            for i, code_scenario in enumerate(code_scenarios):
-                code_embedding = code_embeddings[i]
-                
-                # Check similarity against all story scenarios
-                is_duplicate = False
-                max_similarity = 0.0
-                
-                for story_embedding in story_embeddings:
-                    # Calculate cosine similarity
-                    similarity = np.dot(code_embedding, story_embedding) / (
-                        np.linalg.norm(code_embedding) * np.linalg.norm(story_embedding)
-                    )
-                    max_similarity = max(max_similarity, similarity)
-                    
-                    if similarity > threshold:
-                        is_duplicate = True
-                        logger.debug(f"Filtered duplicate scenario (similarity {similarity:.2f}): {code_scenario[:50]}...")
-                        break
-                
-                if not is_duplicate:
+            unique_scenarios = []
+            for code_scenario, max_similarity in zip(code_scenarios, max_similarities):
+                if max_similarity > threshold:
+                    logger.debug(f"Filtered duplicate scenario (similarity {max_similarity:.2f}): {code_scenario[:50]}...")
+                else:
                     unique_scenarios.append(code_scenario)
                     logger.debug(f"Kept unique scenario (max similarity {max_similarity:.2f}): {code_scenario[:50]}...")
             
@@ -651,6 +640,10 @@ If not confident, return: {{"confident": false}}"""
         
         logger.debug(f"Extracted {len(story_scenarios)} story-based scenarios")
         
+        # Story scenarios are the same for every endpoint: embed them once
+        embedding_service = None
+        story_embeddings = None
+        
         # Analyze codebase for each endpoint
         for api_spec in api_specs:
             try:
@@ -668,10 +661,20 @@ If not confident, return: {{"confident": false}}"""
                 code_examples = code_analysis.get("code_examples", {})
                 
                 if code_scenarios:
+                    if story_scenarios and story_embeddings is None:
+                        try:
+                            from src.ai.embedding_service import EmbeddingService
+                            embedding_service = embedding_service or EmbeddingService()
+                            story_embeddings = await embedding_service.embed_texts(story_scenarios)
+                        except Exception as e:
+                            logger.warning(f"Failed to embed story scenarios: {e}")
+                    
                     # Deduplicate against story scenarios
                     unique_scenarios = await self._deduplicate_scenarios(
                         story_scenarios=story_scenarios,
-                        code_scenarios=code_scenarios
+                        code_scenarios=code_scenarios,
+                        story_embeddings=story_embeddings,
+                        embedding_service=embedding_service
                     )
                     
                     if unique_scenarios:
@@ -686,6 +689,35 @@ If not confident, return: {{"confident": false}}"""
                 logger.warning(f"Code analysis integration failed for {api_spec.endpoint_path}: {e}")
                 continue
     
+    def _specs_from_swagger_result(self, result: dict) -> List[APISpec]:
+        """
+        Endpoints of a Swagger RAG result.
+        
+        Endpoint vectors map to their record in the endpoint index and
+        whole-spec documents to all of the spec's indexed endpoints;
+        results unknown to the index are parsed from their text.
+        
+        Args:
+            result: Swagger RAG result (document/content and metadata)
+            
+        Returns:
+            List of APISpec objects
+        """
+        metadata = result.get("metadata") or {}
+        endpoint_index = self.swagger_extractor.endpoint_index
+        service_name = metadata.get("service_name")
+        file_path = metadata.get("file_path")
+        if metadata.get("doc_type") == "endpoint":
+            record = endpoint_index.get(service_name, file_path, metadata.get("method", ""), metadata.get("path", ""))
+            records = [record] if record else []
+        else:
+            records = endpoint_index.records_for_file(service_name, file_path)
+        if records:
+            return [record.to_api_spec() for record in records]
+        
+        content = result.get("document", "") or result.get("content", "")
+        return self._parse_swagger_content(content)
+    
     def _parse_swagger_content(self, content: str) -> List[APISpec]:
         """Parse API endpoints from Swagger documentation."""
         specs = []
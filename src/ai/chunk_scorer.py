@@ -0,0 +1,249 @@
+"""
+Compiled chunk scoring for the query-focused context extractor.
+Single Responsibility: Counting pattern hits in document chunks efficiently.
+
+The extractor's scoring patterns are mostly alternations of whole words, e.g.
+r'\\b(must|should|shall)\\b'. Those are counted from a single word tokenization
+of the chunk instead of one regex scan per pattern; only phrases and
+patterns of other shapes keep a (precompiled) regex. Counts are identical to
+running re.findall per pattern.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+_WORD_BOUNDED_ALTERNATION_RE = re.compile(r"^\\b\(([^()]+)\)\\b$")
+_ALTERNATIVE_RE = re.compile(r"^(\w+?)(\w\?)?$")
+
+
+@dataclass(frozen=True)
+class _CompiledPattern:
+    """
+    A scoring pattern split into whole words and everything else.
+
+    For r'\\b(a|b|c d)\\b', the single words a and b are counted from the chunk's
+    word counts, and only the phrase 'c d' needs a regex scan - skipped entirely
+    when the chunk does not contain the phrase's first word. This is exact as
+    long as no single word also appears inside a phrase; otherwise (and for
+    patterns of any other shape) the whole pattern stays a regex.
+    """
+    words: FrozenSet[str]
+    regex: Optional["re.Pattern[str]"]
+    guard: Optional[FrozenSet[str]]
+
+    @classmethod
+    def compile(cls, pattern: str) -> "_CompiledPattern":
+        match = _WORD_BOUNDED_ALTERNATION_RE.match(pattern)
+        if not match:
+            return cls(words=frozenset(), regex=re.compile(pattern, re.IGNORECASE), guard=None)
+
+        words, phrases = set(), []
+        for alternative in match.group(1).split("|"):
+            word = _ALTERNATIVE_RE.match(alternative)
+            if word:
+                # Text is lowercased before scoring and patterns are case-insensitive
+                base = word.group(1).lower()
+                words.add(base)
+                if word.group(2):  # Optional last character, e.g. 'returns?'
+                    words.add(base + word.group(2)[0].lower())
+            else:
+                phrases.append(alternative)
+
+        if not phrases:
+            return cls(words=frozenset(words), regex=None, guard=None)
+
+        phrase_words = {w.lower() for phrase in phrases for w in _WORD_RE.findall(phrase)}
+        first_words = [_WORD_RE.match(phrase) for phrase in phrases]
+        if words & phrase_words or not all(first_words):
+            return cls(words=frozenset(), regex=re.compile(pattern, re.IGNORECASE), guard=None)
+
+        return cls(
+            words=frozenset(words),
+            regex=re.compile(rf"\b({'|'.join(phrases)})\b", re.IGNORECASE),
+            guard=frozenset(m.group(0).lower() for m in first_words),
+        )
+
+    def count(self, text: str, word_counts: Counter) -> int:
+        total = sum(word_counts[w] for w in self.words)
+        if self.regex is not None and (
+            self.guard is None or any(word_counts[w] for w in self.guard)
+        ):
+            total += len(self.regex.findall(text))
+        return total
+
+
+@dataclass(frozen=True)
+class StoryTerms:
+    """Story keywords and acceptance-criteria terms, tokenized once per story."""
+    keywords: Tuple[str, ...]
+    ac_terms: Tuple[Tuple[str, ...], ...]
+
+    @classmethod
+    def from_story(cls, story_keywords: Sequence[str], acceptance_criteria: Sequence[str]) -> "StoryTerms":
+        """
+        Pre-tokenize story context for relevance scoring.
+
+        Args:
+            story_keywords: Keywords from the story
+            acceptance_criteria: Acceptance criteria from the story
+
+        Returns:
+            StoryTerms
+        """
+        return cls(
+            keywords=tuple(kw.lower() for kw in story_keywords),
+            # Key terms from each AC (words > 4 chars)
+            ac_terms=tuple(
+                tuple(w.lower() for w in ac.split() if len(w) > 4)
+                for ac in acceptance_criteria
+            ),
+        )
+
+
+class ChunkScorer:
+    """
+    Scores chunks for relevance, testability and section type.
+
+    Build once per pattern set; scoring a chunk tokenizes it a single time.
+    """
+
+    def __init__(
+        self,
+        testable_patterns: Sequence[Tuple[str, float]],
+        non_testable_patterns: Sequence[Tuple[str, float]],
+        section_patterns: Dict[str, str],
+    ):
+        """
+        Compile the scoring patterns.
+
+        Args:
+            testable_patterns: (pattern, weight) pairs that raise testability
+            non_testable_patterns: (pattern, negative weight) pairs that lower it
+            section_patterns: Section type to pattern
+        """
+        self.testable = [(_CompiledPattern.compile(p), w) for p, w in testable_patterns]
+        self.non_testable = [(_CompiledPattern.compile(p), w) for p, w in non_testable_patterns]
+        self.sections = [(name, _CompiledPattern.compile(p)) for name, p in section_patterns.items()]
+
+    @staticmethod
+    def word_counts(chunk_lower: str) -> Counter:
+        """Count whole words in lowercased chunk text."""
+        return Counter(_WORD_RE.findall(chunk_lower))
+
+    def score_relevance(self, chunk: str, terms: StoryTerms) -> float:
+        """
+        Score chunk relevance to the story (0.0 to 1.0).
+
+        Args:
+            chunk: Chunk text
+            terms: Pre-tokenized story terms
+
+        Returns:
+            Relevance score
+        """
+        if not chunk:
+            return 0.0
+
+        chunk_lower = chunk.lower()
+        score = 0.0
+
+        # Keyword matching (40% of relevance)
+        if terms.keywords:
+            keyword_matches = sum(1 for kw in terms.keywords if kw in chunk_lower)
+            keyword_score = min(keyword_matches / max(len(terms.keywords), 1), 1.0)
+            score += keyword_score * 0.4
+
+        # AC term matching (60% of relevance)
+        if terms.ac_terms:
+            ac_matches = 0
+            for ac_terms in terms.ac_terms:
+                matches = sum(1 for term in ac_terms if term in chunk_lower)
+                if matches >= 2:  # At least 2 terms match
+                    ac_matches += 1
+
+            ac_score = min(ac_matches / max(len(terms.ac_terms), 1), 1.0)
+            score += ac_score * 0.6
+
+        return min(score, 1.0)
+
+    def score_testability(self, chunk: str, word_counts: Optional[Counter] = None) -> float:
+        """
+        Score chunk testability (0.0 to 1.0).
+
+        Args:
+            chunk: Chunk text
+            word_counts: Optional precomputed word_counts(chunk.lower())
+
+        Returns:
+            Testability score
+        """
+        if not chunk:
+            return 0.0
+
+        chunk_lower = chunk.lower()
+        if word_counts is None:
+            word_counts = self.word_counts(chunk_lower)
+        score = 0.5  # Start neutral
+
+        # Apply testable patterns (boost score)
+        for pattern, weight in self.testable:
+            matches = pattern.count(chunk_lower, word_counts)
+            score += min(matches * weight * 0.1, weight)  # Cap contribution per pattern
+
+        # Apply non-testable patterns (reduce score)
+        for pattern, weight in self.non_testable:
+            matches = pattern.count(chunk_lower, word_counts)
+            score += min(matches * weight * 0.1, weight)  # weight is negative
+
+        # Clamp to 0.0-1.0
+        return max(0.0, min(1.0, score))
+
+    def classify_section(self, chunk: str, word_counts: Optional[Counter] = None) -> str:
+        """
+        Classify chunk into a section type.
+
+        Args:
+            chunk: Chunk text
+            word_counts: Optional precomputed word_counts(chunk.lower())
+
+        Returns:
+            Section type with the most pattern hits, or 'other'
+        """
+        chunk_lower = chunk.lower()
+        if word_counts is None:
+            word_counts = self.word_counts(chunk_lower)
+
+        best_type = 'other'
+        best_score = 0
+
+        for section_type, pattern in self.sections:
+            matches = pattern.count(chunk_lower, word_counts)
+            if matches > best_score:
+                best_score = matches
+                best_type = section_type
+
+        return best_type
+
+    def score_chunks(self, chunks: List[str], terms: StoryTerms) -> List[Tuple[float, float, str]]:
+        """
+        Score many chunks against one story.
+
+        Args:
+            chunks: Chunk texts
+            terms: Pre-tokenized story terms
+
+        Returns:
+            (relevance, testability, section_type) per chunk
+        """
+        results = []
+        for chunk in chunks:
+            word_counts = self.word_counts(chunk.lower())
+            results.append((
+                self.score_relevance(chunk, terms),
+                self.score_testability(chunk, word_counts),
+                self.classify_section(chunk, word_counts),
+            ))
+        return results
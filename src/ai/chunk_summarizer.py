@@ -0,0 +1,242 @@
+"""
+Chunk summarization service for query-focused extraction.
+Single Responsibility: Summarizing long document chunks with one shared client.
+
+Summaries are requested concurrently (bounded) and memoized on disk, keyed by
+model, chunk content and story context, so regenerating a story does not pay
+for the same summaries again. The memo is a GzipFileCache, so entries expire
+and the least recently used ones are evicted beyond a configured count.
+"""
+
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from src.config.settings import settings
+from src.utils.file_cache import GzipFileCache
+
+
+SUMMARY_PROMPT = """Extract ONLY the QA-testable requirements from this document section.
+
+Story Context: {story_summary}
+
+Acceptance Criteria:
+{ac_text}
+
+Document Section:
+{chunk}
+
+Output ONLY:
+1. Functional requirements that can be tested
+2. Expected behaviors with specific conditions
+3. Error cases and edge cases
+4. API endpoints/methods mentioned
+
+Skip: Background, history, decisions, meeting notes, alternatives considered.
+
+Format as bullet points. Be concise (max 500 chars)."""
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ChunkSummarizer:
+    """
+    Summarizes document chunks into QA-testable bullet points.
+
+    One AsyncOpenAI client is reused for all requests. Use get_chunk_summarizer()
+    to share an instance (and its client and semaphore) across extractors.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        cache_dir: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        client=None,
+        max_entries: Optional[int] = None,
+        ttl_hours: Optional[float] = None,
+    ):
+        """
+        Initialize the summarizer.
+
+        Args:
+            model: Model used for summarization
+            cache_dir: Directory for cached summaries (defaults to settings)
+            max_concurrency: Maximum concurrent requests (defaults to settings)
+            client: Optional AsyncOpenAI client (created lazily if not provided)
+            max_entries: Cached summaries kept before LRU eviction (defaults to settings)
+            ttl_hours: Maximum age of a cached summary (defaults to settings)
+        """
+        self.model = model
+        self.cache_dir = Path(cache_dir or settings.extraction_summary_cache_dir)
+        max_entries = max_entries if max_entries is not None else settings.extraction_summary_cache_max_entries
+        self.ttl_hours = ttl_hours if ttl_hours is not None else settings.extraction_summary_cache_ttl_hours
+        self.files = GzipFileCache(self.cache_dir, max_entries, label="chunk summary")
+        self.max_concurrency = max(1, max_concurrency or settings.extraction_summary_concurrency)
+        self._client = client
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+    @property
+    def client(self):
+        """Shared AsyncOpenAI client."""
+        if self._client is None:
+            from src.ai.generation.ai_client_factory import AIClientFactory
+            self._client, _ = AIClientFactory.create_openai_client(model=self.model)
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the loop they are first used on
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @staticmethod
+    def _prompt_inputs(story_summary: str, acceptance_criteria: Sequence[str]) -> tuple:
+        """The parts of the story that go into the prompt (and therefore the cache key)."""
+        summary = story_summary[:500] if story_summary else "Not provided"
+        ac_text = "\n".join(f"- {ac}" for ac in list(acceptance_criteria)[:5])
+        return summary, ac_text
+
+    def cache_key(self, chunk: str, story_summary: str, acceptance_criteria: Sequence[str]) -> str:
+        """
+        Build the cache key for a chunk summary.
+
+        Args:
+            chunk: Chunk text
+            story_summary: Story summary
+            acceptance_criteria: Story acceptance criteria
+
+        Returns:
+            Hex key derived from (model, chunk hash, story context hash)
+        """
+        summary, ac_text = self._prompt_inputs(story_summary, acceptance_criteria)
+        story_hash = _sha256(f"{summary}\n{ac_text}")
+        return _sha256(f"{self.model}\n{_sha256(chunk[:2000])}\n{story_hash}")
+
+    def _load(self, key: str) -> Optional[str]:
+        try:
+            data = self.files.read(key, self.ttl_hours)
+            if data is None:
+                return None
+            self.files.touch(key)
+            return data["summary"]
+        except Exception as e:
+            logger.debug(f"[SUMMARIZER] Ignoring unreadable cache entry {key}: {e}")
+            return None
+
+    def _save(self, key: str, summary: str) -> None:
+        try:
+            self.files.write(key, {"model": self.model, "summary": summary})
+        except Exception as e:
+            logger.warning(f"[SUMMARIZER] Failed to cache summary: {e}")
+
+    async def summarize_many(
+        self,
+        chunks: Sequence[str],
+        story_summary: str,
+        acceptance_criteria: Sequence[str],
+    ) -> List[str]:
+        """
+        Summarize chunks concurrently, serving repeats from the disk cache.
+
+        A failed request falls back to sentence truncation for that chunk (not cached).
+
+        Args:
+            chunks: Chunk texts
+            story_summary: Story summary for context
+            acceptance_criteria: Story acceptance criteria
+
+        Returns:
+            Summaries in the same order as chunks
+        """
+        keys = [self.cache_key(chunk, story_summary, acceptance_criteria) for chunk in chunks]
+        results: Dict[str, str] = {}
+        misses: Dict[str, str] = {}
+        for key, chunk in zip(keys, chunks):
+            if key in results or key in misses:
+                continue
+            cached = self._load(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                misses[key] = chunk
+
+        if misses:
+            summary, ac_text = self._prompt_inputs(story_summary, acceptance_criteria)
+            summaries = await asyncio.gather(*(
+                self._summarize(chunk, summary, ac_text) for chunk in misses.values()
+            ))
+            for key, (text, ok) in zip(misses, summaries):
+                results[key] = text
+                if ok:
+                    self._save(key, text)
+
+        logger.info(
+            f"[SUMMARIZER] {len(chunks)} chunks: {len(chunks) - len(misses)} cached, "
+            f"{len(misses)} summarized"
+        )
+        return [results[key] for key in keys]
+
+    async def _summarize(self, chunk: str, story_summary: str, ac_text: str) -> tuple:
+        """Summarize one chunk. Returns (text, succeeded)."""
+        prompt = SUMMARY_PROMPT.format(
+            story_summary=story_summary, ac_text=ac_text, chunk=chunk[:2000]
+        )
+        try:
+            async with self._get_semaphore():
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=300,
+                    temperature=0.1
+                )
+            result = response.choices[0].message.content.strip()
+            logger.debug(f"[SUMMARIZER] Summarized {len(chunk)} -> {len(result)} chars")
+            return result, True
+        except Exception as e:
+            logger.warning(f"[SUMMARIZER] AI summarization failed: {e}, using truncation")
+            return truncate_at_sentence(chunk, 500), False
+
+
+def truncate_at_sentence(text: str, max_chars: int) -> str:
+    """Truncate text at a sentence boundary."""
+    if len(text) <= max_chars:
+        return text
+
+    truncated = text[:max_chars]
+
+    # Try to end at sentence boundary
+    last_period = truncated.rfind('.')
+    last_newline = truncated.rfind('\n')
+    cut_point = max(last_period, last_newline)
+
+    if cut_point > max_chars * 0.7:
+        return truncated[:cut_point + 1].strip()
+
+    return truncated.strip() + "..."
+
+
+_summarizers: Dict[str, ChunkSummarizer] = {}
+
+
+def get_chunk_summarizer(model: str) -> ChunkSummarizer:
+    """
+    Get the shared summarizer for a model.
+
+    Args:
+        model: Model used for summarization
+
+    Returns:
+        ChunkSummarizer reused across extractor instances
+    """
+    if model not in _summarizers:
+        _summarizers[model] = ChunkSummarizer(model=model)
+    return _summarizers[model]
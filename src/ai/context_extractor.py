@@ -21,6 +21,10 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
+from src.ai.chunk_scorer import ChunkScorer, StoryTerms
+from src.ai.chunk_summarizer import ChunkSummarizer, get_chunk_summarizer, truncate_at_sentence
+from src.utils.text_processor import tokenize
+
 
 @dataclass
 class ScoredChunk:
@@ -76,6 +80,14 @@ SECTION_PATTERNS = {
     'background': r'\b(background|overview|context|introduction|history)\b',
 }
 
+# Compiled once; counts hits for all patterns from a single tokenization per chunk
+CHUNK_SCORER = ChunkScorer(TESTABLE_PATTERNS, NON_TESTABLE_PATTERNS, SECTION_PATTERNS)
+
+# Chunks longer than this are AI-summarized (when enabled)
+SUMMARIZE_MIN_CHARS = 1000
+# Expected summary length, used to decide which chunks are worth summarizing up front
+SUMMARY_ESTIMATE_CHARS = 500
+
 
 class QueryFocusedExtractor:
     """
@@ -102,7 +114,8 @@ class QueryFocusedExtractor:
         self,
         min_relevance_score: float = 0.3,
         use_ai_summarization: bool = True,
-        ai_model: str = "gpt-4o-mini"
+        ai_model: str = "gpt-4o-mini",
+        summarizer: Optional[ChunkSummarizer] = None
     ):
         """
         Initialize the extractor.
@@ -111,10 +124,12 @@ class QueryFocusedExtractor:
             min_relevance_score: Minimum combined score to include chunk (0.0-1.0)
             use_ai_summarization: Whether to use AI for long chunk summarization
             ai_model: Model to use for AI summarization
+            summarizer: Optional summarizer (defaults to the shared one for ai_model)
         """
         self.min_relevance_score = min_relevance_score
         self.use_ai_summarization = use_ai_summarization
         self.ai_model = ai_model
+        self._summarizer = summarizer
         
         logger.info(f"[EXTRACTOR] Initialized QueryFocusedExtractor: "
                    f"min_score={min_relevance_score}, ai_summarize={use_ai_summarization}")
@@ -152,13 +167,12 @@ class QueryFocusedExtractor:
         chunks = self._chunk_document(document)
         logger.debug(f"[EXTRACTOR] Split into {len(chunks)} chunks")
         
-        # Step 2 & 3: Score each chunk
+        # Step 2 & 3: Score each chunk (story terms tokenized once)
+        terms = StoryTerms.from_story(story_keywords, acceptance_criteria)
         scored_chunks = []
-        for chunk in chunks:
-            relevance = self._score_relevance(chunk, story_keywords, acceptance_criteria)
-            testability = self._score_testability(chunk)
-            section_type = self._classify_section(chunk)
-            
+        for chunk, (relevance, testability, section_type) in zip(
+            chunks, CHUNK_SCORER.score_chunks(chunks, terms)
+        ):
             # Combined score: 60% relevance, 40% testability
             combined = (relevance * 0.6) + (testability * 0.4)
             
@@ -183,7 +197,17 @@ class QueryFocusedExtractor:
             logger.warning("[EXTRACTOR] No chunks passed threshold, using top 3")
             filtered = sorted(scored_chunks, key=lambda x: x.combined_score, reverse=True)[:3]
         
-        # Step 5: Build output within budget
+        # Step 5: Summarize the long chunks likely to fit, in one concurrent batch
+        summaries: Dict[str, str] = {}
+        if self.use_ai_summarization:
+            to_summarize = self._select_chunks_to_summarize(filtered, max_output_chars)
+            if to_summarize:
+                summarized = await self.summarizer.summarize_many(
+                    to_summarize, story_summary or "", acceptance_criteria
+                )
+                summaries = dict(zip(to_summarize, summarized))
+        
+        # Step 6: Build output within budget
         output_parts = []
         current_chars = 0
         
@@ -191,12 +215,15 @@ class QueryFocusedExtractor:
             chunk_text = chunk.text
             
             # If chunk is too long and AI summarization enabled, summarize it
-            if len(chunk_text) > 1000 and self.use_ai_summarization:
-                chunk_text = await self._ai_summarize_chunk(
-                    chunk_text, 
-                    story_summary or "",
-                    acceptance_criteria
-                )
+            if len(chunk_text) > SUMMARIZE_MIN_CHARS and self.use_ai_summarization:
+                if chunk_text not in summaries:
+                    # Summaries came out longer than estimated; budget still has room
+                    summaries[chunk_text] = await self._ai_summarize_chunk(
+                        chunk_text,
+                        story_summary or "",
+                        acceptance_criteria
+                    )
+                chunk_text = summaries[chunk_text]
             
             # Check if we can fit this chunk
             if current_chars + len(chunk_text) > max_output_chars:
@@ -286,32 +313,7 @@ class QueryFocusedExtractor:
         - Keyword overlap with story keywords
         - Semantic overlap with acceptance criteria
         """
-        if not chunk:
-            return 0.0
-        
-        chunk_lower = chunk.lower()
-        score = 0.0
-        
-        # Keyword matching (40% of relevance)
-        if story_keywords:
-            keyword_matches = sum(1 for kw in story_keywords if kw.lower() in chunk_lower)
-            keyword_score = min(keyword_matches / max(len(story_keywords), 1), 1.0)
-            score += keyword_score * 0.4
-        
-        # AC term matching (60% of relevance)
-        if acceptance_criteria:
-            ac_matches = 0
-            for ac in acceptance_criteria:
-                # Extract key terms from AC (words > 4 chars)
-                ac_terms = [w.lower() for w in ac.split() if len(w) > 4]
-                matches = sum(1 for term in ac_terms if term in chunk_lower)
-                if matches >= 2:  # At least 2 terms match
-                    ac_matches += 1
-            
-            ac_score = min(ac_matches / max(len(acceptance_criteria), 1), 1.0)
-            score += ac_score * 0.6
-        
-        return min(score, 1.0)
+        return CHUNK_SCORER.score_relevance(chunk, StoryTerms.from_story(story_keywords, acceptance_criteria))
     
     def _score_testability(self, chunk: str) -> float:
         """
@@ -320,39 +322,37 @@ class QueryFocusedExtractor:
         Higher scores for content that describes verifiable behavior.
         Lower scores for background, history, discussions.
         """
-        if not chunk:
-            return 0.0
-        
-        chunk_lower = chunk.lower()
-        score = 0.5  # Start neutral
-        
-        # Apply testable patterns (boost score)
-        for pattern, weight in TESTABLE_PATTERNS:
-            matches = len(re.findall(pattern, chunk_lower, re.IGNORECASE))
-            score += min(matches * weight * 0.1, weight)  # Cap contribution per pattern
-        
-        # Apply non-testable patterns (reduce score)
-        for pattern, weight in NON_TESTABLE_PATTERNS:
-            matches = len(re.findall(pattern, chunk_lower, re.IGNORECASE))
-            score += min(matches * weight * 0.1, weight)  # weight is negative
-        
-        # Clamp to 0.0-1.0
-        return max(0.0, min(1.0, score))
+        return CHUNK_SCORER.score_testability(chunk)
     
     def _classify_section(self, chunk: str) -> str:
         """Classify chunk into section type."""
-        chunk_lower = chunk.lower()
-        
-        best_type = 'other'
-        best_score = 0
-        
-        for section_type, pattern in SECTION_PATTERNS.items():
-            matches = len(re.findall(pattern, chunk_lower, re.IGNORECASE))
-            if matches > best_score:
-                best_score = matches
-                best_type = section_type
+        return CHUNK_SCORER.classify_section(chunk)
+    
+    @property
+    def summarizer(self) -> ChunkSummarizer:
+        """Summarizer shared by all extractors using the same model."""
+        if self._summarizer is None:
+            self._summarizer = get_chunk_summarizer(self.ai_model)
+        return self._summarizer
+    
+    def _select_chunks_to_summarize(self, chunks: List[ScoredChunk], max_output_chars: int) -> List[str]:
+        """
+        Pick the long chunks the output budget is expected to reach.
         
-        return best_type
+        Walks the ranked chunks assuming each long chunk shrinks to about
+        SUMMARY_ESTIMATE_CHARS, so chunks far past the budget are not summarized.
+        """
+        selected = []
+        estimated_chars = 0
+        for chunk in chunks:
+            if estimated_chars >= max_output_chars:
+                break
+            if chunk.char_count > SUMMARIZE_MIN_CHARS:
+                selected.append(chunk.text)
+                estimated_chars += SUMMARY_ESTIMATE_CHARS
+            else:
+                estimated_chars += chunk.char_count
+        return selected
     
     async def _ai_summarize_chunk(
         self,
@@ -365,65 +365,12 @@ class QueryFocusedExtractor:
         
         Only called for chunks > 1000 chars when AI summarization is enabled.
         """
-        try:
-            from src.config.settings import settings
-            import openai
-            
-            client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
-            
-            ac_text = "\n".join(f"- {ac}" for ac in acceptance_criteria[:5])
-            
-            prompt = f"""Extract ONLY the QA-testable requirements from this document section.
-
-Story Context: {story_summary[:500] if story_summary else 'Not provided'}
-
-Acceptance Criteria:
-{ac_text}
-
-Document Section:
-{chunk[:2000]}
-
-Output ONLY:
-1. Functional requirements that can be tested
-2. Expected behaviors with specific conditions
-3. Error cases and edge cases
-4. API endpoints/methods mentioned
-
-Skip: Background, history, decisions, meeting notes, alternatives considered.
-
-Format as bullet points. Be concise (max 500 chars)."""
-
-            response = await client.chat.completions.create(
-                model=self.ai_model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=300,
-                temperature=0.1
-            )
-            
-            result = response.choices[0].message.content.strip()
-            logger.debug(f"[EXTRACTOR] AI summarized {len(chunk)} -> {len(result)} chars")
-            return result
-            
-        except Exception as e:
-            logger.warning(f"[EXTRACTOR] AI summarization failed: {e}, using truncation")
-            return self._truncate_at_sentence(chunk, 500)
+        summaries = await self.summarizer.summarize_many([chunk], story_summary, acceptance_criteria)
+        return summaries[0]
     
     def _truncate_at_sentence(self, text: str, max_chars: int) -> str:
         """Truncate text at sentence boundary."""
-        if len(text) <= max_chars:
-            return text
-        
-        truncated = text[:max_chars]
-        
-        # Try to end at sentence boundary
-        last_period = truncated.rfind('.')
-        last_newline = truncated.rfind('\n')
-        cut_point = max(last_period, last_newline)
-        
-        if cut_point > max_chars * 0.7:
-            return truncated[:cut_point + 1].strip()
-        
-        return truncated.strip() + "..."
+        return truncate_at_sentence(text, max_chars)
 
 
 def extract_story_keywords(story_summary: str, story_description: str, 
@@ -600,7 +547,8 @@ async def extract_relevant_from_any_source(
 
 def extract_swagger_endpoints(
     swagger_content: str,
-    story_keywords: List[str]
+    story_keywords: List[str],
+    records: Optional[List[Any]] = None
 ) -> str:
     """
     Special extraction for Swagger/OpenAPI content.
@@ -611,10 +559,20 @@ def extract_swagger_endpoints(
     Args:
         swagger_content: Raw Swagger document content
         story_keywords: Keywords from the story
+        records: The spec's EndpointRecords from the endpoint index; when
+            given, matching endpoints are rendered from the records instead
+            of scanning the text
         
     Returns:
         Filtered Swagger content with only relevant endpoints
     """
+    if records:
+        keyword_tokens = tokenize(" ".join(story_keywords))
+        relevant = [record for record in records if record.tokens & keyword_tokens]
+        if relevant:
+            logger.info(f"[EXTRACTOR] Swagger: kept {len(relevant)}/{len(records)} indexed endpoints")
+            return "\n\n".join(record.to_document() for record in relevant)
+    
     if not swagger_content:
         return ""
     
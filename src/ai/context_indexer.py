@@ -7,6 +7,7 @@ Refactored to follow SOLID principles:
 - Dependency Injection: Uses DocumentProcessor, DocumentFetcher, DocumentIndexer
 """
 
+import asyncio
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 
@@ -15,6 +16,8 @@ from loguru import logger
 from src.ai.indexing.document_processor import DocumentProcessor
 from src.ai.indexing.document_fetcher import DocumentFetcher
 from src.ai.indexing.document_indexer import DocumentIndexer
+from src.ai.indexing.endpoint_index import extract_endpoint_records, get_endpoint_index
+from src.config.settings import settings
 from src.ai.rag_store import RAGVectorStore
 from src.models.test_plan import TestPlan
 from src.models.story import JiraStory
@@ -67,17 +70,20 @@ class ContextIndexer:
         self,
         docs: List[Dict[str, Any]],
         project_key: Optional[str] = None
-    ) -> None:
+    ) -> int:
         """
         Index Confluence documentation for retrieval.
         
         Args:
             docs: List of Confluence document dicts (from story_collector)
             project_key: Optional project key for filtering
+
+        Returns:
+            Number of Confluence docs stored
         """
         if not docs:
             logger.info("No Confluence docs to index")
-            return
+            return 0
         
         # Process documents
         doc_texts = []
@@ -94,23 +100,26 @@ class ContextIndexer:
             ids.append(doc_id)
         
         # Index documents
-        await self.indexer.index_confluence_docs(doc_texts, metadatas, ids)
+        return await self.indexer.index_confluence_docs(doc_texts, metadatas, ids)
     
     async def index_jira_stories(
         self,
         stories: List[JiraStory],
         project_key: Optional[str] = None
-    ) -> None:
+    ) -> int:
         """
         Index Jira stories for pattern learning.
         
         Args:
             stories: List of Jira stories
             project_key: Optional project key for filtering
+
+        Returns:
+            Number of Jira stories stored
         """
         if not stories:
             logger.info("No Jira stories to index")
-            return
+            return 0
         
         # Process stories
         doc_texts = []
@@ -127,23 +136,26 @@ class ContextIndexer:
             ids.append(doc_id)
         
         # Index stories
-        await self.indexer.index_jira_stories(doc_texts, metadatas, ids)
+        return await self.indexer.index_jira_stories(doc_texts, metadatas, ids)
     
     async def index_existing_tests(
         self,
         tests: List[Dict[str, Any]],
         project_key: str
-    ) -> None:
+    ) -> int:
         """
         Index existing Zephyr test cases for duplicate detection and style learning.
         
         Args:
             tests: List of existing test case dicts from Zephyr
             project_key: Project key for filtering
+
+        Returns:
+            Number of existing tests stored
         """
         if not tests:
             logger.info("No existing tests to index")
-            return
+            return 0
         
         # Process tests
         doc_texts = []
@@ -161,20 +173,34 @@ class ContextIndexer:
             ids.append(doc_id)
         
         # Index tests
-        await self.indexer.index_existing_tests(doc_texts, metadatas, ids)
+        return await self.indexer.index_existing_tests(doc_texts, metadatas, ids)
 
     async def index_external_docs(self) -> int:
         """
         Index external documentation.
         Uses DocumentFetcher and DocumentIndexer services.
         
+        Only new or changed pages are re-embedded (conditional re-crawl);
+        pages that disappeared are deleted from the collection. An empty
+        collection forces a full fetch. The crawl's validators are only
+        recorded once every page is stored, so failed pages are retried.
+        
         Returns:
             Number of documents indexed
         """
+        stats = self.store.get_collection_stats(self.store.EXTERNAL_DOCS_COLLECTION)
+        force_refresh = stats.get('count', 0) == 0
+        
         # Fetch external documents
-        external_docs = await self.fetcher.fetch_external_docs()
+        external_docs = await self.fetcher.fetch_external_docs(force_refresh=force_refresh)
+        
+        removed_urls = getattr(self.fetcher, 'external_stats', {}).get('removed', [])
+        if removed_urls:
+            deleted = self.indexer.remove_external_docs(removed_urls)
+            logger.info(f"Removed {deleted} external docs that disappeared from the source")
         
         if not external_docs:
+            self.fetcher.commit_external_docs()
             return 0
         
         # Process documents (ChromaDB will handle upserts based on stable IDs)
@@ -182,26 +208,30 @@ class ContextIndexer:
         metadatas = []
         ids = []
         
-        for doc in external_docs:
-            # Process document text
-            doc_text = self.processor.build_external_doc_document(doc.url, doc.title, doc.html)
+        # Process document texts (cleaned in one batch). The batch blocks on the HTML
+        # process pool, so run it off the event loop to keep concurrent index phases going
+        cleaned_texts = await asyncio.to_thread(self.processor.build_external_doc_documents, external_docs)
+        for doc, doc_text in zip(external_docs, cleaned_texts):
             if not doc_text:
                 continue
             
             # Create metadata
             metadata = self.indexer.create_external_doc_metadata(doc.url, doc.title, doc_text)
-            doc_hash = metadata['doc_hash']
             
             doc_texts.append(doc_text)
             metadatas.append(metadata)
-            ids.append(f"plainid_{doc_hash}")
+            ids.append(self.indexer.create_external_doc_id(doc.url))
         
         if not doc_texts:
             logger.warning("No new external documentation to index")
+            self.fetcher.commit_external_docs()
             return 0
         
-        # Index documents
-        return await self.indexer.index_external_docs(doc_texts, metadatas, ids)
+        # Index documents; the validator cache is only saved once they are stored
+        indexed = await self.indexer.index_external_docs(doc_texts, metadatas, ids)
+        if indexed == len(doc_texts):
+            self.fetcher.commit_external_docs()
+        return indexed
     
     async def index_story_context(
         self,
@@ -237,14 +267,29 @@ class ContextIndexer:
         Index GitLab Swagger/OpenAPI documentation.
         Uses DocumentFetcher and DocumentIndexer services.
         
+        Only new or changed specs (by blob SHA) are downloaded and
+        re-embedded; specs that disappeared are deleted from the collection.
+        Each spec's operations also go into the endpoint index (and, if
+        enabled, are embedded one vector per endpoint). An empty collection
+        or endpoint index forces a full fetch.
+        
         Returns:
             Number of documents indexed
         """
+        endpoint_index = get_endpoint_index()
+        stats = self.store.get_collection_stats(self.store.SWAGGER_DOCS_COLLECTION)
+        force_refresh = stats.get('count', 0) == 0 or len(endpoint_index) == 0
+        
         # Fetch GitLab Swagger documents
-        swagger_docs = await self.fetcher.fetch_gitlab_swagger_docs()
+        swagger_docs = await self.fetcher.fetch_gitlab_swagger_docs(force_refresh=force_refresh)
         
-        if not swagger_docs:
-            return 0
+        stale_endpoints = []
+        removed_specs = getattr(self.fetcher, 'swagger_stats', {}).get('removed', [])
+        if removed_specs:
+            deleted = self.indexer.remove_swagger_docs(removed_specs)
+            logger.info(f"Removed {deleted} Swagger docs that disappeared from GitLab")
+            for spec in removed_specs:
+                stale_endpoints.extend(endpoint_index.remove_file(spec['service_name'], spec['file_path']))
         
         # Process documents (ChromaDB will handle upserts based on stable IDs)
         doc_texts = []
@@ -252,14 +297,24 @@ class ContextIndexer:
         ids = []
         
         for doc in swagger_docs:
+            # Extract project key from service name or use default
+            project_key = doc.service_name.split('-')[0].upper() if '-' in doc.service_name else 'PLAT'
+            
+            # Endpoint-level records replace the file's previous ones
+            records = extract_endpoint_records(doc, project_key)
+            stale_endpoints.extend(endpoint_index.replace_file(doc.service_name, doc.file_path, records))
+            if settings.swagger_endpoint_embeddings_enabled:
+                for record in records:
+                    doc_texts.append(record.to_document())
+                    metadatas.append(self.indexer.create_endpoint_metadata(record))
+                    ids.append(self.indexer.create_endpoint_doc_id(record))
+            
             # Process document text
             doc_text = self.processor.build_swagger_document(doc)
             if not doc_text:
                 continue
             
             # Create metadata
-            # Extract project key from service name or use default
-            project_key = doc.service_name.split('-')[0].upper() if '-' in doc.service_name else 'PLAT'
             metadata = self.indexer.create_swagger_metadata(doc, project_key)
             doc_hash = metadata['doc_hash']
             
@@ -267,10 +322,25 @@ class ContextIndexer:
             metadatas.append(metadata)
             ids.append(f"swagger_{doc_hash}")
         
+        if stale_endpoints:
+            deleted = self.indexer.remove_endpoint_docs(stale_endpoints)
+            logger.info(f"Removed {deleted} Swagger endpoint docs that no longer exist")
+        if swagger_docs or removed_specs:
+            endpoint_index.save()
+            logger.info(f"Endpoint index: {len(endpoint_index)} endpoints")
+        
+        if not swagger_docs:
+            if removed_specs:
+                self.fetcher.commit_gitlab_swagger_docs()
+            return 0
+        
         if not doc_texts:
             logger.warning("No new Swagger documentation to index")
+            self.fetcher.commit_gitlab_swagger_docs()
             return 0
         
-        # Index documents
-        return await self.indexer.index_swagger_docs(doc_texts, metadatas, ids)
-
+        # Index documents; the manifest is only updated once they are stored
+        indexed = await self.indexer.index_swagger_docs(doc_texts, metadatas, ids)
+        if indexed == len(doc_texts):
+            self.fetcher.commit_gitlab_swagger_docs()
+        return indexed
@@ -6,9 +6,10 @@ Caches EnrichedStory objects to avoid reprocessing unchanged stories.
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Union
 from loguru import logger
 
+from src.ai.enrichment_cache_sqlite import SQLiteEnrichmentCache
 from src.models.enriched_story import EnrichedStory
 from src.config.settings import settings
 
@@ -98,7 +99,6 @@ class EnrichmentCache:
             logger.debug(f"  - Cached at: {enriched.enrichment_timestamp}")
             logger.debug(f"  - Age: {cache_age.days} days")
             logger.debug(f"  - Source stories: {', '.join(enriched.source_story_ids)}")
-            logger.debug(f"  - APIs: {len(enriched.api_specifications)}")
             logger.debug(f"  - ACs: {len(enriched.acceptance_criteria)}")
             
             logger.info(f"Using cached enrichment for {story_key} (age: {cache_age.days}d)")
@@ -185,3 +185,31 @@ class EnrichmentCache:
             logger.error(f"Failed to get cache stats: {e}")
             return {}
 
+
+_sqlite_caches: Dict[str, SQLiteEnrichmentCache] = {}
+
+
+def create_enrichment_cache(cache_dir: Optional[str] = None) -> Union[EnrichmentCache, SQLiteEnrichmentCache]:
+    """
+    Create the enrichment cache for the configured backend.
+    
+    The sqlite backend is shared per database file, so generators created per
+    request reuse one connection and one sweeper thread.
+    
+    Args:
+        cache_dir: Cache directory (defaults to settings). The file backend
+            stores entries in it; the sqlite backend uses enrichment_cache.db
+            inside it instead of settings.enrichment_cache_db_path
+        
+    Returns:
+        Cache with get_cached/save_cached/clear_cache/get_cache_stats
+    """
+    if settings.enrichment_cache_backend == "sqlite":
+        if cache_dir:
+            db_path = str(Path(cache_dir) / "enrichment_cache.db")
+        else:
+            db_path = settings.enrichment_cache_db_path
+        if db_path not in _sqlite_caches:
+            _sqlite_caches[db_path] = SQLiteEnrichmentCache(db_path)
+        return _sqlite_caches[db_path]
+    return EnrichmentCache(cache_dir)
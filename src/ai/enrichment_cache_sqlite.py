@@ -0,0 +1,266 @@
+"""
+SQLite backend for the enrichment cache.
+
+One database file (WAL mode) replaces the directory of per-story JSON files:
+lookups go through the story_key primary key instead of globbing, payloads
+are compact compressed JSON, and a background sweeper enforces the TTL and
+a maximum entry count so the cache stays bounded.
+
+Payloads are zstd-compressed when the zstandard package is installed and
+zlib-compressed otherwise; the codec is stored per row, so a database stays
+readable when the installed packages change.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+from src.models.enriched_story import EnrichedStory
+from src.config.settings import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrichments (
+    story_key TEXT PRIMARY KEY,
+    story_updated TEXT,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_enrichments_created ON enrichments (created_at);
+CREATE INDEX IF NOT EXISTS idx_enrichments_accessed ON enrichments (accessed_at);
+"""
+
+
+def _compress(data: bytes) -> tuple:
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def _decompress(codec: str, payload: bytes) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard is required to read this cache entry")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return zlib.decompress(payload)
+
+
+class SQLiteEnrichmentCache:
+    """
+    SQLite-backed cache for enriched stories.
+
+    Same interface as EnrichmentCache: get_cached, save_cached, clear_cache,
+    get_cache_stats. Invalidation: if source story updated or entry > TTL
+    days old (checked on read and by the background sweeper).
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        """
+        Open (or create) the cache database and start the sweeper.
+
+        Args:
+            db_path: Database file (defaults to settings)
+            max_entries: Entries kept before least recently used ones are
+                evicted (defaults to settings)
+            sweep_interval: Seconds between background sweeps; 0 disables
+                the sweeper thread (defaults to settings)
+        """
+        self.db_path = Path(db_path or settings.enrichment_cache_db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_days = settings.enrichment_cache_ttl_days
+        self.max_entries = max_entries if max_entries is not None else settings.enrichment_cache_max_entries
+        if sweep_interval is None:
+            sweep_interval = settings.enrichment_cache_sweep_interval_seconds
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._stop = threading.Event()
+        self._sweeper = None
+        if sweep_interval > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(sweep_interval,), name="enrichment-cache-sweeper", daemon=True
+            )
+            self._sweeper.start()
+        logger.debug(f"Enrichment cache (sqlite) initialized at {self.db_path} (TTL: {self.ttl_days} days)")
+
+    @property
+    def _ttl_seconds(self) -> float:
+        return self.ttl_days * 86400
+
+    def get_cached(self, story_key: str, story_updated: Optional[datetime] = None) -> Optional[EnrichedStory]:
+        """
+        Retrieve cached enriched story if available and valid.
+
+        Args:
+            story_key: Story key
+            story_updated: Optional story update timestamp for validation
+
+        Returns:
+            EnrichedStory if cached and valid, None otherwise
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT created_at, codec, payload FROM enrichments WHERE story_key = ?", (story_key,)
+                ).fetchone()
+            if row is None:
+                logger.debug(f"No cache found for {story_key}")
+                return None
+
+            created_at, codec, payload = row
+            cache_age_days = (time.time() - created_at) / 86400
+            if cache_age_days > self.ttl_days:
+                logger.info(f"Cache expired for {story_key} (age: {int(cache_age_days)} days)")
+                return None
+
+            enriched = EnrichedStory(**json.loads(_decompress(codec, payload)))
+
+            # If story was updated after cache, invalidate
+            if story_updated and enriched.enrichment_timestamp < story_updated:
+                logger.info(f"Cache invalidated for {story_key} (story updated after cache)")
+                return None
+
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE enrichments SET accessed_at = ? WHERE story_key = ?", (time.time(), story_key)
+                )
+
+            logger.info(f"Using cached enrichment for {story_key} (age: {int(cache_age_days)}d)")
+            return enriched
+
+        except Exception as e:
+            logger.warning(f"Failed to load cache for {story_key}: {e}")
+            return None
+
+    def save_cached(self, enriched: EnrichedStory, story_updated: Optional[datetime] = None) -> None:
+        """
+        Save enriched story to cache (replaces any previous entry atomically).
+
+        Args:
+            enriched: EnrichedStory to cache
+            story_updated: Optional story update timestamp for versioning
+        """
+        try:
+            data = json.dumps(enriched.dict(), default=str, separators=(",", ":")).encode("utf-8")
+            codec, payload = _compress(data)
+            updated = (story_updated or enriched.enrichment_timestamp).isoformat()
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO enrichments "
+                    "(story_key, story_updated, created_at, accessed_at, codec, size, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (enriched.story_key, updated, now, now, codec, len(payload), payload),
+                )
+            logger.info(
+                f"Cached enrichment for {enriched.story_key} "
+                f"({len(data) / 1024:.1f} KB -> {len(payload) / 1024:.1f} KB {codec})"
+            )
+        except Exception as e:
+            logger.error(f"Failed to save cache for {enriched.story_key}: {e}")
+
+    def clear_cache(self, story_key: Optional[str] = None) -> int:
+        """
+        Clear cache for specific story or all stories.
+
+        Args:
+            story_key: Optional story key to clear (if None, clears all)
+
+        Returns:
+            Number of entries deleted
+        """
+        try:
+            with self._lock:
+                if story_key:
+                    cursor = self._conn.execute("DELETE FROM enrichments WHERE story_key = ?", (story_key,))
+                else:
+                    cursor = self._conn.execute("DELETE FROM enrichments")
+            count = cursor.rowcount
+            if count > 0:
+                logger.info(f"Cleared {count} cache entr{'y' if count == 1 else 'ies'}" + (f" for {story_key}" if story_key else ""))
+            return count
+        except Exception as e:
+            logger.error(f"Failed to clear cache: {e}")
+            return 0
+
+    def get_cache_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with cache stats
+        """
+        try:
+            with self._lock:
+                count, total_size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM enrichments"
+                ).fetchone()
+            return {
+                "total_files": count,
+                "total_size_kb": total_size // 1024,
+                "cache_dir": str(self.db_path),
+                "ttl_days": self.ttl_days,
+                "backend": "sqlite",
+            }
+        except Exception as e:
+            logger.error(f"Failed to get cache stats: {e}")
+            return {}
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Delete expired entries, then the least recently used beyond max_entries.
+
+        Returns:
+            Counts of 'expired' and 'evicted' entries
+        """
+        with self._lock:
+            expired = self._conn.execute(
+                "DELETE FROM enrichments WHERE created_at < ?", (time.time() - self._ttl_seconds,)
+            ).rowcount
+            evicted = self._conn.execute(
+                "DELETE FROM enrichments WHERE story_key IN ("
+                "SELECT story_key FROM enrichments ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if expired or evicted:
+            logger.info(f"Enrichment cache sweep: {expired} expired, {evicted} evicted")
+        return {"expired": expired, "evicted": evicted}
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning(f"Enrichment cache sweep failed: {e}")
+
+    def close(self) -> None:
+        """Stop the sweeper and close the database."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+        with self._lock:
+            self._conn.close()
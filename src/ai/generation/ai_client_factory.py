@@ -16,7 +16,8 @@ class AIClientFactory:
     Factory for creating AI client instances.
     Supports OpenAI and Anthropic (Claude) clients.
     
-    All clients are async to ensure non-blocking I/O in FastAPI.
+    All clients are async to ensure non-blocking I/O in FastAPI, and share the
+    same retry/timeout policy regardless of provider.
     """
 
     @staticmethod
@@ -36,7 +37,11 @@ class AIClientFactory:
         api_key = api_key or settings.openai_api_key
         model = model or settings.ai_model
         
-        client = AsyncOpenAI(api_key=api_key)
+        client = AsyncOpenAI(
+            api_key=api_key,
+            timeout=settings.ai_request_timeout,
+            max_retries=settings.ai_max_retries,
+        )
         logger.info(f"Created AsyncOpenAI client with model: {model}")
         
         return client, model
@@ -58,7 +63,11 @@ class AIClientFactory:
         api_key = api_key or settings.anthropic_api_key
         model = model or settings.default_ai_model
         
-        client = AsyncAnthropic(api_key=api_key)
+        client = AsyncAnthropic(
+            api_key=api_key,
+            timeout=settings.ai_request_timeout,
+            max_retries=settings.ai_max_retries,
+        )
         logger.info(f"Created AsyncAnthropic client with model: {model}")
         
         return client, model
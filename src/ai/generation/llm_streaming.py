@@ -0,0 +1,133 @@
+"""
+Streaming helpers for AI completions.
+Single Responsibility: Turning provider responses and streams into text deltas and streamed test cases.
+
+Both providers' async clients are used, so completions never block the event loop.
+"""
+
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from loguru import logger
+
+from src.ai.generation.response_parser import ResponseParser
+from src.ai.generation.stream_parser import IncrementalTestCaseParser
+from src.models.test_case import TestCase
+
+
+async def stream_openai_text(
+    client: Any,
+    on_usage: Optional[Callable[[Any], None]] = None,
+    **create_kwargs: Any,
+) -> AsyncIterator[str]:
+    """
+    Stream text deltas from an AsyncOpenAI chat completion.
+
+    Args:
+        client: AsyncOpenAI client
+        on_usage: Optional callback receiving the usage object sent at the end of the stream
+        **create_kwargs: Arguments for chat.completions.create (stream is forced on)
+
+    Yields:
+        Non-empty content deltas
+    """
+    if on_usage:
+        # Passed as extra_body so older SDKs without the stream_options kwarg still work
+        create_kwargs.setdefault("extra_body", {})["stream_options"] = {"include_usage": True}
+    stream = await client.chat.completions.create(stream=True, **create_kwargs)
+    async for chunk in stream:
+        if on_usage and getattr(chunk, "usage", None):
+            on_usage(chunk.usage)
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def complete_anthropic_text(
+    client: Any,
+    on_usage: Optional[Callable[[Any], None]] = None,
+    **create_kwargs: Any,
+) -> str:
+    """
+    Await an AsyncAnthropic message without streaming.
+
+    Args:
+        client: AsyncAnthropic client
+        on_usage: Optional callback receiving the response usage (None if absent)
+        **create_kwargs: Arguments for messages.create
+
+    Returns:
+        Text of the first content block
+    """
+    response = await client.messages.create(**create_kwargs)
+    if on_usage:
+        on_usage(getattr(response, "usage", None))
+    return response.content[0].text
+
+
+async def stream_anthropic_text(
+    client: Any,
+    on_usage: Optional[Callable[[Any], None]] = None,
+    **create_kwargs: Any,
+) -> AsyncIterator[str]:
+    """
+    Stream text deltas from an AsyncAnthropic message.
+
+    Args:
+        client: AsyncAnthropic client
+        on_usage: Optional callback receiving the message usage once the stream ends
+            (input and cache token counts from message_start, output tokens from message_delta)
+        **create_kwargs: Arguments for messages.create (stream is forced on)
+
+    Yields:
+        Non-empty text deltas
+    """
+    stream = await client.messages.create(stream=True, **create_kwargs)
+    usage = {}
+    async for event in stream:
+        if event.type == "content_block_delta" and getattr(event.delta, "text", None):
+            yield event.delta.text
+        elif on_usage and event.type == "message_start" and getattr(event.message, "usage", None):
+            usage.update(
+                (field, getattr(event.message.usage, field, 0) or 0)
+                for field in ("input_tokens", "cache_read_input_tokens", "cache_creation_input_tokens", "output_tokens")
+            )
+        elif on_usage and event.type == "message_delta" and getattr(event, "usage", None):
+            usage["output_tokens"] = getattr(event.usage, "output_tokens", 0) or 0
+    if on_usage and usage:
+        on_usage(SimpleNamespace(**usage))
+
+
+async def emit_streamed_test_cases(
+    deltas: AsyncIterator[str],
+    response_parser: ResponseParser,
+    on_test_case: Callable[[TestCase], Awaitable[None]],
+    log_prefix: str = "[STREAM]",
+) -> str:
+    """
+    Consume a completion stream, passing each test case on as soon as it is well-formed.
+
+    Args:
+        deltas: Text deltas from stream_openai_text / stream_anthropic_text
+        response_parser: Parser used to build TestCase objects
+        on_test_case: Async callback receiving each TestCase
+        log_prefix: Prefix for log lines
+
+    Returns:
+        Full response text, for the regular end-of-response parse
+    """
+    import time
+
+    parser = IncrementalTestCaseParser()
+    started = time.perf_counter()
+
+    async for delta in deltas:
+        for tc_data in parser.feed(delta):
+            if parser.emitted == 1:
+                logger.info(f"{log_prefix} First streamed test case after {time.perf_counter() - started:.1f}s")
+            await on_test_case(response_parser.build_test_case(tc_data))
+
+    logger.info(
+        f"{log_prefix} Stream complete: {parser.emitted} test cases, "
+        f"{len(parser.text)} chars in {time.perf_counter() - started:.1f}s"
+    )
+    return parser.text
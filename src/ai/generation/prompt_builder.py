@@ -12,9 +12,7 @@ Refactored to support:
 - Comprehensive logging for debugging
 """
 
-import json
 import time
-from pathlib import Path
 from typing import Optional, List, Dict, Any
 from loguru import logger
 
@@ -41,26 +39,62 @@ from src.ai.prompts_compact import (
     COMPACT_JSON_SCHEMA,
     COMPACT_SYSTEM_INSTRUCTION,
 )
+from src.ai.generation.prompt_cache import PromptParts
+from src.ai.generation.prompt_overrides import get_prompt_overrides
+from src.ai.generation.token_budget import BudgetItem, TokenBudgetAllocator, get_token_counter
+from src.config.settings import settings
 
-# Path for prompt overrides
-PROMPT_OVERRIDES_FILE = Path("data/prompt_overrides.json")
+# Fixed header lines for each RAG source section
+RAG_SECTION_HEADERS: Dict[str, List[str]] = {
+    'test_plans': ["\n--- SIMILAR PAST TEST PLANS (Learn patterns from these) ---\n"],
+    'confluence': ["\n--- COMPANY DOCUMENTATION (Use this terminology) ---\n"],
+    'stories': ["\n--- SIMILAR PAST STORIES (Apply same approach) ---\n"],
+    'existing_tests': [
+        "\n--- EXISTING TESTS (CRITICAL: Check for duplicates before generating!) ---\n",
+        "⚠️  DUPLICATE DETECTION REQUIREMENT:\n",
+        "• Review these existing tests carefully - do they already cover your scenario?\n",
+        "• If a test already exists for this functionality → DO NOT create a duplicate!\n",
+        "• Document in your reasoning: 'Checked existing tests: [found/not found duplicates]'\n",
+        "• If similar test exists: Reference it and explain how yours differs, or skip it\n",
+        "• Better to skip a test than create redundant coverage\n\n",
+    ],
+    'external_docs': [
+        "\n--- EXTERNAL API DOCUMENTATION (Use exact endpoints/payloads) ---\n",
+        "Requirements for test data:",
+        "• Copy EXACT JSON structures from documentation - do NOT modify",
+        "• Include ALL required fields shown in examples",
+        "• Use actual field names and data types",
+        "• If JSON example shown, include it verbatim in test steps",
+        "• NO generic placeholders like '<token>' or 'Bearer <value>'",
+        "• If exact payload unavailable: state 'Reference [doc name] for payload'\n",
+    ],
+    'swagger_docs': [
+        "\n--- SWAGGER/OPENAPI DOCUMENTATION (Use exact API specs) ---\n",
+        "Requirements for API test data:",
+        "• Copy EXACT endpoint paths, methods, and parameters from Swagger specs",
+        "• Use EXACT status codes documented in responses",
+        "• Reference EXACT request/response schema field names and types",
+        "• Include authentication requirements from security schemes",
+        "• Match parameter names, types, and required/optional indicators",
+        "• If request body schema shown, use exact field names in test data",
+        "• NO invented endpoints - only use what's documented\n",
+    ],
+}
 
-
-def _load_prompt_overrides() -> Dict[str, str]:
-    """Load prompt overrides from disk."""
-    try:
-        if PROMPT_OVERRIDES_FILE.exists():
-            with open(PROMPT_OVERRIDES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
-        logger.warning(f"Failed to load prompt overrides: {e}")
-    return {}
+# Value multiplier per RAG source when packing the budget (API docs are the priority)
+RAG_SECTION_WEIGHTS: Dict[str, float] = {
+    'test_plans': 1.0,
+    'confluence': 1.0,
+    'stories': 0.8,
+    'existing_tests': 1.0,
+    'external_docs': 1.2,
+    'swagger_docs': 1.2,
+}
 
 
 def _get_prompt_section(section_name: str, default_content: str) -> str:
-    """Get prompt section content, with override if available."""
-    overrides = _load_prompt_overrides()
-    return overrides.get(section_name, default_content)
+    """Get prompt section content, with override if available (cached in memory)."""
+    return get_prompt_overrides().get(section_name, default_content)
 
 
 class PromptBuilder:
@@ -457,33 +491,45 @@ Ensure all required fields are populated with realistic values.
             RAG_BUDGET = MAX_TOTAL_TOKENS - RESERVED_FOR_PROMPTS
             logger.info(f"Using standard model ({self.model}): {RAG_BUDGET} tokens for RAG")
         
+        counter = get_token_counter(self.model)
+        allocator = TokenBudgetAllocator(RAG_BUDGET, counter)
+        
         sections = []
         sections.append("<retrieved_context>")
         sections.append("=== COMPANY DATA (Retrieved from RAG) ===")
         sections.append("This is your PRIMARY reference for test generation.\n")
-        
-        # Track token usage
-        header_text = "\n".join(sections)
-        tokens_used = self._estimate_tokens(header_text)
-        tokens_remaining = RAG_BUDGET - tokens_used
-        
-        # Add similar test plans
-        tokens_remaining = self._add_test_plans_section(sections, retrieved_context, tokens_remaining)
-        
-        # Add Confluence docs
-        tokens_remaining = self._add_confluence_section(sections, retrieved_context, tokens_remaining)
-        
-        # Add similar stories
-        tokens_remaining = self._add_stories_section(sections, retrieved_context, tokens_remaining)
-        
-        # Add existing tests
-        tokens_remaining = self._add_existing_tests_section(sections, retrieved_context, tokens_remaining)
-        
-        # Add external docs (External API) - PRIORITY
-        tokens_remaining = self._add_external_docs_section(sections, retrieved_context, tokens_remaining)
-        
-        # Add swagger docs (GitLab OpenAPI specs)
-        tokens_remaining = self._add_swagger_docs_section(sections, retrieved_context, tokens_remaining)
+        allocator.reserve("\n".join(sections))
+        # Footer is at most this long
+        allocator.reserve(f"\n=== END RETRIEVED CONTEXT ===\nToken budget: {RAG_BUDGET}/{RAG_BUDGET} used\n</retrieved_context>\n")
+        
+        # Candidate documents (top 3 per source), in prompt order
+        sources = [
+            ('test_plans', retrieved_context.similar_test_plans, self._format_test_plan_doc),
+            ('confluence', retrieved_context.similar_confluence_docs, self._format_confluence_doc),
+            ('stories', retrieved_context.similar_jira_stories, self._format_story_doc),
+            ('existing_tests', retrieved_context.similar_existing_tests, self._format_existing_test_doc),
+            ('external_docs', retrieved_context.similar_external_docs, self._format_external_doc),  # PRIORITY
+            ('swagger_docs', retrieved_context.similar_swagger_docs, self._format_swagger_doc),
+        ]
+        candidates = []
+        for section_name, docs, format_doc in sources:
+            if not docs:
+                continue
+            allocator.reserve("\n".join(RAG_SECTION_HEADERS[section_name]))
+            for i, doc in enumerate(docs[:3], 1):
+                relevance = max(1 - doc.get('distance', 0), 0.05)
+                candidates.append(BudgetItem(
+                    key=section_name,
+                    text=format_doc(i, doc),
+                    value=relevance * RAG_SECTION_WEIGHTS[section_name],
+                ))
+        
+        # Pack documents by value per token, then render each section with what was kept
+        selected = allocator.pack(candidates)
+        tokens_remaining = RAG_BUDGET - self._count_tokens("\n".join(sections))
+        for section_name, _, _ in sources:
+            blocks = [item.text for item in selected if item.key == section_name]
+            tokens_remaining = self._add_rag_section(sections, section_name, blocks, tokens_remaining)
         
         # Footer
         sections.append(f"\n=== END RETRIEVED CONTEXT ===")
@@ -565,151 +611,110 @@ Ensure all required fields are populated with realistic values.
         
         return folder_context
 
-    def _add_test_plans_section(self, sections: list, retrieved_context, tokens_remaining: int) -> int:
-        """Add similar test plans section - FULL CONTENT, NO TRUNCATION."""
-        if not retrieved_context.similar_test_plans:
-            return tokens_remaining
-        
-        sections.append("\n--- SIMILAR PAST TEST PLANS (Learn patterns from these) ---\n")
-        for i, doc in enumerate(retrieved_context.similar_test_plans[:3], 1):
-            sections.append(f"\n{i}. Test Plan Example:")
-            sections.append(f"   Similarity: {1 - doc.get('distance', 0):.2f}")
-            sections.append(f"   {doc.get('document', '')}")  # FULL CONTENT
-            sections.append("   " + "-" * 70)
-        
-        return tokens_remaining
-
-    def _add_confluence_section(self, sections: list, retrieved_context, tokens_remaining: int) -> int:
-        """Add Confluence docs section - FULL CONTENT, NO TRUNCATION."""
-        if not retrieved_context.similar_confluence_docs:
-            return tokens_remaining
-        
-        sections.append("\n--- COMPANY DOCUMENTATION (Use this terminology) ---\n")
+    def _add_rag_section(self, sections: list, section_name: str, blocks: List[str], tokens_remaining: int) -> int:
+        """
+        Add a RAG section header and its selected document blocks.
         
-        for i, doc in enumerate(retrieved_context.similar_confluence_docs[:3], 1):
-            metadata = doc.get('metadata', {})
-            doc_text = doc.get('document', '')
-            
-            sections.append(f"\n{i}. {metadata.get('title', 'Unknown')}")
-            if metadata.get('url'):
-                sections.append(f"   Source: {metadata.get('url')}")
-            sections.append(f"   Relevance: {1 - doc.get('distance', 0):.2f}")
+        Args:
+            sections: Prompt lines to append to
+            section_name: Key in RAG_SECTION_HEADERS
+            blocks: Formatted document blocks chosen by the budget allocator
+            tokens_remaining: Tokens left before this section
             
-            sections.append(f"\n   Content:")
-            sections.append(f"   {'-' * 68}")
-            # Add content with proper indentation
-            for line in doc_text.split('\n'):
-                sections.append(f"   {line}")
-            sections.append(f"   {'-' * 68}")
-        
-        return tokens_remaining
-
-    def _add_stories_section(self, sections: list, retrieved_context, tokens_remaining: int) -> int:
-        """Add similar stories section - FULL CONTENT, NO TRUNCATION."""
-        if not retrieved_context.similar_jira_stories:
+        Returns:
+            Tokens left after this section (exact count)
+        """
+        if not blocks:
             return tokens_remaining
         
-        sections.append("\n--- SIMILAR PAST STORIES (Apply same approach) ---\n")
-        
-        for i, doc in enumerate(retrieved_context.similar_jira_stories[:3], 1):
-            metadata = doc.get('metadata', {})
-            doc_text = doc.get('document', '')
-            
-            sections.append(f"\n{i}. Story: {metadata.get('story_key', 'Unknown')}")
-            sections.append(f"   {doc_text}")  # FULL CONTENT, NO TRUNCATION
-            sections.append("   " + "-" * 70)
-        
-        return tokens_remaining
+        added = list(RAG_SECTION_HEADERS[section_name]) + blocks
+        sections.extend(added)
+        return tokens_remaining - self._count_tokens("\n".join(added))
 
-    def _add_existing_tests_section(self, sections: list, retrieved_context, tokens_remaining: int) -> int:
-        """Add existing tests section - FULL CONTENT, NO TRUNCATION."""
-        if not retrieved_context.similar_existing_tests:
-            return tokens_remaining
-        
-        sections.append("\n--- EXISTING TESTS (CRITICAL: Check for duplicates before generating!) ---\n")
-        sections.append("⚠️  DUPLICATE DETECTION REQUIREMENT:\n")
-        sections.append("• Review these existing tests carefully - do they already cover your scenario?\n")
-        sections.append("• If a test already exists for this functionality → DO NOT create a duplicate!\n")
-        sections.append("• Document in your reasoning: 'Checked existing tests: [found/not found duplicates]'\n")
-        sections.append("• If similar test exists: Reference it and explain how yours differs, or skip it\n")
-        sections.append("• Better to skip a test than create redundant coverage\n\n")
-        
-        for i, doc in enumerate(retrieved_context.similar_existing_tests[:3], 1):
-            metadata = doc.get('metadata', {})
-            doc_text = doc.get('document', '')
-            
-            sections.append(f"\n{i}. Test: {metadata.get('test_name', 'Unknown')}")
-            sections.append(f"   {doc_text}")  # FULL CONTENT, NO TRUNCATION
-            sections.append("   " + "-" * 70)
-        
-        return tokens_remaining
+    @staticmethod
+    def _format_test_plan_doc(i: int, doc: Dict[str, Any]) -> str:
+        """Format a similar test plan - FULL CONTENT, NO TRUNCATION."""
+        return "\n".join([
+            f"\n{i}. Test Plan Example:",
+            f"   Similarity: {1 - doc.get('distance', 0):.2f}",
+            f"   {doc.get('document', '')}",
+            "   " + "-" * 70,
+        ])
 
-    def _add_external_docs_section(self, sections: list, retrieved_context, tokens_remaining: int) -> int:
-        """Add external API documentation section - FULL CONTENT, NO TRUNCATION."""
-        if not retrieved_context.similar_external_docs:
-            return tokens_remaining
-        
-        sections.append("\n--- EXTERNAL API DOCUMENTATION (Use exact endpoints/payloads) ---\n")
-        sections.append("Requirements for test data:")
-        sections.append("• Copy EXACT JSON structures from documentation - do NOT modify")
-        sections.append("• Include ALL required fields shown in examples")
-        sections.append("• Use actual field names and data types")
-        sections.append("• If JSON example shown, include it verbatim in test steps")
-        sections.append("• NO generic placeholders like '<token>' or 'Bearer <value>'")
-        sections.append("• If exact payload unavailable: state 'Reference [doc name] for payload'\n")
-        
-        for i, doc in enumerate(retrieved_context.similar_external_docs[:3], 1):
-            metadata = doc.get('metadata', {})
-            doc_text = doc.get('document', '')
-            
-            # Build header with metadata
-            sections.append(f"\n{i}. {metadata.get('title', 'Unknown')}")
-            sections.append(f"   Source: {metadata.get('source_url', 'N/A')}")
-            if metadata.get('last_updated'):
-                sections.append(f"   Last Updated: {metadata.get('last_updated')}")
-            sections.append(f"   Relevance: {1 - doc.get('distance', 0):.2f}")
-            
-            # Add full content with clear separation
-            sections.append(f"\n   Content:")
-            sections.append(f"   {'-' * 68}")
-            # Add content with proper indentation
-            for line in doc_text.split('\n'):
-                sections.append(f"   {line}")
-            sections.append(f"   {'-' * 68}")
-        
-        return tokens_remaining
+    @staticmethod
+    def _format_confluence_doc(i: int, doc: Dict[str, Any]) -> str:
+        """Format a Confluence doc - FULL CONTENT, NO TRUNCATION."""
+        metadata = doc.get('metadata', {})
+        lines = [f"\n{i}. {metadata.get('title', 'Unknown')}"]
+        if metadata.get('url'):
+            lines.append(f"   Source: {metadata.get('url')}")
+        lines.append(f"   Relevance: {1 - doc.get('distance', 0):.2f}")
+        lines.append(f"\n   Content:")
+        lines.append(f"   {'-' * 68}")
+        # Add content with proper indentation
+        lines.extend(f"   {line}" for line in doc.get('document', '').split('\n'))
+        lines.append(f"   {'-' * 68}")
+        return "\n".join(lines)
 
-    def _add_swagger_docs_section(self, sections: list, retrieved_context, tokens_remaining: int) -> int:
-        """Add Swagger/OpenAPI documentation section - FULL CONTENT, NO TRUNCATION."""
-        if not retrieved_context.similar_swagger_docs:
-            return tokens_remaining
-        
-        sections.append("\n--- SWAGGER/OPENAPI DOCUMENTATION (Use exact API specs) ---\n")
-        sections.append("Requirements for API test data:")
-        sections.append("• Copy EXACT endpoint paths, methods, and parameters from Swagger specs")
-        sections.append("• Use EXACT status codes documented in responses")
-        sections.append("• Reference EXACT request/response schema field names and types")
-        sections.append("• Include authentication requirements from security schemes")
-        sections.append("• Match parameter names, types, and required/optional indicators")
-        sections.append("• If request body schema shown, use exact field names in test data")
-        sections.append("• NO invented endpoints - only use what's documented\n")
-        
-        for i, doc in enumerate(retrieved_context.similar_swagger_docs[:3], 1):
-            metadata = doc.get('metadata', {})
-            doc_text = doc.get('document', '')
-            
-            sections.append(f"\n{i}. Swagger API: {metadata.get('service_name', 'Unknown')}")
-            sections.append(f"   File: {metadata.get('file_path', 'N/A')}")
-            sections.append(f"   Type: {metadata.get('api_type', 'N/A')}")
-            sections.append(f"   Similarity: {1 - doc.get('distance', 0):.2f}")
-            sections.append(f"{doc_text}")  # FULL CONTENT, NO TRUNCATION
-            sections.append("   " + "-" * 70)
-        
-        return tokens_remaining
+    @staticmethod
+    def _format_story_doc(i: int, doc: Dict[str, Any]) -> str:
+        """Format a similar story - FULL CONTENT, NO TRUNCATION."""
+        metadata = doc.get('metadata', {})
+        return "\n".join([
+            f"\n{i}. Story: {metadata.get('story_key', 'Unknown')}",
+            f"   {doc.get('document', '')}",
+            "   " + "-" * 70,
+        ])
+
+    @staticmethod
+    def _format_existing_test_doc(i: int, doc: Dict[str, Any]) -> str:
+        """Format an existing test - FULL CONTENT, NO TRUNCATION."""
+        metadata = doc.get('metadata', {})
+        return "\n".join([
+            f"\n{i}. Test: {metadata.get('test_name', 'Unknown')}",
+            f"   {doc.get('document', '')}",
+            "   " + "-" * 70,
+        ])
+
+    @staticmethod
+    def _format_external_doc(i: int, doc: Dict[str, Any]) -> str:
+        """Format external API documentation - FULL CONTENT, NO TRUNCATION."""
+        metadata = doc.get('metadata', {})
+        # Build header with metadata
+        lines = [
+            f"\n{i}. {metadata.get('title', 'Unknown')}",
+            f"   Source: {metadata.get('source_url', 'N/A')}",
+        ]
+        if metadata.get('last_updated'):
+            lines.append(f"   Last Updated: {metadata.get('last_updated')}")
+        lines.append(f"   Relevance: {1 - doc.get('distance', 0):.2f}")
+        # Add full content with clear separation
+        lines.append(f"\n   Content:")
+        lines.append(f"   {'-' * 68}")
+        lines.extend(f"   {line}" for line in doc.get('document', '').split('\n'))
+        lines.append(f"   {'-' * 68}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_swagger_doc(i: int, doc: Dict[str, Any]) -> str:
+        """Format Swagger/OpenAPI documentation - FULL CONTENT, NO TRUNCATION."""
+        metadata = doc.get('metadata', {})
+        return "\n".join([
+            f"\n{i}. Swagger API: {metadata.get('service_name', 'Unknown')}",
+            f"   File: {metadata.get('file_path', 'N/A')}",
+            f"   Type: {metadata.get('api_type', 'N/A')}",
+            f"   Similarity: {1 - doc.get('distance', 0):.2f}",
+            f"{doc.get('document', '')}",
+            "   " + "-" * 70,
+        ])
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens exactly with the model's tokenizer (memoized)."""
+        return get_token_counter(self.model).count(text)
 
     def _estimate_tokens(self, text: str) -> int:
-        """Estimate token count (rough: 1 token ≈ 4 chars for English)."""
-        return len(text) // 4
+        """Count tokens (tokenizer-backed; ~4 chars/token if tiktoken is unavailable)."""
+        return self._count_tokens(text)
     
     def build_optimized_prompt(
         self,
@@ -1017,8 +1022,12 @@ Ensure all required fields are populated with realistic values.
             existing_tests=existing_tests_data,  # NEW: Pass existing tests
             rag_context=rag_context,
             include_example=include_example,
-            max_rag_tokens=self.MAX_RAG_TOKENS
+            max_rag_tokens=self.MAX_RAG_TOKENS,
+            cache_layout=settings.prompt_cache_layout
         )
+        if isinstance(prompt, PromptParts):
+            # Static rules/example/format first, so the provider can cache the prefix
+            prompt = prompt.text
         
         # Log stats
         elapsed = time.time() - start_time
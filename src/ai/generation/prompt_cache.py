@@ -0,0 +1,161 @@
+"""
+Prompt layout and token accounting for provider-side prompt caching.
+Single Responsibility: Splitting prompts into a cacheable prefix and measuring cache hits.
+
+Both providers cache identical prompt prefixes: OpenAI automatically, Anthropic
+up to an explicit cache_control breakpoint. A prompt only benefits when the
+static instructions come first and per-story content comes after them.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Union
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class PromptParts:
+    """A prompt split into a static (cacheable) prefix and per-story content."""
+
+    static: str
+    dynamic: str
+
+    @property
+    def text(self) -> str:
+        """Full prompt text, static prefix first."""
+        return f"{self.static}\n\n{self.dynamic}"
+
+
+def prompt_text(prompt: Union[str, PromptParts]) -> str:
+    """Get the full text of a plain or split prompt."""
+    return prompt.text if isinstance(prompt, PromptParts) else prompt
+
+
+def anthropic_content(prompt: Union[str, PromptParts]) -> Union[str, List[Dict[str, Any]]]:
+    """
+    Build Anthropic message content, with a cache breakpoint after the static prefix.
+
+    Args:
+        prompt: Plain prompt or PromptParts
+
+    Returns:
+        Message content (plain string when there is nothing to cache)
+    """
+    if not isinstance(prompt, PromptParts):
+        return prompt
+    return [
+        {"type": "text", "text": prompt.static, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": prompt.dynamic},
+    ]
+
+
+@dataclass
+class TokenUsage:
+    """
+    Input/output token totals across the LLM calls of one generation.
+
+    input_tokens counts all prompt tokens, cached or not, so cache hit ratios
+    are comparable between providers.
+    """
+
+    calls: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+    by_stage: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record_openai(self, usage: Any, stage: str = "other") -> None:
+        """
+        Record an OpenAI usage object (prompt_tokens_details.cached_tokens are cache hits).
+
+        Args:
+            usage: response.usage (or the final streamed chunk's usage)
+            stage: Pipeline stage the call belongs to
+        """
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self._add(
+            stage,
+            input_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            cached=getattr(details, "cached_tokens", 0) or 0,
+            cache_write=0,
+            output_tokens=getattr(usage, "completion_tokens", 0) or 0,
+        )
+
+    def record_anthropic(self, usage: Any, stage: str = "other") -> None:
+        """
+        Record an Anthropic usage object.
+
+        Anthropic reports uncached input, cache reads and cache writes separately;
+        they are summed into input_tokens.
+
+        Args:
+            usage: response.usage (or message_start usage merged with message_delta output)
+            stage: Pipeline stage the call belongs to
+        """
+        if usage is None:
+            return
+        uncached = getattr(usage, "input_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        self._add(
+            stage,
+            input_tokens=uncached + cache_read + cache_write,
+            cached=cache_read,
+            cache_write=cache_write,
+            output_tokens=getattr(usage, "output_tokens", 0) or 0,
+        )
+
+    def _add(self, stage: str, input_tokens: int, cached: int, cache_write: int, output_tokens: int) -> None:
+        self.calls += 1
+        self.input_tokens += input_tokens
+        self.cached_input_tokens += cached
+        self.cache_write_tokens += cache_write
+        self.output_tokens += output_tokens
+
+        totals = self.by_stage.setdefault(stage, {"input_tokens": 0, "cached_input_tokens": 0})
+        totals["input_tokens"] += input_tokens
+        totals["cached_input_tokens"] += cached
+
+        logger.debug(
+            f"[TOKENS] {stage}: input={input_tokens} (cached={cached}, cache_write={cache_write}), "
+            f"output={output_tokens}"
+        )
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        """Input tokens billed at the full rate."""
+        return self.input_tokens - self.cached_input_tokens
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of input tokens served from the provider's prompt cache."""
+        return self.cached_input_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get totals for TestPlanMetadata.token_usage.
+
+        Returns:
+            Token totals, cache hit ratio and per-stage input breakdown
+        """
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "uncached_input_tokens": self.uncached_input_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_hit_ratio": round(self.cache_hit_ratio, 3),
+            "by_stage": {stage: dict(totals) for stage, totals in self.by_stage.items()},
+        }
+
+    def log_summary(self, label: str) -> None:
+        """Log totals for one generation."""
+        logger.info(
+            f"[TOKENS] {label}: {self.calls} calls, input={self.input_tokens} "
+            f"(cached={self.cached_input_tokens}, {self.cache_hit_ratio:.0%} hit), "
+            f"cache_write={self.cache_write_tokens}, output={self.output_tokens}"
+        )
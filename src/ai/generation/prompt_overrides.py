@@ -0,0 +1,145 @@
+"""
+Shared registry for prompt section overrides.
+Single Responsibility: Loading, caching and saving data/prompt_overrides.json.
+
+The file is parsed once and kept in memory. Each lookup only stats the file
+and re-reads it when its (mtime, inode, size) signature changes, so edits made
+by another process are still picked up.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+# Path for prompt overrides
+PROMPT_OVERRIDES_FILE = Path("data/prompt_overrides.json")
+
+_Signature = Tuple[int, int, int]
+
+
+class PromptOverridesRegistry:
+    """In-memory prompt overrides, revalidated against the file on disk."""
+
+    def __init__(self, path: Path = PROMPT_OVERRIDES_FILE):
+        """
+        Initialize the registry.
+
+        Args:
+            path: JSON file mapping section names to override content
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._overrides: Dict[str, str] = {}
+        self._signature: Optional[_Signature] = None
+        self._loaded = False
+
+    def _stat(self) -> Optional[_Signature]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_ino, st.st_size
+
+    def _current(self) -> Dict[str, str]:
+        signature = self._stat()
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return self._overrides
+
+            overrides: Dict[str, str] = {}
+            if signature is not None:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        overrides = json.load(f)
+                except Exception as e:
+                    logger.warning(f"Failed to load prompt overrides: {e}")
+
+            self._overrides = overrides
+            self._signature = signature
+            self._loaded = True
+            return overrides
+
+    def get(self, section_name: str, default_content: str) -> str:
+        """
+        Get prompt section content, with override if available.
+
+        Args:
+            section_name: Section identifier
+            default_content: Content used when there is no override
+
+        Returns:
+            Override or default content
+        """
+        return self._current().get(section_name, default_content)
+
+    def load(self) -> Dict[str, str]:
+        """
+        Get all overrides.
+
+        Returns:
+            Copy of the section -> content mapping
+        """
+        return dict(self._current())
+
+    def save(self, overrides: Dict[str, str]) -> None:
+        """
+        Write overrides to disk and make them current.
+
+        Args:
+            overrides: Complete section -> content mapping
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(overrides, f, indent=2, ensure_ascii=False)
+        tmp_path.replace(self.path)
+
+        with self._lock:
+            self._overrides = dict(overrides)
+            self._signature = self._stat()
+            self._loaded = True
+
+    def reset(self) -> bool:
+        """
+        Delete the overrides file, restoring defaults.
+
+        Returns:
+            True if a file was removed
+        """
+        try:
+            self.path.unlink()
+            removed = True
+        except FileNotFoundError:
+            removed = False
+        self.invalidate()
+        return removed
+
+    def invalidate(self) -> None:
+        """Drop the in-memory copy; the next lookup re-reads the file."""
+        with self._lock:
+            self._overrides = {}
+            self._signature = None
+            self._loaded = False
+
+
+_registry: Optional[PromptOverridesRegistry] = None
+
+
+def get_prompt_overrides() -> PromptOverridesRegistry:
+    """
+    Get the shared prompt overrides registry.
+
+    Returns:
+        PromptOverridesRegistry for PROMPT_OVERRIDES_FILE
+    """
+    global _registry
+    if _registry is None:
+        _registry = PromptOverridesRegistry(PROMPT_OVERRIDES_FILE)
+    return _registry
@@ -79,6 +79,42 @@ class ResponseParser:
             logger.error(f"Response text preview: {json_text[:500]}")
             raise ValueError(f"Invalid JSON in AI response: {e}")
 
+    def build_test_case(self, tc_data: dict) -> TestCase:
+        """
+        Build a single TestCase from one element of the AI "test_cases" array.
+        
+        Used both for complete responses and for elements emitted while the
+        response is still streaming.
+        
+        Args:
+            tc_data: Parsed test case dict
+            
+        Returns:
+            TestCase object
+        """
+        steps = [
+            TestStep(
+                step_number=step.get("step_number", idx + 1),
+                action=step.get("action", ""),
+                expected_result=step.get("expected_result", ""),
+                test_data=step.get("test_data"),
+            )
+            for idx, step in enumerate(tc_data.get("steps", []))
+        ]
+
+        return TestCase(
+            title=tc_data.get("title", "Untitled Test"),
+            description=tc_data.get("description", ""),
+            preconditions=tc_data.get("preconditions"),
+            steps=steps,
+            expected_result=tc_data.get("expected_result", ""),
+            priority=tc_data.get("priority", "medium"),
+            test_type=tc_data.get("test_type", "functional"),
+            tags=tc_data.get("tags", []),
+            automation_candidate=tc_data.get("automation_candidate", True),
+            risk_level=tc_data.get("risk_level", "medium"),
+        )
+
     def build_test_plan(
         self,
         main_story: any,
@@ -103,33 +139,10 @@ class ResponseParser:
             TestPlan object
         """
         # Extract test cases
-        test_cases = []
-        for tc_data in test_plan_data.get("test_cases", []):
-            # Parse steps
-            steps = [
-                TestStep(
-                    step_number=step.get("step_number", idx + 1),
-                    action=step.get("action", ""),
-                    expected_result=step.get("expected_result", ""),
-                    test_data=step.get("test_data"),
-                )
-                for idx, step in enumerate(tc_data.get("steps", []))
-            ]
-
-            # Create test case
-            test_case = TestCase(
-                title=tc_data.get("title", "Untitled Test"),
-                description=tc_data.get("description", ""),
-                preconditions=tc_data.get("preconditions"),
-                steps=steps,
-                expected_result=tc_data.get("expected_result", ""),
-                priority=tc_data.get("priority", "medium"),
-                test_type=tc_data.get("test_type", "functional"),
-                tags=tc_data.get("tags", []),
-                automation_candidate=tc_data.get("automation_candidate", True),
-                risk_level=tc_data.get("risk_level", "medium"),
-            )
-            test_cases.append(test_case)
+        test_cases = [
+            self.build_test_case(tc_data)
+            for tc_data in test_plan_data.get("test_cases", [])
+        ]
 
         # Count test types
         edge_case_count = sum(
@@ -0,0 +1,156 @@
+"""
+Incremental parser for streamed AI test plan responses.
+Single Responsibility: Extracting complete test case objects from a partial JSON stream.
+
+The model streams one large JSON object whose "test_cases" array dominates the
+output. Instead of waiting for the full completion, this parser tracks JSON
+structure character by character and hands back each array element as soon
+as its closing brace arrives.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+
+class IncrementalTestCaseParser:
+    """
+    Extracts complete elements of the top-level "test_cases" array from a
+    JSON document that arrives in arbitrary chunks.
+
+    Handles both provider formats:
+    - OpenAI: Direct JSON (structured output)
+    - Claude: JSON wrapped in <json> tags, possibly preceded by prose
+    """
+
+    def __init__(self, array_key: str = "test_cases"):
+        """
+        Initialize parser.
+
+        Args:
+            array_key: Top-level key whose array elements should be emitted
+        """
+        self.array_key = array_key
+        self._buffer: List[str] = []
+        self._pending = ""
+        self._started = False
+        self._done = False
+
+        # JSON scanner state
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_chars: List[str] = []
+        self._last_key: Optional[str] = None
+        self._in_array = False
+        self._element_chars: Optional[List[str]] = None
+        self.emitted = 0
+
+    @property
+    def text(self) -> str:
+        """Full response text received so far."""
+        return "".join(self._buffer)
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of streamed text.
+
+        Args:
+            chunk: Next piece of the model output
+
+        Returns:
+            Test case dicts completed by this chunk (possibly empty)
+        """
+        if not chunk:
+            return []
+        self._buffer.append(chunk)
+
+        if not self._started:
+            self._pending += chunk
+            start = self._find_json_start(self._pending)
+            if start is None:
+                return []
+            self._started = True
+            chunk, self._pending = self._pending[start:], ""
+
+        completed: List[Dict[str, Any]] = []
+        for char in chunk:
+            if self._done:
+                break
+            element = self._consume(char)
+            if element is not None:
+                completed.append(element)
+        return completed
+
+    def _find_json_start(self, text: str) -> Optional[int]:
+        """Locate where the JSON document starts, or None if not yet known."""
+        tag = text.find("<json>")
+        if tag != -1:
+            brace = text.find("{", tag)
+            return brace if brace != -1 else None
+
+        stripped = text.lstrip()
+        if stripped.startswith("{"):
+            return len(text) - len(stripped)
+        # Prose before a <json> tag (Claude) - keep waiting for the tag
+        return None
+
+    def _consume(self, char: str) -> Optional[Dict[str, Any]]:
+        """Advance the scanner by one character."""
+        if self._element_chars is not None:
+            self._element_chars.append(char)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if len(self._stack) == 1:
+                    self._last_key = "".join(self._string_chars)
+            elif len(self._stack) == 1:
+                self._string_chars.append(char)
+            return None
+
+        if char == '"':
+            self._in_string = True
+            self._string_chars = []
+        elif char in "{[":
+            if (
+                char == "["
+                and self._stack == ["{"]
+                and self._last_key == self.array_key
+            ):
+                self._in_array = True
+            self._stack.append(char)
+            if char == "{" and self._in_array and len(self._stack) == 3:
+                self._element_chars = ["{"]
+        elif char in "}]":
+            if not self._stack:
+                return None
+            self._stack.pop()
+            if char == "}" and self._in_array and len(self._stack) == 2:
+                return self._finish_element()
+            if char == "]" and self._in_array and len(self._stack) == 1:
+                self._in_array = False
+            if not self._stack:
+                self._done = True
+        elif char == "," and len(self._stack) == 1:
+            self._last_key = None
+        return None
+
+    def _finish_element(self) -> Optional[Dict[str, Any]]:
+        """Decode the element that just closed."""
+        raw = "".join(self._element_chars or [])
+        self._element_chars = None
+        try:
+            element = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"[STREAM] Skipping malformed test case element: {e}")
+            return None
+        if not isinstance(element, dict):
+            return None
+        self.emitted += 1
+        return element
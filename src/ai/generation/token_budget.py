@@ -0,0 +1,182 @@
+"""
+Token counting and budget allocation for prompt assembly.
+Single Responsibility: Measuring prompt text in real tokens and fitting it to a budget.
+
+Counts come from the model's tokenizer (tiktoken) when it is installed and fall
+back to the ~4 chars/token estimate otherwise. Counts are memoized per string,
+so RAG documents that appear in several prompt builds are tokenized once.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from loguru import logger
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Encoding used when tiktoken does not know the model (e.g. Claude models)
+DEFAULT_ENCODING = "o200k_base"
+COUNT_CACHE_SIZE = 4096
+
+
+class TokenCounter:
+    """Exact (tokenizer-backed) token counts with memoization."""
+
+    def __init__(self, model: str = "gpt-4o"):
+        """
+        Initialize the counter.
+
+        Args:
+            model: Model whose tokenizer to use
+        """
+        self.model = model
+        self._encoding = self._load_encoding(model)
+        self.count = lru_cache(maxsize=COUNT_CACHE_SIZE)(self._count)
+
+    @staticmethod
+    def _load_encoding(model: str):
+        if tiktoken is None:
+            logger.debug("tiktoken not installed, estimating tokens as len(text) // 4")
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(DEFAULT_ENCODING)
+        except Exception as e:
+            # Encodings are downloaded on first use; stay usable offline
+            logger.warning(f"Failed to load tokenizer for {model}, estimating tokens: {e}")
+            return None
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a real tokenizer."""
+        return self._encoding is not None
+
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is None:
+            return len(text) // 4
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut text to at most max_tokens tokens.
+
+        Args:
+            text: Text to truncate
+            max_tokens: Token limit
+
+        Returns:
+            Text unchanged if it fits, otherwise its first max_tokens tokens
+        """
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is None:
+            return text[:max_tokens * 4]
+        return self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:max_tokens])
+
+
+_counters: Dict[str, TokenCounter] = {}
+
+
+def get_token_counter(model: Optional[str] = None) -> TokenCounter:
+    """
+    Get the shared token counter for a model.
+
+    Args:
+        model: Model name (defaults to gpt-4o)
+
+    Returns:
+        TokenCounter reused across prompt builds
+    """
+    model = (model or "gpt-4o").lower()
+    if model not in _counters:
+        _counters[model] = TokenCounter(model)
+    return _counters[model]
+
+
+@dataclass
+class BudgetItem:
+    """A candidate prompt section with its value to the prompt."""
+
+    key: Any
+    text: str
+    value: float
+    tokens: int = 0
+
+
+class TokenBudgetAllocator:
+    """
+    Packs optional prompt sections into a token budget.
+
+    Fixed text is charged with reserve(); optional sections are then chosen
+    greedily by value per token, so a long low-relevance document cannot
+    crowd out several short relevant ones.
+    """
+
+    def __init__(self, budget: int, counter: Optional[TokenCounter] = None):
+        """
+        Initialize the allocator.
+
+        Args:
+            budget: Total tokens available
+            counter: Token counter (defaults to the shared gpt-4o counter)
+        """
+        self.budget = budget
+        self.counter = counter or get_token_counter()
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        """Tokens still available."""
+        return self.budget - self.used
+
+    def reserve(self, text: str) -> int:
+        """
+        Charge fixed text against the budget.
+
+        Args:
+            text: Text that is always included
+
+        Returns:
+            Its token count
+        """
+        tokens = self.counter.count(text)
+        self.used += tokens
+        return tokens
+
+    def pack(self, items: Sequence[BudgetItem]) -> List[BudgetItem]:
+        """
+        Choose the items with the highest value per token that fit.
+
+        Args:
+            items: Candidate sections
+
+        Returns:
+            Selected items in their original order, with tokens filled in
+        """
+        for item in items:
+            item.tokens = self.counter.count(item.text)
+
+        ranked = sorted(
+            range(len(items)),
+            key=lambda i: items[i].value / max(items[i].tokens, 1),
+            reverse=True,
+        )
+        selected = set()
+        for i in ranked:
+            if items[i].tokens <= self.remaining:
+                selected.add(i)
+                self.used += items[i].tokens
+
+        dropped = len(items) - len(selected)
+        if dropped:
+            logger.info(f"[BUDGET] Dropped {dropped}/{len(items)} sections to fit {self.budget} tokens")
+        return [items[i] for i in sorted(selected)]
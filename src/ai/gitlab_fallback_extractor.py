@@ -11,12 +11,13 @@ import yaml
 import asyncio
 import shutil
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Awaitable, List, Optional, Dict, Any
 from loguru import logger
 
 from src.models.enriched_story import APISpec
 from src.config.settings import settings
 from src.ai.generation.ai_client_factory import AIClientFactory
+from src.ai.gitlab_search_cache import GitLabSearchCache
 
 
 class GitLabMCPClient:
@@ -25,6 +26,8 @@ class GitLabMCPClient:
     
     Uses MCP Python client library to communicate with mcp-remote subprocess.
     mcp-remote handles OAuth authentication automatically (browser opens on first use).
+    The subprocess and session are kept warm in a shared MCPSessionPool, so
+    searches do not each start a new Node process.
     """
     
     def __init__(self):
@@ -43,8 +46,7 @@ class GitLabMCPClient:
             return
         
         try:
-            from mcp.client.stdio import stdio_client, StdioServerParameters
-            from mcp.client.session import ClientSession
+            from src.mcp.session_pool import get_session_pool
             
             # Set up OAuth cache directory (configurable for K8s)
             if settings.mcp_oauth_cache_dir:
@@ -69,6 +71,21 @@ class GitLabMCPClient:
             self.mcp_remote_path = mcp_remote_path
             self.mcp_endpoint = "https://gitlab.com/api/v4/mcp"
             
+            # One warm mcp-remote session shared by all searches (started on first call)
+            if self.mcp_remote_path == "npx":
+                command, args = "npx", ["-y", "mcp-remote", self.mcp_endpoint]
+            else:
+                command, args = self.mcp_remote_path, [self.mcp_endpoint]
+            self.pool = get_session_pool(
+                command,
+                args,
+                size=settings.mcp_session_pool_size,
+                max_concurrent_calls=settings.mcp_max_concurrent_calls,
+                call_timeout=settings.mcp_call_timeout_seconds,
+                start_timeout=settings.mcp_session_start_timeout_seconds,
+                health_interval=settings.mcp_health_check_interval_seconds,
+            )
+            
             logger.info(f"GitLab MCP client initialized (OAuth cache: {self.oauth_cache_dir})")
             logger.info("Using mcp-remote with OAuth authentication")
             logger.info("Browser will open for OAuth login on first use")
@@ -103,112 +120,59 @@ class GitLabMCPClient:
             return []
         
         try:
-            from mcp.client.stdio import stdio_client, StdioServerParameters
-            from mcp.client.session import ClientSession
-            
             logger.debug(f"Semantic code search via GitLab MCP: {semantic_query} in {project_id}")
             
-            # Build mcp-remote command
-            if self.mcp_remote_path == "npx":
-                cmd = ["npx", "-y", "mcp-remote", self.mcp_endpoint]
-            else:
-                cmd = [self.mcp_remote_path, self.mcp_endpoint]
-            
-            logger.info(f"Connecting to GitLab MCP via: {' '.join(cmd[:3])}...")
-            logger.info("If browser opens, please authorize OAuth login!")
-            
-            # Build StdioServerParameters
-            if self.mcp_remote_path == "npx":
-                server_params = StdioServerParameters(
-                    command="npx",
-                    args=["-y", "mcp-remote", self.mcp_endpoint]
-                )
-            else:
-                server_params = StdioServerParameters(
-                    command=self.mcp_remote_path,
-                    args=[self.mcp_endpoint]
-                )
-            
-            # Use MCP stdio client to communicate with mcp-remote
-            async with stdio_client(server_params) as streams:
-                if not streams:
-                    logger.error("Failed to establish stdio connection")
-                    return []
-                
-                read, write = streams
-                async with ClientSession(read, write) as session:
-                    try:
-                        # Initialize the session
-                        await session.initialize()
-                        logger.debug("MCP session initialized")
+            # Build parameters (only include directory_path if provided)
+            params = {
+                "project_id": project_id,
+                "semantic_query": semantic_query,
+                "limit": limit
+            }
+            if directory_path:
+                params["directory_path"] = directory_path
+            
+            result = await self.pool.call_tool("semantic_code_search", params)
+            
+            logger.debug(f"MCP tool call completed, parsing results...")
+            
+            # Parse results
+            if result.content:
+                results = []
+                for item in result.content:
+                    if hasattr(item, 'text'):
+                        text = item.text
+                        # Skip error messages
+                        if 'Validation error' in text or 'Error' in text[:50]:
+                            logger.warning(f"MCP returned error: {text}")
+                            continue
                         
-                        # List available tools
                         try:
-                            tools = await session.list_tools()
-                            logger.debug(f"Available MCP tools: {[t.name for t in tools.tools]}")
-                        except Exception as e:
-                            logger.warning(f"Could not list tools: {e}")
-                        
-                        # Call semantic_code_search tool
-                        logger.info("Calling semantic_code_search tool via MCP...")
-                        
-                        # Build parameters (only include directory_path if provided)
-                        params = {
-                            "project_id": project_id,
-                            "semantic_query": semantic_query,
-                            "limit": limit
-                        }
-                        if directory_path:
-                            params["directory_path"] = directory_path
-                        
-                        result = await session.call_tool(
-                            "semantic_code_search",
-                            params
-                        )
-                        
-                        logger.debug(f"MCP tool call completed, parsing results...")
-                        
-                        # Parse results
-                        if result.content:
-                            results = []
-                            for item in result.content:
-                                if hasattr(item, 'text'):
-                                    text = item.text
-                                    # Skip error messages
-                                    if 'Validation error' in text or 'Error' in text[:50]:
-                                        logger.warning(f"MCP returned error: {text}")
-                                        continue
-                                    
-                                    try:
-                                        data = json.loads(text)
-                                        if isinstance(data, list):
-                                            results.extend(data)
-                                        else:
-                                            results.append(data)
-                                    except json.JSONDecodeError:
-                                        # If not JSON, treat as plain text content
-                                        if 'Validation error' not in text and 'Error' not in text[:50]:
-                                            results.append({"content": text})
-                                elif hasattr(item, 'content'):
-                                    # Handle different content types
-                                    content_str = str(item.content)
-                                    if 'Validation error' not in content_str and 'Error' not in content_str[:50]:
-                                        results.append({"content": content_str})
-                            
-                            # Filter out error results
-                            valid_results = [r for r in results if not any(
-                                'Validation error' in str(v) or 'Error' in str(v)[:50] 
-                                for v in r.values()
-                            )]
-                            
-                            logger.info(f"MCP semantic search returned {len(valid_results)} valid results (filtered {len(results) - len(valid_results)} errors)")
-                            return valid_results
-                        else:
-                            logger.warning("MCP returned no content")
-                            return []
-                    except Exception as session_error:
-                        logger.error(f"Error in MCP session: {session_error}", exc_info=True)
-                        return []
+                            data = json.loads(text)
+                            if isinstance(data, list):
+                                results.extend(data)
+                            else:
+                                results.append(data)
+                        except json.JSONDecodeError:
+                            # If not JSON, treat as plain text content
+                            if 'Validation error' not in text and 'Error' not in text[:50]:
+                                results.append({"content": text})
+                    elif hasattr(item, 'content'):
+                        # Handle different content types
+                        content_str = str(item.content)
+                        if 'Validation error' not in content_str and 'Error' not in content_str[:50]:
+                            results.append({"content": content_str})
+                
+                # Filter out error results
+                valid_results = [r for r in results if not any(
+                    'Validation error' in str(v) or 'Error' in str(v)[:50] 
+                    for v in r.values()
+                )]
+                
+                logger.info(f"MCP semantic search returned {len(valid_results)} valid results (filtered {len(results) - len(valid_results)} errors)")
+                return valid_results
+            else:
+                logger.warning("MCP returned no content")
+                return []
         
         except Exception as e:
             logger.error(f"Error in MCP semantic code search: {e}", exc_info=True)
@@ -240,67 +204,52 @@ class GitLabMCPClient:
             return []
         
         try:
-            from mcp.client.stdio import stdio_client, StdioServerParameters
-            from mcp.client.session import ClientSession
-            
             logger.debug(f"GitLab search via MCP: {search} (scope: {scope})")
             
-            # Build StdioServerParameters
-            if self.mcp_remote_path == "npx":
-                server_params = StdioServerParameters(
-                    command="npx",
-                    args=["-y", "mcp-remote", self.mcp_endpoint]
-                )
-            else:
-                server_params = StdioServerParameters(
-                    command=self.mcp_remote_path,
-                    args=[self.mcp_endpoint]
-                )
+            # Call gitlab_search tool
+            # Build parameters based on scope (different scopes support different parameters)
+            params = {
+                "scope": scope,
+                "search": search,
+                "per_page": per_page
+            }
             
-            # Use MCP stdio client
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    
-                    # Call gitlab_search tool
-                    # Build parameters based on scope (different scopes support different parameters)
-                    params = {
-                        "scope": scope,
-                        "search": search,
-                        "per_page": per_page
-                    }
-                    
-                    # Only add project_id or group_id if provided and supported by scope
-                    # merge_requests scope doesn't support group_id in some GitLab versions
-                    if project_id:
-                        params["project_id"] = project_id
-                    elif group_id and scope not in ["merge_requests", "issues"]:
-                        # Only add group_id for scopes that support it
-                        params["group_id"] = group_id
-                    
-                    result = await session.call_tool("gitlab_search", params)
-                    
-                    # Parse results
-                    if result.content:
-                        results = []
-                        for item in result.content:
-                            if hasattr(item, 'text'):
-                                try:
-                                    data = json.loads(item.text)
-                                    if isinstance(data, list):
-                                        results.extend(data)
-                                    else:
-                                        results.append(data)
-                                except json.JSONDecodeError:
-                                    results.append({"content": item.text})
-                        return results
-                    else:
-                        return []
+            # Only add project_id or group_id if provided and supported by scope
+            # merge_requests scope doesn't support group_id in some GitLab versions
+            if project_id:
+                params["project_id"] = project_id
+            elif group_id and scope not in ["merge_requests", "issues"]:
+                # Only add group_id for scopes that support it
+                params["group_id"] = group_id
+            
+            result = await self.pool.call_tool("gitlab_search", params)
+            
+            # Parse results
+            if result.content:
+                results = []
+                for item in result.content:
+                    if hasattr(item, 'text'):
+                        try:
+                            data = json.loads(item.text)
+                            if isinstance(data, list):
+                                results.extend(data)
+                            else:
+                                results.append(data)
+                        except json.JSONDecodeError:
+                            results.append({"content": item.text})
+                return results
+            else:
+                return []
         
         except Exception as e:
             logger.error(f"Error in MCP GitLab search: {e}", exc_info=True)
             return []
 
+    async def close(self) -> None:
+        """Stop the pooled MCP session(s) for this event loop."""
+        if self.mcp_available:
+            await self.pool.close()
+
 
 class GitLabFallbackExtractor:
     """
@@ -324,9 +273,94 @@ class GitLabFallbackExtractor:
             logger.warning(f"GitLab MCP client not available: {e}")
             self.mcp_client = None
         
+        self.search_cache = GitLabSearchCache() if settings.gitlab_search_cache_enabled else None
+        self._inflight: Dict[str, asyncio.Future] = {}
         self.max_services = settings.gitlab_fallback_max_services
         self.max_apis = settings.enrichment_max_apis
     
+    async def _semantic_search(
+        self,
+        project_id: str,
+        query: str,
+        limit: int,
+        ref: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """semantic_code_search through the result cache (keyed by project, query and ref)."""
+        params = {"project_id": str(project_id), "semantic_query": query, "limit": limit}
+        return await self._cached_search("semantic_code_search", params, ref)
+    
+    async def _blob_search(
+        self,
+        search: str,
+        group_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        per_page: int = 20,
+        scope: str = "blobs",
+        max_age_hours: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """gitlab_search through the result cache."""
+        params = {"scope": scope, "search": search, "project_id": project_id, "group_id": group_id, "per_page": per_page}
+        return await self._cached_search("gitlab_search", params, max_age_hours=max_age_hours)
+    
+    async def _cached_search(
+        self,
+        tool: str,
+        params: Dict[str, Any],
+        ref: Optional[str] = None,
+        max_age_hours: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        # Identical searches already in flight share one MCP call
+        key = json.dumps([tool, params, ref], sort_keys=True, default=str)
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._run_cached_search(tool, params, ref, max_age_hours))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+    
+    async def _run_cached_search(
+        self,
+        tool: str,
+        params: Dict[str, Any],
+        ref: Optional[str],
+        max_age_hours: Optional[float]
+    ) -> List[Dict[str, Any]]:
+        if self.search_cache is not None:
+            cached = self.search_cache.get(tool, params, ref, max_age_hours)
+            if cached is not None:
+                logger.debug(f"GitLab search cache hit: {tool} {params}")
+                return cached
+        if tool == "semantic_code_search":
+            results = await self.mcp_client.semantic_code_search(**params)
+        else:
+            results = await self.mcp_client.gitlab_search(**params)
+        # Empty results are not cached: the MCP client also returns [] on errors
+        if results and self.search_cache is not None:
+            self.search_cache.put(tool, params, results, ref)
+        return results
+    
+    async def _fan_out(self, searches: List[Awaitable[List[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Run searches concurrently (bounded), in input order; failures yield [].
+        
+        Args:
+            searches: Search coroutines
+            
+        Returns:
+            Results per search, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.gitlab_fallback_max_concurrency))
+        
+        async def run(search: Awaitable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await search
+                except Exception as e:
+                    logger.debug(f"GitLab search failed: {e}")
+                    return []
+        
+        return await asyncio.gather(*(run(search) for search in searches))
+    
     async def _find_branches_for_story(
         self,
         story_key: str
@@ -351,45 +385,38 @@ class GitLabFallbackExtractor:
         try:
             group_id = settings.gitlab_group_path
             
+            lookup_max_age = settings.gitlab_branch_lookup_ttl_minutes / 60
+            
             # Search for merge requests containing the story key
             # This is the most reliable way to find branches for a story
-            mr_results = []
-            try:
-                # Try with group_id first
-                mr_results = await self.mcp_client.gitlab_search(
-                    scope="merge_requests",
-                    search=story_key,
-                    group_id=group_id,
-                    per_page=30
-                )
-                logger.info(f"Found {len(mr_results)} merge requests for {story_key}")
-            except Exception as e:
-                logger.debug(f"MR search with group_id failed: {e}, trying without group_id")
+            async def find_merge_requests() -> List[Dict[str, Any]]:
                 try:
-                    # Try without group_id (global search)
-                    mr_results = await self.mcp_client.gitlab_search(
-                        scope="merge_requests",
-                        search=story_key,
-                        per_page=30
+                    # Try with group_id first
+                    results = await self._blob_search(
+                        story_key, group_id=group_id, per_page=30, scope="merge_requests", max_age_hours=lookup_max_age
                     )
-                    logger.info(f"Found {len(mr_results)} merge requests (global search)")
-                except Exception as e2:
-                    logger.warning(f"MR search failed completely: {e2}")
-                    mr_results = []
+                    logger.info(f"Found {len(results)} merge requests for {story_key}")
+                    return results
+                except Exception as e:
+                    logger.debug(f"MR search with group_id failed: {e}, trying without group_id")
+                    try:
+                        # Try without group_id (global search)
+                        results = await self._blob_search(
+                            story_key, per_page=30, scope="merge_requests", max_age_hours=lookup_max_age
+                        )
+                        logger.info(f"Found {len(results)} merge requests (global search)")
+                        return results
+                    except Exception as e2:
+                        logger.warning(f"MR search failed completely: {e2}")
+                        return []
             
             # Also search for the story key in code (to find which projects it's in)
-            code_results = []
-            try:
-                code_results = await self.mcp_client.gitlab_search(
-                    scope="blobs",
-                    search=story_key,
-                    group_id=group_id,
-                    per_page=30
-                )
-                logger.info(f"Found {len(code_results)} code files containing {story_key}")
-            except Exception as e:
-                logger.warning(f"Blob search failed: {e}")
-                code_results = []
+            async def find_code() -> List[Dict[str, Any]]:
+                results = await self._blob_search(story_key, group_id=group_id, per_page=30, max_age_hours=lookup_max_age)
+                logger.info(f"Found {len(results)} code files containing {story_key}")
+                return results
+            
+            mr_results, code_results = await self._fan_out([find_merge_requests(), find_code()])
             
             # Extract unique project IDs from results
             projects = {}
@@ -407,6 +434,7 @@ class GitLabFallbackExtractor:
                             'source_branch': source_branch,
                             'target_branch': target_branch,
                             'ref': source_branch or target_branch or 'master',
+                            'sha': result.get('sha'),  # MR head commit
                             'mr_title': result.get('title', ''),
                         }
                         logger.debug(f"Found project {project_id} via MR: {result.get('title', 'N/A')}")
@@ -483,66 +511,46 @@ class GitLabFallbackExtractor:
             
             # 3. Search in found repos FIRST (most likely to have the code)
             search_results = []
-            
-            if branches:
-                logger.info(f"🔍 Searching within {len(branches)} projects found for {story_key}")
-                for branch_info in branches[:self.max_services]:
-                    project_id = branch_info.get('project_id')
-                    if not project_id:
-                        continue
-                    
-                    logger.info(f"   Searching project {project_id}...")
-                    
-                    # Use MORE AI queries per project (top 10 instead of 5)
-                    for query in ai_queries[:10]:  # Increased from 5 to 10
-                        try:
-                            results = await self.mcp_client.semantic_code_search(
-                                project_id=str(project_id),
-                                semantic_query=query,
-                                limit=20  # Increased from 15 to 20
-                            )
-                            if results:
-                                logger.info(f"      ✅ Found {len(results)} results with query: '{query[:60]}...'")
-                                search_results.extend(results)
-                        except Exception as e:
-                            logger.debug(f"      Error searching project {project_id}: {e}")
-                            continue
-            
-            # 4. Also search group-wide MORE AGGRESSIVELY
-            # Use semantic code search (better than blob search) for group-wide
-            logger.info(f"🔍 Group-wide semantic search (found {len(search_results)} results so far)")
             group_id = settings.gitlab_group_path
             
-            # Try semantic code search first (more accurate)
-            for query in ai_queries[:15]:  # Increased from 10 to 15
+            async def search_project(branch_info: Dict[str, Any], query: str) -> List[Dict[str, Any]]:
+                results = await self._semantic_search(
+                    branch_info['project_id'],
+                    query,
+                    limit=20,  # Increased from 15 to 20
+                    ref=branch_info.get('sha') or branch_info.get('ref')
+                )
+                if results:
+                    logger.info(f"      ✅ Found {len(results)} results with query: '{query[:60]}...'")
+                return results
+            
+            async def search_group(query: str) -> List[Dict[str, Any]]:
                 try:
-                    # Try semantic code search if we have a project ID from branches
-                    if branches and branches[0].get('project_id'):
-                        # Use the first project as reference for group-wide semantic search
-                        results = await self.mcp_client.semantic_code_search(
-                            project_id=str(branches[0]['project_id']),
-                            semantic_query=query,
-                            limit=20
-                        )
-                        if results:
-                            logger.info(f"   ✅ Found {len(results)} semantic results with query: '{query[:60]}...'")
-                            search_results.extend(results)
+                    # Use the first project as reference for group-wide semantic search
+                    results = await search_project(branches[0], query)
                 except Exception as e:
                     logger.debug(f"   Error in semantic search with '{query[:30]}...': {e}")
                     # Fallback to blob search
-                    try:
-                        blob_results = await self.mcp_client.gitlab_search(
-                            scope="blobs",
-                            search=query,
-                            group_id=group_id,
-                            per_page=20  # Increased from 15
-                        )
-                        if blob_results:
-                            logger.info(f"   ✅ Found {len(blob_results)} blobs with query: '{query[:60]}...'")
-                            search_results.extend(blob_results)
-                    except Exception as e2:
-                        logger.debug(f"   Error in blob search: {e2}")
-                        continue
+                    results = await self._blob_search(query, group_id=group_id, per_page=20)  # Increased from 15
+                    if results:
+                        logger.info(f"   ✅ Found {len(results)} blobs with query: '{query[:60]}...'")
+                return results
+            
+            searches = []
+            if branches:
+                projects = [b for b in branches[:self.max_services] if b.get('project_id')]
+                logger.info(f"🔍 Searching within {len(projects)} projects found for {story_key}")
+                # Use MORE AI queries per project (top 10 instead of 5)
+                searches += [search_project(b, query) for b in projects for query in ai_queries[:10]]
+            
+            # 4. Also search group-wide MORE AGGRESSIVELY
+            # Use semantic code search (better than blob search) for group-wide
+            if branches and branches[0].get('project_id'):
+                searches += [search_group(query) for query in ai_queries[:15]]  # Increased from 10 to 15
+            
+            logger.info(f"🔍 Running {len(searches)} code searches (up to {settings.gitlab_fallback_max_concurrency} concurrently)")
+            for results in await self._fan_out(searches):
+                search_results.extend(results)
             
             if not search_results:
                 logger.error(f"❌ NO CODE FOUND via MCP search for {story_key}")
@@ -843,26 +851,18 @@ Focus on semantic meaning, not exact text matching."""
         search_queries.extend(service_queries)
         
         # If we have specific branches/projects, search within them first
+        searches = []
         if branches:
             logger.info(f"Searching within {len(branches)} projects found for {story_key}")
             for branch_info in branches[:self.max_services]:
                 project_id = branch_info.get('project_id')
                 if not project_id:
                     continue
-                
-                logger.debug(f"Searching in project {project_id}")
-                
-                for query in search_queries[:3]:  # Limit queries per project
-                    try:
-                        results = await self.mcp_client.semantic_code_search(
-                            project_id=str(project_id),  # Use numeric ID
-                            semantic_query=query,
-                            limit=10
-                        )
-                        all_results.extend(results)
-                    except Exception as e:
-                        logger.debug(f"Error searching project {project_id} with '{query}': {e}")
-                        continue
+                ref = branch_info.get('sha') or branch_info.get('ref')
+                searches += [
+                    self._semantic_search(project_id, query, limit=10, ref=ref)  # Use numeric ID
+                    for query in search_queries[:3]  # Limit queries per project
+                ]
         
         # Also do group-wide blob search with feature-specific queries
         logger.info("Performing group-wide blob search")
@@ -884,21 +884,10 @@ Focus on semantic meaning, not exact text matching."""
         
         # Combine with existing queries
         all_search_queries = search_queries[:5] + feature_queries
+        searches += [self._blob_search(query, group_id=group_id, per_page=10) for query in all_search_queries]
         
-        for query in all_search_queries:
-            try:
-                blob_results = await self.mcp_client.gitlab_search(
-                    scope="blobs",
-                    search=query,
-                    group_id=group_id,
-                    per_page=10
-                )
-                
-                all_results.extend(blob_results)
-                
-            except Exception as e:
-                logger.warning(f"Error searching with query '{query}': {e}")
-                continue
+        for results in await self._fan_out(searches):
+            all_results.extend(results)
         
         # Deduplicate results
         seen = set()
@@ -1612,11 +1601,8 @@ Focus on semantic meaning, not exact text matching."""
             projects_to_search = []
             try:
                 # Try to find projects related to the service
-                project_results = await self.mcp_client.gitlab_search(
-                    scope="projects",
-                    search=f"{service_name}",
-                    group_id=settings.gitlab_group_path,
-                    per_page=5
+                project_results = await self._blob_search(
+                    f"{service_name}", group_id=settings.gitlab_group_path, per_page=5, scope="projects"
                 )
                 for proj in project_results:
                     proj_id = proj.get("id") or proj.get("project_id")
@@ -1628,40 +1614,24 @@ Focus on semantic meaning, not exact text matching."""
             # If no specific projects found, use group-wide blob search
             if not projects_to_search:
                 logger.info("No specific projects found, using group-wide blob search")
-                for query in semantic_queries[:5]:
-                    try:
-                        logger.debug(f"Searching for: {query}")
-                        blob_results = await self.mcp_client.gitlab_search(
-                            scope="blobs",
-                            search=f"{query} file:*Test.java OR file:*test.ts OR file:*_test.py",
-                            group_id=settings.gitlab_group_path,
-                            per_page=10
-                        )
-                        if blob_results:
-                            logger.debug(f"Found {len(blob_results)} blob results for query: {query[:50]}...")
-                            all_test_results.extend(blob_results)
-                    except Exception as e:
-                        logger.warning(f"Blob search failed for '{query}': {e}")
-                        continue
+                searches = [
+                    self._blob_search(
+                        f"{query} file:*Test.java OR file:*test.ts OR file:*_test.py",
+                        group_id=settings.gitlab_group_path,
+                        per_page=10
+                    )
+                    for query in semantic_queries[:5]
+                ]
             else:
                 # Use semantic code search within found projects
                 logger.info(f"Searching in {len(projects_to_search)} projects using semantic search")
-                for project_id in projects_to_search[:3]:  # Limit to 3 projects
-                    for query in semantic_queries[:3]:  # Limit queries per project
-                        try:
-                            logger.debug(f"Semantic search in project {project_id}: {query}")
-                            search_results = await self.mcp_client.semantic_code_search(
-                                project_id=project_id,
-                                semantic_query=query,
-                                limit=10
-                            )
-                            
-                            if search_results:
-                                logger.debug(f"Found {len(search_results)} results for query: {query[:50]}...")
-                                all_test_results.extend(search_results)
-                        except Exception as e:
-                            logger.warning(f"Semantic search failed in project {project_id} for '{query}': {e}")
-                            continue
+                searches = [
+                    self._semantic_search(project_id, query, limit=10)
+                    for project_id in projects_to_search[:3]  # Limit to 3 projects
+                    for query in semantic_queries[:3]  # Limit queries per project
+                ]
+            for search_results in await self._fan_out(searches):
+                all_test_results.extend(search_results)
             
             logger.info(f"Total test-related code snippets found: {len(all_test_results)}")
             
@@ -0,0 +1,117 @@
+"""
+Persistent cache of GitLab MCP search results.
+
+Fallback extraction repeats the same searches for every story touching a
+service. Results are cached per (tool, parameters, ref): project searches
+pass the MR head SHA (or branch) as ref, so new commits miss the cache,
+while group-wide searches and branch lookups rely on the TTL.
+
+Entries are stored in a GzipFileCache: hits mark an entry as used and
+saves evict the least recently used entries beyond max_entries.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from src.config.settings import settings
+from src.utils.file_cache import GzipFileCache
+
+
+class GitLabSearchCache:
+    """
+    File-based cache of MCP search results.
+
+    File format: {sha256(tool, params, ref)[:32]}.json.gz
+    Invalidation: a different ref, or age > TTL (callers may pass a
+    shorter max age, e.g. for branch lookups)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        ttl_hours: Optional[float] = None,
+    ):
+        """
+        Initialize the search cache.
+
+        Args:
+            cache_dir: Directory for entries (defaults to settings)
+            max_entries: Entries kept before LRU eviction (defaults to settings)
+            ttl_hours: Maximum entry age (defaults to settings)
+        """
+        self.cache_dir = Path(cache_dir or settings.gitlab_search_cache_dir)
+        self.max_entries = max_entries if max_entries is not None else settings.gitlab_search_cache_max_entries
+        self.ttl_hours = ttl_hours if ttl_hours is not None else settings.gitlab_search_cache_ttl_hours
+        self.files = GzipFileCache(self.cache_dir, self.max_entries, label="GitLab search cache entry")
+
+    @staticmethod
+    def _key(tool: str, params: Dict[str, Any], ref: Optional[str]) -> str:
+        raw = json.dumps({"tool": tool, "params": params, "ref": ref}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def get(
+        self,
+        tool: str,
+        params: Dict[str, Any],
+        ref: Optional[str] = None,
+        max_age_hours: Optional[float] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Cached results of a search.
+
+        Args:
+            tool: MCP tool name
+            params: Tool parameters
+            ref: Commit SHA or branch the search ran against (None for
+                group-wide searches)
+            max_age_hours: Maximum age for this lookup (defaults to the TTL)
+
+        Returns:
+            The cached results, or None if missing, expired or unreadable
+        """
+        key = self._key(tool, params, ref)
+        try:
+            data = self.files.read(key, max_age_hours if max_age_hours is not None else self.ttl_hours)
+            if data is None:
+                return None
+            self.files.touch(key)
+            return data["results"]
+        except Exception as e:
+            logger.warning(f"Failed to read GitLab search cache entry {key}: {e}")
+            return None
+
+    def put(
+        self,
+        tool: str,
+        params: Dict[str, Any],
+        results: List[Dict[str, Any]],
+        ref: Optional[str] = None,
+    ) -> None:
+        """
+        Store the results of a search and evict least recently used entries.
+
+        Args:
+            tool: MCP tool name
+            params: Tool parameters
+            results: Search results
+            ref: Commit SHA or branch the search ran against
+        """
+        try:
+            payload = {"tool": tool, "params": params, "ref": ref, "results": results}
+            self.files.write(self._key(tool, params, ref), payload)
+        except Exception as e:
+            logger.warning(f"Failed to save GitLab search cache entry for {tool}: {e}")
+
+    def clear(self) -> int:
+        """
+        Delete all entries.
+
+        Returns:
+            Number of entries deleted
+        """
+        return self.files.clear()
@@ -3,6 +3,8 @@
 from src.ai.indexing.document_processor import DocumentProcessor
 from src.ai.indexing.document_fetcher import DocumentFetcher
 from src.ai.indexing.document_indexer import DocumentIndexer
+from src.ai.indexing.endpoint_index import EndpointIndex, EndpointRecord
+from src.ai.indexing.embedding_pipeline import EmbeddingPipeline
 
-__all__ = ["DocumentProcessor", "DocumentFetcher", "DocumentIndexer"]
+__all__ = ["DocumentProcessor", "DocumentFetcher", "DocumentIndexer", "EndpointIndex", "EndpointRecord", "EmbeddingPipeline"]
 
@@ -3,13 +3,15 @@ Document fetching service for retrieving documents from external sources.
 Single Responsibility: Fetching documents from external sources, GitLab, web, etc.
 """
 
-import asyncio
-from typing import List, Optional
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
 from loguru import logger
 
 from src.config.settings import settings
 from src.external.external_doc_crawler import ExternalDocCrawler, ExternalDocument
-from src.external.gitlab_swagger_fetcher import GitLabSwaggerFetcher, SwaggerDocument
+from src.external.gitlab_swagger_fetcher import AsyncGitLabSwaggerFetcher, SwaggerDocument
+from src.external.http_cache import HTTPCache
 
 
 class DocumentFetcher:
@@ -23,100 +25,145 @@ class DocumentFetcher:
 
     def __init__(self):
         """Initialize document fetcher."""
-        pass
+        # Counts and removed URLs from the last fetch_external_docs() run
+        self.external_stats: Dict[str, Any] = {}
+        # Counts and removed specs from the last fetch_gitlab_swagger_docs() run
+        self.swagger_stats: Dict[str, Any] = {}
+        self._swagger_fetcher: Optional[AsyncGitLabSwaggerFetcher] = None
+        self._external_http_cache: Optional[HTTPCache] = None
 
-    async def fetch_external_docs(self) -> List[ExternalDocument]:
+    async def fetch_external_docs(self, force_refresh: bool = False) -> List[ExternalDocument]:
         """
         Fetch external documentation using configured settings.
         
+        Each entry point is crawled in a single pass: pages are downloaded
+        once and yield both their links and their document. Re-crawls are
+        conditional (ETag / Last-Modified / body hash), so only new or
+        changed pages are returned; the run's counts and the URLs of pages
+        that disappeared are left in self.external_stats. Call
+        commit_external_docs() once the returned documents are indexed.
+        
+        Args:
+            force_refresh: Ignore cached validators and return every page
+        
         Returns:
             List of ExternalDocument objects
         """
+        self.external_stats = {}
+        self._external_http_cache = None
         if not settings.external_doc_index_enabled:
             logger.info("External documentation indexing disabled via settings")
             return []
 
-        urls_to_fetch = await self._discover_external_urls()
-        
-        if not urls_to_fetch:
+        entry_urls = self._external_entry_urls()
+        if not entry_urls:
             logger.info("No external documentation URLs to fetch")
             return []
 
-        logger.info(f"Fetching content for {len(urls_to_fetch)} external documentation URLs")
-        
-        # Create crawler for content fetching
-        fetch_crawler = ExternalDocCrawler(
-            base_url=urls_to_fetch[0] if urls_to_fetch else "",
-            max_pages=settings.external_doc_max_pages,
-            delay=settings.external_doc_request_delay,
-            max_depth=1  # Only fetch the given URLs, no further crawling
-        )
-        
-        if not fetch_crawler.is_available():
-            logger.error("External documentation crawler dependencies not available (requests/beautifulsoup4)")
-            return []
+        http_cache = None
+        if settings.external_doc_conditional_get:
+            http_cache = HTTPCache(Path(settings.http_cache_dir) / "external_docs.json")
+            if force_refresh:
+                http_cache.clear()
 
-        docs = await fetch_crawler.fetch_content(urls_to_fetch)
-        
-        if not docs:
-            logger.warning("No external documentation content fetched (all requests failed)")
-            return []
-        
-        logger.info(f"Successfully fetched {len(docs)} external documents")
-        return docs
-
-    async def _discover_external_urls(self) -> List[str]:
-        """
-        Discover external documentation URLs from configured entry points.
-        
-        Returns:
-            List of URLs to fetch
-        """
-        configured_urls = settings.external_doc_urls or []
-        
-        if not configured_urls:
-            # Try base_url if no configured URLs
-            base_url = settings.external_doc_base_url
-            if base_url:
-                configured_urls = [base_url]
-            else:
+        logger.info(f"Starting crawl from {len(entry_urls)} configured entry points")
+        
+        docs_by_url: Dict[str, ExternalDocument] = {}
+        stats: Counter = Counter()
+        reached: Set[str] = set()
+        gone: List[str] = []
+        complete = True
+        for entry_url in entry_urls:
+            crawler = self._create_crawler(entry_url, http_cache)
+            if not crawler.is_available():
+                logger.error("External documentation crawler dependencies not available (requests/beautifulsoup4)")
                 return []
-        
-        logger.info(f"Starting crawl from {len(configured_urls)} configured entry points")
-        
-        all_discovered = set()
-        
-        for entry_url in configured_urls:
             try:
-                temp_crawler = ExternalDocCrawler(
-                    base_url=entry_url,
-                    max_pages=settings.external_doc_max_pages,
-                    delay=settings.external_doc_request_delay,
-                    max_depth=settings.external_doc_max_depth,
-                )
-                
-                if temp_crawler.is_available():
-                    logger.info(f"Crawling from: {entry_url}")
-                    discovered = await temp_crawler.discover_urls()
-                    all_discovered.update(discovered)
-                    logger.info(f"  → Found {len(discovered)} URLs from this entry point")
+                logger.info(f"Crawling from: {entry_url}")
+                docs = await crawler.crawl()
+                if not crawler.reached_urls:
+                    # Entry page unreachable or not crawlable; try it on its own
+                    docs = await crawler.fetch_content([entry_url])
+                    reached.update(doc.url for doc in docs)
+                    complete = False
+                for doc in docs:
+                    docs_by_url.setdefault(doc.url, doc)
+                stats.update(crawler.stats)
+                reached.update(crawler.reached_urls)
+                gone.extend(crawler.gone_urls)
+                complete = complete and not crawler.truncated and not crawler.stats["failed"]
+                logger.info(f"  → Fetched {len(docs)} new/changed pages from this entry point")
             except Exception as e:
                 logger.warning(f"Failed to crawl from {entry_url}: {e}")
-                # Still add the entry URL itself
-                all_discovered.add(entry_url)
+                complete = False
+        
+        removed = list(gone)
+        if http_cache is not None:
+            # Pages no longer linked count as removed only after a complete crawl
+            if complete:
+                removed.extend(http_cache.prune(reached))
+            # Saved by commit_external_docs(), so pages that fail to embed are returned again
+            self._external_http_cache = http_cache
+        
+        self.external_stats = {
+            "new": stats["new"],
+            "changed": stats["changed"],
+            "unchanged": stats["unchanged"],
+            "failed": stats["failed"],
+            "removed": list(dict.fromkeys(removed)),
+        }
+        logger.info(
+            f"External docs: {stats['new']} new, {stats['changed']} changed, {stats['unchanged']} unchanged, "
+            f"{len(self.external_stats['removed'])} removed, {stats['failed']} failed"
+        )
         
-        urls_to_index = list(all_discovered)
-        logger.info(f"Total discovered URLs: {len(urls_to_index)}")
+        if not docs_by_url:
+            logger.info("No new or changed external documentation")
+            return []
         
-        return urls_to_index
+        logger.info(f"Successfully fetched {len(docs_by_url)} external documents")
+        return list(docs_by_url.values())
+
+    def commit_external_docs(self) -> None:
+        """Record the pages from the last fetch_external_docs() run as indexed."""
+        if self._external_http_cache is not None:
+            self._external_http_cache.save()
+            self._external_http_cache = None
 
-    async def fetch_gitlab_swagger_docs(self) -> List[SwaggerDocument]:
+    def _external_entry_urls(self) -> List[str]:
+        """Configured entry points (external_doc_urls, else external_doc_base_url)."""
+        configured_urls = settings.external_doc_urls or []
+        if not configured_urls and settings.external_doc_base_url:
+            configured_urls = [settings.external_doc_base_url]
+        return list(configured_urls)
+
+    def _create_crawler(self, entry_url: str, http_cache: Optional[HTTPCache] = None) -> ExternalDocCrawler:
+        return ExternalDocCrawler(
+            base_url=entry_url,
+            max_pages=settings.external_doc_max_pages,
+            delay=settings.external_doc_request_delay,
+            max_depth=settings.external_doc_max_depth,
+            concurrency=settings.external_doc_max_concurrency,
+            burst=settings.external_doc_burst,
+            http_cache=http_cache,
+        )
+
+    async def fetch_gitlab_swagger_docs(self, force_refresh: bool = False) -> List[SwaggerDocument]:
         """
         Fetch Swagger/OpenAPI documentation from GitLab services.
         
+        Only specs whose blob SHA changed since the last indexed run are
+        downloaded (concurrently); the run's counts and removed specs are
+        left in self.swagger_stats. Call commit_gitlab_swagger_docs() once
+        the returned documents are indexed.
+        
+        Args:
+            force_refresh: Ignore the manifest and return every spec
+        
         Returns:
             List of SwaggerDocument objects
         """
+        self.swagger_stats = {}
         if not settings.gitlab_swagger_enabled:
             logger.info("GitLab Swagger indexing disabled via settings")
             return []
@@ -128,17 +175,19 @@ class DocumentFetcher:
         logger.info("Fetching Swagger/OpenAPI docs from GitLab")
         
         try:
-            fetcher = GitLabSwaggerFetcher()
+            fetcher = AsyncGitLabSwaggerFetcher()
             
             if not fetcher.is_available():
                 logger.warning("GitLab Swagger fetcher not available")
                 return []
             
-            # Fetch all swagger docs from the configured group
-            docs = await asyncio.to_thread(fetcher.fetch_all)
+            # Fetch new/changed swagger docs from the configured group
+            docs = await fetcher.fetch_changed(force_refresh=force_refresh)
+            self.swagger_stats = fetcher.stats
+            self._swagger_fetcher = fetcher
             
             if not docs:
-                logger.warning("No Swagger documentation found in GitLab")
+                logger.info("No new or changed Swagger documentation in GitLab")
                 return []
             
             logger.info(f"Successfully fetched {len(docs)} Swagger documents from GitLab")
@@ -148,3 +197,8 @@ class DocumentFetcher:
             logger.error(f"Failed to fetch GitLab Swagger docs: {e}")
             return []
 
+    def commit_gitlab_swagger_docs(self) -> None:
+        """Record the specs from the last fetch_gitlab_swagger_docs() run as indexed."""
+        if self._swagger_fetcher is not None:
+            self._swagger_fetcher.save_manifest()
+            self._swagger_fetcher = None
@@ -96,7 +96,7 @@ class DocumentIndexer:
         metadatas: List[Dict[str, Any]],
         ids: List[str],
         batch_size: int = 1000,
-    ) -> None:
+    ) -> int:
         """
         Index Confluence documents with batching.
         
@@ -105,10 +105,14 @@ class DocumentIndexer:
             metadatas: List of metadata dicts
             ids: List of document IDs
             batch_size: Batch size for indexing
+
+        Returns:
+            Number of Confluence documents stored (less than the input if a batch failed)
         """
         total = len(doc_texts)
         logger.info(f"📄 Indexing {total} Confluence documents (with upsert logic)")
         
+        indexed = 0
         try:
             normalized_metadatas = [self._normalize_metadata(meta) for meta in metadatas]
             for i in range(0, total, batch_size):
@@ -122,6 +126,7 @@ class DocumentIndexer:
                     metadatas=batch_meta,
                     ids=batch_ids
                 )
+                indexed += len(batch_ids)
                 
                 if total > batch_size:
                     batch_num = (i // batch_size) + 1
@@ -133,13 +138,15 @@ class DocumentIndexer:
         except Exception as e:
             logger.error(f"Failed to index Confluence docs: {e}")
 
+        return indexed
+
     async def index_jira_stories(
         self,
         doc_texts: List[str],
         metadatas: List[Dict[str, Any]],
         ids: List[str],
         batch_size: int = 1000,
-    ) -> None:
+    ) -> int:
         """
         Index Jira stories with batching.
         
@@ -148,6 +155,9 @@ class DocumentIndexer:
             metadatas: List of metadata dicts
             ids: List of document IDs
             batch_size: Batch size for indexing
+
+        Returns:
+            Number of unique Jira stories stored (less than the input if a batch failed)
         """
         # Deduplicate by ID (keep first occurrence)
         seen_ids = set()
@@ -168,6 +178,7 @@ class DocumentIndexer:
         total = len(deduped_docs)
         logger.info(f"📋 Indexing {total} Jira stories (with upsert logic)")
         
+        indexed = 0
         try:
             normalized_metadatas = [self._normalize_metadata(meta) for meta in deduped_meta]
             for i in range(0, total, batch_size):
@@ -181,6 +192,7 @@ class DocumentIndexer:
                     metadatas=batch_meta,
                     ids=batch_ids
                 )
+                indexed += len(batch_ids)
                 
                 if total > batch_size:
                     batch_num = (i // batch_size) + 1
@@ -192,13 +204,15 @@ class DocumentIndexer:
         except Exception as e:
             logger.error(f"Failed to index Jira stories: {e}")
 
+        return indexed
+
     async def index_existing_tests(
         self,
         doc_texts: List[str],
         metadatas: List[Dict[str, Any]],
         ids: List[str],
         batch_size: int = 1000,
-    ) -> None:
+    ) -> int:
         """
         Index existing test cases with batching.
         
@@ -207,10 +221,14 @@ class DocumentIndexer:
             metadatas: List of metadata dicts
             ids: List of document IDs
             batch_size: Batch size for indexing
+
+        Returns:
+            Number of test cases stored (less than the input if a batch failed)
         """
         total = len(doc_texts)
         logger.info(f"Indexing {total} existing test cases")
         
+        indexed = 0
         try:
             normalized_metadatas = [self._normalize_metadata(meta) for meta in metadatas]
             for i in range(0, total, batch_size):
@@ -224,6 +242,7 @@ class DocumentIndexer:
                     metadatas=batch_meta,
                     ids=batch_ids
                 )
+                indexed += len(batch_ids)
                 
                 batch_num = (i // batch_size) + 1
                 total_batches = (total - 1) // batch_size + 1
@@ -234,6 +253,8 @@ class DocumentIndexer:
         except Exception as e:
             logger.error(f"Failed to index existing tests: {e}")
 
+        return indexed
+
     async def index_external_docs(
         self,
         doc_texts: List[str],
@@ -271,6 +292,37 @@ class DocumentIndexer:
             logger.error(f"Failed to index external docs: {e}")
             return 0
 
+    def remove_external_docs(self, urls: List[str]) -> int:
+        """
+        Delete external documentation pages that no longer exist.
+        
+        Args:
+            urls: Source URLs of the removed pages
+            
+        Returns:
+            Number of documents deleted
+        """
+        if not urls:
+            return 0
+        ids = [self.create_external_doc_id(url) for url in urls]
+        return self.store.delete_documents(self.store.EXTERNAL_DOCS_COLLECTION, ids)
+
+    def create_external_doc_id(self, url: str) -> str:
+        """
+        Create the stable ID of an external documentation page.
+        
+        Args:
+            url: Source URL
+            
+        Returns:
+            Document ID (derived from the URL's doc_hash)
+        """
+        return f"plainid_{self._external_doc_hash(url)}"
+
+    @staticmethod
+    def _external_doc_hash(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+
     def create_confluence_metadata(
         self,
         doc: Dict[str, Any],
@@ -396,7 +448,7 @@ class DocumentIndexer:
         has_request_examples = "request" in text.lower() and ("{" in text or "[" in text)
         has_json_examples = "=== JSON EXAMPLES ===" in text
         
-        doc_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        doc_hash = self._external_doc_hash(url)
         
         now = datetime.now()
         return {
@@ -455,9 +507,7 @@ class DocumentIndexer:
             Metadata dictionary
         """
         # Create hash from service name and file path for deduplication
-        doc_hash = hashlib.sha256(
-            f"{swagger_doc.service_name}_{swagger_doc.file_path}".encode("utf-8")
-        ).hexdigest()[:16]
+        doc_hash = self._swagger_doc_hash(swagger_doc.service_name, swagger_doc.file_path)
         
         # Determine API type from file path
         api_type = "external" if "external" in swagger_doc.file_path else "internal"
@@ -475,6 +525,74 @@ class DocumentIndexer:
             "timestamp": datetime.now().isoformat()
         }
 
+    @staticmethod
+    def _swagger_doc_hash(service_name: str, file_path: str) -> str:
+        return hashlib.sha256(f"{service_name}_{file_path}".encode("utf-8")).hexdigest()[:16]
+
+    def remove_swagger_docs(self, specs: List[Dict[str, str]]) -> int:
+        """
+        Delete Swagger/OpenAPI documents whose spec files no longer exist.
+        
+        Args:
+            specs: Removed specs (dicts with service_name and file_path)
+            
+        Returns:
+            Number of documents deleted
+        """
+        if not specs:
+            return 0
+        ids = [f"swagger_{self._swagger_doc_hash(spec['service_name'], spec['file_path'])}" for spec in specs]
+        return self.store.delete_documents(self.store.SWAGGER_DOCS_COLLECTION, ids)
+
+    def create_endpoint_metadata(self, record) -> Dict[str, Any]:
+        """
+        Create metadata dict for one Swagger endpoint.
+        
+        Args:
+            record: EndpointRecord
+            
+        Returns:
+            Metadata dictionary (doc_type 'endpoint'; method and path
+            identify the record in the endpoint index)
+        """
+        return {
+            "source": "gitlab_swagger",
+            "doc_type": "endpoint",
+            "service_name": record.service_name,
+            "file_path": record.file_path,
+            "method": record.method,
+            "path": record.path,
+            "project_key": record.project_key,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def create_endpoint_doc_id(self, record) -> str:
+        """
+        Create the stable ID of a Swagger endpoint vector.
+        
+        Args:
+            record: EndpointRecord
+            
+        Returns:
+            Document ID (hash of service, spec file, method and path)
+        """
+        return f"swagger_ep_{hashlib.sha256(record.key.encode('utf-8')).hexdigest()[:16]}"
+
+    def remove_endpoint_docs(self, records: List[Any]) -> int:
+        """
+        Delete the vectors of Swagger endpoints that no longer exist.
+        
+        Args:
+            records: Removed EndpointRecords
+            
+        Returns:
+            Number of documents deleted
+        """
+        if not records:
+            return 0
+        ids = [self.create_endpoint_doc_id(record) for record in records]
+        return self.store.delete_documents(self.store.SWAGGER_DOCS_COLLECTION, ids)
+
     async def index_swagger_docs(
         self,
         doc_texts: List[str],
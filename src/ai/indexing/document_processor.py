@@ -3,10 +3,11 @@ Document processing service for cleaning and preparing documents.
 Single Responsibility: Text cleaning, HTML parsing, content extraction.
 """
 
-from typing import Optional
+from typing import List, Optional, Sequence
 import yaml
 from loguru import logger
-from src.infrastructure.html_parser import HTMLParser
+from src.config.settings import settings
+from src.infrastructure.html_parser import HTMLParser, strip_html_batch
 from src.models.test_plan import TestPlan
 
 
@@ -185,6 +186,30 @@ class DocumentProcessor:
         # This avoids duplication and makes the content cleaner
         return text
 
+    def build_external_doc_documents(self, docs: Sequence) -> List[Optional[str]]:
+        """
+        Build document texts for many external docs (see build_external_doc_document).
+        
+        Large batches are cleaned in a process pool.
+        
+        Args:
+            docs: ExternalDocument objects
+            
+        Returns:
+            Document text per doc (None if no content), in input order
+        """
+        texts = strip_html_batch(
+            [doc.html for doc in docs],
+            max_workers=settings.html_clean_max_workers,
+            min_batch=settings.html_clean_min_batch,
+        )
+        results = []
+        for doc, text in zip(docs, texts):
+            if not text:
+                logger.warning(f"No textual content extracted from {doc.url}")
+            results.append(text or None)
+        return results
+
     def build_swagger_document(self, swagger_doc) -> str:
         """
         Build searchable document from Swagger/OpenAPI YAML.
@@ -0,0 +1,208 @@
+"""
+Shared embedding/upsert pipeline for concurrent indexing runs.
+
+index-all runs its phases concurrently. Left alone, every phase would call
+the embedding API on its own and EmbeddingService's per-call request limit
+would multiply by the number of phases. EmbeddingPipeline stands in for
+RAGVectorStore instead: add_documents() puts the batch on a bounded queue
+(submitters wait while the queue is full) and a fixed set of workers embeds
+and upserts batches under one tokens-per-minute budget.
+
+Submitters still await their own batch, so errors surface in the phase that
+produced it, exactly as with a direct store call.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from src.config.settings import settings
+
+
+class TokenRateLimiter:
+    """
+    Sliding one-minute budget of estimated embedding tokens.
+
+    Waiters are served in arrival order. A request larger than the whole
+    budget is clamped to it so it can still run once the window is empty.
+    """
+
+    WINDOW_SECONDS = 60.0
+
+    def __init__(
+        self,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            tokens_per_minute: Token budget per minute (0 disables limiting)
+            clock: Monotonic clock in seconds
+        """
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._used = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until the tokens fit in the current window, then spend them.
+
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        if self.tokens_per_minute <= 0:
+            return
+        tokens = min(tokens, self.tokens_per_minute)
+
+        async with self._lock:
+            while True:
+                now = self._clock()
+                while self._window and now - self._window[0][0] >= self.WINDOW_SECONDS:
+                    self._used -= self._window.popleft()[1]
+                if self._used + tokens <= self.tokens_per_minute:
+                    self._window.append((now, tokens))
+                    self._used += tokens
+                    return
+                wait = self._window[0][0] + self.WINDOW_SECONDS - now
+                logger.debug(f"Embedding token budget exhausted, waiting {wait:.1f}s")
+                await asyncio.sleep(wait)
+
+
+class EmbeddingPipeline:
+    """
+    Bounded queue of add_documents() batches drained by a fixed set of workers.
+
+    Use as an async context manager. Anything other than add_documents() is
+    delegated to the wrapped store, so the pipeline can be handed to
+    DocumentIndexer in place of a RAGVectorStore.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            store: RAGVectorStore (or compatible) doing the embedding and upsert
+            workers: Batches embedded at once across all submitters (defaults to settings)
+            queue_size: Batches waiting before submitters block (defaults to settings)
+            tokens_per_minute: Global embedding token budget (defaults to settings, 0 = unlimited)
+        """
+        self.store = store
+        self.workers = max(1, workers or settings.embedding_pipeline_workers)
+        self.queue_size = max(1, queue_size or settings.embedding_pipeline_queue_size)
+        self.rate_limiter = TokenRateLimiter(
+            tokens_per_minute if tokens_per_minute is not None else settings.embedding_tokens_per_minute
+        )
+        self.stats: Dict[str, int] = {"batches": 0, "documents": 0, "failed": 0, "queue_peak": 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the pipeline itself
+        if name == "store":
+            raise AttributeError(name)
+        return getattr(self.store, name)
+
+    async def __aenter__(self) -> "EmbeddingPipeline":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close(drain=exc_type is None)
+
+    def start(self) -> None:
+        """Start the workers (must be called from the running event loop)."""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info(f"Started embedding pipeline ({self.workers} workers, queue of {self.queue_size} batches)")
+
+    async def close(self, drain: bool = True) -> None:
+        """
+        Stop the workers.
+
+        Args:
+            drain: Wait for queued batches first (False cancels them)
+        """
+        if self._queue is None:
+            return
+        if drain:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+        logger.info(
+            f"Embedding pipeline closed: {self.stats['documents']} documents in {self.stats['batches']} batches "
+            f"({self.stats['failed']} failed, peak queue {self.stats['queue_peak']})"
+        )
+
+    async def add_documents(
+        self,
+        collection_name: str,
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+    ) -> None:
+        """
+        Queue a batch for embedding and wait until it is stored.
+
+        Falls through to the store when the pipeline is not running.
+
+        Args:
+            collection_name: Name of the collection
+            documents: List of document texts
+            metadatas: List of metadata dicts for each document
+            ids: List of unique IDs for each document
+
+        Raises:
+            Exception: Whatever the store raised for this batch
+        """
+        if self._queue is None or not documents:
+            await self.store.add_documents(collection_name, documents, metadatas, ids)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((collection_name, documents, metadatas, ids, future))
+        self.stats["queue_peak"] = max(self.stats["queue_peak"], self._queue.qsize())
+        await future
+
+    @staticmethod
+    def _estimate_tokens(documents: List[str]) -> int:
+        # Same ~3 characters per token estimate as EmbeddingService
+        return sum(len(doc) for doc in documents) // 3
+
+    async def _worker(self) -> None:
+        while True:
+            collection_name, documents, metadatas, ids, future = await self._queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                await self.rate_limiter.acquire(self._estimate_tokens(documents))
+                await self.store.add_documents(collection_name, documents, metadatas, ids)
+                self.stats["batches"] += 1
+                self.stats["documents"] += len(documents)
+                if not future.done():
+                    future.set_result(None)
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"Embedding pipeline batch for {collection_name} failed: {e}")
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
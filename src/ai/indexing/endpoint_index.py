@@ -0,0 +1,562 @@
+"""
+Endpoint-level index of Swagger/OpenAPI specs.
+
+Built at indexing time from the parsed specs: one EndpointRecord per
+(service, method, path) with parameters, schemas and examples. Lookups at
+story time query the index (a path trie for explicit endpoint mentions and
+a token index for keyword matches) instead of re-parsing the flattened
+Swagger text with regexes.
+
+The index is persisted as a gzip JSON list of records; the trie and token
+index are rebuilt on load.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import yaml
+from loguru import logger
+
+from src.config.settings import settings
+from src.models.enriched_story import APISpec
+from src.utils.text_processor import tokenize
+
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
+HTTP_METHODS = ('get', 'post', 'put', 'patch', 'delete', 'options', 'head')
+
+# Length limits for schema summaries and examples kept per endpoint
+MAX_SCHEMA_CHARS = 400
+MAX_EXAMPLE_CHARS = 1000
+
+def _segments(path: str) -> List[str]:
+    return [s for s in path.split('?')[0].split('#')[0].strip('/').split('/') if s]
+
+
+def _is_param(segment: str) -> bool:
+    return segment.startswith('{') and segment.endswith('}')
+
+
+@dataclass
+class EndpointRecord:
+    """One operation of a Swagger/OpenAPI spec."""
+
+    service_name: str
+    file_path: str
+    method: str
+    path: str
+    project_key: str = ''
+    base_path: str = ''
+    operation_id: Optional[str] = None
+    summary: Optional[str] = None
+    description: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    parameters: List[str] = field(default_factory=list)
+    request_schema: Optional[str] = None
+    response_schema: Optional[str] = None
+    request_example: Optional[str] = None
+    response_example: Optional[str] = None
+    dto_definitions: Optional[Dict[str, Any]] = None
+    authentication: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Unique key: service, spec file, method and path."""
+        return f"{self.service_name}|{self.file_path}|{self.method} {self.path}"
+
+    @cached_property
+    def tokens(self) -> FrozenSet[str]:
+        """Searchable tokens (literal path segments, operation, summary, tags, service)."""
+        literal_path = ' '.join(s for s in _segments(self.path) if not _is_param(s))
+        return frozenset(tokenize(' '.join([
+            literal_path,
+            self.operation_id or '',
+            self.summary or '',
+            ' '.join(self.tags),
+            self.service_name,
+        ])))
+
+    def to_api_spec(self) -> APISpec:
+        """APISpec for prompts and enrichment."""
+        return APISpec(
+            endpoint_path=self.path,
+            http_methods=[self.method],
+            request_schema=self.request_schema,
+            response_schema=self.response_schema,
+            parameters=list(self.parameters),
+            authentication=self.authentication,
+            service_name=self.service_name,
+            request_example=self.request_example,
+            response_example=self.response_example,
+            dto_definitions=self.dto_definitions,
+        )
+
+    def to_document(self) -> str:
+        """Text embedded for this endpoint."""
+        lines = [
+            f"Service: {self.service_name}",
+            f"Endpoint: {self.method} {self.path}",
+        ]
+        if self.base_path:
+            lines.append(f"Base Path: {self.base_path}")
+        if self.operation_id:
+            lines.append(f"Operation: {self.operation_id}")
+        if self.summary:
+            lines.append(f"Summary: {self.summary}")
+        if self.description:
+            lines.append(f"Description: {self.description}")
+        if self.tags:
+            lines.append(f"Tags: {', '.join(self.tags)}")
+        if self.parameters:
+            lines.append("Parameters:")
+            lines.extend(f"  - {param}" for param in self.parameters)
+        if self.request_schema:
+            lines.append(f"Request Body: {self.request_schema}")
+        if self.request_example:
+            lines.append(f"Request Example: {self.request_example}")
+        if self.response_schema:
+            lines.append(f"Responses: {self.response_schema}")
+        if self.response_example:
+            lines.append(f"Response Example: {self.response_example}")
+        if self.authentication:
+            lines.append(f"Authentication: {self.authentication}")
+        return "\n".join(lines)
+
+
+class _SpecReader:
+    """Resolves $refs and summarizes schemas of one parsed spec."""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+
+    def resolve(self, node: Any, depth: int = 0) -> Any:
+        """Follow local $refs ('#/components/schemas/X', '#/definitions/X')."""
+        while isinstance(node, dict) and '$ref' in node and depth < 10:
+            ref = node['$ref']
+            if not isinstance(ref, str) or not ref.startswith('#/'):
+                return node
+            target: Any = self.spec
+            for part in ref[2:].split('/'):
+                target = target.get(part, {}) if isinstance(target, dict) else {}
+            node = target
+            depth += 1
+        return node if isinstance(node, dict) else {}
+
+    @staticmethod
+    def ref_name(node: Any) -> Optional[str]:
+        if isinstance(node, dict):
+            if '$ref' in node:
+                return str(node['$ref']).rsplit('/', 1)[-1]
+            if node.get('type') == 'array' and isinstance(node.get('items'), dict) and '$ref' in node['items']:
+                return f"{str(node['items']['$ref']).rsplit('/', 1)[-1]}[]"
+        return None
+
+    def fields(self, schema: Any) -> Dict[str, Dict[str, Any]]:
+        """Top-level properties of a schema (allOf merged): name -> {type, required, description}."""
+        schema = self.resolve(schema)
+        if schema.get('type') == 'array':
+            schema = self.resolve(schema.get('items', {}))
+        properties: Dict[str, Any] = {}
+        required: Set[str] = set(schema.get('required') or [])
+        for part in schema.get('allOf') or []:
+            part = self.resolve(part)
+            properties.update(part.get('properties') or {})
+            required.update(part.get('required') or [])
+        properties.update(schema.get('properties') or {})
+        result = {}
+        for name, prop in properties.items():
+            resolved = self.resolve(prop) if isinstance(prop, dict) else {}
+            info: Dict[str, Any] = {
+                'type': self.ref_name(prop) or resolved.get('type', 'object'),
+                'required': name in required,
+            }
+            if resolved.get('description'):
+                info['description'] = str(resolved['description'])[:200]
+            result[str(name)] = info
+        return result
+
+    def summarize(self, schema: Any) -> Optional[str]:
+        """'Name {field: type*, ...}' (* = required), truncated."""
+        if not schema:
+            return None
+        name = self.ref_name(schema) or self.resolve(schema).get('type', '')
+        fields = self.fields(schema)
+        body = ', '.join(f"{n}: {f['type']}{'*' if f['required'] else ''}" for n, f in fields.items())
+        text = f"{name} {{{body}}}".strip() if body else str(name)
+        return text[:MAX_SCHEMA_CHARS] or None
+
+    def example(self, media: Dict[str, Any]) -> Optional[str]:
+        """Example of a media type object (example, first of examples, or schema example)."""
+        value = None
+        if 'example' in media:
+            value = media['example']
+        elif isinstance(media.get('examples'), dict) and media['examples']:
+            first = self.resolve(next(iter(media['examples'].values())))
+            value = first.get('value')
+        else:
+            value = self.resolve(media.get('schema', {})).get('example')
+        if value is None:
+            return None
+        text = value if isinstance(value, str) else json.dumps(value, default=str)
+        return text[:MAX_EXAMPLE_CHARS]
+
+
+def _base_path(spec: Dict[str, Any]) -> str:
+    if spec.get('basePath'):
+        return str(spec['basePath']).rstrip('/')
+    servers = spec.get('servers') or []
+    if servers and isinstance(servers[0], dict):
+        url = str(servers[0].get('url', ''))
+        path = re.sub(r'^[a-z]+://[^/]+', '', url)
+        return path.rstrip('/') if path.startswith('/') else ''
+    return ''
+
+
+def _authentication(spec: Dict[str, Any], operation: Dict[str, Any]) -> Optional[str]:
+    requirements = operation.get('security', spec.get('security')) or []
+    schemes = (spec.get('components') or {}).get('securitySchemes') or spec.get('securityDefinitions') or {}
+    names = []
+    for requirement in requirements:
+        for name in (requirement or {}):
+            scheme = schemes.get(name) or {}
+            kind = scheme.get('scheme') or scheme.get('type')
+            names.append(f"{name} ({kind})" if kind else name)
+    return ', '.join(dict.fromkeys(names)) or None
+
+
+def extract_endpoint_records(
+    swagger_doc,
+    project_key: str = '',
+    spec: Optional[Dict[str, Any]] = None
+) -> List[EndpointRecord]:
+    """
+    Build one record per operation of a Swagger/OpenAPI document.
+
+    Args:
+        swagger_doc: SwaggerDocument (service_name, file_path, content)
+        project_key: Project key for filtering
+        spec: Already parsed spec (parsed from swagger_doc.content if None)
+
+    Returns:
+        List of EndpointRecord objects (empty if the spec cannot be parsed)
+    """
+    if spec is None:
+        try:
+            spec = yaml.load(swagger_doc.content, Loader=_YAMLLoader)
+        except yaml.YAMLError as e:
+            logger.warning(f"Failed to parse Swagger spec {swagger_doc.file_path} for endpoint index: {e}")
+            return []
+    if not isinstance(spec, dict):
+        return []
+
+    reader = _SpecReader(spec)
+    base_path = _base_path(spec)
+    records = []
+    for path, path_item in (spec.get('paths') or {}).items():
+        path_item = reader.resolve(path_item)
+        shared_params = path_item.get('parameters') or []
+        for method, operation in path_item.items():
+            if method not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+
+            parameters = []
+            request_schema = request_example = None
+            dto_definitions = None
+            params_by_name = {}
+            for param in list(shared_params) + list(operation.get('parameters') or []):
+                param = reader.resolve(param)
+                params_by_name[(param.get('name'), param.get('in'))] = param
+            for param in params_by_name.values():
+                if param.get('in') == 'body':  # Swagger 2 request body
+                    request_schema = reader.summarize(param.get('schema'))
+                    dto_definitions = reader.fields(param.get('schema')) or None
+                    continue
+                param_type = reader.resolve(param.get('schema', {})).get('type') or param.get('type', 'unknown')
+                required = ' (required)' if param.get('required') else ''
+                parameters.append(f"{param.get('name', 'unknown')} ({param.get('in', 'unknown')}, {param_type}){required}")
+
+            request_body = reader.resolve(operation.get('requestBody', {}))
+            for content_type, media in (request_body.get('content') or {}).items():
+                media = media or {}
+                request_schema = reader.summarize(media.get('schema')) or content_type
+                dto_definitions = reader.fields(media.get('schema')) or None
+                request_example = reader.example(media)
+                break
+
+            responses = []
+            response_example = None
+            for status_code, response in (operation.get('responses') or {}).items():
+                response = reader.resolve(response)
+                desc = response.get('description', 'No description')
+                schema = response.get('schema')  # Swagger 2
+                for media in (response.get('content') or {}).values():
+                    media = media or {}
+                    schema = media.get('schema')
+                    if response_example is None and str(status_code).startswith('2'):
+                        response_example = reader.example(media)
+                    break
+                name = reader.ref_name(schema)
+                responses.append(f"{status_code}: {desc}" + (f" ({name})" if name else ''))
+
+            records.append(EndpointRecord(
+                service_name=swagger_doc.service_name,
+                file_path=swagger_doc.file_path,
+                method=method.upper(),
+                path=str(path),
+                project_key=project_key,
+                base_path=base_path,
+                operation_id=operation.get('operationId'),
+                summary=operation.get('summary'),
+                description=(operation.get('description') or '')[:500] or None,
+                tags=[str(tag) for tag in operation.get('tags') or []],
+                parameters=parameters,
+                request_schema=request_schema,
+                response_schema='; '.join(responses[:3]) or None,
+                request_example=request_example,
+                response_example=response_example,
+                dto_definitions=dto_definitions,
+                authentication=_authentication(spec, operation),
+            ))
+    return records
+
+
+class _TrieNode:
+    __slots__ = ('children', 'param', 'keys')
+
+    def __init__(self):
+        self.children: Dict[str, _TrieNode] = {}
+        self.param: Optional[_TrieNode] = None
+        self.keys: Set[str] = set()
+
+
+class EndpointIndex:
+    """
+    In-memory endpoint index with a path trie and a token index.
+
+    Path segments like {id} are wildcard nodes in the trie, so a concrete
+    path from a story (/policies/123/rules) matches the templated path
+    (/policies/{policyId}/rules). Prefixes in the story path (gateway or
+    server base paths) are skipped when matching.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the index, loading it from disk if the file exists.
+
+        Args:
+            path: Index file (defaults to settings)
+        """
+        self.path = Path(path or settings.swagger_endpoint_index_path)
+        self.records: Dict[str, EndpointRecord] = {}
+        self._by_file: Dict[Tuple[str, str], Dict[str, None]] = {}  # Ordered key sets
+        self._root = _TrieNode()
+        self._tokens: Dict[str, Set[str]] = {}
+        self.mtime: Optional[float] = None
+        if self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _add(self, record: EndpointRecord) -> None:
+        key = record.key
+        if key in self.records:
+            self._remove(key)
+        self.records[key] = record
+        self._by_file.setdefault((record.service_name, record.file_path), {})[key] = None
+        node = self._root
+        for segment in _segments(record.path):
+            if _is_param(segment):
+                node.param = node.param or _TrieNode()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment.lower(), _TrieNode())
+        node.keys.add(key)
+        for token in record.tokens:
+            self._tokens.setdefault(token, set()).add(key)
+
+    def _remove(self, key: str) -> Optional[EndpointRecord]:
+        record = self.records.pop(key, None)
+        if record is None:
+            return None
+        self._by_file.get((record.service_name, record.file_path), {}).pop(key, None)
+        node: Optional[_TrieNode] = self._root
+        for segment in _segments(record.path):
+            node = node.param if _is_param(segment) else node.children.get(segment.lower())
+            if node is None:
+                break
+        if node is not None:
+            node.keys.discard(key)
+        for token in record.tokens:
+            keys = self._tokens.get(token)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tokens[token]
+        return record
+
+    def replace_file(self, service_name: str, file_path: str, records: Iterable[EndpointRecord]) -> List[EndpointRecord]:
+        """
+        Replace the records of one spec file.
+
+        Args:
+            service_name: Spec service name
+            file_path: Spec file path
+            records: New records of the file
+
+        Returns:
+            Records that were dropped (operations no longer in the file)
+        """
+        old = list(self._by_file.pop((service_name, file_path), {}))
+        new = list(records)
+        new_keys = {record.key for record in new}
+        dropped = [self._remove(key) for key in old if key not in new_keys]
+        for record in new:
+            self._add(record)
+        return [record for record in dropped if record is not None]
+
+    def remove_file(self, service_name: str, file_path: str) -> List[EndpointRecord]:
+        """Drop every record of a spec file; returns the removed records."""
+        return self.replace_file(service_name, file_path, [])
+
+    def records_for_file(self, service_name: Optional[str], file_path: Optional[str]) -> List[EndpointRecord]:
+        """Records of one spec file, in spec order."""
+        return [self.records[key] for key in self._by_file.get((service_name or '', file_path or ''), {})]
+
+    def get(self, service_name: str, file_path: str, method: str, path: str) -> Optional[EndpointRecord]:
+        """Record for an exact (service, file, method, path)."""
+        return self.records.get(f"{service_name}|{file_path}|{method.upper()} {path}")
+
+    def _walk(self, node: _TrieNode, segments: List[str], params: int, found: List[Tuple[int, str]]) -> None:
+        if not segments:
+            found.extend((params, key) for key in node.keys)
+            return
+        segment, rest = segments[0], segments[1:]
+        if not _is_param(segment):
+            child = node.children.get(segment.lower())
+            if child is not None:
+                self._walk(child, rest, params, found)
+        if node.param is not None:
+            self._walk(node.param, rest, params + 1, found)
+
+    def match_path(self, path: str, method: Optional[str] = None) -> List[EndpointRecord]:
+        """
+        Records whose templated path matches a concrete or templated path.
+
+        Leading segments of the given path are skipped until something
+        matches (base paths like /policy-mgmt/1.0). At least one literal
+        segment must match; matches with fewer wildcard segments come
+        first.
+
+        Args:
+            path: Endpoint path (e.g. from story text)
+            method: Optional HTTP method filter
+
+        Returns:
+            Matching records, most specific first
+        """
+        segments = _segments(path)
+        for offset in range(len(segments)):
+            found: List[Tuple[int, str]] = []
+            self._walk(self._root, segments[offset:], 0, found)
+            records = [
+                self.records[key] for params, key in sorted(found)
+                if params < len(segments) - offset  # Wildcards only (e.g. /{id}) is too weak
+                and (method is None or self.records[key].method == method.upper())
+            ]
+            if records:
+                return records
+        return []
+
+    def search(self, text: str, limit: int = 10, project_key: Optional[str] = None) -> List[EndpointRecord]:
+        """
+        Rank records by the (IDF-weighted) tokens they share with a text.
+
+        Args:
+            text: Query text (story text or keywords)
+            limit: Maximum records returned
+            project_key: Optional project key filter
+
+        Returns:
+            Best matching records
+        """
+        scores: Counter = Counter()
+        total = max(1, len(self.records))
+        for token in tokenize(text):
+            keys = self._tokens.get(token)
+            if not keys:
+                continue
+            weight = math.log(1 + total / len(keys))
+            for key in keys:
+                scores[key] += weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for key, _ in ranked:
+            record = self.records[key]
+            if project_key and record.project_key and record.project_key != project_key:
+                continue
+            results.append(record)
+            if len(results) >= limit:
+                break
+        return results
+
+    def load(self) -> None:
+        """Load the records from disk and rebuild the trie and token index."""
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            self.records, self._by_file, self._root, self._tokens = {}, {}, _TrieNode(), {}
+            for item in data.get('records', []):
+                self._add(EndpointRecord(**item))
+            self.mtime = self.path.stat().st_mtime
+            logger.debug(f"Loaded {len(self.records)} endpoints from {self.path}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable endpoint index {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write the records atomically."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'records': [asdict(r) for r in self.records.values()]}, f, separators=(',', ':'), default=str)
+            os.replace(tmp_path, self.path)
+            self.mtime = self.path.stat().st_mtime
+        except Exception as e:
+            logger.warning(f"Failed to save endpoint index {self.path}: {e}")
+
+
+# Shared read-side instances, reloaded when another process rewrites the file
+_shared: Dict[str, EndpointIndex] = {}
+
+
+def get_endpoint_index(path: Optional[str] = None) -> EndpointIndex:
+    """
+    Shared EndpointIndex for a file, reloaded if the file changed on disk.
+
+    Args:
+        path: Index file (defaults to settings)
+
+    Returns:
+        The index (empty if the file does not exist yet)
+    """
+    path = str(path or settings.swagger_endpoint_index_path)
+    index = _shared.get(path)
+    if index is None:
+        index = _shared[path] = EndpointIndex(path)
+    elif index.path.exists() and index.path.stat().st_mtime != index.mtime:
+        index.load()
+    return index
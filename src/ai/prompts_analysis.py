@@ -12,9 +12,11 @@ Key features:
 - Few-shot example showing REASONING, not just format
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from loguru import logger
 
+from src.ai.generation.prompt_cache import PromptParts
+
 
 # =============================================================================
 # STAGE 1: ANALYSIS SYSTEM INSTRUCTION
@@ -446,14 +448,18 @@ def build_analysis_prompt(
     confluence_docs: Optional[List[Dict[str, Any]]] = None,
     swagger_docs: Optional[List[Dict[str, Any]]] = None,
     existing_tests: Optional[List[Dict[str, Any]]] = None,
-    api_specifications: Optional[List[Dict[str, Any]]] = None
-) -> str:
+    api_specifications: Optional[List[Dict[str, Any]]] = None,
+    cache_layout: bool = False
+) -> Union[str, PromptParts]:
     """
     Build the Stage 1 analysis prompt.
     
     This prompt asks the AI to analyze the story and produce a CoveragePlan,
     NOT to generate tests yet.
     
+    With cache_layout, the instruction, few-shot example and output format
+    come first as a static prefix that providers can cache across stories.
+    
     Args:
         story_key: Jira story key
         story_title: Story summary
@@ -463,9 +469,10 @@ def build_analysis_prompt(
         swagger_docs: Swagger/API documentation
         existing_tests: Existing tests to check for overlap
         api_specifications: API specs from story enrichment
+        cache_layout: Return PromptParts with static sections first
         
     Returns:
-        Complete analysis prompt
+        Complete analysis prompt (PromptParts if cache_layout)
     """
     sections = []
     
@@ -501,6 +508,24 @@ def build_analysis_prompt(
         sections.append(tests_section)
         logger.info(f"[ANALYSIS PROMPT] Added existing tests section with {len(existing_tests)} tests")
     
+    if cache_layout:
+        parts = PromptParts(
+            static="\n\n".join([
+                ANALYSIS_SYSTEM_INSTRUCTION,
+                f"\n{ANALYSIS_FEW_SHOT_EXAMPLE}",
+                f"\n=== OUTPUT FORMAT ===\n\n{ANALYSIS_OUTPUT_FORMAT}",
+            ]),
+            dynamic="\n\n".join(sections[1:] + [
+                "\n=== YOUR TASK ===\n\nAnalyze the story above and output a JSON coverage plan "
+                "in the OUTPUT FORMAT given earlier."
+            ]),
+        )
+        logger.info(
+            f"[ANALYSIS PROMPT] Cache layout: {len(parts.static)} static chars, "
+            f"{len(parts.dynamic)} dynamic chars"
+        )
+        return parts
+    
     # Section 6: Few-shot example
     sections.append(f"\n{ANALYSIS_FEW_SHOT_EXAMPLE}")
     logger.info("[ANALYSIS PROMPT] Added few-shot example")
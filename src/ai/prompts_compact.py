@@ -15,9 +15,12 @@ Structure:
 Logging: All prompt construction is logged for debugging.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from loguru import logger
 
+from src.ai.generation.prompt_cache import PromptParts
+from src.ai.generation.token_budget import get_token_counter
+
 # ============================================================================
 # SECTION 1: CORE RULES (Compact - ~800 tokens)
 # ============================================================================
@@ -292,13 +295,17 @@ def build_compact_prompt(
     existing_tests: Optional[List[Dict[str, Any]]] = None,  # NEW: Existing tests for duplicate detection
     rag_context: Optional[str] = None,
     include_example: bool = True,
-    max_rag_tokens: int = 2000
-) -> str:
+    max_rag_tokens: int = 2000,
+    cache_layout: bool = False
+) -> Union[str, PromptParts]:
     """
     Build a compact prompt for test generation.
     
     Target: ~4K words (16K tokens) max
     
+    With cache_layout, the rules, example and output requirements come first
+    as a static prefix that providers can cache across stories.
+    
     Args:
         story_key: Jira story key (e.g., "PLAT-11372")
         story_title: Story summary
@@ -312,9 +319,10 @@ def build_compact_prompt(
         rag_context: Pre-formatted RAG context (will be truncated if too long)
         include_example: Whether to include the example (skip if RAG has similar tests)
         max_rag_tokens: Maximum tokens for RAG context
+        cache_layout: Return PromptParts with static sections first
         
     Returns:
-        Complete prompt string
+        Complete prompt string (PromptParts if cache_layout)
     """
     sections = []
     token_counts = {}
@@ -402,6 +410,8 @@ def build_compact_prompt(
         token_counts['rag'] = 0
         logger.info("[PROMPT] Section 6 (RAG): skipped (no context)")
     
+    dynamic_count = len(sections) - 1
+    
     # Section 7: Example (conditional)
     if include_example:
         sections.append(f"\n--- EXAMPLE (structure only) ---\n{COMPACT_EXAMPLE}")
@@ -432,6 +442,8 @@ def build_compact_prompt(
     if total_tokens > 16000:
         logger.warning(f"[PROMPT] WARNING: Prompt exceeds 16K token budget ({total_tokens} tokens)")
     
+    if cache_layout:
+        return _static_first(sections, dynamic_count, "Generate the test cases for the story above.")
     return prompt
 
 
@@ -523,20 +535,20 @@ def _build_story_section(
 
 
 def _estimate_tokens(text: str) -> int:
-    """Estimate token count (rough: 1 token ≈ 4 chars for English)."""
-    return len(text) // 4
+    """Count tokens with the tokenizer (memoized; ~4 chars/token if tiktoken is unavailable)."""
+    return get_token_counter().count(text)
 
 
 def _truncate_to_tokens(text: str, max_tokens: int) -> str:
     """Truncate text to fit within token budget."""
-    max_chars = max_tokens * 4
-    if len(text) <= max_chars:
+    counter = get_token_counter()
+    if counter.count(text) <= max_tokens:
         return text
     
-    truncated = text[:max_chars]
+    truncated = counter.truncate(text, max_tokens)
     # Try to end at a sentence boundary
     last_period = truncated.rfind('.')
-    if last_period > max_chars * 0.8:
+    if last_period > len(truncated) * 0.8:
         truncated = truncated[:last_period + 1]
     
     return truncated + f"\n... [truncated to ~{max_tokens} tokens]"
@@ -697,14 +709,18 @@ def build_stage2_prompt(
     coverage_plan: Dict[str, Any],
     confluence_docs: Optional[List[Dict[str, Any]]] = None,
     swagger_docs: Optional[List[Dict[str, Any]]] = None,
-    api_specifications: Optional[List[Dict[str, Any]]] = None
-) -> str:
+    api_specifications: Optional[List[Dict[str, Any]]] = None,
+    cache_layout: bool = False
+) -> Union[str, PromptParts]:
     """
     Build Stage 2 generation prompt using the CoveragePlan from Stage 1.
     
     This prompt is focused on GENERATING tests from the analysis,
     not analyzing the story again.
     
+    With cache_layout, the instruction, output format and example come first
+    as a static prefix that providers can cache across stories.
+    
     Args:
         story_key: Jira story key
         story_title: Story summary
@@ -714,9 +730,10 @@ def build_stage2_prompt(
         confluence_docs: PRD/Confluence documents
         swagger_docs: Swagger/API documentation
         api_specifications: API specs from story enrichment
+        cache_layout: Return PromptParts with static sections first
         
     Returns:
-        Complete Stage 2 generation prompt
+        Complete Stage 2 generation prompt (PromptParts if cache_layout)
     """
     sections = []
     
@@ -774,6 +791,8 @@ Description (abbreviated):
         sections.append(prd_section)
         logger.info("[STAGE2 PROMPT] Added PRD section")
     
+    dynamic_count = len(sections) - 1
+    
     # Section 6: Output format
     sections.append(f"\n--- OUTPUT FORMAT ---\n{COMPACT_OUTPUT_FORMAT}")
     logger.info("[STAGE2 PROMPT] Added output format")
@@ -785,9 +804,35 @@ Description (abbreviated):
     prompt = "\n\n".join(sections)
     logger.info(f"[STAGE2 PROMPT] Total length: {len(prompt)} chars, {len(prompt.split())} words")
     
+    if cache_layout:
+        return _static_first(
+            sections, dynamic_count, "Generate a test for every planned test in the coverage plan above."
+        )
     return prompt
 
 
+def _static_first(sections: List[str], dynamic_count: int, task: str) -> PromptParts:
+    """
+    Reorder prompt sections so the static ones form a cacheable prefix.
+    
+    Args:
+        sections: Sections in legacy order (instruction, dynamic sections, static tail)
+        dynamic_count: Number of dynamic sections after the instruction
+        task: Closing instruction, since the story no longer precedes the format
+        
+    Returns:
+        PromptParts
+    """
+    dynamic = sections[1:1 + dynamic_count]
+    static = [sections[0]] + sections[1 + dynamic_count:]
+    parts = PromptParts(
+        static="\n\n".join(static),
+        dynamic="\n\n".join(dynamic + [f"\n--- YOUR TASK ---\n{task} Follow the output format given earlier."]),
+    )
+    logger.info(f"[PROMPT] Cache layout: {len(parts.static)} static chars, {len(parts.dynamic)} dynamic chars")
+    return parts
+
+
 def _build_coverage_plan_section(coverage_plan: Dict[str, Any]) -> str:
     """Build the coverage plan section from Stage 1 analysis."""
     parts = []
@@ -8,14 +8,17 @@ V3 Updates:
 - Swagger endpoint filtering by story keywords
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, FrozenSet, Optional, Any
 from dataclasses import dataclass
 import asyncio
 
 from loguru import logger
 
+from src.ai.generation.token_budget import get_token_counter
 from src.ai.rag_store import RAGVectorStore
 from src.models.story import JiraStory
+from src.utils.near_duplicates import find_text_duplicates, jaccard, word_set
+from src.utils.reranking import keyword_match_counts, keyword_tokens, mmr_select
 from src.config.settings import settings
 
 
@@ -88,6 +91,8 @@ class RAGRetriever:
         self.dedup_threshold = 0.80  # Lowered from 0.85 - more aggressive dedup
         self.max_doc_chars = 3000  # Max chars per document (for summarization)
         self.max_total_rag_tokens = 4000  # Token budget for all RAG content
+        self.mmr_enabled = settings.rag_mmr_enabled
+        self.mmr_lambda = settings.rag_mmr_lambda
         
         logger.info("[RAG] Initialized RAG retriever v2 with optimized settings")
         logger.info(f"[RAG] Settings: min_similarity={self.min_similarity}, dedup_threshold={self.dedup_threshold}, "
@@ -97,7 +102,8 @@ class RAGRetriever:
         self,
         story: JiraStory,
         project_key: Optional[str] = None,
-        story_context: Optional[Any] = None
+        story_context: Optional[Any] = None,
+        include_embeddings: bool = False
     ) -> RetrievedContext:
         """
         Retrieve relevant context for a story from all RAG collections.
@@ -106,6 +112,7 @@ class RAGRetriever:
             story: Jira story to retrieve context for
             project_key: Optional project key for filtering
             story_context: Optional StoryContext with additional context (subtasks, etc.)
+            include_embeddings: Attach each doc's stored vector as 'embedding'
             
         Returns:
             RetrievedContext with all retrieved information
@@ -130,12 +137,12 @@ class RAGRetriever:
         import asyncio
         
         similar_test_plans, similar_docs, similar_stories, similar_tests, similar_external, similar_swagger = await asyncio.gather(
-            self._retrieve_similar_test_plans(query, metadata_filter),
-            self._retrieve_similar_confluence_docs(query, metadata_filter),
-            self._retrieve_similar_jira_stories(query, metadata_filter),
-            self._retrieve_similar_existing_tests(query, metadata_filter),
-            self._retrieve_similar_external_docs(query, metadata_filter),
-            self._retrieve_similar_swagger_docs(query, metadata_filter),
+            self._retrieve_similar_test_plans(query, metadata_filter, include_embeddings),
+            self._retrieve_similar_confluence_docs(query, metadata_filter, include_embeddings),
+            self._retrieve_similar_jira_stories(query, metadata_filter, include_embeddings),
+            self._retrieve_similar_existing_tests(query, metadata_filter, include_embeddings),
+            self._retrieve_similar_external_docs(query, metadata_filter, include_embeddings),
+            self._retrieve_similar_swagger_docs(query, metadata_filter, include_embeddings),
             return_exceptions=True
         )
         
@@ -245,7 +252,8 @@ class RAGRetriever:
     async def _retrieve_similar_test_plans(
         self,
         query: str,
-        metadata_filter: Dict[str, Any]
+        metadata_filter: Dict[str, Any],
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """Retrieve similar past test plans."""
         try:
@@ -259,7 +267,8 @@ class RAGRetriever:
                 collection_name=self.store.TEST_PLANS_COLLECTION,
                 query_text=query,
                 top_k=self.top_k_tests,
-                metadata_filter=metadata_filter
+                metadata_filter=metadata_filter,
+                include_embeddings=include_embeddings
             )
             logger.info(f"Retrieved {len(results)} similar test plans")
             return results
@@ -270,7 +279,8 @@ class RAGRetriever:
     async def _retrieve_similar_confluence_docs(
         self,
         query: str,
-        metadata_filter: Dict[str, Any]
+        metadata_filter: Dict[str, Any],
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """Retrieve similar Confluence documentation."""
         try:
@@ -284,7 +294,8 @@ class RAGRetriever:
                 collection_name=self.store.CONFLUENCE_DOCS_COLLECTION,
                 query_text=query,
                 top_k=self.top_k_docs,
-                metadata_filter=metadata_filter
+                metadata_filter=metadata_filter,
+                include_embeddings=include_embeddings
             )
             logger.info(f"Retrieved {len(results)} similar Confluence docs")
             return results
@@ -295,7 +306,8 @@ class RAGRetriever:
     async def _retrieve_similar_jira_stories(
         self,
         query: str,
-        metadata_filter: Dict[str, Any]
+        metadata_filter: Dict[str, Any],
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """Retrieve similar Jira stories."""
         try:
@@ -309,7 +321,8 @@ class RAGRetriever:
                 collection_name=self.store.JIRA_ISSUES_COLLECTION,
                 query_text=query,
                 top_k=self.top_k_stories,
-                metadata_filter=metadata_filter
+                metadata_filter=metadata_filter,
+                include_embeddings=include_embeddings
             )
             logger.info(f"Retrieved {len(results)} similar Jira stories")
             return results
@@ -320,7 +333,8 @@ class RAGRetriever:
     async def _retrieve_similar_existing_tests(
         self,
         query: str,
-        metadata_filter: Dict[str, Any]
+        metadata_filter: Dict[str, Any],
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """Retrieve similar existing test cases."""
         try:
@@ -334,7 +348,8 @@ class RAGRetriever:
                 collection_name=self.store.EXISTING_TESTS_COLLECTION,
                 query_text=query,
                 top_k=self.top_k_existing,
-                metadata_filter=metadata_filter
+                metadata_filter=metadata_filter,
+                include_embeddings=include_embeddings
             )
             logger.info(f"Retrieved {len(results)} similar existing tests")
             return results
@@ -345,7 +360,8 @@ class RAGRetriever:
     async def _retrieve_similar_external_docs(
         self,
         query: str,
-        metadata_filter: Dict[str, Any]
+        metadata_filter: Dict[str, Any],
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """Retrieve similar external documentation (external API docs)."""
         try:
@@ -360,7 +376,8 @@ class RAGRetriever:
                 collection_name=self.store.EXTERNAL_DOCS_COLLECTION,
                 query_text=query,
                 top_k=10,  # Get top 10 external docs
-                metadata_filter=None  # No project filter for external docs
+                metadata_filter=None,  # No project filter for external docs
+                include_embeddings=include_embeddings
             )
             logger.info(f"Retrieved {len(results)} external documentation entries")
             return results
@@ -371,7 +388,8 @@ class RAGRetriever:
     async def _retrieve_similar_swagger_docs(
         self,
         query: str,
-        metadata_filter: Dict[str, Any]
+        metadata_filter: Dict[str, Any],
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """Retrieve similar Swagger/OpenAPI documentation from GitLab services."""
         try:
@@ -386,7 +404,8 @@ class RAGRetriever:
                 collection_name=self.store.SWAGGER_DOCS_COLLECTION,
                 query_text=query,
                 top_k=self.top_k_swagger,
-                metadata_filter=metadata_filter
+                metadata_filter=metadata_filter,
+                include_embeddings=include_embeddings
             )
             logger.info(f"Retrieved {len(results)} Swagger documentation entries")
             return results
@@ -406,67 +425,98 @@ class RAGRetriever:
         
         return filtered
     
-    def rerank_by_keywords(self, docs: List[Dict[str, Any]], story_keywords: List[str]) -> List[Dict[str, Any]]:
+    # Relevance multipliers by source type
+    TYPE_PRIORITY = {
+        'jira_issues': 1.15,      # Related stories = most relevant
+        'swagger_docs': 1.12,      # API specs = very relevant
+        'existing_tests': 1.10,    # Similar tests = helpful for style
+        'confluence_docs': 1.05,   # Internal docs = somewhat relevant
+        'external_docs': 1.02,     # External docs = background only
+    }
+    KEYWORD_BOOST = 0.03  # +3% per keyword match
+    
+    def _keyword_scores(
+        self,
+        docs: List[Dict[str, Any]],
+        story_keywords: List[str],
+        doc_tokens: Optional[List[FrozenSet[str]]] = None
+    ) -> List[float]:
+        """Similarity plus keyword boost per doc, matched against precomputed token sets."""
+        if doc_tokens is None:
+            doc_tokens = [keyword_tokens(doc.get('document', '')) for doc in docs]
+        matches = keyword_match_counts(doc_tokens, story_keywords)
+        return [doc.get('similarity', 0) + count * self.KEYWORD_BOOST for doc, count in zip(docs, matches)]
+    
+    def _type_multiplier(self, doc: Dict[str, Any]) -> float:
+        return self.TYPE_PRIORITY.get(doc.get('metadata', {}).get('source_type', 'unknown'), 1.0)
+    
+    def rerank_by_keywords(
+        self,
+        docs: List[Dict[str, Any]],
+        story_keywords: List[str],
+        doc_tokens: Optional[List[FrozenSet[str]]] = None
+    ) -> List[Dict[str, Any]]:
         """Re-rank documents by keyword overlap with story."""
         if not story_keywords:
             return docs
         
-        def keyword_score(doc: Dict[str, Any]) -> float:
-            doc_text = doc.get('document', '').lower()
-            # Count how many story keywords appear in doc
-            matches = sum(1 for kw in story_keywords if kw.lower() in doc_text)
-            # Boost score by keyword density
-            base_similarity = doc.get('similarity', 0)
-            keyword_boost = matches * 0.03  # +3% per keyword match
-            return base_similarity + keyword_boost
-        
-        ranked = sorted(docs, key=keyword_score, reverse=True)
+        scores = self._keyword_scores(docs, story_keywords, doc_tokens)
+        order = sorted(range(len(docs)), key=scores.__getitem__, reverse=True)
         logger.debug(f"Re-ranked {len(docs)} docs by keywords: {story_keywords[:5]}")
-        return ranked
+        return [docs[i] for i in order]
     
     def prioritize_by_type(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Prioritize documents by source type relevance."""
-        # Define priority multipliers
-        type_priority = {
-            'jira_issues': 1.15,      # Related stories = most relevant
-            'swagger_docs': 1.12,      # API specs = very relevant
-            'existing_tests': 1.10,    # Similar tests = helpful for style
-            'confluence_docs': 1.05,   # Internal docs = somewhat relevant
-            'external_docs': 1.02,     # External docs = background only
-        }
-        
-        def priority_score(doc: Dict[str, Any]) -> float:
-            source_type = doc.get('metadata', {}).get('source_type', 'unknown')
-            multiplier = type_priority.get(source_type, 1.0)
-            base_similarity = doc.get('similarity', 0)
-            return base_similarity * multiplier
-        
-        prioritized = sorted(docs, key=priority_score, reverse=True)
+        prioritized = sorted(
+            docs, key=lambda doc: doc.get('similarity', 0) * self._type_multiplier(doc), reverse=True
+        )
         logger.debug(f"Prioritized {len(docs)} docs by type")
         return prioritized
     
+    def select_diverse(
+        self,
+        docs: List[Dict[str, Any]],
+        relevance: List[float],
+        max_docs: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Take the top max_docs, trading relevance against redundancy (MMR).
+        
+        Runs on the embeddings returned with the search results; without them
+        (or with MMR disabled) this is a plain top-N cut of the ranked docs.
+        
+        Args:
+            docs: Ranked documents
+            relevance: Relevance score per document
+            max_docs: Number of documents to keep
+            
+        Returns:
+            Selected documents, most relevant first
+        """
+        if (
+            not self.mmr_enabled
+            or len(docs) <= max_docs
+            or any(doc.get('embedding') is None for doc in docs)
+        ):
+            return docs[:max_docs]
+        
+        indices = mmr_select(relevance, [doc['embedding'] for doc in docs], max_docs, self.mmr_lambda)
+        if indices != list(range(len(indices))):
+            logger.debug(f"[RAG] MMR swapped in {len(set(indices) - set(range(max_docs)))} more diverse docs")
+        return [docs[i] for i in indices]
+    
     def deduplicate_docs(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove near-duplicate documents."""
+        """
+        Remove near-duplicate documents.
+        
+        Keeps the first of any docs whose word overlap exceeds dedup_threshold,
+        using MinHash buckets instead of comparing every pair.
+        """
         if len(docs) <= 1:
             return docs
         
-        unique_docs = []
-        seen_content = []
-        
-        for doc in docs:
-            doc_text = doc.get('document', '')
-            # Check if similar to any already-included doc
-            is_duplicate = False
-            for seen in seen_content:
-                overlap = self._text_similarity(doc_text, seen)
-                if overlap > self.dedup_threshold:
-                    is_duplicate = True
-                    logger.debug(f"Skipping duplicate doc (overlap: {overlap:.2f})")
-                    break
-            
-            if not is_duplicate:
-                unique_docs.append(doc)
-                seen_content.append(doc_text)
+        flags = find_text_duplicates([doc.get('document', '') for doc in docs], self.dedup_threshold)
+        unique_docs = [doc for doc, is_duplicate in zip(docs, flags) if not is_duplicate]
         
         if len(unique_docs) < len(docs):
             logger.info(f"Deduplicated {len(docs)} → {len(unique_docs)} docs")
@@ -475,34 +525,22 @@ class RAGRetriever:
     
     def _text_similarity(self, text1: str, text2: str) -> float:
         """Quick text similarity using set overlap (Jaccard similarity)."""
-        if not text1 or not text2:
-            return 0.0
-        
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        
-        return intersection / union if union > 0 else 0.0
+        return jaccard(word_set(text1), word_set(text2))
     
     def truncate_long_docs(self, docs: List[Dict[str, Any]], max_tokens: int = None) -> List[Dict[str, Any]]:
         """Truncate documents that exceed token budget."""
         if max_tokens is None:
             max_tokens = self.max_tokens_per_doc
         
+        counter = get_token_counter()
         truncated = []
         for doc in docs:
             doc_text = doc.get('document', '')
-            doc_tokens = len(doc_text) // 4  # Rough estimate
+            doc_tokens = counter.count(doc_text)
             
             if doc_tokens > max_tokens:
                 # Truncate to max_tokens
-                max_chars = max_tokens * 4
-                truncated_text = doc_text[:max_chars] + f"\n... [truncated from {doc_tokens} to {max_tokens} tokens]"
+                truncated_text = counter.truncate(doc_text, max_tokens) + f"\n... [truncated from {doc_tokens} to {max_tokens} tokens]"
                 doc = doc.copy()
                 doc['document'] = truncated_text
                 doc['truncated'] = True
@@ -573,7 +611,10 @@ class RAGRetriever:
         logger.info(f"Retrieving OPTIMIZED RAG context for {story.key}")
         
         # Step 1: Retrieve raw context (casts wide net)
-        raw_context = await self.retrieve_for_story(story, project_key, story_context)
+        # (with stored vectors for MMR re-ranking)
+        raw_context = await self.retrieve_for_story(
+            story, project_key, story_context, include_embeddings=self.mmr_enabled
+        )
         
         # Step 2: Extract keywords for re-ranking
         keywords = self.extract_keywords(story, story_context)
@@ -588,60 +629,38 @@ class RAGRetriever:
             ]
         story_summary = story.summary or ""
         
-        # Step 3: Optimize each collection (now with query-focused extraction)
-        optimized_test_plans = self._optimize_docs(
-            raw_context.similar_test_plans,
-            keywords,
-            max_docs_per_type,
-            "test_plans",
-            story_acs=story_acs,
-            story_summary=story_summary
-        )
-        
-        optimized_confluence = self._optimize_docs(
-            raw_context.similar_confluence_docs,
-            keywords,
-            max_docs_per_type,
-            "confluence",
-            story_acs=story_acs,
-            story_summary=story_summary
-        )
-        
-        optimized_stories = self._optimize_docs(
-            raw_context.similar_jira_stories,
-            keywords,
-            max_docs_per_type,
-            "jira_stories",
-            story_acs=story_acs,
-            story_summary=story_summary
-        )
-        
-        optimized_tests = self._optimize_docs(
-            raw_context.similar_existing_tests,
-            keywords,
-            max_docs_per_type,
-            "existing_tests",
-            story_acs=story_acs,
-            story_summary=story_summary
-        )
-        
-        optimized_external = self._optimize_docs(
-            raw_context.similar_external_docs,
-            keywords,
-            max_docs_per_type,
-            "external_docs",
-            story_acs=story_acs,
-            story_summary=story_summary
-        )
-        
-        optimized_swagger = self._optimize_docs(
-            raw_context.similar_swagger_docs,
-            keywords,
-            max_docs_per_type + 2,  # Allow more swagger docs (important for APIs)
-            "swagger",
-            story_acs=story_acs,
-            story_summary=story_summary
-        )
+        # Step 3: Optimize each collection (now with query-focused extraction).
+        # Collections are optimized concurrently; one semaphore bounds the
+        # extraction calls across all of them.
+        semaphore = asyncio.Semaphore(max(1, settings.extraction_max_concurrency))
+        collections = [
+            (raw_context.similar_test_plans, max_docs_per_type, "test_plans"),
+            (raw_context.similar_confluence_docs, max_docs_per_type, "confluence"),
+            (raw_context.similar_jira_stories, max_docs_per_type, "jira_stories"),
+            (raw_context.similar_existing_tests, max_docs_per_type, "existing_tests"),
+            (raw_context.similar_external_docs, max_docs_per_type, "external_docs"),
+            # Allow more swagger docs (important for APIs)
+            (raw_context.similar_swagger_docs, max_docs_per_type + 2, "swagger"),
+        ]
+        (
+            optimized_test_plans,
+            optimized_confluence,
+            optimized_stories,
+            optimized_tests,
+            optimized_external,
+            optimized_swagger,
+        ) = await asyncio.gather(*(
+            self._optimize_docs(
+                docs,
+                keywords,
+                max_docs,
+                collection_name,
+                story_acs=story_acs,
+                story_summary=story_summary,
+                semaphore=semaphore,
+            )
+            for docs, max_docs, collection_name in collections
+        ))
         
         optimized_context = RetrievedContext(
             similar_test_plans=optimized_test_plans,
@@ -655,14 +674,15 @@ class RAGRetriever:
         logger.info(f"✅ Optimized RAG context: {optimized_context.get_summary()}")
         return optimized_context
     
-    def _optimize_docs(
+    async def _optimize_docs(
         self,
         docs: List[Dict[str, Any]],
         keywords: List[str],
         max_docs: int,
         collection_name: str,
         story_acs: Optional[List[str]] = None,
-        story_summary: Optional[str] = None
+        story_summary: Optional[str] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
     ) -> List[Dict[str, Any]]:
         """
         Apply all optimization steps to a document collection.
@@ -672,8 +692,11 @@ class RAGRetriever:
         2. Re-rank by keyword overlap
         3. Prioritize by document type
         4. Deduplicate similar documents
-        5. Apply query-focused extraction (NEW - v3)
-        6. Take top N within token budget
+        5. Take top N (MMR over stored embeddings when available)
+        6. Apply query-focused extraction to the top N (NEW - v3)
+        
+        Extraction keeps document order, so only the docs that will be
+        returned are extracted.
         """
         if not docs:
             logger.debug(f"[RAG] {collection_name}: no docs to optimize")
@@ -688,28 +711,34 @@ class RAGRetriever:
             return []
         logger.debug(f"[RAG] {collection_name}: {len(filtered)}/{len(docs)} passed similarity filter")
         
-        # Step 2: Re-rank by keywords
-        reranked = self.rerank_by_keywords(filtered, keywords)
-        
-        # Step 3: Prioritize by type
-        prioritized = self.prioritize_by_type(reranked)
+        # Step 2-3: Score by keyword overlap (token sets built once per doc)
+        # and source type, then rank
+        doc_tokens = [keyword_tokens(doc.get('document', '')) for doc in filtered]
+        keyword_scores = self._keyword_scores(filtered, keywords, doc_tokens)
+        relevance = {
+            id(doc): score * self._type_multiplier(doc) for doc, score in zip(filtered, keyword_scores)
+        }
+        ranked = sorted(filtered, key=lambda doc: relevance[id(doc)], reverse=True)
         
         # Step 4: Deduplicate
-        unique = self.deduplicate_docs(prioritized)
+        unique = self.deduplicate_docs(ranked)
         logger.debug(f"[RAG] {collection_name}: {len(unique)} unique docs after dedup")
         
-        # Step 5: Apply query-focused extraction (NEW)
-        extracted = self._apply_query_focused_extraction(
-            docs=unique,
+        # Step 5: Take top N, diversified by MMR over the stored vectors
+        selected = self.select_diverse(unique, [relevance[id(doc)] for doc in unique], max_docs)
+        # Vectors are only needed for re-ranking; keep them out of prompts and responses
+        selected = [{k: v for k, v in doc.items() if k != 'embedding'} for doc in selected]
+        
+        # Step 6: Apply query-focused extraction (NEW)
+        top_docs = await self._apply_query_focused_extraction(
+            docs=selected,
             collection_name=collection_name,
             keywords=keywords,
             story_acs=story_acs or [],
-            story_summary=story_summary or ""
+            story_summary=story_summary or "",
+            semaphore=semaphore
         )
         
-        # Step 6: Take top N
-        top_docs = extracted[:max_docs]
-        
         # Log final stats
         total_chars = sum(len(doc.get('document', '')) for doc in top_docs)
         avg_similarity = sum(doc.get('similarity', 0) for doc in top_docs) / len(top_docs) if top_docs else 0
@@ -719,18 +748,30 @@ class RAGRetriever:
         
         return top_docs
     
-    def _apply_query_focused_extraction(
+    async def _apply_query_focused_extraction(
         self,
         docs: List[Dict[str, Any]],
         collection_name: str,
         keywords: List[str],
         story_acs: List[str],
-        story_summary: str
+        story_summary: str,
+        semaphore: Optional[asyncio.Semaphore] = None
     ) -> List[Dict[str, Any]]:
         """
-        Apply query-focused extraction to each document.
+        Apply query-focused extraction to each document concurrently.
         
         Maps collection names to source types for extraction config.
+        
+        Args:
+            docs: Documents to extract from (order is preserved)
+            collection_name: Collection the docs came from
+            keywords: Story keywords
+            story_acs: Story acceptance criteria
+            story_summary: Story summary
+            semaphore: Optional semaphore bounding concurrent extractions
+            
+        Returns:
+            Documents with extracted content
         """
         # Map collection names to source types
         source_type_map = {
@@ -746,34 +787,37 @@ class RAGRetriever:
         }
         
         source_type = source_type_map.get(collection_name, 'confluence')
+        semaphore = semaphore or asyncio.Semaphore(max(1, settings.extraction_max_concurrency))
         
         # Import here to avoid circular imports
         from src.ai.context_extractor import extract_relevant_from_any_source, extract_swagger_endpoints
+        from src.ai.indexing.endpoint_index import get_endpoint_index
         
-        extracted_docs = []
-        
-        for doc in docs:
+        async def extract_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
             doc_text = doc.get('document', '')
             
             if not doc_text or len(doc_text) < 50:
-                extracted_docs.append(doc)
-                continue
+                return doc
             
             try:
                 # Special handling for Swagger docs
                 if source_type == 'swagger':
-                    extracted_text = extract_swagger_endpoints(doc_text, keywords)
+                    metadata = doc.get('metadata') or {}
+                    if metadata.get('doc_type') == 'endpoint':
+                        return doc  # Already a single endpoint
+                    records = get_endpoint_index().records_for_file(
+                        metadata.get('service_name'), metadata.get('file_path')
+                    )
+                    extracted_text = extract_swagger_endpoints(doc_text, keywords, records)
                 else:
-                    # Use async extraction in sync context
-                    extracted_text = asyncio.get_event_loop().run_until_complete(
-                        extract_relevant_from_any_source(
+                    async with semaphore:
+                        extracted_text = await extract_relevant_from_any_source(
                             content=doc_text,
                             source_type=source_type,
                             story_keywords=keywords,
                             acceptance_criteria=story_acs,
                             story_summary=story_summary
                         )
-                    )
                 
                 # Update doc with extracted content
                 doc = doc.copy()
@@ -787,9 +831,9 @@ class RAGRetriever:
                 doc = doc.copy()
                 doc['document'] = self._truncate_text(doc_text, 2000)
             
-            extracted_docs.append(doc)
+            return doc
         
-        return extracted_docs
+        return list(await asyncio.gather(*(extract_doc(doc) for doc in docs)))
     
     def _truncate_text(self, text: str, max_chars: int) -> str:
         """Simple truncation with sentence boundary detection."""
@@ -275,7 +275,8 @@ class RAGVectorStore:
         query_text: str,
         top_k: int = 10,
         metadata_filter: Optional[Dict[str, Any]] = None,
-        min_similarity_override: Optional[float] = None
+        min_similarity_override: Optional[float] = None,
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Retrieve similar documents using semantic search.
@@ -285,6 +286,8 @@ class RAGVectorStore:
             query_text: Query text for similarity search
             top_k: Number of results to return
             metadata_filter: Optional metadata filters (e.g., {"project_key": "PLAT"})
+            include_embeddings: Also return each document's stored vector under
+                'embedding' (for re-ranking without re-embedding)
             
         Returns:
             List of retrieved documents with metadata and similarity scores
@@ -303,11 +306,16 @@ class RAGVectorStore:
         
         # Query ChromaDB
         try:
+            include = ["documents", "metadatas", "distances"]
+            if include_embeddings:
+                include.append("embeddings")
             results = collection.query(
                 query_embeddings=[query_embedding],
                 n_results=top_k,
-                where=metadata_filter
+                where=metadata_filter,
+                include=include
             )
+            embeddings = results.get('embeddings') if include_embeddings else None
             
             # Format results with similarity filtering and logging
             documents = []
@@ -323,13 +331,16 @@ class RAGVectorStore:
                     
                     # Filter by minimum similarity threshold
                     if similarity >= min_similarity:
-                        documents.append({
+                        result = {
                             'id': results['ids'][0][i],
                             'document': doc,
                             'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
                             'distance': distance,
                             'similarity': similarity
-                        })
+                        }
+                        if embeddings is not None:
+                            result['embedding'] = embeddings[0][i]
+                        documents.append(result)
                     else:
                         filtered_count += 1
                         logger.debug(
@@ -584,6 +595,30 @@ class RAGVectorStore:
         
         return stats
     
+    def delete_documents(self, collection_name: str, ids: List[str]) -> int:
+        """
+        Delete documents from a collection by ID.
+        
+        Args:
+            collection_name: Name of the collection
+            ids: Document IDs (missing IDs are ignored)
+            
+        Returns:
+            Number of documents deleted
+        """
+        if not ids:
+            return 0
+        try:
+            collection = self.get_or_create_collection(collection_name)
+            existing = collection.get(ids=ids, include=[])['ids']
+            if existing:
+                collection.delete(ids=existing)
+                logger.info(f"Deleted {len(existing)} documents from {collection_name}")
+            return len(existing)
+        except Exception as e:
+            logger.warning(f"Failed to delete documents from {collection_name}: {e}")
+            return 0
+    
     def clear_collection(self, collection_name: str) -> None:
         """
         Clear all documents from a collection.
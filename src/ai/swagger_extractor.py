@@ -9,6 +9,7 @@ import yaml
 from typing import List, Optional, Set
 from loguru import logger
 
+from src.ai.indexing.endpoint_index import get_endpoint_index
 from src.ai.rag_store import RAGVectorStore
 from src.models.enriched_story import APISpec
 from src.config.settings import settings
@@ -21,11 +22,16 @@ class SwaggerExtractor:
     Uses two strategies:
     1. Semantic search: Query swagger_docs RAG for story-related endpoints
     2. Explicit extraction: Regex scan for endpoint mentions in story text
+    
+    Endpoint details come from the endpoint index built at indexing time;
+    regex parsing of the flattened Swagger text is only the fallback for
+    specs indexed before the endpoint index existed.
     """
     
     def __init__(self):
         """Initialize Swagger extractor with RAG store."""
         self.rag_store = RAGVectorStore()
+        self.endpoint_index = get_endpoint_index()
         self.max_apis = settings.enrichment_max_apis
     
     async def extract_endpoints(
@@ -236,8 +242,8 @@ class SwaggerExtractor:
                 metadata = match.get('metadata', {})
                 similarity = match.get('similarity', 0.0)
                 
-                # Parse swagger content from document
-                api_spec = self._parse_swagger_doc(doc_text, metadata)
+                # Endpoint details from the index (regex parsing for unindexed specs)
+                api_spec = self._spec_from_index(metadata) or self._parse_swagger_doc(doc_text, metadata)
                 
                 if api_spec and api_spec.endpoint_path not in seen_paths:
                     # Check if endpoint is explicitly mentioned in story
@@ -283,6 +289,11 @@ class SwaggerExtractor:
             if path not in seen_paths:
                 # Get methods from text or default to common ones
                 methods = path_to_methods.get(path, ["GET"])
+                indexed_spec = self._spec_from_path(path, methods)
+                if indexed_spec:
+                    specs.append(indexed_spec)
+                    seen_paths.add(path)
+                    continue
                 specs.append(APISpec(
                     endpoint_path=path,
                     http_methods=methods,
@@ -292,6 +303,53 @@ class SwaggerExtractor:
         
         return specs
     
+    def _spec_from_index(self, metadata: dict) -> Optional[APISpec]:
+        """
+        APISpec for a semantic match from the endpoint index.
+        
+        Endpoint vectors carry their method and path; whole-spec documents
+        map to the spec's first operation (what the regex parser picked).
+        
+        Args:
+            metadata: Match metadata
+            
+        Returns:
+            APISpec, or None if the index has no record for the match
+        """
+        service_name = metadata.get('service_name')
+        file_path = metadata.get('file_path')
+        if metadata.get('doc_type') == 'endpoint':
+            record = self.endpoint_index.get(service_name, file_path, metadata.get('method', ''), metadata.get('path', ''))
+            return record.to_api_spec() if record else None
+        records = self.endpoint_index.records_for_file(service_name, file_path)
+        if not records:
+            return None
+        first = records[0]
+        spec = first.to_api_spec()
+        spec.http_methods = sorted({r.method for r in records if r.path == first.path})
+        return spec
+    
+    def _spec_from_path(self, path: str, methods: List[str]) -> Optional[APISpec]:
+        """
+        APISpec for an explicitly mentioned path, if it matches an indexed endpoint.
+        
+        Args:
+            path: Path from story text (concrete IDs and base paths allowed)
+            methods: HTTP methods mentioned with the path
+            
+        Returns:
+            APISpec with the story's path and methods and the spec's details,
+            or None if nothing in the index matches
+        """
+        records = self.endpoint_index.match_path(path)
+        if not records:
+            return None
+        record = next((r for r in records if r.method in methods), records[0])
+        spec = record.to_api_spec()
+        spec.endpoint_path = path
+        spec.http_methods = methods
+        return spec
+    
     def _parse_swagger_doc(self, doc_text: str, metadata: dict) -> Optional[APISpec]:
         """
         Parse swagger document text and extract APISpec.
@@ -3,19 +3,29 @@ AI test plan generator - refactored for SOLID principles.
 Orchestrates AI test generation using specialized services.
 """
 
-from typing import Optional
+import asyncio
+from typing import Awaitable, Callable, Optional
 from loguru import logger
 
 from src.aggregator.story_collector import StoryContext
 from src.config.settings import settings
 from src.models.test_plan import TestPlan
+from src.models.test_case import TestCase
 from src.models.enriched_story import EnrichedStory
 from src.ai.generation.ai_client_factory import AIClientFactory
 from src.ai.generation.prompt_builder import PromptBuilder
 from src.ai.generation.response_parser import ResponseParser
+from src.ai.generation.llm_streaming import (
+    complete_anthropic_text,
+    emit_streamed_test_cases,
+    stream_anthropic_text,
+    stream_openai_text,
+)
+from src.ai.generation.prompt_cache import TokenUsage
 from src.ai.prompts_optimized import SYSTEM_INSTRUCTION
-from src.ai.enrichment_cache import EnrichmentCache
+from src.ai.enrichment_cache import create_enrichment_cache
 from src.ai.story_enricher import StoryEnricher
+from src.utils.stage_timer import StageTimer
 
 
 class TestPlanGenerator:
@@ -57,6 +67,7 @@ class TestPlanGenerator:
         # AI parameters
         self.temperature = settings.temperature
         self.max_tokens = settings.max_tokens
+        self.token_usage = TokenUsage()
         
         # Services (dependency injection)
         # Use compact mode for reduced token usage (~4K words instead of ~12K)
@@ -69,7 +80,7 @@ class TestPlanGenerator:
         self.response_parser = response_parser or ResponseParser()
         
         # Story enrichment services
-        self.enrichment_cache = EnrichmentCache()
+        self.enrichment_cache = create_enrichment_cache()
         self.story_enricher = StoryEnricher()
         
         # API context builder (for fallback: story → swagger → MCP)
@@ -83,7 +94,8 @@ class TestPlanGenerator:
         context: StoryContext,
         existing_tests: list = None,
         folder_structure: list = None,
-        use_rag: bool = None
+        use_rag: bool = None,
+        on_test_case: Optional[Callable[[TestCase], Awaitable[None]]] = None
     ) -> TestPlan:
         """
         Generate a comprehensive test plan from story context.
@@ -93,6 +105,8 @@ class TestPlanGenerator:
             existing_tests: List of existing test cases from Zephyr
             folder_structure: Zephyr folder structure
             use_rag: Whether to use RAG for context retrieval
+            on_test_case: Optional async callback for streaming mode; receives each
+                TestCase as soon as it is parsed from the completion stream
             
         Returns:
             TestPlan object with generated test cases
@@ -107,42 +121,56 @@ class TestPlanGenerator:
         if use_rag is None:
             use_rag = settings.enable_rag
         
-        # Step 0: Enrich story (preprocess and compress) if enabled
-        enriched_story = await self._enrich_story(main_story, context) if settings.enable_story_enrichment else None
+        timer = StageTimer(main_story.key)
+        self.token_usage = TokenUsage()
+        
+        # Steps 0-1: Enrichment and RAG retrieval both depend only on the collected
+        # StoryContext, so run them concurrently instead of back to back
+        async def enrich() -> Optional[EnrichedStory]:
+            if not settings.enable_story_enrichment:
+                return None
+            with timer.span("enrichment"):
+                return await self._enrich_story(main_story, context)
+        
+        async def retrieve():
+            if not use_rag:
+                return None
+            with timer.span("rag_retrieval"):
+                return await self._retrieve_rag_context_raw(main_story, context)
+        
+        enriched_story, retrieved_context = await asyncio.gather(enrich(), retrieve())
         
-        # Step 1: Retrieve RAG context FIRST (so we can pass swagger_docs to API context builder)
         rag_context_str = None
-        retrieved_context = None
-        if use_rag:
-            retrieved_context = await self._retrieve_rag_context_raw(main_story, context)
-            if retrieved_context and retrieved_context.has_context():
-                rag_context_str = self.prompt_builder.build_rag_context(retrieved_context)
-                logger.info(f"✅ RAG context retrieved: {retrieved_context.get_summary()}")
+        if retrieved_context and retrieved_context.has_context():
+            rag_context_str = self.prompt_builder.build_rag_context(retrieved_context)
+            logger.info(f"✅ RAG context retrieved: {retrieved_context.get_summary()}")
         
         # Step 1.5: Build API context using fallback flow (story → swagger_rag → MCP)
-        # NOW we can pass swagger_rag_docs from retrieved_context (no duplicate query!)
+        # Joins both branches: needs enrichment and the swagger docs from RAG (no duplicate query)
         api_context = None
         if enriched_story:
-            combined_text = self.story_enricher._build_combined_text(main_story, [])
-            swagger_rag_docs = retrieved_context.similar_swagger_docs if retrieved_context else None
-            api_context = await self.api_context_builder.build_api_context(
-                main_story=main_story,
-                story_context=context,
-                combined_text=combined_text,
-                swagger_rag_docs=swagger_rag_docs  # Pass swagger docs from RAG (no duplicate query)
-            )
+            with timer.span("api_context"):
+                combined_text = self.story_enricher._build_combined_text(main_story, [])
+                swagger_rag_docs = retrieved_context.similar_swagger_docs if retrieved_context else None
+                api_context = await self.api_context_builder.build_api_context(
+                    main_story=main_story,
+                    story_context=context,
+                    combined_text=combined_text,
+                    swagger_rag_docs=swagger_rag_docs  # Pass swagger docs from RAG (no duplicate query)
+                )
             logger.info(f"API context built: {len(api_context.api_specifications)} endpoints, flow={api_context.extraction_flow}")
         
         # Step 2: Build prompt (with enriched story + API context + RAG context)
-        prompt = self.prompt_builder.build_generation_prompt(
-            context=context,
-            rag_context=rag_context_str,
-            existing_tests=existing_tests,
-            folder_structure=folder_structure,
-            enriched_story=enriched_story,
-            api_context=api_context,
-            retrieved_context=retrieved_context,  # Pass raw context for compact prompt
-        )
+        with timer.span("prompt_build"):
+            prompt = self.prompt_builder.build_generation_prompt(
+                context=context,
+                rag_context=rag_context_str,
+                existing_tests=existing_tests,
+                folder_structure=folder_structure,
+                enriched_story=enriched_story,
+                api_context=api_context,
+                retrieved_context=retrieved_context,  # Pass raw context for compact prompt
+            )
         
         # DEBUG: Save prompt to file for inspection
         try:
@@ -155,7 +183,8 @@ class TestPlanGenerator:
             logger.debug(f"Failed to save prompt to file: {e}")
         
         # Step 3: Call AI API
-        response_text = await self._call_ai_api(prompt)
+        with timer.span("llm_generation"):
+            response_text = await self._call_ai_api(prompt, on_test_case=on_test_case)
         
         # Step 4: Parse response (extracts reasoning and data)
         test_plan_data, reasoning = self.response_parser.parse_ai_response(response_text)
@@ -178,11 +207,18 @@ class TestPlanGenerator:
         )
         
         # Step 6: Validate test cases (pass enriched_story for API spec validation)
-        self.response_parser.validate_test_cases(test_plan, enriched_story=enriched_story)
+        with timer.span("validation"):
+            self.response_parser.validate_test_cases(test_plan, enriched_story=enriched_story)
         
         # Step 7: Auto-index test plan for future RAG retrieval if enabled
         if use_rag and settings.rag_auto_index:
-            await self._auto_index_test_plan(test_plan, context)
+            with timer.span("auto_index"):
+                await self._auto_index_test_plan(test_plan, context)
+        
+        timer.log_summary()
+        test_plan.metadata.stage_timings = timer.as_dict()
+        self.token_usage.log_summary(main_story.key)
+        test_plan.metadata.token_usage = self.token_usage.as_dict()
         
         return test_plan
 
@@ -305,15 +341,25 @@ class TestPlanGenerator:
             logger.info("No RAG context found (database may be empty)")
             return None
 
-    async def _call_ai_api(self, prompt: str) -> str:
+    async def _call_ai_api(
+        self,
+        prompt: str,
+        on_test_case: Optional[Callable[[TestCase], Awaitable[None]]] = None
+    ) -> str:
         """
         Call AI API with the prompt using structured output.
         
         OpenAI: Uses response_format with JSON schema for reliable parsing (for supported models)
         Claude: Uses XML tags as fallback (no native structured output support)
         
+        Both providers go through their async clients, so a generation never blocks
+        the event loop. Retries and timeouts are configured identically on both
+        clients by AIClientFactory (settings.ai_max_retries / ai_request_timeout).
+        
         Args:
             prompt: Complete prompt
+            on_test_case: Optional async callback; when set, the completion is streamed
+                and each TestCase is passed here as soon as it is well-formed
             
         Returns:
             AI response text (JSON string for OpenAI, text with JSON for Claude)
@@ -328,41 +374,94 @@ class TestPlanGenerator:
                 # Never block the API call on logging issues
                 pass
             if self.use_openai:
-                # Check if model supports json_schema (gpt-4o-2024-08-06+, gpt-4o-mini-2024-07-18+)
-                supports_json_schema = (
-                    "gpt-4o" in self.model.lower() and 
-                    ("2024-08-06" in self.model or "2024-11" in self.model or "mini" in self.model.lower())
-                ) or "o1" in self.model.lower()
+                kwargs = self._build_openai_request(prompt)
+                if on_test_case:
+                    logger.info(f"Streaming OpenAI API: {self.model}")
+                    return await emit_streamed_test_cases(
+                        stream_openai_text(
+                            self.client,
+                            on_usage=lambda usage: self.token_usage.record_openai(usage, "generation"),
+                            **kwargs
+                        ),
+                        self.response_parser,
+                        on_test_case,
+                    )
+                
+                response = await self.client.chat.completions.create(**kwargs)
+                self.token_usage.record_openai(getattr(response, "usage", None), "generation")
+                response_text = response.choices[0].message.content
+                logger.info(f"OpenAI response: {len(response_text)} chars")
+                return response_text
                 
-                if supports_json_schema:
-                    logger.info(f"Calling OpenAI API with structured output: {self.model}")
-                    
-                    # Get JSON schema from prompt builder
-                    json_schema = self.prompt_builder.get_json_schema()
-                    
-                    # Use structured output for reliable JSON parsing
-                    response = await self.client.chat.completions.create(
-                        model=self.model,
-                        max_tokens=self.max_tokens,
-                        temperature=self.temperature,
-                        response_format={
-                            "type": "json_schema",
-                            "json_schema": json_schema
-                        },
-                        messages=[
-                            {"role": "system", "content": SYSTEM_INSTRUCTION},
-                            {"role": "user", "content": prompt}
-                        ],
+            else:
+                # Claude doesn't support response_format, use XML tags
+                kwargs = self._build_anthropic_request(prompt)
+                if on_test_case:
+                    logger.info(f"Streaming Claude API with XML-tagged output: {self.model}")
+                    return await emit_streamed_test_cases(
+                        stream_anthropic_text(
+                            self.client,
+                            on_usage=lambda usage: self.token_usage.record_anthropic(usage, "generation"),
+                            **kwargs
+                        ),
+                        self.response_parser,
+                        on_test_case,
                     )
-                    
-                    response_text = response.choices[0].message.content
-                    logger.info(f"OpenAI response: {len(response_text)} chars (structured JSON)")
-                    return response_text
-                else:
-                    # Older OpenAI models (gpt-4-turbo, gpt-4, etc.) - use JSON mode
-                    logger.info(f"Calling OpenAI API with JSON mode (legacy): {self.model}")
-                    
-                    json_prompt = prompt + "\n\n" + """
+                
+                logger.info(f"Calling Claude API with XML-tagged output: {self.model}")
+                response_text = await complete_anthropic_text(
+                    self.client,
+                    on_usage=lambda usage: self.token_usage.record_anthropic(usage, "generation"),
+                    **kwargs
+                )
+                logger.info(f"Claude response: {len(response_text)} chars")
+                return response_text
+                
+        except Exception as e:
+            logger.error(f"AI API call failed: {e}")
+            raise
+
+    def _build_openai_request(self, prompt: str) -> dict:
+        """
+        Build chat.completions.create arguments for OpenAI.
+        
+        Args:
+            prompt: Complete prompt
+            
+        Returns:
+            Keyword arguments for the request
+        """
+        # Check if model supports json_schema (gpt-4o-2024-08-06+, gpt-4o-mini-2024-07-18+)
+        supports_json_schema = (
+            "gpt-4o" in self.model.lower() and 
+            ("2024-08-06" in self.model or "2024-11" in self.model or "mini" in self.model.lower())
+        ) or "o1" in self.model.lower()
+        
+        if supports_json_schema:
+            logger.info(f"Calling OpenAI API with structured output: {self.model}")
+            
+            # Get JSON schema from prompt builder
+            json_schema = self.prompt_builder.get_json_schema()
+            
+            # Use structured output for reliable JSON parsing
+            return {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                "response_format": {
+                    "type": "json_schema",
+                    "json_schema": json_schema
+                },
+                "messages": [
+                    {"role": "system", "content": SYSTEM_INSTRUCTION},
+                    {"role": "user", "content": prompt}
+                ],
+            }
+        
+        # Older OpenAI models (gpt-4-turbo, gpt-4, etc.) - use JSON mode
+        logger.info(f"Calling OpenAI API with JSON mode (legacy): {self.model}")
+        
+        json_prompt = prompt + "\n\n" + """
 Return your response as valid JSON matching this exact structure:
 {
   "reasoning": "your analysis here",
@@ -389,28 +488,30 @@ Return your response as valid JSON matching this exact structure:
   "suggested_folder": "folder/path"
 }
 """
-                    
-                    response = await self.client.chat.completions.create(
-                        model=self.model,
-                        max_tokens=self.max_tokens,
-                        temperature=self.temperature,
-                        response_format={"type": "json_object"},
-                        messages=[
-                            {"role": "system", "content": SYSTEM_INSTRUCTION + "\n\nYou must respond with valid JSON only."},
-                            {"role": "user", "content": json_prompt}
-                        ],
-                    )
-                    
-                    response_text = response.choices[0].message.content
-                    logger.info(f"OpenAI response: {len(response_text)} chars (JSON mode)")
-                    return response_text
-                
-            else:
-                # Claude doesn't support response_format, use XML tags
-                logger.info(f"Calling Claude API with XML-tagged output: {self.model}")
-                
-                # Add XML output instructions for Claude
-                claude_prompt = prompt + "\n\n" + """
+        
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": SYSTEM_INSTRUCTION + "\n\nYou must respond with valid JSON only."},
+                {"role": "user", "content": json_prompt}
+            ],
+        }
+
+    def _build_anthropic_request(self, prompt: str) -> dict:
+        """
+        Build messages.create arguments for Claude.
+        
+        Args:
+            prompt: Complete prompt
+            
+        Returns:
+            Keyword arguments for the request
+        """
+        # Add XML output instructions for Claude
+        claude_prompt = prompt + "\n\n" + """
 <output_instructions>
 Return your response as valid JSON wrapped in <json> tags:
 <json>
@@ -424,22 +525,17 @@ Return your response as valid JSON wrapped in <json> tags:
 </json>
 </output_instructions>
 """
-                
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    system=SYSTEM_INSTRUCTION,
-                    messages=[{"role": "user", "content": claude_prompt}],
-                )
-                
-                response_text = response.content[0].text
-                logger.info(f"Claude response: {len(response_text)} chars")
-                return response_text
-                
-        except Exception as e:
-            logger.error(f"AI API call failed: {e}")
-            raise
+        
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            # The system instruction is identical for every story: cache it
+            "system": [
+                {"type": "text", "text": SYSTEM_INSTRUCTION, "cache_control": {"type": "ephemeral"}}
+            ],
+            "messages": [{"role": "user", "content": claude_prompt}],
+        }
 
     async def _auto_index_test_plan(self, test_plan: TestPlan, context: StoryContext) -> None:
         """
@@ -12,21 +12,31 @@ This approach ensures:
 - Tests are generated according to the plan
 """
 
+import asyncio
 import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Awaitable, Callable, Union
 from loguru import logger
 
 from src.aggregator.story_collector import StoryContext
 from src.config.settings import settings
 from src.models.test_plan import TestPlan
+from src.models.test_case import TestCase
 from src.models.enriched_story import EnrichedStory
 from src.models.coverage_plan import CoveragePlan, PatternMatch, PRDRequirement, APICoverage, ExistingTestOverlap, PlannedTest
 from src.ai.generation.ai_client_factory import AIClientFactory
 from src.ai.generation.response_parser import ResponseParser
+from src.ai.generation.llm_streaming import (
+    complete_anthropic_text,
+    emit_streamed_test_cases,
+    stream_anthropic_text,
+    stream_openai_text,
+)
+from src.ai.generation.prompt_cache import PromptParts, TokenUsage, anthropic_content, prompt_text
 from src.ai.prompts_analysis import build_analysis_prompt, ANALYSIS_JSON_SCHEMA
 from src.ai.prompts_compact import build_stage2_prompt, COMPACT_JSON_SCHEMA
-from src.ai.enrichment_cache import EnrichmentCache
+from src.ai.enrichment_cache import create_enrichment_cache
 from src.ai.story_enricher import StoryEnricher
+from src.utils.stage_timer import StageTimer
 
 
 class TwoStageGenerator:
@@ -56,10 +66,12 @@ class TwoStageGenerator:
         # AI parameters
         self.temperature = settings.temperature
         self.max_tokens = settings.max_tokens
+        self.cache_layout = settings.prompt_cache_layout
+        self.token_usage = TokenUsage()
         
         # Services
         self.response_parser = ResponseParser()
-        self.enrichment_cache = EnrichmentCache()
+        self.enrichment_cache = create_enrichment_cache()
         self.story_enricher = StoryEnricher()
         
         # API context builder
@@ -73,7 +85,9 @@ class TwoStageGenerator:
         context: StoryContext,
         existing_tests: list = None,
         folder_structure: list = None,
-        use_rag: bool = None
+        use_rag: bool = None,
+        on_test_case: Optional[Callable[[TestCase], Awaitable[None]]] = None,
+        on_stage: Optional[Callable[[str, str], None]] = None
     ) -> TestPlan:
         """
         Generate test plan using two-stage approach.
@@ -83,6 +97,10 @@ class TwoStageGenerator:
             existing_tests: List of existing test cases from Zephyr
             folder_structure: Zephyr folder structure
             use_rag: Whether to use RAG for context retrieval
+            on_test_case: Optional async callback; when set, Stage 2 streams the
+                completion and each TestCase is passed here as soon as it is parsed
+            on_stage: Optional progress callback receiving (stage, event) for each
+                pipeline stage as it starts and finishes
             
         Returns:
             TestPlan object with generated test cases
@@ -94,25 +112,36 @@ class TwoStageGenerator:
         if use_rag is None:
             use_rag = settings.enable_rag
         
-        # Step 0: Enrich story
-        enriched_story = await self._enrich_story(main_story, context) if settings.enable_story_enrichment else None
+        timer = StageTimer(main_story.key, listener=on_stage)
+        self.token_usage = TokenUsage()
         
-        # Step 1: Retrieve RAG context
-        retrieved_context = None
-        if use_rag:
-            retrieved_context = await self._retrieve_rag_context(main_story, context)
+        # Steps 0-1: Enrichment and RAG retrieval are independent - run them concurrently
+        async def enrich() -> Optional[EnrichedStory]:
+            if not settings.enable_story_enrichment:
+                return None
+            with timer.span("enrichment"):
+                return await self._enrich_story(main_story, context)
         
-        # Step 2: Build API context
+        async def retrieve():
+            if not use_rag:
+                return None
+            with timer.span("rag_retrieval"):
+                return await self._retrieve_rag_context(main_story, context)
+        
+        enriched_story, retrieved_context = await asyncio.gather(enrich(), retrieve())
+        
+        # Step 2: Build API context (joins enrichment + swagger docs from RAG)
         api_context = None
         if enriched_story:
-            combined_text = self.story_enricher._build_combined_text(main_story, [])
-            swagger_rag_docs = retrieved_context.similar_swagger_docs if retrieved_context else None
-            api_context = await self.api_context_builder.build_api_context(
-                main_story=main_story,
-                story_context=context,
-                combined_text=combined_text,
-                swagger_rag_docs=swagger_rag_docs
-            )
+            with timer.span("api_context"):
+                combined_text = self.story_enricher._build_combined_text(main_story, [])
+                swagger_rag_docs = retrieved_context.similar_swagger_docs if retrieved_context else None
+                api_context = await self.api_context_builder.build_api_context(
+                    main_story=main_story,
+                    story_context=context,
+                    combined_text=combined_text,
+                    swagger_rag_docs=swagger_rag_docs
+                )
             logger.info(f"[TWO-STAGE] API context: {len(api_context.api_specifications)} endpoints")
         
         # Extract data for prompts
@@ -148,16 +177,17 @@ class TwoStageGenerator:
         # ========================================
         logger.info("[TWO-STAGE] === STAGE 1: ANALYSIS ===")
         
-        coverage_plan = await self._run_stage1_analysis(
-            story_key=main_story.key,
-            story_title=main_story.summary,
-            story_description=main_story.description or "",
-            acceptance_criteria=acceptance_criteria,
-            confluence_docs=confluence_docs,
-            swagger_docs=swagger_docs,
-            existing_tests=existing_tests_data,
-            api_specifications=api_specifications
-        )
+        with timer.span("stage1_analysis"):
+            coverage_plan = await self._run_stage1_analysis(
+                story_key=main_story.key,
+                story_title=main_story.summary,
+                story_description=main_story.description or "",
+                acceptance_criteria=acceptance_criteria,
+                confluence_docs=confluence_docs,
+                swagger_docs=swagger_docs,
+                existing_tests=existing_tests_data,
+                api_specifications=api_specifications
+            )
         
         logger.info(f"[TWO-STAGE] Analysis complete: {coverage_plan.get_summary()}")
         
@@ -169,18 +199,20 @@ class TwoStageGenerator:
         # ========================================
         logger.info("[TWO-STAGE] === STAGE 2: GENERATION ===")
         
-        test_plan = await self._run_stage2_generation(
-            story_key=main_story.key,
-            story_title=main_story.summary,
-            story_description=main_story.description or "",
-            acceptance_criteria=acceptance_criteria,
-            coverage_plan=coverage_plan,
-            confluence_docs=confluence_docs,
-            swagger_docs=swagger_docs,
-            api_specifications=api_specifications,
-            folder_structure=folder_structure,
-            enriched_story=enriched_story
-        )
+        with timer.span("stage2_generation"):
+            test_plan = await self._run_stage2_generation(
+                story_key=main_story.key,
+                story_title=main_story.summary,
+                story_description=main_story.description or "",
+                acceptance_criteria=acceptance_criteria,
+                coverage_plan=coverage_plan,
+                confluence_docs=confluence_docs,
+                swagger_docs=swagger_docs,
+                api_specifications=api_specifications,
+                folder_structure=folder_structure,
+                enriched_story=enriched_story,
+                on_test_case=on_test_case
+            )
         
         logger.info(f"[TWO-STAGE] Generation complete: {len(test_plan.test_cases)} tests")
         
@@ -189,8 +221,17 @@ class TwoStageGenerator:
         # ========================================
         logger.info("[TWO-STAGE] === VALIDATION ===")
         
+        # CPU-bound validators run in worker threads so they overlap with the
+        # gap-filling LLM calls instead of blocking the event loop. The quality
+        # check gets a snapshot of the Stage 2 tests, since gap tests are
+        # appended while it runs.
+        stage2_snapshot = test_plan.model_copy(update={"test_cases": list(test_plan.test_cases)})
+        quality_check = asyncio.create_task(asyncio.to_thread(
+            self.response_parser.validate_test_cases, stage2_snapshot, enriched_story
+        ))
+        
         from src.ai.coverage_validator import validate_test_coverage
-        validation_result = validate_test_coverage(coverage_plan, test_plan)
+        validation_result = await asyncio.to_thread(validate_test_coverage, coverage_plan, test_plan)
         
         if not validation_result.is_valid:
             logger.warning(f"[TWO-STAGE] Coverage gaps detected: {len(validation_result.gaps)} gaps")
@@ -200,26 +241,40 @@ class TwoStageGenerator:
             if len(validation_result.gaps) > 0:
                 logger.info("[TWO-STAGE] Attempting to fill coverage gaps...")
                 
-                additional_tests = await self._reprompt_for_gaps(
-                    story_key=main_story.key,
-                    story_title=main_story.summary,
-                    story_description=main_story.description or "",
-                    acceptance_criteria=acceptance_criteria,
-                    coverage_plan=coverage_plan,
-                    validation_result=validation_result,
-                    confluence_docs=confluence_docs,
-                    swagger_docs=swagger_docs,
-                    api_specifications=api_specifications
-                )
+                with timer.span("gap_filling"):
+                    additional_tests = await self._reprompt_for_gaps(
+                        story_key=main_story.key,
+                        story_title=main_story.summary,
+                        story_description=main_story.description or "",
+                        acceptance_criteria=acceptance_criteria,
+                        coverage_plan=coverage_plan,
+                        validation_result=validation_result,
+                        confluence_docs=confluence_docs,
+                        swagger_docs=swagger_docs,
+                        api_specifications=api_specifications,
+                        existing_tests=test_plan.test_cases
+                    )
                 
                 if additional_tests:
                     # Merge additional tests into test plan
                     for test in additional_tests:
                         test_plan.test_cases.append(test)
+                        if on_test_case:
+                            await on_test_case(test)
                     logger.info(f"[TWO-STAGE] Added {len(additional_tests)} tests to fill gaps")
         else:
             logger.info("[TWO-STAGE] All patterns and requirements covered!")
         
+        try:
+            await quality_check
+        except Exception as e:
+            logger.warning(f"[TWO-STAGE] Test case quality check failed: {e}")
+        
+        timer.log_summary()
+        test_plan.metadata.stage_timings = timer.as_dict()
+        self.token_usage.log_summary(main_story.key)
+        test_plan.metadata.token_usage = self.token_usage.as_dict()
+        
         return test_plan
     
     async def _run_stage1_analysis(
@@ -247,14 +302,15 @@ class TwoStageGenerator:
             confluence_docs=confluence_docs,
             swagger_docs=swagger_docs,
             existing_tests=existing_tests,
-            api_specifications=api_specifications
+            api_specifications=api_specifications,
+            cache_layout=self.cache_layout
         )
         
         # Save prompt for debugging
-        self._save_debug_file(story_key, "stage1_prompt", prompt)
+        self._save_debug_file(story_key, "stage1_prompt", prompt_text(prompt))
         
         # Call AI
-        response_text = await self._call_ai_api(prompt, use_json_schema=False)
+        response_text = await self._call_ai_api(prompt, use_json_schema=False, stage="stage1_analysis")
         
         # Parse response
         try:
@@ -307,12 +363,14 @@ class TwoStageGenerator:
         swagger_docs: List[Dict],
         api_specifications: List[Dict],
         folder_structure: list,
-        enriched_story: Optional[EnrichedStory]
+        enriched_story: Optional[EnrichedStory],
+        on_test_case: Optional[Callable[[TestCase], Awaitable[None]]] = None
     ) -> TestPlan:
         """
         Run Stage 2: Generation.
         
-        Generates tests from the CoveragePlan.
+        Generates tests from the CoveragePlan. With on_test_case set, the
+        completion is streamed and test cases are emitted incrementally.
         """
         # Build Stage 2 prompt
         prompt = build_stage2_prompt(
@@ -323,14 +381,20 @@ class TwoStageGenerator:
             coverage_plan=coverage_plan.to_dict(),
             confluence_docs=confluence_docs,
             swagger_docs=swagger_docs,
-            api_specifications=api_specifications
+            api_specifications=api_specifications,
+            cache_layout=self.cache_layout
         )
         
         # Save prompt for debugging
-        self._save_debug_file(story_key, "stage2_prompt", prompt)
+        self._save_debug_file(story_key, "stage2_prompt", prompt_text(prompt))
         
         # Call AI
-        response_text = await self._call_ai_api(prompt, use_json_schema=True)
+        if on_test_case:
+            response_text = await self._call_ai_api_streaming(
+                prompt, on_test_case, use_json_schema=True, stage="stage2_generation"
+            )
+        else:
+            response_text = await self._call_ai_api(prompt, use_json_schema=True, stage="stage2_generation")
         
         # Parse response
         test_plan_data, reasoning = self.response_parser.parse_ai_response(response_text)
@@ -363,9 +427,6 @@ class TwoStageGenerator:
             validation_check=validation_check
         )
         
-        # Validate test cases
-        self.response_parser.validate_test_cases(test_plan, enriched_story=enriched_story)
-        
         return test_plan
     
     async def _reprompt_for_gaps(
@@ -378,69 +439,122 @@ class TwoStageGenerator:
         validation_result: Any,
         confluence_docs: List[Dict],
         swagger_docs: List[Dict],
-        api_specifications: List[Dict]
-    ) -> List[Any]:
+        api_specifications: List[Dict],
+        existing_tests: Optional[List[TestCase]] = None
+    ) -> List[TestCase]:
         """
         Re-prompt to fill coverage gaps.
         
-        Creates a focused prompt asking for tests to cover the missing items.
+        Gaps are grouped by type (pattern, PRD, API, planned test) and split
+        into shards of at most settings.gap_fill_shard_size gaps. Each shard is
+        an independent focused prompt; shards run concurrently (bounded by
+        settings.gap_fill_max_concurrency) and are merged in shard order, so the
+        result does not depend on which call finishes first. Tests whose titles
+        duplicate an existing or already-merged test are dropped.
         """
-        try:
-            # Build gap-filling prompt
-            prompt = self._build_gap_filling_prompt(
-                story_key=story_key,
-                story_title=story_title,
-                acceptance_criteria=acceptance_criteria,
-                coverage_plan=coverage_plan,
-                validation_result=validation_result,
-                swagger_docs=swagger_docs
-            )
-            
-            # Save prompt for debugging
-            self._save_debug_file(story_key, "gap_filling_prompt", prompt)
-            
-            # Call AI
-            response_text = await self._call_ai_api(prompt, use_json_schema=True)
-            
-            # Parse response
-            test_plan_data, _ = self.response_parser.parse_ai_response(response_text)
-            
-            # Extract test cases
-            test_cases_data = test_plan_data.get("test_cases", [])
-            
-            # Convert to TestCase objects
-            from src.models.test_case import TestCase, TestStep
-            additional_tests = []
-            for tc_data in test_cases_data:
-                steps = [
-                    TestStep(
-                        step_number=s.get("step_number", 1),
-                        action=s.get("action", ""),
-                        expected_result=s.get("expected_result", ""),
-                        test_data=s.get("test_data", "{}")
-                    )
-                    for s in tc_data.get("steps", [])
-                ]
-                
-                test_case = TestCase(
-                    title=tc_data.get("title", ""),
-                    description=tc_data.get("description", ""),
-                    preconditions=tc_data.get("preconditions", ""),
-                    steps=steps,
-                    expected_result=tc_data.get("expected_result", ""),
-                    priority=tc_data.get("priority", "high"),
-                    test_type=tc_data.get("test_type", "functional"),
-                    tags=tc_data.get("tags", []),
-                    automation_candidate=tc_data.get("automation_candidate", True),
-                    risk_level=tc_data.get("risk_level", "medium")
+        shards = self._shard_gaps(validation_result.gaps)
+        semaphore = asyncio.Semaphore(max(1, settings.gap_fill_max_concurrency))
+        logger.info(f"[TWO-STAGE] Filling {len(validation_result.gaps)} gaps in {len(shards)} concurrent shards")
+        
+        async def fill_shard(index: int, gaps: List[Any]) -> List[TestCase]:
+            try:
+                # Build gap-filling prompt
+                prompt = self._build_gap_filling_prompt(
+                    story_key=story_key,
+                    story_title=story_title,
+                    acceptance_criteria=acceptance_criteria,
+                    coverage_plan=coverage_plan,
+                    gaps=gaps,
+                    swagger_docs=swagger_docs
                 )
+                
+                # Save prompt for debugging
+                self._save_debug_file(story_key, f"gap_filling_prompt_{index + 1}", prompt)
+                
+                # Call AI
+                async with semaphore:
+                    response_text = await self._call_ai_api(prompt, use_json_schema=True, stage="gap_filling")
+                
+                return self._parse_gap_tests(response_text)
+                
+            except Exception as e:
+                logger.warning(f"[TWO-STAGE] Gap-filling shard {index + 1}/{len(shards)} failed: {e}")
+                return []
+        
+        shard_results = await asyncio.gather(*(
+            fill_shard(i, gaps) for i, gaps in enumerate(shards)
+        ))
+        
+        # Merge in shard order, dropping duplicate titles
+        seen_titles = {self._normalize_title(tc.title) for tc in existing_tests or []}
+        additional_tests = []
+        for tests in shard_results:
+            for test_case in tests:
+                title_key = self._normalize_title(test_case.title)
+                if title_key in seen_titles:
+                    logger.debug(f"[TWO-STAGE] Dropping duplicate gap test: {test_case.title}")
+                    continue
+                seen_titles.add(title_key)
                 additional_tests.append(test_case)
+        
+        return additional_tests
+    
+    @staticmethod
+    def _shard_gaps(gaps: List[Any]) -> List[List[Any]]:
+        """Group gaps by type (first-seen order) and split groups into bounded shards."""
+        shard_size = max(1, settings.gap_fill_shard_size)
+        by_type: Dict[str, List[Any]] = {}
+        for gap in gaps:
+            by_type.setdefault(gap.gap_type, []).append(gap)
+        
+        shards = []
+        for group in by_type.values():
+            for i in range(0, len(group), shard_size):
+                shards.append(group[i:i + shard_size])
+        return shards
+    
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        """Normalize a test title for duplicate detection."""
+        return " ".join("".join(c if c.isalnum() else " " for c in (title or "").lower()).split())
+    
+    def _parse_gap_tests(self, response_text: str) -> List[TestCase]:
+        """Parse a gap-filling response into TestCase objects."""
+        # Parse response
+        test_plan_data, _ = self.response_parser.parse_ai_response(response_text)
+        
+        # Extract test cases
+        test_cases_data = test_plan_data.get("test_cases", [])
+        
+        # Convert to TestCase objects
+        from src.models.test_case import TestStep
+        additional_tests = []
+        for tc_data in test_cases_data:
+            steps = [
+                TestStep(
+                    step_number=s.get("step_number", 1),
+                    action=s.get("action", ""),
+                    expected_result=s.get("expected_result", ""),
+                    test_data=s.get("test_data", "{}")
+                )
+                for s in tc_data.get("steps", [])
+            ]
             
-            return additional_tests
-            
-        except Exception as e:
-            logger.warning(f"[TWO-STAGE] Gap-filling failed: {e}")
-            return []
+            test_case = TestCase(
+                title=tc_data.get("title", ""),
+                description=tc_data.get("description", ""),
+                preconditions=tc_data.get("preconditions", ""),
+                steps=steps,
+                expected_result=tc_data.get("expected_result", ""),
+                priority=tc_data.get("priority", "high"),
+                test_type=tc_data.get("test_type", "functional"),
+                tags=tc_data.get("tags", []),
+                automation_candidate=tc_data.get("automation_candidate", True),
+                risk_level=tc_data.get("risk_level", "medium")
+            )
+            additional_tests.append(test_case)
+        
+        return additional_tests
     
     def _build_gap_filling_prompt(
         self,
@@ -448,10 +562,10 @@ class TwoStageGenerator:
         story_title: str,
         acceptance_criteria: List[str],
         coverage_plan: CoveragePlan,
-        validation_result: Any,
+        gaps: List[Any],
         swagger_docs: List[Dict]
     ) -> str:
-        """Build a prompt to fill coverage gaps."""
+        """Build a prompt to fill a set of coverage gaps."""
         parts = []
         
         parts.append("You are a QA engineer filling coverage gaps in a test plan.")
@@ -461,7 +575,7 @@ class TwoStageGenerator:
         parts.append("The following coverage gaps were detected. Create tests to fill them:")
         parts.append("")
         
-        for gap in validation_result.gaps:
+        for gap in gaps:
             if gap.severity == "critical":
                 parts.append(f"⚠️ CRITICAL: {gap.description}")
             elif gap.severity == "high":
@@ -565,22 +679,35 @@ class TwoStageGenerator:
         except Exception as e:
             logger.debug(f"Failed to save debug file: {e}")
     
-    async def _call_ai_api(self, prompt: str, use_json_schema: bool = False) -> str:
-        """Call AI API with the prompt."""
+    async def _call_ai_api(
+        self,
+        prompt: Union[str, PromptParts],
+        use_json_schema: bool = False,
+        stage: str = "other"
+    ) -> str:
+        """
+        Call AI API with the prompt, recording token usage under stage.
+        
+        PromptParts are sent static prefix first; on Anthropic the prefix is
+        also marked as a cache breakpoint.
+        """
         try:
             if self.use_openai:
-                return await self._call_openai(prompt, use_json_schema)
+                return await self._call_openai(prompt, use_json_schema, stage)
             else:
-                return await self._call_anthropic(prompt)
+                return await self._call_anthropic(prompt, stage)
         except Exception as e:
             logger.error(f"AI API call failed: {e}")
             raise
     
-    async def _call_openai(self, prompt: str, use_json_schema: bool = False) -> str:
-        """Call OpenAI API."""
-        from openai import AsyncOpenAI
-        
-        messages = [{"role": "user", "content": prompt}]
+    async def _call_openai(
+        self,
+        prompt: Union[str, PromptParts],
+        use_json_schema: bool = False,
+        stage: str = "other"
+    ) -> str:
+        """Call OpenAI API (prompt caching is automatic for identical prefixes)."""
+        messages = [{"role": "user", "content": prompt_text(prompt)}]
         
         kwargs = {
             "model": self.model,
@@ -596,19 +723,66 @@ class TwoStageGenerator:
             }
         
         response = await self.client.chat.completions.create(**kwargs)
+        self.token_usage.record_openai(getattr(response, "usage", None), stage)
         return response.choices[0].message.content
     
-    async def _call_anthropic(self, prompt: str) -> str:
+    async def _call_anthropic(self, prompt: Union[str, PromptParts], stage: str = "other") -> str:
         """Call Anthropic API."""
-        from anthropic import AsyncAnthropic
-        
-        response = await self.client.messages.create(
+        return await complete_anthropic_text(
+            self.client,
+            on_usage=lambda usage: self.token_usage.record_anthropic(usage, stage),
             model=self.model,
             max_tokens=self.max_tokens,
             temperature=self.temperature,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": anthropic_content(prompt)}]
         )
-        return response.content[0].text
+    
+    async def _call_ai_api_streaming(
+        self,
+        prompt: Union[str, PromptParts],
+        on_test_case: Callable[[TestCase], Awaitable[None]],
+        use_json_schema: bool = False,
+        stage: str = "other"
+    ) -> str:
+        """
+        Stream the completion, emitting each test case as soon as it is well-formed.
+        
+        Returns:
+            Full response text, for the regular end-of-response parse
+        """
+        try:
+            if self.use_openai:
+                kwargs = {
+                    "model": self.model,
+                    "messages": [{"role": "user", "content": prompt_text(prompt)}],
+                    "temperature": self.temperature,
+                    "max_tokens": self.max_tokens,
+                }
+                if use_json_schema:
+                    kwargs["response_format"] = {
+                        "type": "json_schema",
+                        "json_schema": COMPACT_JSON_SCHEMA
+                    }
+                deltas = stream_openai_text(
+                    self.client,
+                    on_usage=lambda usage: self.token_usage.record_openai(usage, stage),
+                    **kwargs
+                )
+            else:
+                deltas = stream_anthropic_text(
+                    self.client,
+                    on_usage=lambda usage: self.token_usage.record_anthropic(usage, stage),
+                    model=self.model,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    messages=[{"role": "user", "content": anthropic_content(prompt)}]
+                )
+            return await emit_streamed_test_cases(
+                deltas, self.response_parser, on_test_case, log_prefix="[TWO-STAGE]"
+            )
+        except Exception as e:
+            logger.error(f"AI API streaming call failed: {e}")
+            raise
     
     async def _enrich_story(self, main_story, story_context: StoryContext) -> Optional[EnrichedStory]:
         """Enrich story with comprehensive context."""
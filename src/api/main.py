@@ -14,15 +14,20 @@ from pathlib import Path
 
 from src.config.settings import settings
 from src.api.middleware.jwt_auth import JWTAuthMiddleware
+from src.mcp.session_pool import close_session_pools
 
-from .routes import stories, test_plans, ui, rag, connect, zephyr, prompts
+from .routes import stories, test_plans, ui, rag, connect, zephyr, prompts, jobs
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info(f"Starting Womba API Server - Environment: {settings.environment}")
+    job_queue = jobs.get_job_queue()
+    await job_queue.start()
     yield
+    await job_queue.stop()
+    await close_session_pools()
     logger.info("Shutting down Womba API Server")
 
 
@@ -54,6 +59,7 @@ app.include_router(ui.router, prefix="/api/v1", tags=["ui"])
 app.include_router(rag.router, tags=["rag"])
 app.include_router(zephyr.router, tags=["zephyr"])
 app.include_router(prompts.router, tags=["prompts"])
+app.include_router(jobs.router, tags=["jobs"])
 
 # Mount static files for web UI
 static_path = Path(__file__).parent.parent / "web" / "static"
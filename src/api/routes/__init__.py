@@ -1,5 +1,5 @@
 """Routes module initialization."""
 
-from . import stories, test_plans, ui, rag, connect, zephyr, prompts
+from . import stories, test_plans, ui, rag, connect, zephyr, prompts, jobs
 
-__all__ = ['stories', 'test_plans', 'ui', 'rag', 'connect', 'zephyr', 'prompts']
+__all__ = ['stories', 'test_plans', 'ui', 'rag', 'connect', 'zephyr', 'prompts', 'jobs']
@@ -0,0 +1,210 @@
+"""
+API routes for background test plan generation jobs.
+
+Generation takes minutes, so instead of holding an HTTP request open the
+client submits a job, polls its status and progress events, and fetches the
+result when it has finished.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from src.aggregator.story_collector import StoryCollector
+from src.ai.two_stage_generator import TwoStageGenerator
+from src.models.job import JobEvent, JobStatus
+from src.utils.stage_timer import StageTimer
+from src.workflows.job_queue import GenerationJobQueue
+
+from .test_plans import GenerateTestPlanRequest, _persist_test_plan
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+class SubmitJobResponse(BaseModel):
+    """Response model for job submission."""
+    job_id: str
+    status: JobStatus
+
+
+class JobStatusResponse(BaseModel):
+    """Response model for job status polling."""
+    job_id: str
+    issue_key: str
+    status: JobStatus
+    stage: Optional[str] = None
+    error: Optional[str] = None
+    events: List[JobEvent] = Field(default_factory=list)
+
+
+async def run_generation_job(
+    payload: Dict[str, Any], on_stage: Callable[[str, str], None]
+) -> Dict[str, Any]:
+    """
+    Run the full generation pipeline for one job.
+
+    Same steps as POST /api/v1/test-plans/generate, with every stage reported
+    through on_stage.
+
+    Args:
+        payload: Serialized GenerateTestPlanRequest
+        on_stage: Progress callback receiving (stage, event)
+
+    Returns:
+        Dict with the test plan and optional Zephyr upload results
+    """
+    import time
+    from .ui import track_test_generation
+
+    request = GenerateTestPlanRequest(**payload)
+    timer = StageTimer(request.issue_key, listener=on_stage)
+    start_time = time.time()
+
+    try:
+        with timer.span("collecting_context"):
+            collector = StoryCollector()
+            context = await collector.collect_story_context(request.issue_key)
+
+        generator = TwoStageGenerator()
+        test_plan = await generator.generate_test_plan(context, on_stage=on_stage)
+
+        with timer.span("saving"):
+            zephyr_results, zephyr_ids = await _persist_test_plan(request, test_plan, context)
+    except Exception:
+        track_test_generation(
+            story_key=request.issue_key,
+            test_count=0,
+            status='failed',
+            duration=int(time.time() - start_time)
+        )
+        raise
+
+    track_test_generation(
+        story_key=request.issue_key,
+        test_count=len(test_plan.test_cases),
+        status='success',
+        duration=int(time.time() - start_time),
+        zephyr_ids=zephyr_ids if zephyr_ids else None,
+        test_plan_file=f"rag:{request.issue_key}"
+    )
+    return {
+        "test_plan": test_plan.model_dump(mode="json"),
+        "zephyr_results": zephyr_results,
+    }
+
+
+_job_queue: Optional[GenerationJobQueue] = None
+
+
+def get_job_queue() -> GenerationJobQueue:
+    """Get the process-wide job queue."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = GenerationJobQueue(pipeline=run_generation_job)
+    return _job_queue
+
+
+def _tenant_for(http_request: Request, issue_key: str) -> str:
+    """Use the Connect installation when authenticated, else the Jira project key."""
+    jira_context = getattr(http_request.state, "jira_context", None)
+    if jira_context is not None:
+        return jira_context.client_key
+    return issue_key.split("-")[0]
+
+
+def _get_job_or_404(job_id: str, http_request: Request):
+    """Get a job of the caller's tenant; other tenants' jobs are reported as missing."""
+    job = get_job_queue().get(job_id)
+    if job is None or job.tenant != _tenant_for(http_request, job.issue_key):
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("", response_model=SubmitJobResponse, status_code=202)
+async def submit_job(request: GenerateTestPlanRequest, http_request: Request):
+    """
+    Queue test plan generation and return immediately.
+
+    Args:
+        request: Test plan generation request
+
+    Returns:
+        Job ID to poll
+    """
+    if request.upload_to_zephyr and not request.project_key:
+        raise HTTPException(
+            status_code=400,
+            detail="project_key is required when upload_to_zephyr is True",
+        )
+
+    tenant = _tenant_for(http_request, request.issue_key)
+    job = await get_job_queue().submit(request.model_dump(), tenant=tenant)
+    logger.info(f"API: Queued job {job.id} for {request.issue_key}")
+    return SubmitJobResponse(job_id=job.id, status=job.status)
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str, http_request: Request):
+    """
+    Get job status, current stage and progress events.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Job status
+    """
+    job = _get_job_or_404(job_id, http_request)
+    return JobStatusResponse(
+        job_id=job.id,
+        issue_key=job.issue_key,
+        status=job.status,
+        stage=job.stage,
+        error=job.error,
+        events=job.events,
+    )
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str, http_request: Request):
+    """
+    Get the generated test plan of a finished job.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Test plan and optional Zephyr upload results
+    """
+    job = _get_job_or_404(job_id, http_request)
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job {job_id} is {job.status.value}" + (f": {job.error}" if job.error else ""),
+        )
+    return job.result
+
+
+@router.post("/{job_id}/cancel", response_model=JobStatusResponse)
+async def cancel_job(job_id: str, http_request: Request):
+    """
+    Cancel a queued or running job. Finished jobs are left unchanged.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Updated job status
+    """
+    _get_job_or_404(job_id, http_request)
+    job = await get_job_queue().cancel(job_id)
+    return JobStatusResponse(
+        job_id=job.id,
+        issue_key=job.issue_key,
+        status=job.status,
+        stage=job.stage,
+        error=job.error,
+        events=job.events,
+    )
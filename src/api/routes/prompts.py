@@ -5,23 +5,19 @@ All file I/O operations are async using asyncio.to_thread.
 """
 
 import asyncio
-import json
 import logging
-from pathlib import Path
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from src.ai import prompts_compact, prompts_analysis
+from src.ai.generation.prompt_overrides import get_prompt_overrides
 from src.config.settings import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/prompts")
 
-# Path for storing prompt overrides
-PROMPT_OVERRIDES_FILE = Path("data/prompt_overrides.json")
-
 
 class PromptSection(BaseModel):
     """Model for a prompt section."""
@@ -48,22 +44,14 @@ class CompanyOverviewRequest(BaseModel):
 
 
 def _load_overrides_sync() -> Dict[str, str]:
-    """Load prompt overrides from disk (sync)."""
-    try:
-        if PROMPT_OVERRIDES_FILE.exists():
-            with open(PROMPT_OVERRIDES_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
-        logger.error(f"Failed to load prompt overrides: {e}")
-    return {}
+    """Load prompt overrides from the shared registry (sync)."""
+    return get_prompt_overrides().load()
 
 
 def _save_overrides_sync(overrides: Dict[str, str]):
-    """Save prompt overrides to disk (sync)."""
+    """Save prompt overrides to disk and refresh the shared registry (sync)."""
     try:
-        PROMPT_OVERRIDES_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(PROMPT_OVERRIDES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(overrides, f, indent=2, ensure_ascii=False)
+        get_prompt_overrides().save(overrides)
         logger.info("Prompt overrides saved successfully")
     except Exception as e:
         logger.error(f"Failed to save prompt overrides: {e}")
@@ -229,8 +217,7 @@ async def update_section(section_id: str, request: UpdateSectionRequest):
 async def reset_prompts():
     """Reset all prompts to defaults by clearing overrides."""
     try:
-        if PROMPT_OVERRIDES_FILE.exists():
-            await asyncio.to_thread(PROMPT_OVERRIDES_FILE.unlink)
+        if await asyncio.to_thread(get_prompt_overrides().reset):
             logger.info("Prompt overrides cleared, reset to defaults")
         
         return {"status": "success", "message": "All prompts reset to defaults"}
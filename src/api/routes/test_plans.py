@@ -2,12 +2,14 @@
 API routes for test plan generation and management.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from pathlib import Path
+import asyncio
 import json
 import os
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from pydantic import BaseModel, Field
 
@@ -36,6 +38,50 @@ class GenerateTestPlanResponse(BaseModel):
     zephyr_results: Optional[dict] = None
 
 
+async def _persist_test_plan(
+    request: GenerateTestPlanRequest, test_plan: TestPlan, context
+) -> Tuple[Optional[dict], List[str]]:
+    """
+    Save a generated test plan to RAG and optionally upload it to Zephyr.
+
+    Args:
+        request: Original generation request
+        test_plan: Generated test plan
+        context: Story context used for generation
+
+    Returns:
+        Tuple of (Zephyr upload results, Zephyr test case IDs)
+    """
+    # Step 3: Save test plan to RAG
+    try:
+        from src.ai.context_indexer import ContextIndexer
+        indexer = ContextIndexer()
+        await indexer.index_test_plan(test_plan, context)
+        logger.info(f"Saved test plan to RAG for {request.issue_key}")
+    except Exception as e:
+        logger.error(f"Failed to save test plan to RAG: {e}")
+
+    # Step 4: Upload to Zephyr if requested
+    zephyr_results = None
+    zephyr_ids = []
+    if request.upload_to_zephyr:
+
+        logger.info("Step 4: Uploading test plan to Zephyr...")
+        zephyr = ZephyrIntegration()
+        zephyr_results = await zephyr.upload_test_plan(
+            test_plan=test_plan,
+            project_key=request.project_key,
+            folder_id=request.folder_id,
+        )
+        logger.info("Successfully uploaded test plan to Zephyr")
+        
+        # Extract Zephyr IDs from results
+        if zephyr_results and 'test_case_ids' in zephyr_results:
+            zephyr_ids = zephyr_results['test_case_ids']
+
+    return zephyr_results, zephyr_ids
+
+
 @router.post("/generate", response_model=GenerateTestPlanResponse)
 async def generate_test_plan(request: GenerateTestPlanRequest):
     """
@@ -79,32 +125,8 @@ async def generate_test_plan(request: GenerateTestPlanRequest):
             f"Generated {len(test_plan.test_cases)} test cases for {request.issue_key}"
         )
 
-        # Step 3: Save test plan to RAG
-        try:
-            from src.ai.context_indexer import ContextIndexer
-            indexer = ContextIndexer()
-            await indexer.index_test_plan(test_plan, context)
-            logger.info(f"Saved test plan to RAG for {request.issue_key}")
-        except Exception as e:
-            logger.error(f"Failed to save test plan to RAG: {e}")
-
-        # Step 4: Upload to Zephyr if requested
-        zephyr_results = None
-        zephyr_ids = []
-        if request.upload_to_zephyr:
-
-            logger.info("Step 4: Uploading test plan to Zephyr...")
-            zephyr = ZephyrIntegration()
-            zephyr_results = await zephyr.upload_test_plan(
-                test_plan=test_plan,
-                project_key=request.project_key,
-                folder_id=request.folder_id,
-            )
-            logger.info("Successfully uploaded test plan to Zephyr")
-            
-            # Extract Zephyr IDs from results
-            if zephyr_results and 'test_case_ids' in zephyr_results:
-                zephyr_ids = zephyr_results['test_case_ids']
+        # Steps 3-4: Save to RAG and optionally upload to Zephyr
+        zephyr_results, zephyr_ids = await _persist_test_plan(request, test_plan, context)
         
         # Track in history (test plan stored in RAG)
         duration = int(time.time() - start_time)
@@ -140,6 +162,105 @@ async def generate_test_plan(request: GenerateTestPlanRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_test_plan_stream(request: GenerateTestPlanRequest):
+    """
+    Generate a test plan and stream test cases as Server-Sent Events.
+
+    Runs the same pipeline as POST /generate, but Stage 2 streams the model
+    output and each test case is sent as soon as it is well-formed, instead of
+    after the full completion.
+
+    Events:
+        status: Pipeline progress ({"stage": ...})
+        test_case: One generated TestCase
+        complete: Final test plan and optional Zephyr upload results
+        error: Generation failed ({"detail": ...})
+
+    Args:
+        request: Test plan generation request
+
+    Returns:
+        text/event-stream response
+    """
+    logger.info(f"API: Streaming test plan generation for {request.issue_key}")
+
+    if request.upload_to_zephyr and not request.project_key:
+        raise HTTPException(
+            status_code=400,
+            detail="project_key is required when upload_to_zephyr is True",
+        )
+
+    async def event_stream():
+        import time
+        start_time = time.time()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def emit_test_case(test_case: TestCase) -> None:
+            await queue.put(_sse_event("test_case", test_case.model_dump(mode="json")))
+
+        async def run_pipeline() -> None:
+            from .ui import track_test_generation
+            try:
+                await queue.put(_sse_event("status", {"stage": "collecting_context"}))
+                collector = StoryCollector()
+                context = await collector.collect_story_context(request.issue_key)
+
+                await queue.put(_sse_event("status", {"stage": "generating"}))
+                generator = TwoStageGenerator()
+                test_plan = await generator.generate_test_plan(context, on_test_case=emit_test_case)
+
+                await queue.put(_sse_event("status", {"stage": "saving"}))
+                zephyr_results, zephyr_ids = await _persist_test_plan(request, test_plan, context)
+
+                track_test_generation(
+                    story_key=request.issue_key,
+                    test_count=len(test_plan.test_cases),
+                    status='success',
+                    duration=int(time.time() - start_time),
+                    zephyr_ids=zephyr_ids if zephyr_ids else None,
+                    test_plan_file=f"rag:{request.issue_key}"
+                )
+                await queue.put(_sse_event("complete", {
+                    "test_plan": test_plan.model_dump(mode="json"),
+                    "zephyr_results": zephyr_results,
+                }))
+            except Exception as e:
+                logger.error(f"Failed to stream test plan for {request.issue_key}: {e}")
+                track_test_generation(
+                    story_key=request.issue_key,
+                    test_count=0,
+                    status='failed',
+                    duration=int(time.time() - start_time)
+                )
+                await queue.put(_sse_event("error", {"detail": str(e)}))
+            finally:
+                await queue.put(None)
+
+        task = asyncio.create_task(run_pipeline())
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                yield message
+        finally:
+            # Client disconnected mid-stream - stop paying for the generation
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/{issue_key}/generate")
 async def generate_test_plan_simple(
     issue_key: str, upload_to_zephyr: bool = False, project_key: Optional[str] = None
@@ -8,7 +8,7 @@ from loguru import logger
 
 from src.aggregator.story_collector import StoryCollector
 from src.ai.story_enricher import StoryEnricher
-from src.ai.enrichment_cache import EnrichmentCache
+from src.ai.enrichment_cache import create_enrichment_cache
 from src.config.config_manager import ConfigManager
 
 
@@ -43,7 +43,7 @@ async def enrich_story_command(
             return
         
         # Initialize services
-        enrichment_cache = EnrichmentCache()
+        enrichment_cache = create_enrichment_cache()
         story_enricher = StoryEnricher()
         story_collector = StoryCollector()
         
@@ -67,7 +67,7 @@ async def enrich_story_command(
         
         # Collect story context
         print(f"\n📥 Collecting story context for {story_key}...")
-        story_context = await story_collector.collect_story_context(story_key)
+        story_context = await story_collector.collect_story_context(story_key, use_cache=use_cache)
         main_story = story_context.main_story
         
         print(f"✅ Collected context:")
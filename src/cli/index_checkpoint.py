@@ -0,0 +1,222 @@
+"""
+Checkpoint journal for resumable index-all runs.
+
+Every run appends JSON lines to {index_checkpoint_dir}/{project}/{run_id}.jsonl
+and fsyncs after each record, so the journal survives kill -9. A source
+journals a batch only after its documents are upserted, together with the
+cursor to continue from. ``index-all --resume`` replays the latest run and
+restarts every unfinished source after its last committed batch.
+
+A kill between an upsert and its journal record re-embeds that one batch on
+resume. Document ids are stable, so this overwrites the same documents
+rather than duplicating them. A torn last line is ignored on replay.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from loguru import logger
+
+from src.config.settings import settings
+
+
+@dataclass
+class PhaseState:
+    """Progress of one source within a run, rebuilt from the journal."""
+
+    status: str = "pending"  # pending | running | completed | failed
+    last_batch_id: int = -1
+    cursor: Dict[str, Any] = field(default_factory=dict)
+    committed: int = 0
+    count: int = 0
+    error: Optional[str] = None
+
+
+class PhaseCheckpoint:
+    """Cursor of one source, handed to its fetch function."""
+
+    def __init__(self, journal: IndexRunJournal, phase: str) -> None:
+        self.journal = journal
+        self.phase = phase
+
+    @property
+    def state(self) -> PhaseState:
+        return self.journal.phases[self.phase]
+
+    @property
+    def cursor(self) -> Dict[str, Any]:
+        return self.state.cursor
+
+    @property
+    def next_batch_id(self) -> int:
+        return self.state.last_batch_id + 1
+
+    @property
+    def committed(self) -> int:
+        return self.state.committed
+
+    def commit_batch(self, batch_id: int, count: int, cursor: Dict[str, Any]) -> None:
+        """
+        Record a batch as stored.
+
+        Args:
+            batch_id: Sequential batch number within the source
+            count: Documents in the batch
+            cursor: Where the source continues after this batch
+        """
+        self.journal.append(
+            {"event": "batch_committed", "phase": self.phase, "batch_id": batch_id, "count": count, "cursor": cursor}
+        )
+
+
+class IndexRunJournal:
+    """Append-only, fsynced journal of one index-all run."""
+
+    def __init__(self, path: Path, project_key: str, run_id: str) -> None:
+        self.path = path
+        self.project_key = project_key
+        self.run_id = run_id
+        self.phases: Dict[str, PhaseState] = {}
+        self.completed = False
+
+    @staticmethod
+    def _project_dir(project_key: str, directory: Optional[Path] = None) -> Path:
+        return Path(directory or settings.index_checkpoint_dir) / project_key
+
+    @classmethod
+    def start(
+        cls,
+        project_key: str,
+        phases: Iterable[str],
+        directory: Optional[Path] = None,
+    ) -> IndexRunJournal:
+        """
+        Start a new run journal.
+
+        Args:
+            project_key: Project being indexed
+            phases: Phase keys of the run
+            directory: Journal root (defaults to settings)
+
+        Returns:
+            The new journal
+        """
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        project_dir = cls._project_dir(project_key, directory)
+        project_dir.mkdir(parents=True, exist_ok=True)
+        journal = cls(project_dir / f"{run_id}.jsonl", project_key, run_id)
+        journal.append({"event": "run_started", "project_key": project_key, "run_id": run_id, "phases": list(phases)})
+        return journal
+
+    @classmethod
+    def load(cls, path: Path) -> IndexRunJournal:
+        """
+        Rebuild a run's state by replaying its journal.
+
+        Args:
+            path: Journal file
+
+        Returns:
+            The journal, ready for further appends
+        """
+        journal = cls(path, "", path.stem)
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        for number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Only the last record can be torn by a crash mid-write
+                if number != len(lines):
+                    raise
+                logger.warning(f"Ignoring truncated last record in {path.name}")
+                break
+            journal._apply(record)
+        return journal
+
+    @classmethod
+    def latest(cls, project_key: str, directory: Optional[Path] = None) -> Optional[IndexRunJournal]:
+        """
+        Most recent run of a project.
+
+        Args:
+            project_key: Project key
+            directory: Journal root (defaults to settings)
+
+        Returns:
+            The latest run's journal, or None if the project has no runs
+        """
+        project_dir = cls._project_dir(project_key, directory)
+        if not project_dir.exists():
+            return None
+        paths = sorted(project_dir.glob("*.jsonl"))
+        return cls.load(paths[-1]) if paths else None
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        event = record.get("event")
+        if event == "run_started":
+            self.project_key = record["project_key"]
+            self.run_id = record["run_id"]
+            self.phases = {phase: PhaseState() for phase in record["phases"]}
+        elif event == "run_completed":
+            self.completed = True
+        elif event in ("phase_started", "phase_completed", "phase_failed", "batch_committed"):
+            state = self.phases.setdefault(record["phase"], PhaseState())
+            if event == "phase_started":
+                state.status = "running"
+            elif event == "phase_completed":
+                state.status = "completed"
+                state.count = record["count"]
+            elif event == "phase_failed":
+                state.status = "failed"
+                state.error = record.get("error")
+            else:
+                state.last_batch_id = record["batch_id"]
+                state.cursor = record["cursor"]
+                state.committed += record["count"]
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Durably append a record and apply it to the in-memory state.
+
+        Args:
+            record: Journal record with an "event" key
+        """
+        line = json.dumps({**record, "at": datetime.now(timezone.utc).isoformat()}, default=str)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._apply(record)
+
+    def checkpoint(self, phase: str) -> PhaseCheckpoint:
+        """Checkpoint handle for one phase."""
+        self.phases.setdefault(phase, PhaseState())
+        return PhaseCheckpoint(self, phase)
+
+    def phase_started(self, phase: str) -> None:
+        self.append({"event": "phase_started", "phase": phase})
+
+    def phase_completed(self, phase: str, count: int) -> None:
+        self.append({"event": "phase_completed", "phase": phase, "count": count})
+
+    def phase_failed(self, phase: str, error: str) -> None:
+        self.append({"event": "phase_failed", "phase": phase, "error": error})
+
+    def run_completed(self, keep_runs: Optional[int] = None) -> None:
+        """
+        Mark the run complete and prune old journals of the project.
+
+        Args:
+            keep_runs: Journals to keep per project (defaults to settings)
+        """
+        self.append({"event": "run_completed"})
+        keep = max(1, keep_runs or settings.index_checkpoint_keep_runs)
+        for path in sorted(self.path.parent.glob("*.jsonl"))[:-keep]:
+            path.unlink(missing_ok=True)
@@ -3,55 +3,199 @@ RAG CLI command handlers.
 Separate module to keep CLI clean and maintainable.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
 import asyncio
-from typing import Optional, List
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, List, Tuple
 from loguru import logger
 
 from src.ai.context_indexer import ContextIndexer
+from src.ai.indexing import DocumentIndexer, EmbeddingPipeline
 from src.ai.rag_store import RAGVectorStore
+from src.config.settings import settings
 from src.integrations.zephyr_integration import ZephyrIntegration
 from src.aggregator.jira_client import JiraClient
 from src.aggregator.confluence_client import ConfluenceClient
 from src.aggregator.story_collector import StoryCollector
 from src.models.story import JiraStory
+from src.cli.index_checkpoint import IndexRunJournal, PhaseCheckpoint
 from src.cli.rag_refresh import RAGRefreshManager
 
 
+def _commit_batch(
+    checkpoint: Optional[PhaseCheckpoint],
+    batch_id: int,
+    count: int,
+    indexed: Optional[int],
+    cursor: dict,
+    source: str,
+    expected: Optional[int] = None
+) -> None:
+    """
+    Record a stored batch in the run checkpoint.
+
+    A batch the indexer only partly stored is not recorded; the phase
+    stops instead, so --resume retries it.
+
+    Args:
+        checkpoint: Run checkpoint of the source (None when not checkpointing)
+        batch_id: Sequential batch number within the source
+        count: Items in the batch
+        indexed: Documents the indexer reported as stored
+        cursor: Where the source continues after this batch
+        source: Source name for the error message
+        expected: Documents that should have been stored (defaults to count)
+    """
+    if checkpoint is None:
+        return
+    expected = count if expected is None else expected
+    if indexed is None or indexed < expected:
+        raise RuntimeError(f"{source} batch {batch_id} was only partly stored ({indexed or 0}/{expected}); rerun with --resume")
+    checkpoint.commit_batch(batch_id, count, cursor)
+
+
+def _page_order(page_id: str) -> Tuple[int, str]:
+    # Confluence ids are numeric strings: order by length, then lexically
+    return (len(page_id), page_id)
+
+
+async def _zephyr_pages(
+    zephyr: ZephyrIntegration,
+    project_key: str,
+    cursor: dict,
+    lookback: int = 500
+) -> AsyncIterator[Tuple[int, List[dict]]]:
+    """
+    Stream Zephyr test pages, continuing after a checkpoint cursor.
+
+    Tests added or deleted since the checkpoint shift offsets, so the
+    recorded offset is only a hint: streaming restarts ``lookback`` tests
+    before it and drops everything up to the last committed key. If that
+    key is not found near the hint (deleted, or the shift was larger than
+    the window), the whole project is streamed again, since re-indexing is
+    an upsert while skipping would lose tests.
+
+    Args:
+        zephyr: Zephyr client
+        project_key: Jira project key
+        cursor: Checkpoint cursor ({"start_at", "last_key"}, empty for a fresh run)
+        lookback: Tests re-read before the recorded offset
+
+    Yields:
+        (offset of the page's first test, page) pairs
+    """
+    last_key = cursor.get("last_key")
+    if last_key:
+        window_start = max(0, cursor.get("start_at", 0) - lookback)
+        offset = window_start
+        found = False
+        pages = zephyr.iter_test_case_pages(project_key, start_at=window_start)
+        try:
+            async for page in pages:
+                page_offset, offset = offset, offset + len(page)
+                if found:
+                    yield page_offset, page
+                    continue
+                keys = [test.get('key') for test in page]
+                if last_key in keys:
+                    found = True
+                    position = keys.index(last_key) + 1
+                    if position < len(page):
+                        yield page_offset + position, page[position:]
+                elif offset - window_start > 2 * lookback:
+                    break
+        finally:
+            # Cancels the page requests still in flight when we stop early
+            await pages.aclose()
+        if found:
+            return
+        logger.warning(f"Last committed Zephyr test {last_key} not found near offset {cursor.get('start_at')}; re-indexing all tests")
+        print(f"  ⚠️  Could not find the last committed test {last_key}; re-indexing all tests")
+
+    offset = 0
+    async for page in zephyr.iter_test_case_pages(project_key):
+        yield offset, page
+        offset += len(page)
+
+
 async def fetch_and_index_zephyr_tests(
     project_key: str,
-    indexer: ContextIndexer
+    indexer: ContextIndexer,
+    checkpoint: Optional[PhaseCheckpoint] = None
 ) -> int:
     """
     Fetch and index all Zephyr tests for a project.
     
+    Args:
+        project_key: Jira project key
+        indexer: Context indexer
+        checkpoint: Run checkpoint; streaming continues after its last
+            committed test and every stored batch is recorded in it
+    
     Returns:
         Number of tests indexed
     """
     print("📥 [1/3] Fetching existing tests from Zephyr...")
     
     zephyr = ZephyrIntegration()
-    tests = await zephyr.get_test_cases_for_project(project_key, max_results=None)
-    print(f"Found {len(tests)} existing tests")
-    
-    if tests:
-        print("📊 Indexing existing tests...")
-        await indexer.index_existing_tests(tests, project_key)
-        print("✅ Indexed existing tests")
-        return len(tests)
+    batch_size = 500
+    batch: List[dict] = []
+    cursor = checkpoint.cursor if checkpoint else {}
+    batch_id = checkpoint.next_batch_id if checkpoint else 0
+    total_indexed = checkpoint.committed if checkpoint else 0
+    end_offset = 0
+    if cursor:
+        print(f"  ♻️  Resuming after {total_indexed:,d} committed tests (last: {cursor.get('last_key')})")
+    
+    async def index_batch() -> None:
+        nonlocal batch_id, total_indexed
+        indexed = await indexer.index_existing_tests(batch, project_key)
+        _commit_batch(
+            checkpoint, batch_id, len(batch), indexed,
+            {"start_at": end_offset, "last_key": batch[-1].get('key')}, "Zephyr"
+        )
+        batch_id += 1
+        total_indexed += len(batch)
+    
+    # Pages are fetched concurrently and indexed as they stream in,
+    # so the full project never has to sit in memory at once
+    async for page_offset, page in _zephyr_pages(zephyr, project_key, cursor):
+        if cursor and page_offset == 0:
+            # Could not continue after the checkpoint: the project is streamed from scratch
+            total_indexed = 0
+        batch.extend(page)
+        end_offset = page_offset + len(page)
+        if len(batch) >= batch_size:
+            await index_batch()
+            print(f"  ✅ Indexed {total_indexed:,d} tests so far...")
+            batch = []
+    
+    if batch:
+        await index_batch()
+    
+    if total_indexed:
+        print(f"✅ Indexed {total_indexed} existing tests")
     else:
         print("⚠️  No tests found to index")
-        return 0
+    return total_indexed
 
 
 async def fetch_and_index_jira_stories(
     project_key: str,
-    indexer: ContextIndexer
+    indexer: ContextIndexer,
+    checkpoint: Optional[PhaseCheckpoint] = None
 ) -> int:
     """
     Fetch and index all Jira stories for a project.
     Uses batch indexing to handle large numbers of stories efficiently.
     
+    Args:
+        project_key: Jira project key
+        indexer: Context indexer
+        checkpoint: Run checkpoint; only issues after its last committed key
+            are fetched and every stored batch is recorded in it
+    
     Returns:
         Number of stories indexed
     """
@@ -59,10 +203,16 @@ async def fetch_and_index_jira_stories(
     
     try:
         jira_client = JiraClient()
-        jql = f"project = {project_key} ORDER BY created DESC"
+        # Key order is stable across runs, so a resumed run can continue after the last committed key
+        last_key = checkpoint.cursor.get("last_key") if checkpoint else None
+        if last_key:
+            print(f"  ♻️  Resuming after {checkpoint.committed:,d} committed stories (last: {last_key})")
+            jql = f"project = {project_key} AND key > {last_key} ORDER BY key ASC"
+        else:
+            jql = f"project = {project_key} ORDER BY key ASC"
         
-        # Use the new search_all_issues method - handles pagination internally
-        all_stories = jira_client.search_all_issues(jql)
+        # search_all_issues is blocking; run it off the event loop so other phases keep going
+        all_stories = await asyncio.to_thread(jira_client.search_all_issues, jql)
         
         print(f"Found {len(all_stories)} Jira issues")
         
@@ -71,6 +221,8 @@ async def fetch_and_index_jira_stories(
             
             # Index in batches to prevent memory issues
             batch_size = 500
+            batch_id = checkpoint.next_batch_id if checkpoint else 0
+            previously_indexed = checkpoint.committed if checkpoint else 0
             total_indexed = 0
             
             for i in range(0, len(all_stories), batch_size):
@@ -79,31 +231,49 @@ async def fetch_and_index_jira_stories(
                 total_batches = (len(all_stories) + batch_size - 1) // batch_size
                 
                 print(f"  Indexing batch {batch_num}/{total_batches} ({len(batch)} stories)...")
-                await indexer.index_jira_stories(batch, project_key)
+                indexed = await indexer.index_jira_stories(batch, project_key)
+                _commit_batch(
+                    checkpoint, batch_id, len(batch), indexed, {"last_key": batch[-1].key}, "Jira",
+                    expected=len({story.key for story in batch})
+                )
+                batch_id += 1
                 total_indexed += len(batch)
                 print(f"  ✅ Batch {batch_num}/{total_batches} indexed ({total_indexed}/{len(all_stories)} total)")
             
             print(f"✅ Successfully indexed all {total_indexed} Jira stories")
-            return total_indexed
+            return previously_indexed + total_indexed
         else:
             print("⚠️  No Jira stories found to index")
-            return 0
+            return checkpoint.committed if checkpoint else 0
             
     except Exception as e:
         print(f"⚠️  Failed to index Jira stories: {e}")
         logger.error(f"Jira story indexing failed: {e}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
+        if checkpoint is not None:
+            # Let the run record the phase as failed so --resume picks it up again
+            raise
         return 0
 
 
 async def fetch_and_index_confluence_docs(
     project_key: str,
-    indexer: ContextIndexer
+    indexer: ContextIndexer,
+    checkpoint: Optional[PhaseCheckpoint] = None
 ) -> int:
     """
     Fetch ALL Confluence pages from ALL spaces dynamically.
     
+    Pages are indexed in id order, in batches, so a checkpointed run can
+    skip pages up to the last committed id.
+    
+    Args:
+        project_key: Jira project key
+        indexer: Context indexer
+        checkpoint: Run checkpoint; pages up to its last committed id are
+            skipped and every stored batch is recorded in it
+    
     Returns:
         Number of docs indexed
     """
@@ -118,12 +288,21 @@ async def fetch_and_index_confluence_docs(
         
         print(f"\n📊 Total unique pages found: {len(pages):,d}")
         
+        last_id = checkpoint.cursor.get("last_id") if checkpoint else None
+        previously_indexed = checkpoint.committed if checkpoint else 0
+        pages = sorted(pages, key=lambda page: _page_order(str(page.get('id', ''))))
+        if last_id:
+            pages = [page for page in pages if _page_order(str(page.get('id', ''))) > _page_order(last_id)]
+            print(f"  ♻️  Resuming after {previously_indexed:,d} committed docs ({len(pages):,d} pages left)")
+        
         # Convert to doc format (pages already have content via API v2 expand parameter)
         all_docs = []
         failed_count = 0
         empty_count = 0
         print(f"📄 Converting {len(pages):,d} pages to doc format...")
-        for idx, page in enumerate(pages, 1):
+        # Extract content (already included via expand parameter in search_all_pages) in one batch
+        contents = await asyncio.to_thread(confluence.extract_page_contents, pages)
+        for idx, (page, content) in enumerate(zip(pages, contents), 1):
             try:
                 page_id = page.get('id', '')
                 space_info = page.get('space', {})
@@ -131,9 +310,6 @@ async def fetch_and_index_confluence_docs(
                 version_info = page.get('version', {})
                 last_modified = version_info.get('when') if version_info else None
                 
-                # Extract content (already included via expand parameter in search_all_pages)
-                content = confluence.extract_page_content(page)
-                
                 if not content or not content.strip():
                     # Skip pages with no content
                     empty_count += 1
@@ -169,41 +345,134 @@ async def fetch_and_index_confluence_docs(
         
         if all_docs:
             print("📊 Indexing Confluence docs...")
-            await indexer.index_confluence_docs(all_docs, project_key)
+            batch_size = 500
+            batch_id = checkpoint.next_batch_id if checkpoint else 0
+            for i in range(0, len(all_docs), batch_size):
+                batch = all_docs[i:i + batch_size]
+                indexed = await indexer.index_confluence_docs(batch, project_key)
+                _commit_batch(checkpoint, batch_id, len(batch), indexed, {"last_id": str(batch[-1]['id'])}, "Confluence")
+                batch_id += 1
             print("✅ Indexed Confluence docs")
-            return len(all_docs)
+            return previously_indexed + len(all_docs)
         else:
             print("⚠️  No Confluence pages found")
-            return 0
+            return previously_indexed
             
     except Exception as e:
         print(f"⚠️  Failed to index Confluence docs: {e}")
         logger.error(f"Confluence indexing failed: {e}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
+        if checkpoint is not None:
+            # Let the run record the phase as failed so --resume picks it up again
+            raise
         return 0
 
 
+@dataclass
+class IndexPhase:
+    """One index-all phase and the phases it has to wait for."""
+
+    number: int
+    key: str
+    icon: str
+    title: str
+    unit: str
+    run: Callable[[], Awaitable[int]]
+    depends_on: Tuple[str, ...] = ()
+
+
+async def run_index_phases(
+    phases: List[IndexPhase],
+    max_concurrency: int,
+    journal: Optional[IndexRunJournal] = None
+) -> Dict[str, int]:
+    """
+    Run index phases concurrently, respecting their dependencies.
+
+    A phase starts once every phase it depends on has finished (failed
+    counts as finished) and a concurrency slot is free. Failures are
+    isolated: a failed phase reports 0 and the others carry on.
+
+    Args:
+        phases: Phases to run
+        max_concurrency: Phases running at once (1 = sequential, in list order)
+        journal: Run journal recording each phase's outcome; phases it
+            already has as completed are skipped with their recorded count
+
+    Returns:
+        Count per phase key
+    """
+    known = {phase.key for phase in phases}
+    for phase in phases:
+        missing = set(phase.depends_on) - known
+        if missing:
+            raise ValueError(f"Phase {phase.key} depends on unknown phases: {', '.join(sorted(missing))}")
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    finished = {phase.key: asyncio.Event() for phase in phases}
+    results = {phase.key: 0 for phase in phases}
+
+    async def run(phase: IndexPhase) -> None:
+        try:
+            for dependency in phase.depends_on:
+                await finished[dependency].wait()
+            state = journal.phases.get(phase.key) if journal else None
+            if state is not None and state.status == "completed":
+                results[phase.key] = state.count
+                print(f"\n⏭️  Phase {phase.number} already complete in run {journal.run_id}: {state.count} {phase.unit} indexed")
+                return
+            async with semaphore:
+                print(f"\n{phase.icon} [{phase.number}/{len(phases)}] PHASE {phase.number}: {phase.title}...")
+                phase_start = time.time()
+                if journal:
+                    journal.phase_started(phase.key)
+                try:
+                    results[phase.key] = await phase.run() or 0
+                    if journal:
+                        journal.phase_completed(phase.key, results[phase.key])
+                    phase_duration = time.time() - phase_start
+                    print(f"✅ Phase {phase.number} complete in {phase_duration:.1f}s: {results[phase.key]} {phase.unit} indexed\n")
+                except Exception as e:
+                    logger.error(f"Phase {phase.number} failed: {e}")
+                    print(f"❌ Phase {phase.number} failed: {e}\n")
+                    if journal:
+                        journal.phase_failed(phase.key, str(e))
+        finally:
+            finished[phase.key].set()
+
+    await asyncio.gather(*(run(phase) for phase in phases))
+    return results
+
+
 async def index_all_data(
     project_key: str,
     *,
     refresh_manager: Optional[RAGRefreshManager] = None,
     refresh_hours: Optional[float] = None,
-    force: bool = False
+    force: bool = False,
+    max_concurrency: Optional[int] = None,
+    resume: bool = False
 ) -> dict:
     """
     Index all available data for a project with comprehensive logging.
+
+    Phases run concurrently and share one embedding pipeline, so total
+    time approaches the slowest phase rather than the sum. Progress is
+    journaled per batch (see index_checkpoint), so an interrupted run can
+    be resumed without re-embedding committed batches.
     
     Args:
         project_key: Jira project key
+        max_concurrency: Phases running at once (defaults to settings)
+        resume: Continue the project's latest run if it did not complete
         
     Returns:
         Dictionary with counts of indexed items
     """
-    import time
-    
     start_time = datetime.now()
     start_datetime = start_time.strftime("%Y-%m-%d %H:%M:%S")
+    max_concurrency = max_concurrency or settings.index_all_max_concurrency
     
     print("\n" + "=" * 70)
     print(f"🚀 STARTING INDEX-ALL FOR PROJECT: {project_key}")
@@ -215,75 +484,44 @@ async def index_all_data(
     print("  3. All Confluence docs from project spaces")
     print("  4. External developer portal documentation")
     print("  5. GitLab Swagger/OpenAPI documentation")
+    print(f"\n⚡ Running up to {max_concurrency} phases at once")
     print("\n⏳ Estimated time: 5-15 minutes for large projects...")
     print("=" * 70 + "\n")
     
-    indexer = ContextIndexer()
     manager = refresh_manager or RAGRefreshManager()
+    phase_keys = ['tests', 'stories', 'docs', 'external_docs', 'swagger_docs']
     
-    # Track results
-    results = {
-        'tests': 0,
-        'stories': 0,
-        'docs': 0,
-        'external_docs': 0,
-        'swagger_docs': 0
-    }
-    
-    # Phase 1: Zephyr Tests
-    print("\n📋 [1/4] PHASE 1: Fetching and indexing Zephyr tests...")
-    phase_start = time.time()
-    try:
-        results['tests'] = await fetch_and_index_zephyr_tests(project_key, indexer)
-        phase_duration = time.time() - phase_start
-        print(f"✅ Phase 1 complete in {phase_duration:.1f}s: {results['tests']} tests indexed\n")
-    except Exception as e:
-        logger.error(f"Phase 1 failed: {e}")
-        print(f"❌ Phase 1 failed: {e}\n")
-    
-    # Phase 2: Jira Stories
-    print("\n📝 [2/4] PHASE 2: Fetching and indexing Jira stories...")
-    phase_start = time.time()
-    try:
-        results['stories'] = await fetch_and_index_jira_stories(project_key, indexer)
-        phase_duration = time.time() - phase_start
-        print(f"✅ Phase 2 complete in {phase_duration:.1f}s: {results['stories']} stories indexed\n")
-    except Exception as e:
-        logger.error(f"Phase 2 failed: {e}")
-        print(f"❌ Phase 2 failed: {e}\n")
-    
-    # Phase 3: Confluence Docs
-    print("\n📚 [3/4] PHASE 3: Fetching and indexing Confluence documentation...")
-    phase_start = time.time()
-    try:
-        results['docs'] = await fetch_and_index_confluence_docs(project_key, indexer)
-        phase_duration = time.time() - phase_start
-        print(f"✅ Phase 3 complete in {phase_duration:.1f}s: {results['docs']} docs indexed\n")
-    except Exception as e:
-        logger.error(f"Phase 3 failed: {e}")
-        print(f"❌ Phase 3 failed: {e}\n")
+    journal = IndexRunJournal.latest(project_key) if resume else None
+    if journal is not None and not journal.completed:
+        print(f"♻️  Resuming index-all run {journal.run_id}")
+    else:
+        if resume:
+            print(f"💡 No interrupted index-all run found for {project_key}; starting a new run")
+        journal = IndexRunJournal.start(project_key, phase_keys)
     
-    # Phase 4: External Docs
-    print("\n🌐 [4/5] PHASE 4: Fetching and indexing external documentation...")
-    phase_start = time.time()
-    try:
-        results['external_docs'] = await indexer.index_external_docs()
-        phase_duration = time.time() - phase_start
-        print(f"✅ Phase 4 complete in {phase_duration:.1f}s: {results['external_docs']} external docs indexed\n")
-    except Exception as e:
-        logger.error(f"Phase 4 failed: {e}")
-        print(f"❌ Phase 4 failed: {e}\n")
+    # Every phase submits its batches through the same pipeline, which
+    # bounds embedding concurrency and the token rate for the whole run
+    async with EmbeddingPipeline(RAGVectorStore()) as pipeline:
+        indexer = ContextIndexer(indexer=DocumentIndexer(store=pipeline))
+        # External docs and Swagger keep their own incremental state (HTTP cache,
+        # blob SHA manifest), so they are checkpointed at phase granularity only
+        phases = [
+            IndexPhase(1, 'tests', '📋', 'Fetching and indexing Zephyr tests', 'tests',
+                       lambda: fetch_and_index_zephyr_tests(project_key, indexer, journal.checkpoint('tests'))),
+            IndexPhase(2, 'stories', '📝', 'Fetching and indexing Jira stories', 'stories',
+                       lambda: fetch_and_index_jira_stories(project_key, indexer, journal.checkpoint('stories'))),
+            IndexPhase(3, 'docs', '📚', 'Fetching and indexing Confluence documentation', 'docs',
+                       lambda: fetch_and_index_confluence_docs(project_key, indexer, journal.checkpoint('docs'))),
+            IndexPhase(4, 'external_docs', '🌐', 'Fetching and indexing external documentation', 'external docs',
+                       indexer.index_external_docs),
+            IndexPhase(5, 'swagger_docs', '🔧', 'Fetching and indexing GitLab Swagger documentation', 'swagger docs',
+                       indexer.index_gitlab_swagger_docs),
+        ]
+        results = await run_index_phases(phases, max_concurrency, journal)
     
-    # Phase 5: GitLab Swagger Docs
-    print("\n🔧 [5/5] PHASE 5: Fetching and indexing GitLab Swagger documentation...")
-    phase_start = time.time()
-    try:
-        results['swagger_docs'] = await indexer.index_gitlab_swagger_docs()
-        phase_duration = time.time() - phase_start
-        print(f"✅ Phase 5 complete in {phase_duration:.1f}s: {results['swagger_docs']} swagger docs indexed\n")
-    except Exception as e:
-        logger.error(f"Phase 5 failed: {e}")
-        print(f"❌ Phase 5 failed: {e}\n")
+    # A run with failed phases stays open for --resume
+    if all(journal.phases[key].status == "completed" for key in phase_keys):
+        journal.run_completed()
     
     # Final summary
     total_duration = datetime.now() - start_time
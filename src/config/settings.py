@@ -38,6 +38,7 @@ class Settings(BaseSettings):
         default="https://api.zephyrscale.smartbear.com/v2",
         description="Zephyr Scale base URL",
     )
+    zephyr_fetch_concurrency: int = Field(default=8, description="Maximum concurrent Zephyr page requests when fetching all test cases")
 
     # Repository Access
     github_token: Optional[str] = Field(default=None, description="GitHub personal access token (optional)")
@@ -45,8 +46,18 @@ class Settings(BaseSettings):
     gitlab_base_url: str = Field(default="https://gitlab.com", description="GitLab base URL")
     gitlab_group_path: str = Field(default="", description="GitLab group path for service repositories")
     gitlab_swagger_enabled: bool = Field(default=True, description="Enable GitLab Swagger indexing")
+    gitlab_swagger_max_concurrency: int = Field(default=8, description="Concurrent spec downloads when refreshing GitLab Swagger docs")
+    gitlab_swagger_manifest_path: str = Field(default="./data/gitlab_swagger_manifest.json", description="Blob SHAs of indexed GitLab Swagger specs; unchanged specs are not downloaded or re-embedded")
+    swagger_endpoint_index_path: str = Field(default="./data/swagger_endpoint_index.json.gz", description="Endpoint-level index (one record per service, method and path) built when Swagger docs are indexed")
+    swagger_endpoint_embeddings_enabled: bool = Field(default=True, description="Also embed each Swagger endpoint as its own vector in the swagger_docs collection")
     gitlab_fallback_enabled: bool = Field(default=True, description="Enable GitLab fallback endpoint extraction when no endpoints found (uses MCP)")
     gitlab_fallback_max_services: int = Field(default=5, description="Maximum number of services to search in GitLab fallback")
+    gitlab_fallback_max_concurrency: int = Field(default=8, description="GitLab fallback searches dispatched concurrently")
+    gitlab_search_cache_enabled: bool = Field(default=True, description="Cache GitLab fallback search results on disk")
+    gitlab_search_cache_dir: str = Field(default="./data/gitlab_search_cache", description="Directory for cached GitLab search results")
+    gitlab_search_cache_ttl_hours: float = Field(default=24.0, description="Maximum age of cached GitLab search results (project searches also miss when the ref SHA changes)")
+    gitlab_search_cache_max_entries: int = Field(default=5000, description="Cached GitLab search results kept before least recently used ones are evicted")
+    gitlab_branch_lookup_ttl_minutes: float = Field(default=30.0, description="Maximum age of cached merge request/branch lookups for a story")
     # MCP Configuration for GitLab fallback
     # Note: GitLab fallback uses MCP (Model Context Protocol) for codebase search
     # The GitLab REST API client is only used for OpenAPI file fetching in RAG indexing
@@ -55,6 +66,11 @@ class Settings(BaseSettings):
     mcp_gitlab_server_args: Optional[str] = Field(default='["-y", "mcp-remote", "https://gitlab.com/api/v4/mcp"]', description="MCP server arguments as JSON string (default: mcp-remote with GitLab API endpoint)")
     mcp_gitlab_token: Optional[str] = Field(default=None, description="GitLab token for MCP server authentication (if not using Cursor's MCP connection)")
     mcp_oauth_cache_dir: Optional[str] = Field(default=None, description="MCP OAuth cache directory path (default: ~/.mcp-auth). Set this in K8s to match your PVC mount path (e.g., /home/womba/.mcp-auth)")
+    mcp_session_pool_size: int = Field(default=1, description="Long-lived MCP server processes/sessions kept warm for GitLab search (each multiplexes concurrent calls)")
+    mcp_max_concurrent_calls: int = Field(default=8, description="MCP tool calls in flight at once across the session pool")
+    mcp_call_timeout_seconds: float = Field(default=60.0, description="Seconds before an MCP tool call is abandoned")
+    mcp_session_start_timeout_seconds: float = Field(default=300.0, description="Seconds allowed for an MCP session to start, including interactive OAuth login")
+    mcp_health_check_interval_seconds: float = Field(default=30.0, description="Seconds between MCP session health-check pings (0 disables)")
     bitbucket_token: Optional[str] = Field(default=None, description="Bitbucket token (optional)")
 
     # Figma (Optional)
@@ -82,6 +98,15 @@ class Settings(BaseSettings):
         default="sqlite:///./womba.db", description="Database connection URL"
     )
 
+    # Background Generation Jobs
+    job_store_path: str = Field(
+        default="./data/jobs.db", description="SQLite file storing background generation jobs"
+    )
+    job_workers: int = Field(default=2, description="Number of concurrent background generation workers")
+    job_max_running_per_tenant: int = Field(
+        default=1, description="Maximum running jobs per tenant, so one tenant cannot starve others"
+    )
+
     # Feature Flags
     enable_mcp_server: bool = Field(default=True, description="Enable MCP server")
     enable_code_generation: bool = Field(default=True, description="Enable code generation")
@@ -102,11 +127,19 @@ class Settings(BaseSettings):
     )
     temperature: float = Field(default=0.2, description="AI temperature for generation (lower = more deterministic, better instruction following)")
     max_tokens: int = Field(default=16000, description="Max tokens for AI responses (gpt-4o-mini supports up to 16384, increased back from 10K)")
+    ai_request_timeout: float = Field(default=600.0, description="Timeout in seconds for a single AI provider request (OpenAI and Anthropic)")
+    ai_max_retries: int = Field(default=2, description="Automatic retries on connection errors, 429 and 5xx (OpenAI and Anthropic)")
     
     # RAG Configuration
     enable_rag: bool = Field(default=True, description="Enable RAG for context retrieval")
     rag_collection_path: str = Field(default="./data/chroma", description="ChromaDB storage path")
     embedding_model: str = Field(default="text-embedding-3-small", description="OpenAI embedding model")
+    embedding_pipeline_workers: int = Field(default=2, description="Document batches embedded at once across all concurrent index-all phases")
+    embedding_pipeline_queue_size: int = Field(default=8, description="Document batches waiting for embedding before index-all phases block (backpressure)")
+    embedding_tokens_per_minute: int = Field(default=1_000_000, description="Global estimated embedding token budget per minute for index-all (0 = unlimited)")
+    index_all_max_concurrency: int = Field(default=5, description="Index-all phases running at once (1 = sequential)")
+    index_checkpoint_dir: str = Field(default="./data/index_runs", description="Directory for index-all checkpoint journals (one per run, used by --resume)")
+    index_checkpoint_keep_runs: int = Field(default=5, description="Index-all checkpoint journals kept per project")
     # RAG Top-K Configuration (adjust based on your data quality and token budget)
     # Note: These are starting defaults. Monitor similarity scores and adjust based on:
     # - Average similarity scores (aim for >0.6)
@@ -135,6 +168,8 @@ class Settings(BaseSettings):
     rag_auto_index: bool = Field(default=True, description="Automatically index after test generation")
     rag_min_similarity: float = Field(default=0.25, description="Minimum similarity threshold (0.0-1.0) - lowered for broader UI search results")
     rag_refresh_hours: Optional[float] = Field(default=None, description="Minimum hours between automatic full RAG refresh runs")
+    rag_mmr_enabled: bool = Field(default=True, description="Re-rank retrieved docs for diversity (MMR) using their stored embeddings")
+    rag_mmr_lambda: float = Field(default=0.7, description="MMR relevance/diversity trade-off (1.0 = relevance only, lower = more diverse)")
 
     # External Documentation Indexing
     external_doc_index_enabled: bool = Field(default=False, description="Enable external documentation indexing")
@@ -145,7 +180,13 @@ class Settings(BaseSettings):
     )
     external_doc_max_pages: int = Field(default=10000, description="Maximum pages to crawl from external docs (set high for no limit)")
     external_doc_max_depth: int = Field(default=5, description="Maximum crawl depth for external docs")
-    external_doc_request_delay: float = Field(default=0.3, description="Delay between requests (seconds)")
+    external_doc_request_delay: float = Field(default=0.3, description="Minimum average seconds between requests to one host (token bucket pacing)")
+    external_doc_max_concurrency: int = Field(default=8, description="Concurrent page fetches while crawling external docs")
+    external_doc_burst: int = Field(default=2, description="Requests to one host allowed back-to-back before pacing applies")
+    external_doc_conditional_get: bool = Field(default=True, description="Re-crawl external docs with If-None-Match/If-Modified-Since and only re-index changed pages")
+    http_cache_dir: str = Field(default="./data/http_cache", description="Directory for ETag/Last-Modified validator caches used by conditional re-crawls")
+    html_clean_max_workers: int = Field(default=0, description="Worker processes for bulk HTML cleaning of Confluence/external pages (0 = CPU count, 1 = in-process)")
+    html_clean_min_batch: int = Field(default=64, description="Minimum pages in a batch before HTML cleaning uses the process pool")
     external_doc_project_key: str = Field(default="", description="Project key for external docs")
 
     # Story Enrichment Configuration
@@ -154,6 +195,14 @@ class Settings(BaseSettings):
     enrichment_cache_ttl_days: int = Field(default=7, description="Cache TTL in days - invalidate if story updated or cache older than this")
     enrichment_max_apis: int = Field(default=5, description="Maximum number of API endpoints to extract from Swagger")
     enrichment_cache_dir: str = Field(default="./data/enrichment_cache", description="Directory for enrichment cache storage")
+    enrichment_cache_backend: str = Field(default="file", description="Enrichment cache backend: 'file' (JSON file per story) or 'sqlite' (single indexed WAL database; use local disk, not NFS)")
+    enrichment_cache_db_path: str = Field(default="./data/enrichment_cache.db", description="Database file for the sqlite enrichment cache backend")
+    enrichment_cache_max_entries: int = Field(default=5000, description="Entries kept by the sqlite backend before least recently used ones are evicted")
+    enrichment_cache_sweep_interval_seconds: float = Field(default=600.0, description="Seconds between sqlite backend TTL/size sweeps (0 disables the sweeper)")
+    story_context_cache_enabled: bool = Field(default=True, description="Reuse collected story context until the story, its subtasks or links are updated")
+    story_context_cache_dir: str = Field(default="./data/story_context_cache", description="Directory for story context snapshots")
+    story_context_cache_max_entries: int = Field(default=500, description="Story context snapshots kept before least recently used ones are evicted")
+    story_context_cache_ttl_hours: float = Field(default=24.0, description="Maximum snapshot age (related bugs and Confluence pages are not version-checked)")
     
     # Prompt Optimization Configuration
     use_compact_prompts: bool = Field(
@@ -161,6 +210,11 @@ class Settings(BaseSettings):
         description="Use compact prompts (~4K words) instead of full prompts (~12K words). "
                     "Compact mode reduces token usage and improves LLM focus on story requirements."
     )
+    prompt_cache_layout: bool = Field(
+        default=True,
+        description="Order static prompt sections (instructions, format, example) before per-story content "
+                    "so providers can serve the prefix from their prompt cache; Anthropic calls also mark a cache breakpoint."
+    )
     
     # Context Extraction Configuration (Query-Focused Summarization)
     enable_query_focused_extraction: bool = Field(
@@ -187,6 +241,26 @@ class Settings(BaseSettings):
         default="gpt-4o-mini",
         description="Model to use for AI-based chunk summarization."
     )
+    extraction_max_concurrency: int = Field(
+        default=8,
+        description="Maximum documents extracted concurrently across all RAG collections."
+    )
+    extraction_summary_concurrency: int = Field(
+        default=8,
+        description="Maximum concurrent chunk summarization requests."
+    )
+    extraction_summary_cache_dir: str = Field(
+        default="./data/chunk_summary_cache",
+        description="Directory for cached chunk summaries, keyed by model, chunk and story context."
+    )
+    extraction_summary_cache_max_entries: int = Field(
+        default=5000,
+        description="Cached chunk summaries kept before least recently used ones are evicted."
+    )
+    extraction_summary_cache_ttl_hours: float = Field(
+        default=168.0,
+        description="Maximum age of a cached chunk summary."
+    )
     
     # Two-Stage Generation Configuration
     use_two_stage_generation: bool = Field(
@@ -196,6 +270,14 @@ class Settings(BaseSettings):
                     "Stage 2: Generate tests from coverage plan. "
                     "This improves pattern detection and coverage completeness."
     )
+    gap_fill_shard_size: int = Field(
+        default=3,
+        description="Maximum coverage gaps per gap-filling prompt; gaps are grouped by type first"
+    )
+    gap_fill_max_concurrency: int = Field(
+        default=4,
+        description="Maximum concurrent gap-filling LLM calls"
+    )
 
 
 # Global settings instance
@@ -5,19 +5,58 @@ from __future__ import annotations
 import asyncio
 import json as json_module
 import re
-from collections import deque
+import time
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 import httpx
 from loguru import logger
 
+from src.external.http_cache import HTTPCache, content_hash
+from src.infrastructure.html_parser import ParsedHTML
+
 try:  # pragma: no cover - optional dependency
     from bs4 import BeautifulSoup  # type: ignore
 except ImportError:  # pragma: no cover
     BeautifulSoup = None  # type: ignore
 
+try:  # pragma: no cover - optional dependency
+    import lxml.html as lxml_html  # type: ignore
+except ImportError:  # pragma: no cover
+    lxml_html = None  # type: ignore
+
+
+# Common documentation content wrappers, tried in order: (tag, attributes)
+CONTENT_SELECTORS = [
+    ("main", {}),
+    ("article", {}),
+    ("div", {"class": "doc-content"}),
+    ("div", {"role": "main"}),
+    ("div", {"class": "article-content"}),
+    ("div", {"id": "doc_main_content"}),
+]
+
+# Elements whose text can label a nearby JSON example
+CONTEXT_TAGS = ["h1", "h2", "h3", "h4", "h5", "strong", "b"]
+
+
+def _xpath(name: str, attrs: Dict[str, str]) -> str:
+    """XPath for a CONTENT_SELECTORS entry (class matches one of the element's classes)."""
+    conditions = "".join(
+        f"[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]" if attr == "class"
+        else f"[@{attr}='{value}']"
+        for attr, value in attrs.items()
+    )
+    return f".//{name}{conditions}"
+
+
+def _stripped_text(node) -> str:
+    """BeautifulSoup's get_text(strip=True) for an lxml element."""
+    return "".join(part.strip() for part in node.itertext())
+
 
 @dataclass
 class ExternalDocument:
@@ -28,8 +67,48 @@ class ExternalDocument:
     html: str
 
 
+class HostRateLimiter:
+    """
+    Per-host token buckets.
+
+    Each host gets `rate` requests per second with bursts of up to `burst`,
+    shared by all workers, instead of every worker sleeping a fixed delay.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, last refill)
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, url: str) -> None:
+        """Wait until a request to the URL's host is allowed."""
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        # Waiters queue on the host lock, so tokens are handed out in order
+        async with lock:
+            now = self._clock()
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self.rate)
+                now = self._clock()
+                tokens = 1.0
+            self._buckets[host] = (tokens - 1, now)
+
+
 class ExternalDocCrawler:
-    """Async crawler with separate URL discovery and content fetching phases."""
+    """
+    Async single-pass crawler.
+
+    A bounded pool of workers pulls URLs from a normalized, de-duplicated
+    frontier; each page is downloaded and parsed once (lxml when installed,
+    BeautifulSoup otherwise), and the same parse yields both its links and
+    its document.
+    """
 
     def __init__(
         self,
@@ -38,149 +117,203 @@ class ExternalDocCrawler:
         delay: float = 0.5,
         max_depth: int = 10,
         user_agent: str = "WombaExternalDocIndexer/1.0",
+        concurrency: int = 8,
+        burst: int = 2,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        http_cache: Optional[HTTPCache] = None,
     ) -> None:
+        """
+        Initialize the crawler.
+
+        Args:
+            base_url: Entry point; links are followed within its host
+            max_pages: Maximum pages to fetch
+            delay: Minimum average seconds between requests per host
+                (token bucket refill interval; 0 = unlimited)
+            max_depth: Maximum link depth from the entry point
+            user_agent: User-Agent header
+            concurrency: Concurrent workers
+            burst: Requests per host allowed back-to-back before pacing applies
+            transport: Optional httpx transport (for tests)
+            http_cache: Validator cache for conditional re-crawls (optional)
+        """
         self.base_url = base_url.rstrip("/")
         self.max_pages = max_pages
         self.delay = delay
         self.max_depth = max_depth
         self.user_agent = user_agent
+        self.concurrency = max(1, concurrency)
+        self.transport = transport
+        self.http_cache = http_cache
+        self.rate_limiter = HostRateLimiter(1 / delay if delay > 0 else 0, burst)
 
         parsed = urlparse(self.base_url)
-        self.allowed_netloc = parsed.netloc
+        self.allowed_netloc = parsed.netloc.lower()
         self.base_path = parsed.path.rstrip("/") or "/"
 
+        # Documents from the last crawl, by URL, so fetch_content() can reuse them
+        self._documents: Dict[str, ExternalDocument] = {}
+        # Outcome of the last crawl
+        self.stats: Counter = Counter()
+        self.reached_urls: List[str] = []
+        self.gone_urls: List[str] = []
+        self.truncated = False
+
     def is_available(self) -> bool:
         """Check if required dependencies are available."""
-        if BeautifulSoup is None:
-            logger.warning("External doc crawler unavailable: install beautifulsoup4")
+        if BeautifulSoup is None and lxml_html is None:
+            logger.warning("External doc crawler unavailable: install beautifulsoup4 or lxml")
             return False
         return True
 
-    async def discover_urls(self) -> List[str]:
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            headers={"User-Agent": self.user_agent, "Accept": "text/html"},
+            timeout=30.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            transport=self.transport,
+        )
+
+    async def crawl(self) -> List[ExternalDocument]:
         """
-        Phase 1: Crawl from base URL to discover all documentation pages.
-        Uses BFS to find all linked pages within the allowed domain.
-        Returns list of URLs to fetch.
+        Full crawl (discovery + fetching in one pass).
+
+        With an http_cache, pages are requested conditionally; pages that
+        answer 304 or return an identical body are not parsed and produce no
+        document (their links come from the cache). Per-run counts are in
+        self.stats and the pages reached in self.reached_urls.
+
+        Returns:
+            Documents for new or changed pages, in discovery (BFS) order
         """
         if not self.is_available():
             return []
 
-        logger.info(f"🔍 Starting URL discovery from {self.base_url}")
-        
-        visited: Set[str] = set()
-        to_visit: deque = deque([(self.base_url, 0)])  # (url, depth)
-        discovered_urls: List[str] = []
-        
-        async with httpx.AsyncClient(
-            headers={"User-Agent": self.user_agent, "Accept": "text/html"},
-            timeout=30.0,
-            follow_redirects=True
-        ) as client:
-            while to_visit:
-                current_url, depth = to_visit.popleft()
-                
-                if depth > self.max_depth:
-                    continue
-                    
-                if current_url in visited:
-                    continue
-                
-                if len(discovered_urls) >= self.max_pages:
-                    logger.info(f"⚠️  Reached max_pages limit ({self.max_pages}), stopping discovery")
-                    break
-                    
-                visited.add(current_url)
-                discovered_urls.append(current_url)
-                logger.debug(f"📄 Discovered [{len(discovered_urls)}/{self.max_pages}]: {current_url} (depth={depth})")
-                
-                # Fetch the page to find more links
-                html = await self._fetch(client, current_url)
-                if not html:
-                    continue
-                    
-                soup = BeautifulSoup(html, "html.parser")
-                links = self._extract_links(soup)
-                
-                for link in links:
-                    # Convert relative URLs to absolute
-                    absolute_url = urljoin(current_url, link)
-                    normalized_url = self._normalize_url(absolute_url)
-                    
-                    if normalized_url and normalized_url not in visited:
-                        to_visit.append((normalized_url, depth + 1))
-                
-                # Rate limiting - ASYNC sleep
-                if self.delay > 0:
-                    await asyncio.sleep(self.delay)
-        
-        logger.info(f"✅ Discovered {len(discovered_urls)} URLs to fetch")
-        return discovered_urls
+        logger.info(f"🔍 Crawling {self.base_url} (workers={self.concurrency}, max_pages={self.max_pages})")
+
+        start_url = self._normalize_url(self.base_url) or self.base_url
+        frontier: asyncio.Queue = asyncio.Queue()
+        order: Dict[str, int] = {start_url: 0}  # Every URL ever admitted, with its discovery index
+        frontier.put_nowait((start_url, 0))
+        documents: Dict[str, ExternalDocument] = {}
+        reached: Set[str] = set()
+        self.stats = Counter()
+        self.gone_urls = []
+
+        def admit(links: Iterable[str], depth: int) -> None:
+            for normalized in links:
+                if normalized not in order and len(order) < self.max_pages:
+                    order[normalized] = len(order)
+                    frontier.put_nowait((normalized, depth + 1))
+
+        async def worker(client: httpx.AsyncClient) -> None:
+            while True:
+                url, depth = await frontier.get()
+                try:
+                    state, html, headers = await self._fetch_page(client, url)
+                    self.stats[state] += 1
+                    if state == "gone":
+                        self.gone_urls.append(url)
+                    if state in ("failed", "gone"):
+                        continue
+                    reached.add(url)
+                    if state == "unchanged":
+                        if depth < self.max_depth:
+                            admit(self.http_cache.get(url).get("links", []), depth)
+                        continue
+
+                    parsed = ParsedHTML(html)
+                    links = [
+                        normalized for normalized in
+                        (self._normalize_url(urljoin(url, link)) for link in self._extract_links(parsed))
+                        if normalized
+                    ]
+                    if depth < self.max_depth:
+                        admit(links, depth)
+                    documents[url] = self._build_document(url, html, parsed)
+                    if self.http_cache is not None:
+                        self.http_cache.store(url, headers, content_hash(html), links=sorted(set(links)))
+                    logger.debug(f"📄 [{len(documents)}/{len(order)}] {url} (depth={depth}, {state})")
+                except Exception as exc:
+                    logger.warning(f"Failed to process {url}: {exc}")
+                finally:
+                    frontier.task_done()
+
+        async with self._client() as client:
+            workers = [asyncio.create_task(worker(client)) for _ in range(self.concurrency)]
+            try:
+                await frontier.join()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+        self.truncated = len(order) >= self.max_pages
+        if self.truncated:
+            logger.info(f"⚠️  Reached max_pages limit ({self.max_pages})")
+        self._documents = documents
+        self.reached_urls = sorted(reached, key=order.__getitem__)
+        result = sorted(documents.values(), key=lambda doc: order[doc.url])
+        logger.info(
+            f"✅ Crawled {len(self.reached_urls)}/{len(order)} pages from {self.base_url}: "
+            f"{self.stats['new']} new, {self.stats['changed']} changed, {self.stats['unchanged']} unchanged, "
+            f"{self.stats['gone']} gone, {self.stats['failed']} failed"
+        )
+        return result
+
+    async def discover_urls(self) -> List[str]:
+        """
+        Discover documentation pages reachable from the base URL.
+
+        Runs the single-pass crawl; the fetched documents are kept, so a
+        following fetch_content() on these URLs makes no further requests.
+
+        Returns:
+            URLs of the pages found, in discovery order
+        """
+        await self.crawl()
+        return list(self.reached_urls)
 
     async def fetch_content(self, urls: Optional[List[str]] = None) -> List[ExternalDocument]:
         """
-        Phase 2: Fetch full content via ASYNC GET requests.
-        
+        Fetch documents for URLs, reusing pages already fetched by a crawl.
+
         Args:
-            urls: List of URLs to fetch. If None, will discover URLs first.
-            
+            urls: List of URLs to fetch. If None, crawls from the base URL.
+
         Returns:
-            List of ExternalDocument objects with full HTML content.
+            List of ExternalDocument objects with full HTML content (input order).
         """
         if not self.is_available():
             return []
 
         if urls is None:
-            urls = await self.discover_urls()
+            return await self.crawl()
 
         if not urls:
             logger.warning("No URLs to fetch content for")
             return []
 
-        documents: List[ExternalDocument] = []
-        total = len(urls)
+        missing = [url for url in dict.fromkeys(urls) if url not in self._documents]
+        if missing:
+            logger.info(f"🚀 Fetching {len(missing)} URLs ({len(urls) - len(missing)} already crawled)")
+            semaphore = asyncio.Semaphore(self.concurrency)
 
-        logger.info(f"🚀 Fetching content for {total} URLs via async GET requests...")
-
-        async with httpx.AsyncClient(
-            headers={"User-Agent": self.user_agent, "Accept": "text/html"},
-            timeout=30.0,
-            follow_redirects=True
-        ) as client:
-            for i, url in enumerate(urls, 1):
-                logger.info(f"📥 [{i}/{total}] GET {url}")
-                html = await self._fetch(client, url)
+            async def fetch_one(client: httpx.AsyncClient, url: str) -> None:
+                async with semaphore:
+                    html = await self._fetch(client, url)
                 if not html:
                     logger.warning(f"❌ Failed to fetch content from {url}")
-                    continue
+                    return
+                self._documents[url] = self._build_document(url, html, ParsedHTML(html))
 
-                soup = BeautifulSoup(html, "html.parser")
-                content_node = self._extract_content_node(soup)
-                content_html = content_node.decode() if content_node else html
-                
-                # Extract JSON examples and append them
-                json_examples = self._extract_json_examples(soup)
-                if json_examples:
-                    content_html += "\n\n=== JSON EXAMPLES ===\n" + "\n\n".join(json_examples)
-                    logger.info(f"   Extracted {len(json_examples)} JSON examples")
-                
-                title = self._extract_title(soup, url)
-
-                documents.append(ExternalDocument(url=url, title=title, html=content_html))
-                logger.info(f"✅ [{i}/{total}] Fetched: {title}")
-
-                # Rate limiting - ASYNC sleep
-                if self.delay > 0:
-                    await asyncio.sleep(self.delay)
-
-        logger.info(f"✅ Content fetching complete: {len(documents)}/{total} pages successfully fetched")
-        return documents
+            async with self._client() as client:
+                await asyncio.gather(*(fetch_one(client, url) for url in missing))
 
-    async def crawl(self) -> List[ExternalDocument]:
-        """
-        Full crawl (discovery + fetching in one pass).
-        """
-        urls = await self.discover_urls()
-        return await self.fetch_content(urls)
+        documents = [self._documents[url] for url in dict.fromkeys(urls) if url in self._documents]
+        logger.info(f"✅ Content fetching complete: {len(documents)}/{len(urls)} pages available")
+        return documents
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -191,7 +324,7 @@ class ExternalDocCrawler:
         if not url:
             return None
         parsed = urlparse(url)
-        if parsed.netloc != self.allowed_netloc:
+        if parsed.scheme not in ("http", "https") or parsed.netloc.lower() != self.allowed_netloc:
             return None
         path = parsed.path or "/"
         
@@ -205,92 +338,162 @@ class ExternalDocCrawler:
             return None
             
         # Remove query params and fragments for canonical form
-        normalized = parsed._replace(query="", fragment="").geturl().rstrip("/")
+        normalized = parsed._replace(
+            scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower(), query="", fragment=""
+        ).geturl().rstrip("/")
         return normalized
 
-    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
-        """Fetch HTML content via async GET request."""
+    def _build_document(self, url: str, html: str, parsed: ParsedHTML) -> ExternalDocument:
+        """Build the document for a page from its (single) parse."""
+        content_node = self._extract_content_node(parsed)
+        if content_node is None:
+            content_html = html
+        elif parsed.use_lxml:
+            content_html = lxml_html.tostring(content_node, encoding="unicode", with_tail=False)
+        else:
+            content_html = content_node.decode()
+
+        # Extract JSON examples and append them
+        json_examples = self._extract_json_examples(parsed)
+        if json_examples:
+            content_html += "\n\n=== JSON EXAMPLES ===\n" + "\n\n".join(json_examples)
+
+        return ExternalDocument(url=url, title=self._extract_title(parsed, url), html=content_html)
+
+    async def _get(
+        self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Optional[httpx.Response]:
+        """Send a GET request (paced per host); None on network errors."""
+        await self.rate_limiter.acquire(url)
         try:
-            response = await client.get(url)
-            if response.status_code == 404:
-                logger.debug(f"Page not found (404): {url}")
-                return None
-            if response.status_code != 200:
-                logger.warning(f"External doc crawler HTTP {response.status_code} for {url}")
-                return None
-            return response.text
+            return await client.get(url, headers=headers)
         except httpx.TimeoutException:
             logger.warning(f"Timeout fetching {url}")
-            return None
         except httpx.RequestError as exc:
             logger.warning(f"External doc crawler failed to fetch {url}: {exc}")
-            return None
         except Exception as exc:  # pragma: no cover - network issues
             logger.warning(f"Unexpected error fetching {url}: {exc}")
+        return None
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> Optional[str]:
+        """Fetch HTML content via async GET request (paced per host)."""
+        response = await self._get(client, url)
+        if response is None:
+            return None
+        if response.status_code == 404:
+            logger.debug(f"Page not found (404): {url}")
             return None
+        if response.status_code != 200:
+            logger.warning(f"External doc crawler HTTP {response.status_code} for {url}")
+            return None
+        return response.text
+
+    async def _fetch_page(
+        self, client: httpx.AsyncClient, url: str
+    ) -> Tuple[str, Optional[str], Mapping[str, str]]:
+        """
+        Fetch a page, conditionally when it is in the HTTP cache.
+
+        Returns:
+            (state, html, response headers); state is 'new', 'changed',
+            'unchanged' (304 or identical body, html None), 'gone' (404/410)
+            or 'failed'
+        """
+        entry = self.http_cache.get(url) if self.http_cache is not None else None
+        headers = self.http_cache.conditional_headers(url) if entry else None
+        response = await self._get(client, url, headers)
+        if response is None:
+            return "failed", None, {}
+        if response.status_code == 304 and entry:
+            return "unchanged", None, response.headers
+        if response.status_code in (404, 410):
+            logger.debug(f"Page not found ({response.status_code}): {url}")
+            if self.http_cache is not None:
+                self.http_cache.remove(url)
+            return "gone", None, response.headers
+        if response.status_code != 200:
+            logger.warning(f"External doc crawler HTTP {response.status_code} for {url}")
+            return "failed", None, response.headers
 
-    def _extract_links(self, soup) -> Set[str]:
+        html = response.text
+        if entry and entry.get("content_hash") == content_hash(html):
+            # Server ignores validators but the body is identical; refresh them
+            self.http_cache.store(url, response.headers, entry["content_hash"], links=entry.get("links", []))
+            return "unchanged", None, response.headers
+        return ("changed" if entry else "new"), html, response.headers
+
+    def _extract_links(self, parsed: ParsedHTML) -> Set[str]:
         """Extract all href links from HTML."""
-        links: Set[str] = set()
-        for tag in soup.find_all("a", href=True):
-            href = tag.get("href")
-            if not href:
-                continue
-            # Skip anchors
-            if href.startswith("#"):
-                continue
-            links.add(href)
-        return links
-
-    def _extract_title(self, soup, fallback: str) -> str:
+        return {href for href in parsed.links if href}
+
+    def _extract_title(self, parsed: ParsedHTML, fallback: str) -> str:
         """Extract page title from HTML."""
-        if soup.title and soup.title.string:
-            return soup.title.string.strip()
-        heading = soup.find(["h1", "h2"])
-        if heading and heading.get_text(strip=True):
-            return heading.get_text(strip=True)
+        root = parsed.root
+        if root is not None:
+            if parsed.use_lxml:
+                title = root.find(".//title")
+                if title is not None and title.text:
+                    return title.text.strip()
+                heading = next(root.iter("h1", "h2"), None)
+                heading_text = _stripped_text(heading) if heading is not None else ""
+            else:
+                if root.title and root.title.string:
+                    return root.title.string.strip()
+                heading = root.find(["h1", "h2"])
+                heading_text = heading.get_text(strip=True) if heading else ""
+            if heading_text:
+                return heading_text
         # Fallback to URL path
-        parsed = urlparse(fallback)
-        return parsed.path.split("/")[-1] or fallback
+        parsed_url = urlparse(fallback)
+        return parsed_url.path.split("/")[-1] or fallback
 
-    def _extract_content_node(self, soup):
-        """Extract main content node from HTML."""
+    def _extract_content_node(self, parsed: ParsedHTML):
+        """Extract main content node from HTML (None for an empty page)."""
+        root = parsed.root
+        if root is None:
+            return None
         # Try common documentation wrappers first
-        selectors = [
-            ("main", {}),
-            ("article", {}),
-            ("div", {"class": "doc-content"}),
-            ("div", {"role": "main"}),
-            ("div", {"class": "article-content"}),
-            ("div", {"id": "doc_main_content"}),
-        ]
-        for name, attrs in selectors:
-            node = soup.find(name, attrs=attrs)
-            if node:
+        for name, attrs in CONTENT_SELECTORS:
+            if parsed.use_lxml:
+                node = next(iter(root.xpath(_xpath(name, attrs))), None)
+            else:
+                node = root.find(name, attrs=attrs)
+            if node is not None:
                 return node
         # Fallback to body if nothing found
-        return soup.body or soup
+        if parsed.use_lxml:
+            return root.find("body") if root.find("body") is not None else root
+        return root.body or root
     
-    def _extract_json_examples(self, soup) -> List[str]:
+    def _extract_json_examples(self, parsed: ParsedHTML) -> List[str]:
         """Extract JSON code examples from HTML with context."""
         json_examples = []
+        root = parsed.root
+        if root is None:
+            return json_examples
         
         # Find all code/pre tags that might contain JSON
-        code_tags = soup.find_all(['code', 'pre'])
+        code_tags = root.iter("code", "pre") if parsed.use_lxml else root.find_all(["code", "pre"])
         
         for tag in code_tags:
-            text = tag.get_text(strip=False)
-            
             # Get context from surrounding text (headers, labels)
             context = ""
-            parent = tag.parent
-            if parent:
-                # Look for nearby headers or labels
-                for sibling in parent.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'strong', 'b'], limit=5):
-                    sibling_text = sibling.get_text(strip=True).lower()
-                    if any(keyword in sibling_text for keyword in ['request', 'body', 'payload', 'example', 'response']):
-                        context = sibling.get_text(strip=True)
-                        break
+            if parsed.use_lxml:
+                text = tag.text_content()
+                parent = tag.getparent()
+                labels = (
+                    (_stripped_text(node) for node in parent.iter(*CONTEXT_TAGS) if node is not parent)
+                    if parent is not None else ()
+                )
+            else:
+                text = tag.get_text(strip=False)
+                parent = tag.parent
+                labels = (node.get_text(strip=True) for node in parent.find_all(CONTEXT_TAGS)) if parent else ()
+            # Look for nearby headers or labels
+            for label in islice(labels, 5):
+                if any(keyword in label.lower() for keyword in ['request', 'body', 'payload', 'example', 'response']):
+                    context = label
+                    break
             
             # Look for JSON patterns (starts with { or [)
             # Try to find complete JSON objects
@@ -301,9 +504,9 @@ class ExternalDocCrawler:
                 potential_json = match.group(1)
                 # Try to parse to validate it's real JSON
                 try:
-                    parsed = json_module.loads(potential_json)
+                    parsed_json = json_module.loads(potential_json)
                     # Re-format for readability
-                    formatted = json_module.dumps(parsed, indent=2)
+                    formatted = json_module.dumps(parsed_json, indent=2)
                     if len(formatted) > 20:  # Skip trivial examples
                         # Add context if available
                         if context:
@@ -1,11 +1,23 @@
 """
 GitLab Swagger/OpenAPI fetcher for indexing API documentation.
+
+GitLabSwaggerFetcher uses the synchronous python-gitlab client.
+AsyncGitLabSwaggerFetcher refreshes the openapi project incrementally: it
+lists the spec directory once, compares blob SHAs with a manifest of the
+last indexed run and downloads only new or changed specs, concurrently.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import os
 from dataclasses import dataclass
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+import httpx
 from loguru import logger
 
 from src.integrations.gitlab_client import GitLabClient
@@ -22,6 +34,21 @@ class SwaggerDocument:
     project_url: str
     branch: str
     project_id: int
+    blob_sha: Optional[str] = None
+
+
+OPENAPI_PROJECT_PATH = 'openapi'
+SPEC_DIR = 'master/specfiles'
+SPEC_REF = 'master'
+SPEC_EXTENSIONS = ('.yaml', '.yml', '.json')
+
+
+def _is_spec_file(item: Dict[str, Any]) -> bool:
+    return item['type'] == 'blob' and item['name'].endswith(SPEC_EXTENSIONS)
+
+
+def _spec_service_name(file_name: str) -> str:
+    return file_name.replace('.yaml', '').replace('.yml', '').replace('.json', '')
 
 
 class GitLabSwaggerFetcher:
@@ -91,7 +118,7 @@ class GitLabSwaggerFetcher:
         # Find the "openapi" project
         swagger_docs = []
         for project in projects:
-            if project['path'].lower() == 'openapi':
+            if project['path'].lower() == OPENAPI_PROJECT_PATH:
                 logger.info(f"Found openapi project: {project['name']} (ID: {project['id']})")
                 docs = self._fetch_from_openapi_project(project)
                 swagger_docs.extend(docs)
@@ -116,11 +143,11 @@ class GitLabSwaggerFetcher:
         swagger_docs = []
         project_id = project['id']
         project_url = project['web_url']
-        branch = 'master'  # The URL shows master branch
+        branch = SPEC_REF  # The URL shows master branch
         
         try:
             # List files in master/specfiles directory
-            specfiles_dir = self.client.list_directory(project_id, 'master/specfiles', ref=branch)
+            specfiles_dir = self.client.list_directory(project_id, SPEC_DIR, ref=branch)
             
             if not specfiles_dir:
                 logger.warning("No master/specfiles/ directory found")
@@ -130,15 +157,15 @@ class GitLabSwaggerFetcher:
             
             # Fetch all YAML/JSON files
             for item in specfiles_dir:
-                if item['type'] == 'blob' and (item['name'].endswith('.yaml') or item['name'].endswith('.yml') or item['name'].endswith('.json')):
-                    file_path = f"master/specfiles/{item['name']}"
+                if _is_spec_file(item):
+                    file_path = f"{SPEC_DIR}/{item['name']}"
                     try:
                         content = self.client.get_file_content(project_id, file_path, ref=branch)
                         
                         if content:
                             logger.info(f"✅ Fetched {file_path}")
                             swagger_docs.append(SwaggerDocument(
-                                service_name=item['name'].replace('.yaml', '').replace('.yml', '').replace('.json', ''),
+                                service_name=_spec_service_name(item['name']),
                                 file_path=file_path,
                                 content=content,
                                 project_url=project_url,
@@ -238,3 +265,203 @@ class GitLabSwaggerFetcher:
         
         return swagger_docs
 
+
+
+class AsyncGitLabSwaggerFetcher:
+    """
+    Incremental, concurrent fetcher for the openapi project's spec files.
+    
+    Talks to the GitLab REST API with httpx. The spec directory is listed
+    once per refresh; a spec is downloaded (by blob SHA) only when its SHA
+    differs from the manifest of the last indexed run, so unchanged specs
+    cost no download and no embedding. The manifest is written by
+    save_manifest(), after the returned documents have been indexed.
+    """
+    
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        base_url: Optional[str] = None,
+        group_path: Optional[str] = None,
+        manifest_path: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the async Swagger fetcher.
+        
+        Args:
+            token: GitLab personal access token (defaults to settings)
+            base_url: GitLab base URL (defaults to settings)
+            group_path: GitLab group path (defaults to settings)
+            manifest_path: Manifest of indexed blob SHAs (defaults to settings)
+            max_concurrency: Concurrent spec downloads (defaults to settings)
+            transport: Optional httpx transport (for tests)
+        """
+        self.token = token or settings.gitlab_token
+        self.api_url = (base_url or settings.gitlab_base_url).rstrip('/') + '/api/v4'
+        self.group_path = group_path or settings.gitlab_group_path
+        self.manifest_path = Path(manifest_path or settings.gitlab_swagger_manifest_path)
+        self.max_concurrency = max(1, max_concurrency or settings.gitlab_swagger_max_concurrency)
+        self.transport = transport
+        # Counts and removed specs from the last fetch_changed() run
+        self.stats: Dict[str, Any] = {}
+        self._pending_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+    
+    def is_available(self) -> bool:
+        """Check if GitLab integration is available and enabled."""
+        if not settings.gitlab_swagger_enabled:
+            logger.info("GitLab Swagger indexing is disabled in settings")
+            return False
+        
+        if not self.token:
+            logger.warning("GitLab token not configured")
+            return False
+        
+        if not self.group_path:
+            logger.warning("GitLab group path not configured, skipping Swagger fetch")
+            return False
+        
+        return True
+    
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.api_url,
+            headers={"PRIVATE-TOKEN": self.token},
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency),
+            transport=self.transport,
+        )
+    
+    def load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Manifest of the last indexed run: file path -> {sha, service_name} (empty if missing)."""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable Swagger manifest {self.manifest_path}: {e}")
+            return {}
+    
+    def save_manifest(self) -> None:
+        """Record the specs returned by the last fetch_changed() run as indexed."""
+        if self._pending_manifest is None:
+            return
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._pending_manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.manifest_path)
+            self._pending_manifest = None
+        except Exception as e:
+            logger.warning(f"Failed to save Swagger manifest {self.manifest_path}: {e}")
+    
+    async def _get_paged(self, client: httpx.AsyncClient, path: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """GET every page of a list endpoint (follows X-Next-Page)."""
+        items: List[Dict[str, Any]] = []
+        page = '1'
+        while page:
+            response = await client.get(path, params={**params, 'per_page': 100, 'page': page})
+            response.raise_for_status()
+            items.extend(response.json())
+            page = response.headers.get('x-next-page', '')
+        return items
+    
+    async def _find_openapi_project(self, client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+        projects = await self._get_paged(
+            client,
+            f"/groups/{quote(self.group_path, safe='')}/projects",
+            {'include_subgroups': 'true', 'search': OPENAPI_PROJECT_PATH, 'simple': 'true'},
+        )
+        for project in projects:
+            if project['path'].lower() == OPENAPI_PROJECT_PATH:
+                return project
+        return None
+    
+    async def fetch_changed(self, force_refresh: bool = False) -> List[SwaggerDocument]:
+        """
+        Fetch the specs that are new or changed since the last indexed run.
+        
+        The run's counts and the specs that disappeared (service_name and
+        file_path) are left in self.stats. Listing errors raise, so a failed
+        listing never reports specs as removed.
+        
+        Args:
+            force_refresh: Ignore the manifest and download every spec
+            
+        Returns:
+            List of SwaggerDocument objects (with blob_sha set)
+        """
+        self.stats = {}
+        manifest = {} if force_refresh else self.load_manifest()
+        
+        async with self._client() as client:
+            project = await self._find_openapi_project(client)
+            if project is None:
+                logger.warning(f"No openapi project found in {self.group_path}")
+                return []
+            logger.info(f"Found openapi project: {project['name']} (ID: {project['id']})")
+            
+            tree = await self._get_paged(
+                client,
+                f"/projects/{project['id']}/repository/tree",
+                {'path': SPEC_DIR, 'ref': SPEC_REF},
+            )
+            specs = [item for item in tree if _is_spec_file(item)]
+            to_fetch = [item for item in specs if manifest.get(item['path'], {}).get('sha') != item['id']]
+            logger.info(
+                f"Found {len(specs)} specs in {SPEC_DIR}/ ({len(to_fetch)} new or changed, "
+                f"{len(specs) - len(to_fetch)} unchanged)"
+            )
+            
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def download(item: Dict[str, Any]) -> Optional[SwaggerDocument]:
+                async with semaphore:
+                    try:
+                        response = await client.get(f"/projects/{project['id']}/repository/blobs/{item['id']}/raw")
+                        response.raise_for_status()
+                    except httpx.HTTPError as e:
+                        logger.warning(f"Failed to fetch {item['path']}: {e}")
+                        return None
+                logger.info(f"✅ Fetched {item['path']}")
+                return SwaggerDocument(
+                    service_name=_spec_service_name(item['name']),
+                    file_path=item['path'],
+                    content=response.content.decode('utf-8', errors='replace'),
+                    project_url=project['web_url'],
+                    branch=SPEC_REF,
+                    project_id=project['id'],
+                    blob_sha=item['id'],
+                )
+            
+            fetched = await asyncio.gather(*(download(item) for item in to_fetch))
+        
+        docs = [doc for doc in fetched if doc is not None]
+        current = {item['path'] for item in specs}
+        removed = [
+            {'service_name': entry['service_name'], 'file_path': path}
+            for path, entry in manifest.items() if path not in current
+        ]
+        
+        # Failed downloads keep their previous entry (or none), so the next run retries them
+        pending = {path: entry for path, entry in manifest.items() if path in current}
+        for doc in docs:
+            pending[doc.file_path] = {'sha': doc.blob_sha, 'service_name': doc.service_name}
+        self._pending_manifest = pending
+        
+        new = sum(1 for doc in docs if doc.file_path not in manifest)
+        self.stats = {
+            'new': new,
+            'changed': len(docs) - new,
+            'unchanged': len(specs) - len(to_fetch),
+            'failed': len(to_fetch) - len(docs),
+            'removed': removed,
+        }
+        logger.info(
+            f"Swagger specs: {self.stats['new']} new, {self.stats['changed']} changed, "
+            f"{self.stats['unchanged']} unchanged, {len(removed)} removed, {self.stats['failed']} failed"
+        )
+        return docs
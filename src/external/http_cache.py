@@ -0,0 +1,113 @@
+"""
+On-disk validator cache for conditional re-crawls.
+
+Per URL it keeps the response's ETag / Last-Modified, a hash of the body and
+caller data (e.g. the page's outgoing links), so a re-crawl can send
+If-None-Match / If-Modified-Since and skip parsing, document building and
+re-embedding for pages that answer 304 or come back byte-identical.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from loguru import logger
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a response body."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class HTTPCache:
+    """JSON-file cache of HTTP validators keyed by URL."""
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        Load the cache file (a missing or corrupt file starts empty).
+
+        Args:
+            path: Cache file path
+        """
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable HTTP cache {self.path}: {e}")
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for a URL, if any."""
+        return self.entries.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a URL (empty if unknown)."""
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, headers: Mapping[str, str], body_hash: str, **data: Any) -> None:
+        """
+        Record the validators and body hash of a 200 response.
+
+        Args:
+            url: Requested URL
+            headers: Response headers
+            body_hash: content_hash() of the body
+            **data: Extra values to keep with the entry
+        """
+        self.entries[url] = {
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "content_hash": body_hash,
+            "checked_at": time.time(),
+            **data,
+        }
+
+    def remove(self, url: str) -> None:
+        """Forget a URL."""
+        self.entries.pop(url, None)
+
+    def prune(self, keep: Iterable[str]) -> List[str]:
+        """
+        Forget every URL not in keep.
+
+        Args:
+            keep: URLs reached by the latest complete crawl
+
+        Returns:
+            The URLs removed
+        """
+        keep = set(keep)
+        removed = [url for url in self.entries if url not in keep]
+        for url in removed:
+            del self.entries[url]
+        return removed
+
+    def clear(self) -> None:
+        """Forget all URLs."""
+        self.entries = {}
+
+    def save(self) -> None:
+        """Write the cache atomically."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save HTTP cache {self.path}: {e}")
@@ -1,17 +1,177 @@
 """
 Centralized HTML parsing and text extraction service.
-Uses BeautifulSoup4 for robust HTML parsing.
+
+Documents are parsed once into a ParsedHTML, which exposes text, title,
+links and code blocks from that single tree. lxml is used when installed
+(much faster than BeautifulSoup's pure-Python html.parser); BeautifulSoup4
+is the fallback. strip_html_batch() cleans many pages in a process pool.
 """
 
+import os
 import re
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from html import escape
+from typing import List, Optional, Sequence
+from urllib.parse import urljoin
 from loguru import logger
 
 try:
-    from bs4 import BeautifulSoup, Tag  # type: ignore
+    from bs4 import BeautifulSoup, CData, NavigableString, Tag  # type: ignore
 except ImportError:  # pragma: no cover
     BeautifulSoup = None  # type: ignore
-    Tag = None  # type: ignore
+    CData = NavigableString = Tag = None  # type: ignore
+
+try:
+    import lxml.html as lxml_html  # type: ignore
+    from lxml import etree  # type: ignore
+except ImportError:  # pragma: no cover
+    lxml_html = None  # type: ignore
+    etree = None  # type: ignore
+
+
+# Parser used when none is requested: the lxml fast path if available
+DEFAULT_PARSER = "lxml" if lxml_html is not None else "html.parser"
+
+# Elements whose text is not page content
+NON_CONTENT_TAGS = frozenset({"script", "style", "nav", "header", "footer"})
+
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+
+
+def _normalize_text(text: str) -> str:
+    """Whitespace clean-up shared by all backends."""
+    text = re.sub(r"\r", "\n", text)  # Normalize line endings
+    text = re.sub(r"\n{3,}", "\n\n", text)  # Collapse multiple newlines
+    text = re.sub(r"[ \t]+", " ", text)  # Collapse multiple spaces
+    return text.strip()
+
+
+class ParsedHTML:
+    """
+    A single parse of an HTML document.
+
+    Text, title, links and code blocks are computed lazily from the same
+    tree, so callers needing several of them pay for one parse. The tree
+    is never mutated.
+    """
+
+    def __init__(self, html: str, parser: str = DEFAULT_PARSER):
+        """
+        Parse HTML.
+        
+        Args:
+            html: HTML content
+            parser: "lxml" for the lxml fast path, otherwise a BeautifulSoup
+                parser name (e.g. html.parser)
+        """
+        self.html = html or ""
+        self.use_lxml = parser == "lxml" and lxml_html is not None
+        if not self.use_lxml and BeautifulSoup is None:
+            raise ImportError(
+                "BeautifulSoup4 or lxml is required for HTML parsing. "
+                "Install it with: pip install beautifulsoup4 lxml"
+            )
+        if self.use_lxml:
+            self.root = self._parse_lxml(self.html)
+        else:
+            self.root = BeautifulSoup(self.html, parser)
+
+    @staticmethod
+    def _parse_lxml(html: str):
+        if not html.strip():
+            return None
+        # libxml2's HTML parser drops CDATA sections (Confluence code macros); keep their text
+        if "<![CDATA[" in html:
+            html = _CDATA_RE.sub(lambda m: escape(m.group(1), quote=False), html)
+        try:
+            return lxml_html.document_fromstring(html)
+        except etree.ParserError:  # Document is empty (e.g. only comments)
+            return None
+
+    @cached_property
+    def text(self) -> str:
+        """Readable text without scripts, styles and navigation, line breaks preserved."""
+        if self.root is None:
+            return ""
+        strings = self._lxml_strings() if self.use_lxml else self._bs4_strings()
+        return _normalize_text("\n".join(strings))
+
+    def _lxml_strings(self):
+        walker = etree.iterwalk(self.root, events=("start", "end", "comment"))
+        for event, element in walker:
+            if event == "comment":
+                if element.tail:
+                    yield element.tail
+            elif event == "start":
+                if element.tag in NON_CONTENT_TAGS:
+                    walker.skip_subtree()
+                elif element.text:
+                    yield element.text
+            elif element.tail and element is not self.root:
+                yield element.tail
+
+    def _bs4_strings(self):
+        nodes = self.root.descendants
+        for node in nodes:
+            if isinstance(node, Tag) and node.name in NON_CONTENT_TAGS:
+                # Skip the subtree: descendants are yielded in document order
+                for _ in node.descendants:
+                    next(nodes, None)
+            elif type(node) in (NavigableString, CData):
+                yield str(node)
+
+    @cached_property
+    def title(self) -> Optional[str]:
+        """<title> text, else the text of a plain <h1>; None if neither."""
+        if self.root is None:
+            return None
+        if self.use_lxml:
+            title = self.root.find(".//title")
+            if title is not None and title.text and title.text.strip():
+                return title.text.strip()[:200]
+            h1 = self.root.find(".//h1")
+            text = self._lxml_single_string(h1) if h1 is not None else None
+        else:
+            if self.root.title and self.root.title.string:
+                return self.root.title.string.strip()[:200]
+            h1 = self.root.find("h1")
+            text = h1.string if h1 else None
+        return text.strip()[:200] if text else None
+
+    @staticmethod
+    def _lxml_single_string(element) -> Optional[str]:
+        """Text of an element holding a single string (BeautifulSoup's .string)."""
+        while len(element) == 1 and not element.text and not element[0].tail:
+            element = element[0]
+        return element.text if len(element) == 0 else None
+
+    @cached_property
+    def links(self) -> List[str]:
+        """href values of <a> tags, without fragment-only and javascript: links."""
+        if self.root is None:
+            return []
+        if self.use_lxml:
+            hrefs = [a.get("href") for a in self.root.iter("a") if a.get("href") is not None]
+        else:
+            hrefs = [a["href"] for a in self.root.find_all("a", href=True)]
+        return [href for href in hrefs if not href.startswith(("#", "javascript:"))]
+
+    @cached_property
+    def code_blocks(self) -> List[str]:
+        """Text of <pre> blocks, then of <code> tags outside <pre>."""
+        if self.root is None:
+            return []
+        if self.use_lxml:
+            blocks = [pre.text_content() for pre in self.root.iter("pre")]
+            blocks += [
+                code.text_content() for code in self.root.iter("code")
+                if next(code.iterancestors("pre"), None) is None
+            ]
+        else:
+            blocks = [pre.get_text() for pre in self.root.find_all("pre")]
+            blocks += [code.get_text() for code in self.root.find_all("code") if not code.find_parent("pre")]
+        return blocks
 
 
 class HTMLParser:
@@ -22,22 +182,37 @@ class HTMLParser:
     - Tag/script/style removal
     - HTML entity handling
     - Title extraction
+    
+    Each method parses its input; use parse() to get several results
+    from one parse.
     """
 
-    def __init__(self, parser: str = "html.parser"):
+    def __init__(self, parser: str = DEFAULT_PARSER):
         """
         Initialize HTML parser.
         
         Args:
-            parser: Parser to use (html.parser, lxml, html5lib)
+            parser: Parser to use (lxml, html.parser, html5lib)
         """
-        if BeautifulSoup is None:
+        if BeautifulSoup is None and lxml_html is None:
             raise ImportError(
                 "BeautifulSoup4 is required for HTML parsing. "
                 "Install it with: pip install beautifulsoup4"
             )
         self.parser = parser
 
+    def parse(self, html: str) -> ParsedHTML:
+        """
+        Parse HTML once for text, title, links and code blocks.
+        
+        Args:
+            html: HTML content
+            
+        Returns:
+            Parsed document
+        """
+        return ParsedHTML(html, self.parser)
+
     def strip_html_tags(self, html: str) -> str:
         """
         Convert HTML to readable text by removing scripts, styles, and tags.
@@ -52,24 +227,9 @@ class HTMLParser:
             return ""
 
         try:
-            soup = BeautifulSoup(html, self.parser)
-            
-            # Remove script, style, nav, header, footer elements
-            for tag in soup(["script", "style", "nav", "header", "footer"]):
-                tag.decompose()
-            
-            # Get text with preserved line breaks
-            text = soup.get_text("\n")
-            
-            # Clean up whitespace
-            text = re.sub(r"\r", "\n", text)  # Normalize line endings
-            text = re.sub(r"\n{3,}", "\n\n", text)  # Collapse multiple newlines
-            text = re.sub(r"[ \t]+", " ", text)  # Collapse multiple spaces
-            
-            return text.strip()
-            
+            return self.parse(html).text
         except Exception as e:
-            logger.warning(f"BeautifulSoup parsing failed: {e}, using regex fallback")
+            logger.warning(f"HTML parsing failed: {e}, using regex fallback")
             return self._strip_html_regex_fallback(html)
 
     def _strip_html_regex_fallback(self, html: str) -> str:
@@ -119,19 +279,7 @@ class HTMLParser:
             return fallback
 
         try:
-            soup = BeautifulSoup(html, self.parser)
-            
-            # Try <title> tag first
-            if soup.title and soup.title.string:
-                return soup.title.string.strip()[:200]
-            
-            # Try <h1> tag as fallback
-            h1 = soup.find("h1")
-            if h1 and h1.string:
-                return h1.string.strip()[:200]
-            
-            return fallback
-            
+            return self.parse(html).title or fallback
         except Exception as e:
             logger.debug(f"Title extraction failed: {e}, using regex")
             return self._extract_title_regex(html, fallback)
@@ -196,21 +344,7 @@ class HTMLParser:
             List of code block contents
         """
         try:
-            soup = BeautifulSoup(html, self.parser)
-            code_blocks = []
-            
-            # Find <pre> tags (usually contain code)
-            for pre in soup.find_all("pre"):
-                code_blocks.append(pre.get_text())
-            
-            # Find standalone <code> tags (not inside <pre>)
-            for code in soup.find_all("code"):
-                # Skip if already captured in <pre>
-                if not code.find_parent("pre"):
-                    code_blocks.append(code.get_text())
-            
-            return code_blocks
-            
+            return self.parse(html).code_blocks
         except Exception as e:
             logger.warning(f"Failed to extract code blocks: {e}")
             return []
@@ -227,25 +361,11 @@ class HTMLParser:
             List of URLs
         """
         try:
-            soup = BeautifulSoup(html, self.parser)
-            links = []
-            
-            for link in soup.find_all("a", href=True):
-                href = link["href"]
-                
-                # Skip anchors and javascript links
-                if href.startswith("#") or href.startswith("javascript:"):
-                    continue
-                
-                # Handle relative URLs if base_url provided
-                if base_url and not href.startswith(("http://", "https://")):
-                    from urllib.parse import urljoin
-                    href = urljoin(base_url, href)
-                
-                links.append(href)
-            
+            links = self.parse(html).links
+            if base_url:
+                # Resolve relative links
+                links = [href if href.startswith(("http://", "https://")) else urljoin(base_url, href) for href in links]
             return links
-            
         except Exception as e:
             logger.warning(f"Failed to extract links: {e}")
             return []
@@ -278,7 +398,7 @@ class HTMLParser:
 
 
 # Create a default instance for convenience
-default_parser = HTMLParser() if BeautifulSoup else None
+default_parser = HTMLParser() if (BeautifulSoup or lxml_html) else None
 
 
 def strip_html_tags(html: str) -> str:
@@ -295,3 +415,37 @@ def extract_title(html: str, fallback: str = "Untitled") -> str:
         return default_parser.extract_title(html, fallback)
     return HTMLParser()._extract_title_regex(html, fallback)
 
+
+def parse_html(html: str) -> ParsedHTML:
+    """Convenience function for parsing HTML once with the default parser."""
+    return ParsedHTML(html)
+
+
+def strip_html_batch(
+    htmls: Sequence[str], max_workers: Optional[int] = None, min_batch: int = 64
+) -> List[str]:
+    """
+    strip_html_tags() over many documents, in a process pool for large batches.
+    
+    Parsing is CPU-bound, so threads do not help; small batches (or
+    max_workers=1) run in-process, where pool start-up would dominate.
+    
+    Args:
+        htmls: HTML documents
+        max_workers: Worker processes (None or 0 = CPU count)
+        min_batch: Smallest batch sent to the pool
+        
+    Returns:
+        Cleaned text per document, in input order
+    """
+    htmls = list(htmls)
+    workers = min(max_workers or os.cpu_count() or 1, len(htmls))
+    if workers <= 1 or len(htmls) < min_batch:
+        return [strip_html_tags(html) for html in htmls]
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(strip_html_tags, htmls, chunksize=max(1, len(htmls) // (workers * 4))))
+    except Exception as e:
+        logger.warning(f"HTML cleaning process pool failed: {e}, cleaning in-process")
+        return [strip_html_tags(html) for html in htmls]
@@ -2,8 +2,9 @@
 Zephyr Scale integration for uploading test cases.
 """
 
-from typing import Dict, List, Optional
-from collections import defaultdict
+import asyncio
+from typing import AsyncIterator, Deque, Dict, List, Optional
+from collections import defaultdict, deque
 
 import httpx
 from loguru import logger
@@ -293,43 +294,119 @@ class ZephyrIntegration:
             logger.info(f"Fetching existing test cases for project: {project_key} (max: {max_results})")
 
         all_tests = []
-        start_at = 0
-        page_size = 100
-        
-        while max_results is None or len(all_tests) < max_results:
-            url = f"{self.base_url}/testcases"
-            params = {
-                "projectKey": project_key, 
-                "maxResults": page_size,
-                "startAt": start_at
-            }
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params, timeout=30.0)
-                response.raise_for_status()
-                data = response.json()
+        async for page in self.iter_test_case_pages(project_key, max_results=max_results):
+            all_tests.extend(page)
 
-            values = data.get("values", [])
-            if not values:
-                break
-                
-            all_tests.extend(values)
-            
-            # Check if there are more results
-            if not data.get("isLast", True):
-                start_at += page_size
-            else:
-                break
-        
         logger.info(f"Fetched {len(all_tests)} total test cases from Zephyr")
         
         # Cache the results
-        import time
         ZephyrIntegration._test_cache[cache_key] = all_tests
         ZephyrIntegration._cache_timestamp = time.time()
         
         return all_tests
 
+    async def iter_test_case_pages(
+        self,
+        project_key: str,
+        max_results: Optional[int] = None,
+        page_size: int = 100,
+        concurrency: Optional[int] = None,
+        start_at: int = 0,
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Stream test cases for a project page by page.
+
+        The first page is fetched on its own to learn ``total``; the remaining
+        ``startAt`` offsets are then fetched concurrently through a bounded
+        window over a single shared client. Pages are yielded in offset order,
+        so callers can index them as they arrive instead of holding the whole
+        project in memory.
+
+        Args:
+            project_key: Jira project key
+            max_results: Maximum number of test cases to yield (None for unlimited)
+            page_size: Number of test cases per request
+            concurrency: Maximum in-flight page requests (defaults to settings)
+            start_at: Offset of the first test case (resumes an earlier stream)
+
+        Yields:
+            Lists of test case dicts, one per page
+
+        Raises:
+            httpx.HTTPError: If a page request fails
+        """
+        window = max(1, concurrency or settings.zephyr_fetch_concurrency)
+        url = f"{self.base_url}/testcases"
+
+        async with httpx.AsyncClient(timeout=30.0) as client:
+
+            async def fetch_page(start_at: int) -> Dict:
+                params = {
+                    "projectKey": project_key,
+                    "maxResults": page_size,
+                    "startAt": start_at,
+                }
+                response = await client.get(url, headers=self.headers, params=params)
+                response.raise_for_status()
+                return response.json()
+
+            first = await fetch_page(start_at)
+            values = first.get("values", [])
+            if max_results is not None:
+                values = values[:max_results]
+            if values:
+                yield values
+            yielded = len(values)
+
+            if not values or first.get("isLast", True):
+                return
+            if max_results is not None and yielded >= max_results:
+                return
+
+            total = first.get("total")
+            if total is None:
+                # No total reported - fall back to sequential paging on isLast
+                offset = start_at + page_size
+                while max_results is None or yielded < max_results:
+                    data = await fetch_page(offset)
+                    values = data.get("values", [])
+                    if max_results is not None:
+                        values = values[:max_results - yielded]
+                    if not values:
+                        break
+                    yield values
+                    yielded += len(values)
+                    if data.get("isLast", True):
+                        break
+                    offset += page_size
+                return
+
+            limit = total if max_results is None else min(total, start_at + max_results)
+            offsets = list(range(start_at + page_size, limit, page_size))
+            logger.info(
+                f"Fetching {len(offsets)} remaining Zephyr pages "
+                f"({limit - start_at} tests, {window} concurrent requests)"
+            )
+
+            pending: Deque[asyncio.Task] = deque()
+            next_offset = 0
+            try:
+                while pending or next_offset < len(offsets):
+                    while next_offset < len(offsets) and len(pending) < window:
+                        pending.append(asyncio.create_task(fetch_page(offsets[next_offset])))
+                        next_offset += 1
+
+                    data = await pending.popleft()
+                    values = data.get("values", [])
+                    if max_results is not None:
+                        values = values[:max_results - yielded]
+                    if values:
+                        yield values
+                        yielded += len(values)
+            finally:
+                for task in pending:
+                    task.cancel()
+
     async def get_relevant_tests_for_story(
         self,
         project_key: str,
@@ -0,0 +1,325 @@
+"""
+Long-lived pool of MCP client sessions over stdio.
+
+Starting an MCP server process (e.g. `npx -y mcp-remote ...`) and
+initializing a session takes seconds, while a tool call on a warm session
+takes milliseconds. MCPSessionPool starts its sessions once, keeps them
+warm with periodic pings, restarts sessions that die or fail a health
+check, and spreads concurrent tool calls over them (each session
+multiplexes requests by id, so calls do not wait for each other).
+"""
+
+import asyncio
+import itertools
+from typing import Any, Coroutine, Dict, List, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+try:
+    from mcp.client.session import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+    MCP_AVAILABLE = True
+except ImportError:
+    ClientSession = StdioServerParameters = stdio_client = None  # type: ignore
+    MCP_AVAILABLE = False
+
+T = TypeVar("T")
+
+
+class MCPSessionUnavailable(RuntimeError):
+    """Raised when no MCP session could be started."""
+
+
+class _PooledSession:
+    """
+    One server process and its initialized session.
+
+    The stdio transport and session context managers must be entered and
+    exited in the same task, so a background task owns them for the life
+    of the session.
+    """
+
+    def __init__(self, name: str, server_params: "StdioServerParameters") -> None:
+        self.name = name
+        self.server_params = server_params
+        self.session: Optional["ClientSession"] = None
+        self.tools: List[str] = []
+        self.error: Optional[BaseException] = None
+        self.starts = 0
+        self.lock = asyncio.Lock()  # Serializes (re)starts of this slot
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> None:
+        """Start the server process and initialize the session."""
+        self._ready.clear()
+        self._stop.clear()
+        self.error = None
+        self.starts += 1
+        self._task = asyncio.create_task(self._run(), name=f"mcp-session-{self.name}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.stop()
+            raise MCPSessionUnavailable(f"MCP session {self.name} did not start within {timeout:.0f}s")
+        if not self.alive:
+            raise MCPSessionUnavailable(f"MCP session {self.name} failed to start: {self.error}")
+
+    async def _run(self) -> None:
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    try:
+                        self.tools = [tool.name for tool in (await session.list_tools()).tools]
+                    except Exception as e:
+                        logger.warning(f"Could not list MCP tools: {e}")
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            self.error = e
+            logger.warning(f"MCP session {self.name} ended: {type(e).__name__}: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self, timeout: float) -> bool:
+        """Health check: True if the session answers a ping in time."""
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"MCP session {self.name} failed health check: {type(e).__name__}: {e}")
+            return False
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Close the session and terminate the server process."""
+        self._stop.set()
+        task, self._task = self._task, None
+        self.session = None
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except Exception:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """
+    Warm MCP sessions shared by all tool calls.
+
+    Sessions start on first use (or start()), are pinged every
+    health_interval seconds, and are restarted when they die or fail a
+    health check. A call that fails on a session that then fails its
+    health check is retried once on a restarted session.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        args: Optional[List[str]] = None,
+        env: Optional[Dict[str, str]] = None,
+        size: int = 1,
+        max_concurrent_calls: int = 8,
+        call_timeout: float = 60.0,
+        start_timeout: float = 300.0,
+        health_interval: float = 30.0,
+    ) -> None:
+        """
+        Configure the pool (no process is started yet).
+
+        Args:
+            command: Server command (e.g. npx)
+            args: Server arguments
+            env: Extra environment for the server process
+            size: Number of server processes/sessions
+            max_concurrent_calls: Tool calls in flight across the pool
+            call_timeout: Seconds before a tool call is abandoned
+            start_timeout: Seconds allowed for a session to start (includes
+                any interactive OAuth login done by the server)
+            health_interval: Seconds between health-check pings; 0 disables
+                the background checker
+        """
+        if not MCP_AVAILABLE:
+            raise ImportError("MCP package not installed. Install with: pip install 'mcp>=1.21.2'")
+        self.command = command
+        self.args = list(args or [])
+        self.env = env
+        self.size = max(1, size)
+        self.max_concurrent_calls = max(1, max_concurrent_calls)
+        self.call_timeout = call_timeout
+        self.start_timeout = start_timeout
+        self.health_interval = health_interval
+        self.restarts = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: List[_PooledSession] = []
+        self._next_slot = itertools.count()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._health_task: Optional[asyncio.Task] = None
+
+    def _server_params(self) -> "StdioServerParameters":
+        return StdioServerParameters(command=self.command, args=self.args, env=self.env)
+
+    def _bind_loop(self) -> None:
+        """Create per-loop state; sessions cannot outlive the event loop that started them."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            logger.debug("MCP session pool used from a new event loop; starting fresh sessions")
+        self._loop = loop
+        self._slots = [_PooledSession(f"{self.command}#{i}", self._server_params()) for i in range(self.size)]
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        self._health_task = None
+
+    async def start(self) -> None:
+        """Start every session now instead of on first use."""
+        self._bind_loop()
+        await asyncio.gather(*(self._ensure_alive(slot) for slot in self._slots))
+
+    async def _ensure_alive(self, slot: _PooledSession, broken: Any = None) -> _PooledSession:
+        """
+        Return the slot with a live session, (re)starting it if needed.
+
+        Args:
+            slot: Pool slot
+            broken: Session known to be unhealthy; restarted unless another
+                caller already replaced it
+        """
+        async with slot.lock:
+            if slot.alive and (broken is None or slot.session is not broken):
+                return slot
+            if slot.starts:
+                self.restarts += 1
+                logger.info(f"Restarting MCP session {slot.name}")
+                await slot.stop()
+            logger.info(f"Starting MCP session {slot.name}: {self.command} {' '.join(self.args[:3])}")
+            await slot.start(self.start_timeout)
+            logger.info(f"MCP session {slot.name} ready (tools: {', '.join(slot.tools) or 'unknown'})")
+        if self.health_interval > 0 and (self._health_task is None or self._health_task.done()):
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-session-health")
+        return slot
+
+    async def _acquire(self) -> _PooledSession:
+        self._bind_loop()
+        slot = self._slots[next(self._next_slot) % len(self._slots)]
+        return await self._ensure_alive(slot)
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a tool on a warm session.
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+
+        Returns:
+            The tool's CallToolResult
+
+        Raises:
+            MCPSessionUnavailable: If no session could be started
+        """
+        self._bind_loop()
+        async with self._semaphore:
+            slot = await self._acquire()
+            session = slot.session
+            try:
+                return await asyncio.wait_for(session.call_tool(name, arguments), self.call_timeout)
+            except Exception as e:
+                # Tool/protocol errors on a healthy session are the caller's to handle
+                if slot.session is session and await slot.ping(min(self.call_timeout, 10.0)):
+                    raise
+                logger.warning(f"MCP call {name} failed on a broken session ({type(e).__name__}); retrying once")
+            slot = await self._ensure_alive(slot, broken=session)
+            return await asyncio.wait_for(slot.session.call_tool(name, arguments), self.call_timeout)
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for slot in list(self._slots):
+                if slot.lock.locked() or not slot.starts:
+                    continue  # Starting, or never used
+                session = slot.session
+                if not await slot.ping(min(self.health_interval, 10.0)):
+                    try:
+                        await self._ensure_alive(slot, broken=session)
+                    except Exception as e:
+                        logger.warning(f"Could not restart MCP session {slot.name}: {e}")
+
+    async def close(self) -> None:
+        """Stop the health checker and every session."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        await asyncio.gather(*(slot.stop() for slot in self._slots))
+
+    async def __aenter__(self) -> "MCPSessionPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+# One pool per server command line, shared by all clients in the process
+_pools: Dict[Tuple[str, Tuple[str, ...]], MCPSessionPool] = {}
+
+
+def get_session_pool(command: str, args: Optional[List[str]] = None, **options: Any) -> MCPSessionPool:
+    """
+    Shared MCPSessionPool for a server command line.
+
+    Args:
+        command: Server command
+        args: Server arguments
+        **options: MCPSessionPool options, used when the pool is created
+
+    Returns:
+        The pool for this command line
+    """
+    key = (command, tuple(args or []))
+    if key not in _pools:
+        _pools[key] = MCPSessionPool(command, list(args or []), **options)
+    return _pools[key]
+
+
+async def close_session_pools() -> None:
+    """Stop the sessions of every shared pool started on the running event loop."""
+    await asyncio.gather(*(pool.close() for pool in list(_pools.values())))
+
+
+def run_and_close_pools(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    asyncio.run() that stops pooled MCP sessions before the loop closes.
+
+    Sessions are bound to the loop that started them, so a CLI command must
+    close them before asyncio.run() tears the loop down; otherwise the MCP
+    server processes linger until interpreter exit.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+
+    async def main() -> T:
+        try:
+            return await coro
+        finally:
+            await close_session_pools()
+
+    return asyncio.run(main())
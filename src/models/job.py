@@ -0,0 +1,49 @@
+"""
+Models for background test plan generation jobs.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a generation job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def is_terminal(self) -> bool:
+        """Whether the job has finished and will not change again."""
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+class JobEvent(BaseModel):
+    """A progress event emitted by a pipeline stage."""
+
+    at: datetime = Field(default_factory=datetime.utcnow, description="Event timestamp")
+    stage: str = Field(description="Pipeline stage name (e.g. collecting_context, stage2_generation)")
+    event: str = Field(description="started, completed or failed")
+
+
+class Job(BaseModel):
+    """A queued or finished test plan generation job."""
+
+    id: str = Field(description="Job ID")
+    tenant: str = Field(description="Tenant the job belongs to (used for fair scheduling)")
+    issue_key: str = Field(description="Jira issue key being processed")
+    status: JobStatus = Field(default=JobStatus.QUEUED, description="Current job state")
+    stage: Optional[str] = Field(default=None, description="Most recent pipeline stage")
+    request: Dict[str, Any] = Field(default_factory=dict, description="Original generation request")
+    result: Optional[Dict[str, Any]] = Field(default=None, description="Generation result when succeeded")
+    error: Optional[str] = Field(default=None, description="Error message when failed")
+    events: List[JobEvent] = Field(default_factory=list, description="Progress events, oldest first")
+    created_at: datetime = Field(default_factory=datetime.utcnow, description="Submission time")
+    started_at: Optional[datetime] = Field(default=None, description="Time a worker picked the job up")
+    finished_at: Optional[datetime] = Field(default=None, description="Time the job reached a terminal state")
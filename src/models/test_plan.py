@@ -3,7 +3,7 @@ Test plan data models.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -29,6 +29,12 @@ class TestPlanMetadata(BaseModel):
     validation_issues: Optional[List[str]] = Field(
         default=None, description="Validation issues detected during generation"
     )
+    stage_timings: Optional[Dict[str, float]] = Field(
+        default=None, description="Seconds spent per generation stage, plus total wall time"
+    )
+    token_usage: Optional[Dict[str, Any]] = Field(
+        default=None, description="LLM input/output tokens for this generation, including prompt-cache hits"
+    )
 
 
 class TestPlan(BaseModel):
@@ -0,0 +1,244 @@
+"""
+Storage for background test plan generation jobs.
+
+Persists job state, results and progress events in a local SQLite database so
+jobs survive restarts and can be polled from any request.
+"""
+
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+from src.config.settings import settings
+from src.models.job import Job, JobEvent, JobStatus
+
+
+class JobStore:
+    """
+    SQLite-backed job repository.
+
+    A short-lived connection is opened per operation, so the store can be used
+    from any thread or task without sharing connection state. WAL mode keeps
+    status polling from blocking workers that are writing progress.
+    """
+
+    _COLUMNS = (
+        "id", "tenant", "issue_key", "status", "stage", "request", "result",
+        "error", "created_at", "started_at", "finished_at",
+    )
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the job store.
+
+        Args:
+            db_path: Path to the SQLite file. Defaults to settings.job_store_path
+        """
+        self.db_path = db_path or settings.job_store_path
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    tenant TEXT NOT NULL,
+                    issue_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    request TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    at TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    event TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_events_job ON job_events (job_id, seq)")
+
+    def create(self, job: Job) -> Job:
+        """
+        Insert a new job.
+
+        Args:
+            job: Job to store
+
+        Returns:
+            The stored job
+        """
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(self._COLUMNS))})",
+                (
+                    job.id, job.tenant, job.issue_key, job.status.value, job.stage,
+                    json.dumps(job.request, default=str),
+                    json.dumps(job.result, default=str) if job.result is not None else None,
+                    job.error, job.created_at.isoformat(),
+                    job.started_at.isoformat() if job.started_at else None,
+                    job.finished_at.isoformat() if job.finished_at else None,
+                ),
+            )
+        logger.info(f"[JOBS] Created job {job.id} for {job.issue_key} (tenant={job.tenant})")
+        return job
+
+    def get(self, job_id: str, include_events: bool = True) -> Optional[Job]:
+        """
+        Retrieve a job by ID.
+
+        Args:
+            job_id: Job ID
+            include_events: Whether to load progress events
+
+        Returns:
+            Job or None if not found
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            events = []
+            if include_events:
+                events = conn.execute(
+                    "SELECT at, stage, event FROM job_events WHERE job_id = ? ORDER BY seq",
+                    (job_id,),
+                ).fetchall()
+        return self._row_to_job(row, events)
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """
+        Update job columns.
+
+        Args:
+            job_id: Job ID
+            **fields: Column values (status, stage, result, error, started_at, finished_at)
+        """
+        if not fields:
+            return
+        assignments, values = self._encode_fields(fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*values, job_id))
+
+    def transition(self, job_id: str, expected: List[JobStatus], **fields: Any) -> bool:
+        """
+        Atomically update a job only if it is currently in one of the expected states.
+
+        Used to make cancel/complete races safe: whichever write lands first wins.
+
+        Args:
+            job_id: Job ID
+            expected: Allowed current states
+            **fields: Column values to set (must include status)
+
+        Returns:
+            True if the job was updated
+        """
+        assignments, values = self._encode_fields(fields)
+        placeholders = ", ".join("?" * len(expected))
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status IN ({placeholders})",
+                (*values, job_id, *(s.value for s in expected)),
+            )
+            return cursor.rowcount > 0
+
+    def _encode_fields(self, fields: Dict[str, Any]) -> tuple:
+        values = []
+        for name, value in fields.items():
+            if name not in self._COLUMNS or name == "id":
+                raise ValueError(f"Unknown job field: {name}")
+            if isinstance(value, JobStatus):
+                value = value.value
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            elif name in ("request", "result") and value is not None:
+                value = json.dumps(value, default=str)
+            values.append(value)
+        return ", ".join(f"{name} = ?" for name in fields), values
+
+    def add_event(self, job_id: str, stage: str, event: str) -> None:
+        """
+        Append a progress event and record the job's current stage.
+
+        Args:
+            job_id: Job ID
+            stage: Pipeline stage name
+            event: started, completed or failed
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO job_events (job_id, at, stage, event) VALUES (?, ?, ?, ?)",
+                (job_id, datetime.utcnow().isoformat(), stage, event),
+            )
+            conn.execute("UPDATE jobs SET stage = ? WHERE id = ?", (stage, job_id))
+
+    def list_jobs(
+        self,
+        tenant: Optional[str] = None,
+        statuses: Optional[List[JobStatus]] = None,
+        limit: int = 50,
+    ) -> List[Job]:
+        """
+        List jobs, newest first (or oldest first when filtering by status).
+
+        Args:
+            tenant: Only jobs for this tenant
+            statuses: Only jobs in these states
+            limit: Maximum number of jobs
+
+        Returns:
+            Jobs without events
+        """
+        clauses, params = [], []
+        if tenant:
+            clauses.append("tenant = ?")
+            params.append(tenant)
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(s.value for s in statuses)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "ASC" if statuses else "DESC"
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY created_at {order} LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [self._row_to_job(row, []) for row in rows]
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row, events: List[sqlite3.Row]) -> Job:
+        data: Dict[str, Any] = dict(row)
+        data["request"] = json.loads(data["request"]) if data["request"] else {}
+        data["result"] = json.loads(data["result"]) if data["result"] else None
+        data["events"] = [JobEvent(at=e["at"], stage=e["stage"], event=e["event"]) for e in events]
+        return Job(**data)
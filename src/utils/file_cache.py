@@ -0,0 +1,169 @@
+"""
+Directory of gzip-compressed JSON entries with least-recently-used eviction.
+
+Shared storage for the file-based caches (story context snapshots, GitLab
+search results). Each entry is one {name}.json.gz file written atomically.
+File mtimes track last use, so an entry's age comes from the save time
+stored in the entry itself.
+
+The LRU order is kept in memory: the directory is scanned once, on first
+use, and afterwards reads, writes and evictions update the order directly.
+Entries written by other processes are picked up at the next scan.
+"""
+
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from loguru import logger
+
+SUFFIX = ".json.gz"
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:  # Removed by another process since the scan
+        return 0.0
+
+
+class GzipFileCache:
+    """
+    LRU-bounded directory of gzip-compressed JSON entries.
+
+    Callers own naming and payloads; the cache adds a "saved_at" timestamp
+    to every payload and enforces age and size limits.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int, label: str = "cache entry"):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for entries
+            max_entries: Entries kept before LRU eviction
+            label: Entry description used in log lines
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.label = label
+        self._lru: Optional["OrderedDict[str, None]"] = None  # oldest first
+
+    def path(self, name: str) -> Path:
+        """File of an entry."""
+        return self.cache_dir / f"{name}{SUFFIX}"
+
+    def _order(self) -> "OrderedDict[str, None]":
+        if self._lru is None:
+            files = list(self.cache_dir.glob(f"*{SUFFIX}")) if self.cache_dir.exists() else []
+            files.sort(key=_mtime)
+            self._lru = OrderedDict((p.name[:-len(SUFFIX)], None) for p in files)
+        return self._lru
+
+    def read(self, name: str, max_age_hours: float) -> Optional[Dict[str, Any]]:
+        """
+        Payload of an entry, without marking it as used.
+
+        Args:
+            name: Entry name
+            max_age_hours: Maximum age since the entry was written
+
+        Returns:
+            The payload, or None if missing or expired
+
+        Raises:
+            Exception: If the entry is unreadable
+        """
+        path = self.path(name)
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        age_hours = (time.time() - payload["saved_at"]) / 3600
+        if age_hours > max_age_hours:
+            logger.debug(f"{self.label} {name} expired (age: {age_hours:.1f}h)")
+            return None
+        return payload
+
+    def touch(self, name: str) -> None:
+        """Mark an entry as recently used."""
+        try:
+            os.utime(self.path(name))
+        except OSError:
+            return
+        order = self._order()
+        order[name] = None
+        order.move_to_end(name)
+
+    def write(self, name: str, payload: Dict[str, Any]) -> Path:
+        """
+        Atomically store an entry and evict least recently used entries.
+
+        Args:
+            name: Entry name
+            payload: JSON-serializable dict
+
+        Returns:
+            The entry's file
+        """
+        path = self.path(name)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        order = self._order()
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({**payload, "saved_at": time.time()}, f, default=str, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        order[name] = None
+        order.move_to_end(name)
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        order = self._order()
+        evicted = 0
+        while len(order) > self.max_entries:
+            name, _ = order.popitem(last=False)
+            self.path(name).unlink(missing_ok=True)
+            evicted += 1
+        if evicted:
+            logger.debug(f"Evicted {evicted} {self.label}(s)")
+
+    def delete(self, names: Iterable[str]) -> int:
+        """
+        Delete entries.
+
+        Args:
+            names: Entry names
+
+        Returns:
+            Number of entries deleted
+        """
+        order = self._order()
+        count = 0
+        for name in names:
+            path = self.path(name)
+            if path.exists():
+                path.unlink()
+                count += 1
+            order.pop(name, None)
+        return count
+
+    def clear(self) -> int:
+        """
+        Delete all entries.
+
+        Returns:
+            Number of entries deleted
+        """
+        if not self.cache_dir.exists():
+            return 0
+        count = 0
+        for path in self.cache_dir.glob(f"*{SUFFIX}"):
+            path.unlink(missing_ok=True)
+            count += 1
+        self._lru = OrderedDict()
+        return count
@@ -0,0 +1,178 @@
+"""
+Batched near-duplicate detection for documents and embeddings.
+
+Text: word-set Jaccard similarity. For thresholds of MINHASH_MIN_THRESHOLD
+and above, MinHash signatures are banded into LSH buckets so each document is
+only compared with the few earlier documents that share a bucket; candidates
+are then confirmed with the exact Jaccard, so results match an all-pairs
+comparison (a pair at the 0.8 threshold is missed by the banding with
+probability below 1e-7). Lower thresholds would be missed far more often by
+this band layout (about 13% of pairs at 0.5), so they use the all-pairs loop.
+
+Embeddings: cosine similarity for all pairs as one normalized matrix product.
+"""
+
+import hashlib
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 128 permutations in 32 bands of 4 rows
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 32
+# Lowest threshold for which the banding above is effectively exact
+MINHASH_MIN_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def word_set(text: str) -> FrozenSet[str]:
+    """Lowercased whitespace-separated words of a text."""
+    return frozenset(text.lower().split()) if text else frozenset()
+
+
+def jaccard(words1: FrozenSet[str], words2: FrozenSet[str]) -> float:
+    """Jaccard similarity of two word sets (0.0 if either is empty)."""
+    if not words1 or not words2:
+        return 0.0
+    intersection = len(words1 & words2)
+    return intersection / (len(words1) + len(words2) - intersection)
+
+
+def _word_hash(word: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """MinHash signatures and LSH band keys for word sets."""
+
+    def __init__(self, num_perm: int = MINHASH_PERMUTATIONS, bands: int = MINHASH_BANDS, seed: int = 1):
+        """
+        Initialize the hash permutations.
+
+        Args:
+            num_perm: Signature length
+            bands: LSH bands (num_perm must be divisible by bands)
+            seed: Seed for the permutation coefficients
+        """
+        if np is None:
+            raise ImportError("numpy is required for MinHash signatures")
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        # Universal hashing (a * x + b) mod p; like datasketch, the uint64
+        # product is allowed to wrap, which keeps the permutations well mixed
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._hash_cache: Dict[str, int] = {}
+
+    def signature(self, words: FrozenSet[str]) -> "np.ndarray":
+        """
+        Compute the MinHash signature of a non-empty word set.
+
+        Args:
+            words: Word set
+
+        Returns:
+            uint64 array of length num_perm
+        """
+        cache = self._hash_cache
+        hashes = []
+        for word in words:
+            h = cache.get(word)
+            if h is None:
+                h = cache[word] = _word_hash(word) & 0xFFFFFFFF
+            hashes.append(h)
+        x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        permuted = (np.outer(x, self._a) + self._b) % np.uint64(_MERSENNE_PRIME)
+        return permuted.min(axis=0)
+
+    def band_keys(self, signature: "np.ndarray") -> List[Tuple[int, bytes]]:
+        """Bucket keys, one per band."""
+        rows = signature.reshape(self.bands, self.rows)
+        return [(band, rows[band].tobytes()) for band in range(self.bands)]
+
+
+_default_hasher: Optional[MinHasher] = None
+
+
+def find_text_duplicates(texts: Sequence[str], threshold: float) -> List[bool]:
+    """
+    Flag texts that are near-duplicates of an earlier kept text.
+
+    A text is a duplicate if its word-set Jaccard similarity with any earlier
+    non-duplicate text exceeds threshold (first occurrence wins). Thresholds
+    below MINHASH_MIN_THRESHOLD (or a missing numpy) fall back to comparing
+    all pairs.
+
+    Args:
+        texts: Texts in priority order
+        threshold: Jaccard similarity above which texts are duplicates
+
+    Returns:
+        is_duplicate flag per text
+    """
+    global _default_hasher
+    word_sets = [word_set(text) for text in texts]
+    flags = [False] * len(texts)
+
+    if np is None or threshold < MINHASH_MIN_THRESHOLD:
+        kept: List[FrozenSet[str]] = []
+        for i, words in enumerate(word_sets):
+            if any(jaccard(words, seen) > threshold for seen in kept):
+                flags[i] = True
+            else:
+                kept.append(words)
+        return flags
+
+    if _default_hasher is None:
+        _default_hasher = MinHasher()
+    hasher = _default_hasher
+    buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    for i, words in enumerate(word_sets):
+        if not words:
+            continue  # Empty text is never similar to anything
+        keys = hasher.band_keys(hasher.signature(words))
+
+        candidates = set()
+        for key in keys:
+            candidates.update(buckets.get(key, ()))
+        if any(jaccard(words, word_sets[j]) > threshold for j in sorted(candidates)):
+            flags[i] = True
+            continue
+
+        for key in keys:
+            buckets.setdefault(key, []).append(i)
+
+    return flags
+
+
+def max_cosine_similarity(
+    queries: Sequence[Sequence[float]],
+    references: Sequence[Sequence[float]],
+) -> "np.ndarray":
+    """
+    Highest cosine similarity of each query vector to any reference vector.
+
+    Args:
+        queries: Query embeddings (n x d)
+        references: Reference embeddings (m x d)
+
+    Returns:
+        Array of length n
+    """
+    if np is None:
+        raise ImportError("numpy is required for embedding similarity")
+    q = np.asarray(queries, dtype=np.float32)
+    r = np.asarray(references, dtype=np.float32)
+    q = q / np.maximum(np.linalg.norm(q, axis=1, keepdims=True), 1e-12)
+    r = r / np.maximum(np.linalg.norm(r, axis=1, keepdims=True), 1e-12)
+    return (q @ r.T).max(axis=1)
@@ -0,0 +1,93 @@
+"""
+Vectorized re-ranking of retrieved documents.
+
+Keyword matching runs against token sets computed once per document, and
+diversity re-ranking (Maximal Marginal Relevance) runs on the embeddings the
+vector store already holds, so re-ranking a result list is a handful of numpy
+operations instead of repeated string scans or re-embedding.
+"""
+
+import re
+from typing import FrozenSet, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def keyword_tokens(text: str) -> FrozenSet[str]:
+    """Lowercased word tokens of a text, punctuation stripped."""
+    return frozenset(_TOKEN_PATTERN.findall(text.lower())) if text else frozenset()
+
+
+def keyword_match_counts(doc_tokens: Sequence[FrozenSet[str]], keywords: Sequence[str]) -> List[int]:
+    """
+    Count the keywords each document contains.
+
+    A keyword matches when all of its words appear in the document, so
+    multi-word components such as "audit logging" still count once.
+
+    Args:
+        doc_tokens: Token set per document (see keyword_tokens)
+        keywords: Story keywords
+
+    Returns:
+        Number of matching keywords per document
+    """
+    keyword_sets = [tokens for tokens in (keyword_tokens(kw) for kw in keywords) if tokens]
+    return [sum(1 for kw in keyword_sets if kw <= tokens) for tokens in doc_tokens]
+
+
+def mmr_select(
+    relevance: Sequence[float],
+    embeddings: Sequence[Sequence[float]],
+    k: int,
+    lambda_mult: float = 0.7,
+) -> List[int]:
+    """
+    Pick k documents by Maximal Marginal Relevance.
+
+    Each step takes the document maximizing
+    lambda * relevance - (1 - lambda) * max cosine similarity to those
+    already picked, so near-identical neighbours of a strong match give way
+    to documents covering something else.
+
+    Args:
+        relevance: Relevance score per document
+        embeddings: Stored embedding per document (n x d)
+        k: Number of documents to select
+        lambda_mult: Relevance/diversity trade-off (1.0 = relevance only)
+
+    Returns:
+        Indices of the selected documents, in selection order
+    """
+    if np is None:
+        raise ImportError("numpy is required for MMR re-ranking")
+    n = len(relevance)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    scores = np.asarray(relevance, dtype=np.float32)
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    similarity = vectors @ vectors.T
+
+    selected = [int(np.argmax(scores))]
+    # Highest similarity of every candidate to the selected set, updated per pick
+    redundancy = similarity[selected[0]].copy()
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < k:
+        mmr = lambda_mult * scores - (1 - lambda_mult) * redundancy
+        mmr[~available] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+
+    return selected
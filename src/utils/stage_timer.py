@@ -0,0 +1,93 @@
+"""
+Lightweight per-stage timing spans for the generation pipeline.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+
+class StageTimer:
+    """
+    Records wall-clock spans for named pipeline stages.
+
+    Spans may overlap (e.g. enrichment and RAG retrieval running concurrently),
+    so the summary reports both the sum of stage durations and the actual
+    elapsed time - the gap between the two is the latency saved by running
+    independent stages in parallel.
+    """
+
+    def __init__(self, label: str, listener: Optional[Callable[[str, str], None]] = None):
+        """
+        Initialize timer.
+
+        Args:
+            label: Identifier used in log lines (usually the story key)
+            listener: Optional callback receiving (stage, "started" | "completed" | "failed")
+        """
+        self.label = label
+        self.listener = listener
+        self._origin = time.perf_counter()
+        self._spans: List[Tuple[str, float, float]] = []
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Time a stage. Works inside coroutines and across awaits.
+
+        Args:
+            name: Stage name
+        """
+        start = time.perf_counter()
+        self._notify(name, "started")
+        outcome = "failed"
+        try:
+            yield
+            outcome = "completed"
+        finally:
+            end = time.perf_counter()
+            self._notify(name, outcome)
+            self._spans.append((name, start - self._origin, end - self._origin))
+            logger.info(
+                f"[SPAN] {self.label} {name}: {end - start:.2f}s "
+                f"(t+{start - self._origin:.2f}s → t+{end - self._origin:.2f}s)"
+            )
+
+    def _notify(self, name: str, event: str) -> None:
+        """Forward a span event to the listener; listener errors never break the pipeline."""
+        if not self.listener:
+            return
+        try:
+            self.listener(name, event)
+        except Exception as e:
+            logger.debug(f"[SPAN] Stage listener failed for {name}: {e}")
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Get stage durations in seconds, plus 'total' elapsed wall time.
+
+        Returns:
+            Mapping of stage name to duration (repeated stages are summed)
+        """
+        durations: Dict[str, float] = {}
+        for name, start, end in self._spans:
+            durations[name] = round(durations.get(name, 0.0) + (end - start), 3)
+        durations['total'] = round(self.elapsed(), 3)
+        return durations
+
+    def elapsed(self) -> float:
+        """Get seconds elapsed since the timer was created."""
+        return time.perf_counter() - self._origin
+
+    def log_summary(self) -> None:
+        """Log per-stage durations and the time saved by overlapping stages."""
+        durations = self.as_dict()
+        total = durations.pop('total')
+        serial = sum(durations.values())
+        stages = ", ".join(f"{name}={secs:.2f}s" for name, secs in durations.items())
+        logger.info(
+            f"[SPAN] {self.label} total={total:.2f}s (serial sum {serial:.2f}s, "
+            f"overlap saved {max(serial - total, 0.0):.2f}s): {stages}"
+        )
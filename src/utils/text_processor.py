@@ -5,6 +5,12 @@ Text processing utilities shared across the codebase.
 from typing import List, Any, Set, Optional
 import re
 
+_TOKEN_PATTERN = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+_TOKEN_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'from', 'that', 'this', 'are', 'was', 'will', 'should', 'can',
+    'all', 'any', 'not', 'api', 'get', 'put', 'post', 'patch', 'delete', 'http', 'https', 'json',
+}
+
 
 def extract_keywords(
     text: str, 
@@ -156,3 +162,20 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
     
     return len(intersection) / len(union) if union else 0.0
 
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Lowercase word tokens of identifiers and prose.
+
+    camelCase, kebab-case and snake_case are split; tokens of two letters
+    or fewer and API stop words (HTTP verbs, "api", "json", ...) are dropped.
+
+    Used by: Swagger endpoint index, endpoint extraction
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Set of tokens
+    """
+    return {t.lower() for t in _TOKEN_PATTERN.findall(text or '') if len(t) > 2 and t.lower() not in _TOKEN_STOPWORDS}
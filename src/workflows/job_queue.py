@@ -0,0 +1,253 @@
+"""
+Background job queue for long-running test plan generation.
+
+Jobs are persisted in JobStore and executed by a bounded pool of asyncio
+workers. Scheduling is round-robin across tenants with a per-tenant cap on
+running jobs, so one tenant submitting a burst cannot starve the others.
+"""
+
+import asyncio
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from loguru import logger
+
+from src.config.settings import settings
+from src.models.job import Job, JobStatus
+from src.storage.job_store import JobStore
+
+# (request, on_stage) -> result. on_stage receives (stage, event) progress updates.
+JobPipeline = Callable[[Dict[str, Any], Callable[[str, str], None]], Awaitable[Dict[str, Any]]]
+
+
+class GenerationJobQueue:
+    """
+    Bounded worker pool with per-tenant fair scheduling.
+
+    Queue order lives in memory; the store is the source of truth. On start,
+    jobs left queued or running by a previous process are re-enqueued.
+    """
+
+    def __init__(
+        self,
+        pipeline: JobPipeline,
+        store: Optional[JobStore] = None,
+        workers: Optional[int] = None,
+        max_running_per_tenant: Optional[int] = None,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            pipeline: Coroutine function executing one job
+            store: Job store (defaults to a JobStore at settings.job_store_path)
+            workers: Number of concurrent workers (defaults to settings.job_workers)
+            max_running_per_tenant: Running-job cap per tenant (defaults to settings)
+        """
+        self.pipeline = pipeline
+        self.store = store or JobStore()
+        self.workers = max(1, workers or settings.job_workers)
+        self.max_running_per_tenant = max(1, max_running_per_tenant or settings.job_max_running_per_tenant)
+
+        self._pending: Dict[str, Deque[str]] = {}
+        self._rotation: Deque[str] = deque()
+        self._running: Counter = Counter()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._cancelled: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        self._cond: Optional[asyncio.Condition] = None
+
+    @property
+    def started(self) -> bool:
+        """Whether worker tasks are running."""
+        return bool(self._workers)
+
+    async def start(self) -> None:
+        """Recover unfinished jobs and start the worker pool."""
+        if self.started:
+            return
+        self._cond = asyncio.Condition()
+
+        recovered = self.store.list_jobs(
+            statuses=[JobStatus.QUEUED, JobStatus.RUNNING], limit=100_000
+        )
+        for job in recovered:
+            if job.status == JobStatus.RUNNING:
+                self.store.update(job.id, status=JobStatus.QUEUED, started_at=None)
+            self._enqueue(job.tenant, job.id)
+        if recovered:
+            logger.info(f"[JOBS] Re-queued {len(recovered)} unfinished jobs from previous run")
+
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(
+            f"[JOBS] Started {self.workers} workers "
+            f"(max {self.max_running_per_tenant} running per tenant)"
+        )
+
+    async def stop(self) -> None:
+        """Stop workers. Interrupted jobs stay in the store and resume on next start."""
+        for task in self._tasks.values():
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._pending.clear()
+        self._rotation.clear()
+        self._running.clear()
+        logger.info("[JOBS] Worker pool stopped")
+
+    async def submit(self, request: Dict[str, Any], tenant: str) -> Job:
+        """
+        Persist and enqueue a new job.
+
+        Args:
+            request: Generation request payload (must include issue_key)
+            tenant: Tenant identifier used for fair scheduling
+
+        Returns:
+            The created job
+        """
+        job = self.store.create(Job(
+            id=uuid.uuid4().hex,
+            tenant=tenant,
+            issue_key=request["issue_key"],
+            request=request,
+        ))
+        async with self._condition():
+            self._enqueue(tenant, job.id)
+            self._condition().notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job with its progress events."""
+        return self.store.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Updated job, or None if not found. Finished jobs are returned unchanged.
+        """
+        job = self.store.get(job_id, include_events=False)
+        if job is None:
+            return None
+
+        if self.store.transition(
+            job_id, [JobStatus.QUEUED],
+            status=JobStatus.CANCELLED, finished_at=datetime.utcnow(),
+        ):
+            async with self._condition():
+                pending = self._pending.get(job.tenant)
+                if pending and job_id in pending:
+                    pending.remove(job_id)
+            logger.info(f"[JOBS] Cancelled queued job {job_id}")
+        elif job_id in self._tasks and self.store.transition(
+            job_id, [JobStatus.RUNNING],
+            status=JobStatus.CANCELLED, finished_at=datetime.utcnow(),
+        ):
+            self._cancelled.add(job_id)
+            self._tasks[job_id].cancel()
+            logger.info(f"[JOBS] Cancelled running job {job_id}")
+
+        return self.store.get(job_id)
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            raise RuntimeError("Job queue is not started")
+        return self._cond
+
+    def _enqueue(self, tenant: str, job_id: str) -> None:
+        if tenant not in self._pending:
+            self._pending[tenant] = deque()
+        if tenant not in self._rotation:
+            self._rotation.append(tenant)
+        self._pending[tenant].append(job_id)
+
+    def _next_job(self) -> Optional[tuple]:
+        """Pick the next (tenant, job_id) round-robin, skipping tenants at their cap."""
+        for _ in range(len(self._rotation)):
+            tenant = self._rotation[0]
+            self._rotation.rotate(-1)
+            pending = self._pending.get(tenant)
+            if not pending:
+                self._rotation.remove(tenant)
+                self._pending.pop(tenant, None)
+                continue
+            if self._running[tenant] >= self.max_running_per_tenant:
+                continue
+            job_id = pending.popleft()
+            if not pending:
+                self._rotation.remove(tenant)
+                self._pending.pop(tenant, None)
+            return tenant, job_id
+        return None
+
+    async def _worker(self, index: int) -> None:
+        cond = self._condition()
+        while True:
+            async with cond:
+                picked = self._next_job()
+                while picked is None:
+                    await cond.wait()
+                    picked = self._next_job()
+                tenant, job_id = picked
+                self._running[tenant] += 1
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[JOBS] Worker {index} failed on job {job_id}: {e}")
+            finally:
+                async with cond:
+                    self._running[tenant] -= 1
+                    cond.notify_all()
+
+    async def _run(self, job_id: str) -> None:
+        if not self.store.transition(
+            job_id, [JobStatus.QUEUED],
+            status=JobStatus.RUNNING, started_at=datetime.utcnow(),
+        ):
+            return  # Cancelled while queued
+
+        job = self.store.get(job_id, include_events=False)
+        logger.info(f"[JOBS] Running job {job_id} for {job.issue_key} (tenant={job.tenant})")
+
+        def on_stage(stage: str, event: str) -> None:
+            self.store.add_event(job_id, stage, event)
+
+        task = asyncio.create_task(self.pipeline(job.request, on_stage))
+        self._tasks[job_id] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if job_id in self._cancelled:
+                # Cancelled through cancel(); the store was already updated
+                self._cancelled.discard(job_id)
+                return
+            raise  # Worker shutdown: job stays running and is recovered on next start
+        except Exception as e:
+            self.store.transition(
+                job_id, [JobStatus.RUNNING],
+                status=JobStatus.FAILED, error=str(e), finished_at=datetime.utcnow(),
+            )
+            logger.error(f"[JOBS] Job {job_id} failed: {e}")
+            return
+        finally:
+            self._tasks.pop(job_id, None)
+
+        self.store.transition(
+            job_id, [JobStatus.RUNNING],
+            status=JobStatus.SUCCEEDED, result=result, finished_at=datetime.utcnow(),
+        )
+        logger.info(f"[JOBS] Job {job_id} succeeded")
@@ -0,0 +1 @@
+# Timing benchmarks (skipped unless pytest runs with --benchmark, see make test-benchmark)
@@ -0,0 +1,46 @@
+"""
+Benchmark of the compiled chunk scorer against the per-pattern implementation.
+"""
+
+import time
+
+import pytest
+
+from src.ai.chunk_scorer import StoryTerms
+from src.ai.context_extractor import CHUNK_SCORER, QueryFocusedExtractor
+from tests.unit.test_chunk_scorer import (
+    ACCEPTANCE_CRITERIA,
+    STORY_KEYWORDS,
+    build_corpus,
+    reference_relevance,
+    reference_section,
+    reference_testability,
+)
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_score_1mb_corpus():
+    """Score a 1 MB Confluence-like corpus with both implementations."""
+    chunks = QueryFocusedExtractor(use_ai_summarization=False)._chunk_document(build_corpus(1_000_000))
+
+    started = time.perf_counter()
+    expected = [
+        (
+            reference_relevance(chunk, STORY_KEYWORDS, ACCEPTANCE_CRITERIA),
+            reference_testability(chunk),
+            reference_section(chunk),
+        )
+        for chunk in chunks
+    ]
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = CHUNK_SCORER.score_chunks(chunks, StoryTerms.from_story(STORY_KEYWORDS, ACCEPTANCE_CRITERIA))
+    compiled_seconds = time.perf_counter() - started
+
+    print(
+        f"\n{len(chunks)} chunks: per-pattern {reference_seconds:.3f}s, "
+        f"compiled {compiled_seconds:.3f}s ({reference_seconds / compiled_seconds:.1f}x)"
+    )
+    assert actual == expected
@@ -0,0 +1,61 @@
+"""
+Benchmark of HTML extraction throughput: separate bs4 parses vs parse-once and the process pool.
+"""
+
+import time
+
+import pytest
+from bs4 import BeautifulSoup
+
+from src.infrastructure.html_parser import ParsedHTML, strip_html_batch
+from tests.unit.test_html_parser import PAGE
+
+pytestmark = pytest.mark.benchmark
+
+
+def reference_extract(html: str) -> tuple:
+    """The original extraction: one BeautifulSoup parse per call."""
+    def soup():
+        return BeautifulSoup(html, "html.parser")
+
+    cleaned = soup()
+    for tag in cleaned(["script", "style", "nav", "header", "footer"]):
+        tag.decompose()
+    text = cleaned.get_text("\n")
+    parsed = soup()
+    title = parsed.title.string.strip() if parsed.title and parsed.title.string else None
+    links = [a["href"] for a in soup().find_all("a", href=True)]
+    code = [pre.get_text() for pre in soup().find_all("pre")]
+    return text, title, links, code
+
+
+def test_extraction_throughput():
+    """Pages/s for four separate bs4 parses vs one lxml parse, and the pool over a batch."""
+    sections = "".join(
+        f"<h2>Section {i}</h2><p>Request body for <b>orders</b> &amp; items {i}.</p>"
+        f'<pre>{{"id": "abc-{i}", "qty": {i}}}</pre><a href="/docs/p{i}">Page {i}</a>'
+        for i in range(60)
+    )
+    pages = [PAGE.replace("<h1>Orders</h1>", f"<h1>Orders {n}</h1>{sections}") for n in range(200)]
+
+    started = time.perf_counter()
+    expected = [reference_extract(html) for html in pages]
+    reference_rate = len(pages) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    parsed = [ParsedHTML(html) for html in pages]
+    actual = [(doc.text, doc.title, doc.links, doc.code_blocks) for doc in parsed]
+    parse_once_rate = len(pages) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    texts = strip_html_batch(pages * 4, min_batch=1)
+    batch_rate = len(texts) / (time.perf_counter() - started)
+
+    print(
+        f"\n{len(pages)} pages: 4x bs4 {reference_rate:.0f} pages/s, parse-once {parse_once_rate:.0f} pages/s "
+        f"({parse_once_rate / reference_rate:.1f}x), process pool text {batch_rate:.0f} pages/s"
+    )
+    for (ref_text, ref_title, ref_links, ref_code), (text, title, links, code) in zip(expected, actual):
+        assert text.split() == ref_text.split()
+        assert (title, links[:1], code[:1]) == (ref_title, ref_links[:1], ref_code[:1])
+    assert texts[: len(pages)] == [doc.text for doc in parsed]
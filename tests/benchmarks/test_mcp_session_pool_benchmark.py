@@ -0,0 +1,47 @@
+"""
+Benchmark of MCP per-query latency: a server process per query vs the session pool.
+"""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from src.mcp.session_pool import MCPSessionPool
+from tests.unit.test_mcp_session_pool import STUB_SERVER
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.asyncio
+async def test_per_query_latency():
+    """Process + session per query (previous behaviour) vs one warm pooled session."""
+    from mcp.client.session import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    queries = [{"project_id": "42", "semantic_query": f"query {i}"} for i in range(8)]
+
+    started = time.perf_counter()
+    for params in queries:
+        async with stdio_client(StdioServerParameters(command=sys.executable, args=[STUB_SERVER])) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                await session.list_tools()
+                await session.call_tool("semantic_code_search", params)
+    spawn_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+    async with MCPSessionPool(sys.executable, [STUB_SERVER], health_interval=0) as pool:
+        started = time.perf_counter()
+        for params in queries:
+            await pool.call_tool("semantic_code_search", params)
+        pooled_ms = (time.perf_counter() - started) * 1000 / len(queries)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(pool.call_tool("semantic_code_search", params) for params in queries))
+        concurrent_ms = (time.perf_counter() - started) * 1000
+
+    print(
+        f"\nper query: spawn {spawn_ms:.0f}ms, pooled {pooled_ms:.1f}ms ({spawn_ms / pooled_ms:.0f}x); "
+        f"{len(queries)} concurrent on one session {concurrent_ms:.1f}ms"
+    )
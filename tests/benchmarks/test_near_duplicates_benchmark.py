@@ -0,0 +1,57 @@
+"""
+Benchmark of batched near-duplicate detection against the per-pair loops.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.utils.near_duplicates import find_text_duplicates, max_cosine_similarity
+from tests.unit.test_near_duplicates import (
+    build_docs,
+    build_embeddings,
+    reference_duplicate_scenarios,
+    reference_text_duplicates,
+)
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_text_duplicates_500_docs():
+    """Time MinHash-bucketed dedup against all-pairs Jaccard over 500 docs."""
+    docs = build_docs(500)
+
+    started = time.perf_counter()
+    expected = reference_text_duplicates(docs, 0.80)
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = find_text_duplicates(docs, 0.80)
+    minhash_seconds = time.perf_counter() - started
+
+    print(
+        f"\n500 docs: pairwise {reference_seconds:.3f}s, minhash {minhash_seconds:.3f}s "
+        f"({reference_seconds / minhash_seconds:.1f}x), {sum(actual)} duplicates"
+    )
+    assert actual == expected
+
+
+def test_embedding_duplicates_500_by_500():
+    """Time the matrix-product cosine similarity against the per-pair loop for 500x500 embeddings."""
+    story = build_embeddings(500, 256, seed=1)
+    code = np.vstack([build_embeddings(450, 256, seed=2), story[:50] * 1.5])
+
+    started = time.perf_counter()
+    expected = reference_duplicate_scenarios(code, story)
+    reference_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [bool(s > 0.85) for s in max_cosine_similarity(code, story)]
+    matrix_seconds = time.perf_counter() - started
+
+    print(
+        f"\n500x500 embeddings: loop {reference_seconds:.3f}s, matrix {matrix_seconds:.4f}s "
+        f"({reference_seconds / matrix_seconds:.0f}x)"
+    )
+    assert actual == expected
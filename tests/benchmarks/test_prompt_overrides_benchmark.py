@@ -0,0 +1,50 @@
+"""
+Benchmark of prompt override lookups: file parse per lookup vs the shared registry.
+"""
+
+import json
+import time
+
+import pytest
+
+from src.ai.generation.prompt_overrides import PromptOverridesRegistry
+
+pytestmark = pytest.mark.benchmark
+
+# Section lookups made by one optimized prompt build (reasoning framework,
+# guidelines, checklist, examples, ...), rounded up
+LOOKUPS_PER_BUILD = 10
+
+
+def legacy_get_prompt_section(path, section_name: str, default_content: str) -> str:
+    """The original lookup: open and parse the file on every call."""
+    overrides = {}
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    return overrides.get(section_name, default_content)
+
+
+def test_prompt_build_lookups(tmp_path):
+    """Time the section lookups of 200 prompt builds."""
+    overrides_file = tmp_path / "prompt_overrides.json"
+    overrides_file.write_text(json.dumps({f"section_{i}": "x" * 2000 for i in range(20)}), encoding="utf-8")
+    builds = 200
+    sections = [f"section_{i}" for i in range(LOOKUPS_PER_BUILD)]
+
+    started = time.perf_counter()
+    for _ in range(builds):
+        expected = [legacy_get_prompt_section(overrides_file, s, "") for s in sections]
+    legacy_seconds = time.perf_counter() - started
+
+    registry = PromptOverridesRegistry(overrides_file)
+    started = time.perf_counter()
+    for _ in range(builds):
+        actual = [registry.get(s, "") for s in sections]
+    cached_seconds = time.perf_counter() - started
+
+    print(
+        f"\n{builds} builds x {LOOKUPS_PER_BUILD} lookups: file parse {legacy_seconds * 1000 / builds:.3f}ms/build, "
+        f"registry {cached_seconds * 1000 / builds:.3f}ms/build ({legacy_seconds / cached_seconds:.1f}x)"
+    )
+    assert actual == expected
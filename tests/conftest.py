@@ -20,6 +20,46 @@ os.environ["GITHUB_TOKEN"] = "test-github-token"
 os.environ["SECRET_KEY"] = "test-secret-key"
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark", action="store_true", default=False, help="Run timing benchmarks (tests marked benchmark)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip timing benchmarks unless --benchmark is given."""
+    if config.getoption("--benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="timing benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def isolate_index_checkpoints(tmp_path, monkeypatch):
+    """Keep index-all checkpoint journals written by tests out of ./data."""
+    from src.config.settings import settings
+
+    monkeypatch.setattr(settings, "index_checkpoint_dir", str(tmp_path / "index_runs"))
+
+
+@pytest.fixture(autouse=True)
+def isolate_data_caches(tmp_path, monkeypatch):
+    """Keep caches and stores that default to ./data out of the working tree, so runs don't share state."""
+    from src.config.settings import settings
+
+    data_dir = tmp_path / "data"
+    monkeypatch.setattr(settings, "story_context_cache_dir", str(data_dir / "story_context_cache"))
+    monkeypatch.setattr(settings, "gitlab_search_cache_dir", str(data_dir / "gitlab_search_cache"))
+    monkeypatch.setattr(settings, "gitlab_swagger_manifest_path", str(data_dir / "gitlab_swagger_manifest.json"))
+    monkeypatch.setattr(settings, "swagger_endpoint_index_path", str(data_dir / "swagger_endpoint_index.json.gz"))
+    monkeypatch.setattr(settings, "http_cache_dir", str(data_dir / "http_cache"))
+    monkeypatch.setattr(settings, "enrichment_cache_db_path", str(data_dir / "enrichment_cache.db"))
+    monkeypatch.setattr(settings, "extraction_summary_cache_dir", str(data_dir / "chunk_summary_cache"))
+    monkeypatch.setattr(settings, "job_store_path", str(data_dir / "jobs.db"))
+
+
 @pytest.fixture
 def sample_jira_issue_data() -> Dict:
     """Sample Jira issue data for testing."""
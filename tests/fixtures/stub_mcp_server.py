@@ -0,0 +1,40 @@
+"""
+Local stdio MCP server standing in for GitLab MCP in tests.
+
+Tools return JSON with the serving process id, so tests can tell whether
+calls shared a process. STUB_MCP_LATENCY adds a delay (seconds) per call.
+"""
+
+import asyncio
+import json
+import os
+
+try:
+    from mcp.server.mcpserver import MCPServer as Server
+except ImportError:  # mcp < 2
+    from mcp.server.fastmcp import FastMCP as Server
+
+LATENCY = float(os.environ.get("STUB_MCP_LATENCY", "0"))
+
+server = Server("stub-gitlab")
+
+
+@server.tool()
+async def semantic_code_search(project_id: str, semantic_query: str, limit: int = 20, directory_path: str = "") -> str:
+    await asyncio.sleep(LATENCY)
+    return json.dumps([{"path": f"{project_id}/{semantic_query}.py", "pid": os.getpid()}])
+
+
+@server.tool()
+async def gitlab_search(scope: str, search: str, per_page: int = 20, project_id: str = "", group_id: str = "") -> str:
+    await asyncio.sleep(LATENCY)
+    return json.dumps([{"path": f"{group_id or project_id}/{scope}/{search}", "pid": os.getpid()}])
+
+
+@server.tool()
+def crash() -> str:
+    os._exit(1)
+
+
+if __name__ == "__main__":
+    server.run()
@@ -104,8 +104,13 @@ async def test_index_all_basic_workflow(mock_jira_client, mock_confluence_client
         mock_conf.search_all_pages = AsyncMock(return_value=[])
         mock_conf_class.return_value = mock_conf
         
+        async def no_pages(*args, **kwargs):
+            return
+            yield
+        
         mock_zeph = Mock()
         mock_zeph.get_test_cases_for_project = AsyncMock(return_value=[])
+        mock_zeph.iter_test_case_pages = no_pages
         mock_zeph_class.return_value = mock_zeph
         
         # Mock indexer methods
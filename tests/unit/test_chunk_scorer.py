@@ -0,0 +1,169 @@
+"""
+Unit tests for the compiled chunk scorer.
+
+The reference functions below are the original per-pattern implementations
+of QueryFocusedExtractor scoring; the compiled scorer must match them exactly.
+"""
+
+import random
+import re
+from typing import List
+
+import pytest
+
+from src.ai.chunk_scorer import ChunkScorer, StoryTerms
+from src.ai.context_extractor import (
+    CHUNK_SCORER,
+    NON_TESTABLE_PATTERNS,
+    SECTION_PATTERNS,
+    TESTABLE_PATTERNS,
+    QueryFocusedExtractor,
+)
+
+
+# ============================================================================
+# REFERENCE IMPLEMENTATION (one re.findall per pattern, ACs split per chunk)
+# ============================================================================
+
+def reference_relevance(chunk: str, story_keywords: List[str], acceptance_criteria: List[str]) -> float:
+    if not chunk:
+        return 0.0
+    chunk_lower = chunk.lower()
+    score = 0.0
+    if story_keywords:
+        keyword_matches = sum(1 for kw in story_keywords if kw.lower() in chunk_lower)
+        keyword_score = min(keyword_matches / max(len(story_keywords), 1), 1.0)
+        score += keyword_score * 0.4
+    if acceptance_criteria:
+        ac_matches = 0
+        for ac in acceptance_criteria:
+            ac_terms = [w.lower() for w in ac.split() if len(w) > 4]
+            matches = sum(1 for term in ac_terms if term in chunk_lower)
+            if matches >= 2:
+                ac_matches += 1
+        ac_score = min(ac_matches / max(len(acceptance_criteria), 1), 1.0)
+        score += ac_score * 0.6
+    return min(score, 1.0)
+
+
+def reference_testability(chunk: str) -> float:
+    if not chunk:
+        return 0.0
+    chunk_lower = chunk.lower()
+    score = 0.5
+    for pattern, weight in TESTABLE_PATTERNS:
+        matches = len(re.findall(pattern, chunk_lower, re.IGNORECASE))
+        score += min(matches * weight * 0.1, weight)
+    for pattern, weight in NON_TESTABLE_PATTERNS:
+        matches = len(re.findall(pattern, chunk_lower, re.IGNORECASE))
+        score += min(matches * weight * 0.1, weight)
+    return max(0.0, min(1.0, score))
+
+
+def reference_section(chunk: str) -> str:
+    chunk_lower = chunk.lower()
+    best_type = 'other'
+    best_score = 0
+    for section_type, pattern in SECTION_PATTERNS.items():
+        matches = len(re.findall(pattern, chunk_lower, re.IGNORECASE))
+        if matches > best_score:
+            best_score = matches
+            best_type = section_type
+    return best_type
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+STORY_KEYWORDS = ["audit", "tenant", "login", "session", "export", "pap"]
+ACCEPTANCE_CRITERIA = [
+    "Audit records are created for every tenant login session",
+    "Administrators can export audit records as CSV",
+    "Unauthorized users receive a 403 error when exporting",
+]
+
+_SENTENCES = [
+    "The system must validate the tenant token before creating an audit record.",
+    "When a user logs in, the API returns 201 and displays the session id.",
+    "Given an expired session, when the user calls GET /api/v1/audit then a 401 error is returned.",
+    "Historically we discussed several options in the review meeting; this was agreed later.",
+    "Note: this might change, TBD after the sync with the platform team.",
+    "As a user story, the administrator exports audit records via POST /api/v1/audit/export.",
+    "Users may not delete audit records; requests are rejected with forbidden.",
+    "Acceptance criteria: AC1 - records shall be created; AC2 - export should be validated.",
+    "Background: the audit service was introduced to provide context for compliance.",
+    "Use case: provided that the tenant is enabled, the workflow creates a login event.",
+    "Verify that invalid payloads fail validation and the response shows the error.",
+    "The endpoint PATCH /tenants/{id}/settings updates settings and cannot be called anonymously.",
+    "Ünïcode tenänt naïve café - the request must still be checked.",
+]
+
+
+def build_corpus(target_bytes: int, seed: int = 7) -> str:
+    """Build a Confluence-like corpus of headed sections and paragraphs."""
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    section = 0
+    while size < target_bytes:
+        section += 1
+        lines = [f"## Section {section}: {rng.choice(['Requirements', 'Overview', 'API', 'Decisions'])}"]
+        for _ in range(rng.randint(2, 6)):
+            lines.append(" ".join(rng.choice(_SENTENCES) for _ in range(rng.randint(1, 8))))
+            lines.append("")
+        text = "\n".join(lines)
+        parts.append(text)
+        size += len(text.encode("utf-8"))
+    return "\n".join(parts)
+
+
+@pytest.fixture(scope="module")
+def corpus_chunks() -> List[str]:
+    """Chunk a ~1 MB corpus the same way the extractor does."""
+    extractor = QueryFocusedExtractor(use_ai_summarization=False)
+    return extractor._chunk_document(build_corpus(1_000_000))
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestChunkScorer:
+    """Test that compiled scoring matches the per-pattern implementation."""
+
+    def test_only_path_pattern_needs_full_scan(self):
+        """Test that word alternations use word counts and phrases become guarded sub-patterns."""
+        scorer = ChunkScorer(TESTABLE_PATTERNS, NON_TESTABLE_PATTERNS, SECTION_PATTERNS)
+        patterns = [p for p, _ in scorer.testable + scorer.non_testable] + [p for _, p in scorer.sections]
+        unguarded = [p.regex.pattern for p in patterns if p.regex is not None and p.guard is None]
+
+        assert unguarded == [r'/[a-zA-Z0-9_/-]+']
+
+    @pytest.mark.parametrize("chunk", _SENTENCES + ["", "as a user story", "note:x note: y", "/a/b //c"])
+    def test_sentence_scores_match_reference(self, chunk):
+        """Test that each tricky sentence scores identically."""
+        terms = StoryTerms.from_story(STORY_KEYWORDS, ACCEPTANCE_CRITERIA)
+
+        assert CHUNK_SCORER.score_relevance(chunk, terms) == reference_relevance(
+            chunk, STORY_KEYWORDS, ACCEPTANCE_CRITERIA
+        )
+        assert CHUNK_SCORER.score_testability(chunk) == reference_testability(chunk)
+        if chunk:
+            assert CHUNK_SCORER.classify_section(chunk) == reference_section(chunk)
+
+    @pytest.mark.slow
+    def test_1mb_corpus_matches_reference(self, corpus_chunks):
+        """Test that every chunk of a 1 MB corpus scores identically."""
+        expected = [
+            (
+                reference_relevance(chunk, STORY_KEYWORDS, ACCEPTANCE_CRITERIA),
+                reference_testability(chunk),
+                reference_section(chunk),
+            )
+            for chunk in corpus_chunks
+        ]
+
+        terms = StoryTerms.from_story(STORY_KEYWORDS, ACCEPTANCE_CRITERIA)
+
+        assert CHUNK_SCORER.score_chunks(corpus_chunks, terms) == expected
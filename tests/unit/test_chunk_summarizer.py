@@ -0,0 +1,151 @@
+"""
+Unit tests for the chunk summarization service.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai.chunk_summarizer import ChunkSummarizer
+from src.ai.context_extractor import QueryFocusedExtractor
+
+
+class FakeCompletions:
+    """Records calls and tracks how many run at once."""
+
+    def __init__(self, fail: bool = False):
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.fail = fail
+
+    async def create(self, model, messages, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail:
+                raise RuntimeError("rate limited")
+            content = messages[0]["content"]
+            section = content.split("Document Section:\n", 1)[1][:20]
+            message = SimpleNamespace(content=f"- summary of {section}")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        finally:
+            self.in_flight -= 1
+
+
+def make_client(fail: bool = False):
+    return SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(fail=fail)))
+
+
+def long_chunk(label: str) -> str:
+    return f"{label}: the system must validate audit records when users log in. " * 20
+
+
+class TestChunkSummarizer:
+    """Test concurrency and disk memoization."""
+
+    @pytest.mark.asyncio
+    async def test_summarizes_concurrently_in_order(self, tmp_path):
+        """Chunks are summarized in parallel and returned in input order."""
+        client = make_client()
+        summarizer = ChunkSummarizer("gpt-4o-mini", cache_dir=str(tmp_path), client=client)
+        chunks = [long_chunk(f"C{i}") for i in range(4)]
+
+        summaries = await summarizer.summarize_many(chunks, "Audit logging", ["Audit records are created"])
+
+        assert [s[:16] for s in summaries] == [f"- summary of C{i}:" for i in range(4)]
+        assert client.chat.completions.calls == 4
+        assert client.chat.completions.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_respects_max_concurrency(self, tmp_path):
+        """No more than max_concurrency requests are in flight."""
+        client = make_client()
+        summarizer = ChunkSummarizer(
+            "gpt-4o-mini", cache_dir=str(tmp_path), max_concurrency=2, client=client
+        )
+
+        await summarizer.summarize_many([long_chunk(f"C{i}") for i in range(5)], "", [])
+
+        assert client.chat.completions.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_survives_new_instance(self, tmp_path):
+        """A second run for the same story is served from disk."""
+        chunks = [long_chunk("A"), long_chunk("B")]
+        first = ChunkSummarizer("gpt-4o-mini", cache_dir=str(tmp_path), client=make_client())
+        expected = await first.summarize_many(chunks, "Audit logging", ["AC one"])
+
+        client = make_client()
+        second = ChunkSummarizer("gpt-4o-mini", cache_dir=str(tmp_path), client=client)
+        summaries = await second.summarize_many(chunks, "Audit logging", ["AC one"])
+
+        assert summaries == expected
+        assert client.chat.completions.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded_and_expires(self, tmp_path, monkeypatch):
+        """Summaries beyond max_entries are evicted, and old ones are summarized again."""
+        chunks = [long_chunk(f"C{i}") for i in range(4)]
+        summarizer = ChunkSummarizer(
+            "gpt-4o-mini", cache_dir=str(tmp_path), client=make_client(), max_entries=3, ttl_hours=1
+        )
+        await summarizer.summarize_many(chunks, "", [])
+
+        assert len(list(tmp_path.glob("*.json.gz"))) == 3
+
+        client = make_client()
+        summarizer._client = client
+        monkeypatch.setattr(time, "time", lambda real=time.time(): real + 2 * 3600)
+        await summarizer.summarize_many(chunks[1:], "", [])
+
+        assert client.chat.completions.calls == 3
+
+    def test_cache_key_depends_on_model_and_story(self, tmp_path):
+        """Different ACs or models produce different keys; identical inputs do not."""
+        chunk = long_chunk("A")
+        mini = ChunkSummarizer("gpt-4o-mini", cache_dir=str(tmp_path), client=make_client())
+        other = ChunkSummarizer("gpt-4o", cache_dir=str(tmp_path), client=make_client())
+
+        key = mini.cache_key(chunk, "Story", ["AC one"])
+        assert key == mini.cache_key(chunk, "Story", ["AC one"])
+        assert key != mini.cache_key(chunk, "Story", ["AC two"])
+        assert key != other.cache_key(chunk, "Story", ["AC one"])
+
+    @pytest.mark.asyncio
+    async def test_failures_fall_back_and_are_not_cached(self, tmp_path):
+        """A failed request returns truncated text and is retried next time."""
+        chunk = long_chunk("A")
+        failing = ChunkSummarizer("gpt-4o-mini", cache_dir=str(tmp_path), client=make_client(fail=True))
+
+        [summary] = await failing.summarize_many([chunk], "", [])
+
+        assert len(summary) <= 503
+        assert not list(tmp_path.glob("*.json.gz"))
+
+
+class TestExtractorUsesSummarizer:
+    """Test that the extractor batches summarization."""
+
+    @pytest.mark.asyncio
+    async def test_long_chunks_summarized_in_one_batch(self, tmp_path):
+        """All long chunks within budget are summarized concurrently, not one by one."""
+        client = make_client()
+        summarizer = ChunkSummarizer("gpt-4o-mini", cache_dir=str(tmp_path), client=client)
+        extractor = QueryFocusedExtractor(min_relevance_score=0.0, summarizer=summarizer)
+        document = "\n\n".join(f"## Section {i}\n{long_chunk(f'S{i}')}" for i in range(3))
+
+        result = await extractor.extract_relevant_content(
+            document=document,
+            story_keywords=["audit"],
+            acceptance_criteria=["audit records validated on login"],
+            max_output_chars=5000,
+        )
+
+        assert client.chat.completions.calls == 3
+        assert client.chat.completions.peak == 3
+        assert result.count("- summary of") == 3
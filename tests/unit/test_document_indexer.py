@@ -36,3 +36,17 @@ async def test_index_existing_tests_normalizes_metadata():
     args = indexer.store.add_documents.await_args
     passed_meta = args.kwargs['metadatas']
     assert all(isinstance(value, str) for meta in passed_meta for value in meta.values())
+
+
+@pytest.mark.asyncio
+async def test_batch_indexing_reports_stored_count():
+    indexer = DocumentIndexer(store=MagicMock())
+    indexer.store.add_documents = AsyncMock(side_effect=[None, RuntimeError("upsert failed")])
+
+    documents = [f"Story {i}" for i in range(4)]
+    metadatas = [{"key": f"S-{i}"} for i in range(4)]
+    ids = ["s0", "s1", "s1", "s2"]
+
+    assert await indexer.index_jira_stories(documents, metadatas, ids, batch_size=2) == 2
+    indexer.store.add_documents = AsyncMock()
+    assert await indexer.index_confluence_docs(documents, metadatas, ids, batch_size=3) == 4
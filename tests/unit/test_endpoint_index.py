@@ -0,0 +1,305 @@
+"""
+Unit tests for the Swagger endpoint index.
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import yaml
+
+from src.ai.api_context_builder import APIContextBuilder
+from src.ai.context_extractor import extract_swagger_endpoints
+from src.ai.context_indexer import ContextIndexer
+from src.ai.indexing.document_processor import DocumentProcessor
+from src.ai.indexing.endpoint_index import EndpointIndex, extract_endpoint_records, get_endpoint_index
+from src.ai.swagger_extractor import SwaggerExtractor
+from src.config.settings import settings
+from src.external.gitlab_swagger_fetcher import SwaggerDocument
+
+POLICY_SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Policy Management", "version": "1.0"},
+    "servers": [{"url": "https://api.example.com/policy-mgmt/1.0"}],
+    "security": [{"bearerAuth": []}],
+    "components": {
+        "securitySchemes": {"bearerAuth": {"type": "http", "scheme": "bearer"}},
+        "schemas": {
+            "PolicyRequest": {
+                "type": "object",
+                "required": ["name"],
+                "properties": {
+                    "name": {"type": "string", "description": "Policy name"},
+                    "applicationId": {"type": "string"},
+                },
+            },
+            "Policy": {"allOf": [{"$ref": "#/components/schemas/PolicyRequest"}, {"properties": {"id": {"type": "string"}}}]},
+        },
+        "parameters": {"PolicyId": {"name": "policyId", "in": "path", "required": True, "schema": {"type": "string"}}},
+    },
+    "paths": {
+        "/policies": {
+            "get": {
+                "operationId": "listPolicies",
+                "summary": "List policies",
+                "tags": ["policies"],
+                "parameters": [{"name": "offset", "in": "query", "schema": {"type": "integer"}}],
+                "responses": {"200": {"description": "OK", "content": {"application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/Policy"}},
+                    "example": [{"id": "p-1", "name": "mask"}],
+                }}}},
+            },
+            "post": {
+                "operationId": "createPolicy",
+                "summary": "Create a policy",
+                "requestBody": {"content": {"application/json": {
+                    "schema": {"$ref": "#/components/schemas/PolicyRequest"},
+                    "examples": {"basic": {"value": {"name": "mask", "applicationId": "app-1"}}},
+                }}},
+                "responses": {"201": {"description": "Created"}, "400": {"description": "Invalid"}},
+            },
+        },
+        "/policies/{policyId}": {
+            "parameters": [{"$ref": "#/components/parameters/PolicyId"}],
+            "delete": {"operationId": "deletePolicy", "summary": "Delete a policy", "responses": {"204": {"description": "Deleted"}}},
+        },
+        "/applications/{applicationId}/policies": {
+            "get": {
+                "operationId": "fetchPoliciesByApplication",
+                "summary": "Policies attached to an application",
+                "parameters": [{"name": "applicationId", "in": "path", "required": True, "schema": {"type": "string"}}],
+                "responses": {"200": {"description": "OK"}},
+            },
+        },
+    },
+}
+
+SWAGGER2_SPEC = {
+    "swagger": "2.0",
+    "basePath": "/audit/v2",
+    "definitions": {"Event": {"type": "object", "properties": {"type": {"type": "string"}}}},
+    "paths": {"/events": {"post": {
+        "parameters": [{"name": "body", "in": "body", "schema": {"$ref": "#/definitions/Event"}}],
+        "responses": {"200": {"description": "OK", "schema": {"$ref": "#/definitions/Event"}}},
+    }}},
+}
+
+
+def swagger_doc(spec: dict, service_name: str = "policy-mgmt", file_path: str = "master/specfiles/policy-mgmt.yaml"):
+    """SwaggerDocument holding a spec serialized as YAML."""
+    return SwaggerDocument(
+        service_name=service_name,
+        file_path=file_path,
+        content=yaml.safe_dump(spec, sort_keys=False),
+        project_url="https://gitlab.example.com/org/openapi",
+        branch="master",
+        project_id=42,
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Endpoint index populated from the policy management spec."""
+    index = EndpointIndex(str(tmp_path / "endpoints.json.gz"))
+    doc = swagger_doc(POLICY_SPEC)
+    index.replace_file(doc.service_name, doc.file_path, extract_endpoint_records(doc, "POLICY"))
+    return index
+
+
+class TestExtractEndpointRecords:
+    """Test one record per operation, with resolved schemas and examples."""
+
+    def test_openapi3_records(self):
+        """Test that OpenAPI 3 operations resolve refs, examples, auth and base path."""
+        records = {f"{r.method} {r.path}": r for r in extract_endpoint_records(swagger_doc(POLICY_SPEC), "POLICY")}
+
+        assert list(records) == [
+            "GET /policies", "POST /policies", "DELETE /policies/{policyId}", "GET /applications/{applicationId}/policies",
+        ]
+        create = records["POST /policies"]
+        assert create.request_schema == "PolicyRequest {name: string*, applicationId: string}"
+        assert create.dto_definitions["name"] == {"type": "string", "required": True, "description": "Policy name"}
+        assert create.request_example == '{"name": "mask", "applicationId": "app-1"}'
+        assert create.response_schema == "201: Created; 400: Invalid"
+        assert create.authentication == "bearerAuth (bearer)"
+        assert create.base_path == "/policy-mgmt/1.0"
+
+        listing = records["GET /policies"]
+        assert listing.parameters == ["offset (query, integer)"]
+        assert listing.response_schema == "200: OK (Policy[])"
+        assert listing.response_example == '[{"id": "p-1", "name": "mask"}]'
+        assert records["DELETE /policies/{policyId}"].parameters == ["policyId (path, string) (required)"]
+
+    def test_swagger2_body_parameter(self):
+        """Test that a Swagger 2 body parameter becomes the request schema."""
+        (record,) = extract_endpoint_records(swagger_doc(SWAGGER2_SPEC, "audit"))
+
+        assert record.request_schema == "Event {type: string}"
+        assert record.response_schema == "200: OK (Event)"
+        assert record.parameters == [] and record.base_path == "/audit/v2"
+
+    def test_unparseable_spec_yields_nothing(self):
+        """Test that invalid YAML produces no records."""
+        doc = swagger_doc({})
+        doc.content = "paths: [unclosed"
+
+        assert extract_endpoint_records(doc) == []
+
+
+class TestEndpointIndex:
+    """Test path trie matching, token search and persistence."""
+
+    def test_match_concrete_path_with_base_prefix(self, index):
+        """Test that concrete paths match templates, with or without the server prefix."""
+        matches = index.match_path("/policy-mgmt/1.0/policies/b8825285-6c6d/")
+
+        assert [(r.method, r.path) for r in matches] == [("DELETE", "/policies/{policyId}")]
+        assert [r.method for r in index.match_path("/policies")] == ["GET", "POST"]
+        assert [r.method for r in index.match_path("/policies", method="post")] == ["POST"]
+        assert index.match_path("/applications/{id}/policies")[0].operation_id == "fetchPoliciesByApplication"
+
+    def test_wildcard_only_and_unknown_paths_do_not_match(self, index):
+        """Test that a lone ID segment or an unknown path matches nothing."""
+        assert index.match_path("/b8825285") == []
+        assert index.match_path("/rulesets/1/actions") == []
+
+    def test_token_search(self, index):
+        """Test token search ranking and project filtering."""
+        results = index.search("fetch policies by application id", limit=2)
+
+        assert results[0].operation_id == "fetchPoliciesByApplication"
+        assert index.search("application", project_key="OTHER") == []
+
+    def test_replace_file_reports_dropped_operations(self, index):
+        """Test that replacing a file returns operations no longer in the spec."""
+        spec = yaml.safe_load(yaml.safe_dump(POLICY_SPEC))
+        del spec["paths"]["/policies/{policyId}"]
+        doc = swagger_doc(spec)
+
+        dropped = index.replace_file(doc.service_name, doc.file_path, extract_endpoint_records(doc, "POLICY"))
+
+        assert [r.key for r in dropped] == ["policy-mgmt|master/specfiles/policy-mgmt.yaml|DELETE /policies/{policyId}"]
+        assert index.match_path("/policies/123") == []
+        assert len(index) == 3 and "delete" not in index._tokens
+
+    def test_save_load_and_shared_reload(self, index):
+        """Test that the shared index reloads after the file changes on disk."""
+        index.save()
+        shared = get_endpoint_index(str(index.path))
+        assert len(shared) == 4
+        assert shared.match_path("/policies/1")[0].parameters == ["policyId (path, string) (required)"]
+
+        index.remove_file("policy-mgmt", "master/specfiles/policy-mgmt.yaml")
+        time.sleep(0.01)
+        index.save()
+
+        assert len(get_endpoint_index(str(index.path))) == 0
+
+
+class TestStoryTimeLookups:
+    """Test that story-time extraction reads endpoint details from the index."""
+
+    @pytest.fixture
+    def extractor(self, index):
+        """SwaggerExtractor over the index, with a mocked RAG store."""
+        with patch("src.ai.swagger_extractor.RAGVectorStore"):
+            extractor = SwaggerExtractor()
+        extractor.endpoint_index = index
+        return extractor
+
+    def test_explicit_path_gets_spec_details(self, extractor):
+        """Test that explicitly mentioned paths take details from the index."""
+        text = "we use POST /policy-mgmt/1.0/policies and GET /unknown-svc/items/list"
+
+        specs = extractor._merge_and_build_specs(extractor._extract_endpoints_explicit(text), [], text)
+
+        by_path = {s.endpoint_path: s for s in specs}
+        indexed = by_path["/policy-mgmt/1.0/policies"]
+        assert indexed.http_methods == ["POST"] and indexed.service_name == "policy-mgmt"
+        assert indexed.request_example == '{"name": "mask", "applicationId": "app-1"}'
+        assert by_path["/unknown-svc/items/list"].service_name == "Mentioned in story"
+
+    def test_semantic_endpoint_match_uses_record(self, extractor):
+        """Test that a semantic endpoint hit is built from its record."""
+        metadata = {"doc_type": "endpoint", "service_name": "policy-mgmt",
+                    "file_path": "master/specfiles/policy-mgmt.yaml", "method": "DELETE", "path": "/policies/{policyId}"}
+
+        spec = extractor._spec_from_index(metadata)
+
+        assert spec.http_methods == ["DELETE"] and spec.parameters == ["policyId (path, string) (required)"]
+
+    def test_context_builder_and_extractor_use_records(self, index):
+        """Test that the context builder and extractor prefer records to document text."""
+        builder = APIContextBuilder.__new__(APIContextBuilder)
+        builder.swagger_extractor = MagicMock(endpoint_index=index)
+        result = {"document": "GET /stale-text/path", "metadata": {
+            "service_name": "policy-mgmt", "file_path": "master/specfiles/policy-mgmt.yaml"}}
+
+        specs = builder._specs_from_swagger_result(result)
+        unknown = builder._specs_from_swagger_result({"document": "GET /legacy/path", "metadata": {}})
+        records = index.records_for_file("policy-mgmt", "master/specfiles/policy-mgmt.yaml")
+        extracted = extract_swagger_endpoints("", ["application"], records)
+
+        assert len(specs) == 4 and specs[1].request_schema.startswith("PolicyRequest")
+        assert [s.endpoint_path for s in unknown] == ["/legacy/path"]
+        assert extracted.startswith("Service: policy-mgmt\nEndpoint: GET /applications/{applicationId}/policies")
+
+
+@pytest.mark.asyncio
+async def test_context_indexer_embeds_endpoints_and_drops_stale_ones(tmp_path, monkeypatch):
+    """Test that indexing embeds one document per endpoint and removes dropped ones."""
+    monkeypatch.setattr(settings, "swagger_endpoint_index_path", str(tmp_path / "endpoints.json.gz"))
+    spec = yaml.safe_load(yaml.safe_dump(POLICY_SPEC))
+    fetcher = MagicMock(swagger_stats={})
+    fetcher.fetch_gitlab_swagger_docs = AsyncMock(return_value=[swagger_doc(spec)])
+    indexer = MagicMock()
+    indexer.store.get_collection_stats.return_value = {"count": 0}
+    indexer.create_swagger_metadata.return_value = {"doc_hash": "abc"}
+    indexer.create_endpoint_doc_id.side_effect = lambda record: record.key
+    indexer.index_swagger_docs = AsyncMock(side_effect=lambda texts, metadatas, ids: len(texts))
+    context_indexer = ContextIndexer(processor=DocumentProcessor(), fetcher=fetcher, indexer=indexer)
+
+    assert await context_indexer.index_gitlab_swagger_docs() == 5
+    ids = indexer.index_swagger_docs.call_args.args[2]
+    assert ids[-1] == "swagger_abc" and len(ids) == 5
+    fetcher.commit_gitlab_swagger_docs.assert_called_once()
+
+    del spec["paths"]["/policies/{policyId}"]
+    fetcher.fetch_gitlab_swagger_docs = AsyncMock(return_value=[swagger_doc(spec)])
+    await context_indexer.index_gitlab_swagger_docs()
+
+    (stale,) = indexer.remove_endpoint_docs.call_args.args[0]
+    assert stale.path == "/policies/{policyId}"
+    assert len(EndpointIndex(settings.swagger_endpoint_index_path)) == 3
+
+
+def test_story_time_lookup_reads_index_instead_of_spec_text(tmp_path):
+    """Test that indexed specs are served from records without scanning the flattened spec text."""
+    processor = DocumentProcessor()
+    index = EndpointIndex(str(tmp_path / "endpoints.json.gz"))
+    results = []
+    for s in range(5):
+        spec = {"openapi": "3.0.0", "info": {"title": f"svc{s}", "version": "1"}, "paths": {}}
+        for e in range(10):
+            spec["paths"][f"/svc{s}/resource{e}/{{id}}"] = {
+                "get": {"operationId": f"getResource{e}", "summary": f"Get resource {e} of service {s}",
+                        "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}],
+                        "responses": {"200": {"description": "OK"}, "404": {"description": "Not found"}}},
+            }
+        doc = swagger_doc(spec, f"svc-{s}", f"master/specfiles/svc-{s}.yaml")
+        index.replace_file(doc.service_name, doc.file_path, extract_endpoint_records(doc, "SVC"))
+        results.append({"document": processor.build_swagger_document(doc),
+                        "metadata": {"service_name": doc.service_name, "file_path": doc.file_path}})
+    builder = APIContextBuilder.__new__(APIContextBuilder)
+    builder.swagger_extractor = MagicMock(endpoint_index=index)
+    builder._parse_swagger_content = MagicMock(return_value=[])
+
+    specs = [spec for result in results for spec in builder._specs_from_swagger_result(result)]
+    records = index.records_for_file("svc-3", "master/specfiles/svc-3.yaml")
+    extracted = extract_swagger_endpoints("unrelated text", ["resource7"], records)
+
+    builder._parse_swagger_content.assert_not_called()
+    assert len(specs) == 50
+    assert "/svc3/resource7/{id}" in {spec.endpoint_path for spec in specs}
+    assert "Endpoint: GET /svc3/resource7/{id}" in extracted and "unrelated text" not in extracted
+    assert index.match_path("/svc3/resource7/abc-123")[0].service_name == "svc-3"
@@ -0,0 +1,149 @@
+"""
+Unit tests for the SQLite enrichment cache backend.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.ai import enrichment_cache as enrichment_cache_module
+from src.ai.enrichment_cache import EnrichmentCache, create_enrichment_cache
+from src.ai.enrichment_cache_sqlite import SQLiteEnrichmentCache
+from src.config.settings import settings
+from src.models.enriched_story import ConfluenceDocRef, EnrichedStory
+
+
+def make_enriched(story_key: str, timestamp: datetime = None) -> EnrichedStory:
+    """Enriched story with a narrative long enough to be compressed."""
+    return EnrichedStory(
+        story_key=story_key,
+        feature_narrative="Tenants can export audit records as CSV. " * 40,
+        acceptance_criteria=["Export includes all fields", "Export is limited to 10k rows"],
+        risk_areas=["Large exports time out"],
+        enrichment_timestamp=timestamp or datetime(2024, 1, 10),
+        source_story_ids=[story_key, "PROJ-2"],
+        confluence_docs=[ConfluenceDocRef(url="https://wiki/x/1", title="Audit PRD")],
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """SQLite cache without a background sweeper."""
+    cache = SQLiteEnrichmentCache(str(tmp_path / "cache.db"), max_entries=3, sweep_interval=0)
+    yield cache
+    cache.close()
+
+
+class TestSQLiteEnrichmentCache:
+    """Test the indexed, compressed backend."""
+
+    def test_round_trip(self, cache):
+        """Test that a saved story is returned unchanged."""
+        enriched = make_enriched("PROJ-1")
+        cache.save_cached(enriched)
+
+        assert cache.get_cached("PROJ-1") == enriched
+        assert cache.get_cached("PROJ-404") is None
+
+        stats = cache.get_cache_stats()
+        assert stats["total_files"] == 1
+        assert stats["backend"] == "sqlite"
+
+    def test_lookup_searches_by_key(self, cache):
+        """Test that a lookup is an index search, so it stays flat as the cache grows."""
+        plan = cache._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT created_at, codec, payload FROM enrichments WHERE story_key = ?", ("PROJ-1",)
+        ).fetchall()
+
+        assert plan[0][-1].startswith("SEARCH enrichments USING")
+
+    def test_story_updated_after_cache_invalidates(self, cache):
+        """Test that an entry older than the story's last update is a miss."""
+        cache.save_cached(make_enriched("PROJ-1", datetime(2024, 1, 10)))
+
+        assert cache.get_cached("PROJ-1", datetime(2024, 1, 9)) is not None
+        assert cache.get_cached("PROJ-1", datetime(2024, 1, 11)) is None
+
+    def test_save_replaces_previous_entry(self, cache):
+        """Test that saving a story again replaces its entry."""
+        cache.save_cached(make_enriched("PROJ-1", datetime(2024, 1, 10)))
+        cache.save_cached(make_enriched("PROJ-1", datetime(2024, 2, 10)))
+
+        assert cache.get_cached("PROJ-1").enrichment_timestamp == datetime(2024, 2, 10)
+        assert cache.get_cache_stats()["total_files"] == 1
+
+    def test_clear_cache(self, cache):
+        """Test clearing one story and then all stories."""
+        for key in ("PROJ-1", "PROJ-2", "PROJ-3"):
+            cache.save_cached(make_enriched(key))
+
+        assert cache.clear_cache("PROJ-1") == 1
+        assert cache.clear_cache() == 2
+        assert cache.get_cache_stats()["total_files"] == 0
+
+    def test_sweep_removes_expired_and_least_recently_used(self, cache, monkeypatch):
+        """Test that a sweep drops expired entries, then the least recently used."""
+        cache.save_cached(make_enriched("OLD-1"))
+        real_time = time.time
+        monkeypatch.setattr(time, "time", lambda: real_time() + (cache.ttl_days + 1) * 86400)
+        for i in range(4):
+            cache.save_cached(make_enriched(f"PROJ-{i}"))
+        # Reading PROJ-0 makes PROJ-1 the least recently used
+        assert cache.get_cached("PROJ-0") is not None
+
+        result = cache.sweep()
+
+        assert result == {"expired": 1, "evicted": 1}
+        assert cache.get_cached("PROJ-1") is None
+        assert cache.get_cached("PROJ-0") is not None
+
+    def test_background_sweeper_runs(self, tmp_path):
+        """Test that the background sweeper enforces max_entries."""
+        cache = SQLiteEnrichmentCache(str(tmp_path / "swept.db"), max_entries=1, sweep_interval=0.05)
+        try:
+            cache.save_cached(make_enriched("PROJ-1"))
+            cache.save_cached(make_enriched("PROJ-2"))
+            deadline = time.time() + 2
+            while cache.get_cache_stats()["total_files"] > 1 and time.time() < deadline:
+                time.sleep(0.02)
+
+            assert cache.get_cache_stats()["total_files"] == 1
+        finally:
+            cache.close()
+
+
+def test_backend_is_selected_by_settings(tmp_path, monkeypatch):
+    """Test that settings select the backend and the SQLite cache is shared."""
+    monkeypatch.setattr(enrichment_cache_module, "_sqlite_caches", {})
+    monkeypatch.setattr(settings, "enrichment_cache_db_path", str(tmp_path / "shared.db"))
+    monkeypatch.setattr(settings, "enrichment_cache_sweep_interval_seconds", 0)
+
+    monkeypatch.setattr(settings, "enrichment_cache_backend", "file")
+    assert isinstance(create_enrichment_cache(str(tmp_path / "files")), EnrichmentCache)
+
+    monkeypatch.setattr(settings, "enrichment_cache_backend", "sqlite")
+    first = create_enrichment_cache()
+    assert isinstance(first, SQLiteEnrichmentCache)
+    assert create_enrichment_cache() is first
+    own = create_enrichment_cache(str(tmp_path / "own"))
+    assert own is not first and own.db_path == tmp_path / "own" / "enrichment_cache.db"
+    first.close()
+    own.close()
+
+
+def test_lookups_match_file_backend(tmp_path):
+    """Test that both backends return the same entries for a populated cache."""
+    file_cache = EnrichmentCache(str(tmp_path / "files"))
+    sqlite_cache = SQLiteEnrichmentCache(str(tmp_path / "cache.db"), max_entries=200, sweep_interval=0)
+    now = datetime.utcnow()
+    for i in range(200):
+        enriched = make_enriched(f"PROJ-{i}", now - timedelta(minutes=i))
+        file_cache.save_cached(enriched)
+        sqlite_cache.save_cached(enriched)
+
+    keys = [f"PROJ-{i}" for i in range(0, 200, 20)] + ["PROJ-404"]
+    try:
+        assert [sqlite_cache.get_cached(key) for key in keys] == [file_cache.get_cached(key) for key in keys]
+    finally:
+        sqlite_cache.close()
@@ -0,0 +1,322 @@
+"""
+Unit tests for the single-pass external docs crawler.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Dict, List
+from unittest.mock import AsyncMock, MagicMock
+from urllib.parse import urljoin
+
+import httpx
+import pytest
+from bs4 import BeautifulSoup
+
+from src.ai.context_indexer import ContextIndexer
+from src.ai.indexing.document_fetcher import DocumentFetcher
+from src.ai.indexing.document_processor import DocumentProcessor
+from src.config.settings import settings
+from src.external import external_doc_crawler
+from src.external.external_doc_crawler import ExternalDocCrawler, HostRateLimiter
+from src.external.http_cache import HTTPCache, content_hash
+
+BASE = "https://docs.example.com/docs"
+
+
+def page(title: str, links: List[str], body: str = "") -> str:
+    """HTML page with a title, a body and links."""
+    anchors = "".join(f'<a href="{href}">{href}</a>' for href in links)
+    return f"<html><head><title>{title}</title></head><body><main>{body}{anchors}</main></body></html>"
+
+
+def build_site(fanout: int = 3, depth: int = 3) -> Dict[str, str]:
+    """A tree of pages where every page also links home and to itself with a fragment."""
+    site = {}
+
+    def add(path: str, level: int) -> None:
+        children = [f"{path}/p{i}" for i in range(fanout)] if level < depth else []
+        links = [f"{child}/" for child in children] + [BASE + "/", f"{path}#top", "https://other.example.com/x"]
+        site[path] = page(path.rsplit("/", 1)[-1], links, body='<pre>{"id": "abc-123", "name": "example"}</pre>')
+        for child in children:
+            add(child, level + 1)
+
+    add(BASE, 0)
+    return site
+
+
+class FakeSite:
+    """httpx transport serving a dict of pages with optional latency and ETags, counting requests."""
+
+    def __init__(self, pages: Dict[str, str], latency: float = 0.0, etags: bool = False):
+        self.pages = pages
+        self.latency = latency
+        self.etags = etags
+        self.requests: Counter = Counter()
+        self.not_modified = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url).rstrip("/")
+        self.requests[url] += 1
+        if self.latency:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(self.latency)
+            finally:
+                self.in_flight -= 1
+        if url not in self.pages:
+            return httpx.Response(404)
+        if not self.etags:
+            return httpx.Response(200, text=self.pages[url])
+        etag = f'"{content_hash(self.pages[url])[:12]}"'
+        if request.headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, text=self.pages[url], headers={"ETag": etag})
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+
+def make_crawler(site: FakeSite, **kwargs) -> ExternalDocCrawler:
+    """Crawler of the fake site without politeness delays."""
+    options = {"max_pages": 1000, "delay": 0, "max_depth": 10, "concurrency": 8}
+    options.update(kwargs)
+    return ExternalDocCrawler(BASE, transport=site.transport(), **options)
+
+
+async def reference_two_phase_crawl(site: FakeSite, max_pages: int) -> int:
+    """The original flow: sequential BFS discovery, then a sequential re-fetch of every page."""
+    crawler = make_crawler(site)
+    async with httpx.AsyncClient(transport=site.transport()) as client:
+        visited, queue, discovered = set(), [BASE], []
+        while queue and len(discovered) < max_pages:
+            url = queue.pop(0)
+            if url in visited:
+                continue
+            visited.add(url)
+            discovered.append(url)
+            html = (await client.get(url)).text
+            soup = BeautifulSoup(html, "html.parser")
+            for link in {tag["href"] for tag in soup.find_all("a", href=True) if not tag["href"].startswith("#")}:
+                normalized = crawler._normalize_url(urljoin(url, link))
+                if normalized and normalized not in visited:
+                    queue.append(normalized)
+        for url in discovered:
+            await client.get(url)
+    return len(discovered)
+
+
+class TestSinglePassCrawl:
+    """Test that discovery and fetching share one request per page."""
+
+    @pytest.mark.asyncio
+    async def test_each_page_fetched_once(self):
+        """Test that every page is requested exactly once."""
+        site = FakeSite(build_site())
+        crawler = make_crawler(site)
+
+        docs = await crawler.crawl()
+
+        assert len(docs) == len(site.pages) == 40
+        assert set(site.requests.values()) == {1}
+        assert docs[0].url == BASE
+        assert "=== JSON EXAMPLES ===" in docs[0].html
+        assert {doc.title for doc in docs[1:4]} == {"p0", "p1", "p2"}
+
+    @pytest.mark.asyncio
+    async def test_fetch_content_reuses_crawled_pages(self):
+        """Test that fetch_content() after discover_urls() makes no new requests."""
+        site = FakeSite(build_site(depth=1))
+        crawler = make_crawler(site)
+
+        urls = await crawler.discover_urls()
+        docs = await crawler.fetch_content(urls)
+
+        assert [doc.url for doc in docs] == urls
+        assert sum(site.requests.values()) == len(site.pages)
+
+    @pytest.mark.asyncio
+    async def test_limits(self):
+        """Test the page and depth limits."""
+        site = FakeSite(build_site())
+
+        assert len(await make_crawler(site, max_pages=5).crawl()) == 5
+        # Depth 1: the entry page and its direct children
+        assert len(await make_crawler(site, max_depth=1).crawl()) == 4
+
+    @pytest.mark.asyncio
+    async def test_unreachable_entry_returns_nothing(self):
+        """Test that a missing entry page yields no documents."""
+        crawler = make_crawler(FakeSite({}))
+
+        assert await crawler.crawl() == []
+
+    @pytest.mark.asyncio
+    async def test_half_the_requests_of_discover_then_fetch(self):
+        """Test that one concurrent pass replaces sequential discovery plus a re-fetch."""
+        pages = build_site(fanout=4, depth=3)
+        reference_site = FakeSite(pages)
+        site = FakeSite(pages, latency=0.001)
+
+        discovered = await reference_two_phase_crawl(reference_site, max_pages=1000)
+        docs = await make_crawler(site, concurrency=8).crawl()
+
+        assert len(docs) == discovered == len(pages)
+        assert sum(site.requests.values()) * 2 == sum(reference_site.requests.values())
+        assert 1 < site.peak <= 8
+
+
+class TestConditionalRecrawl:
+    """Test that re-crawls only parse and return changed pages."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_pages_are_skipped(self, tmp_path):
+        """Test that 304 responses are skipped but their cached links are followed."""
+        pages = build_site(depth=2)
+        cache = HTTPCache(tmp_path / "cache.json")
+        assert len(await make_crawler(FakeSite(pages, etags=True), http_cache=cache).crawl()) == 13
+        cache.save()
+
+        pages[BASE + "/p1"] = pages[BASE + "/p1"].replace("abc-123", "abc-456")
+        site = FakeSite(pages, etags=True)
+        crawler = make_crawler(site, http_cache=HTTPCache(tmp_path / "cache.json"))
+        docs = await crawler.crawl()
+
+        assert [doc.url for doc in docs] == [BASE + "/p1"]
+        assert site.not_modified == 12
+        # Links of 304 pages come from the cache, so the whole site is still reached
+        assert len(crawler.reached_urls) == 13
+        assert crawler.stats == {"unchanged": 12, "changed": 1}
+
+    @pytest.mark.asyncio
+    async def test_identical_body_without_validators_is_unchanged(self, tmp_path):
+        """Test that a body with an unchanged hash counts as unchanged."""
+        pages = build_site(depth=1)
+        cache = HTTPCache(tmp_path / "cache.json")
+        await make_crawler(FakeSite(pages), http_cache=cache).crawl()
+
+        crawler = make_crawler(FakeSite(pages), http_cache=cache)
+
+        assert await crawler.crawl() == []
+        assert crawler.stats == {"unchanged": 4}
+
+    @pytest.fixture
+    def pages(self):
+        """Mutable site served to the fetcher's crawlers."""
+        return build_site(depth=1)
+
+    @pytest.fixture
+    def fetcher(self, pages, tmp_path, monkeypatch):
+        """DocumentFetcher crawling the fake site, with its validator cache under tmp_path."""
+        monkeypatch.setattr(settings, "external_doc_index_enabled", True)
+        monkeypatch.setattr(settings, "external_doc_urls", [BASE])
+        monkeypatch.setattr(settings, "http_cache_dir", str(tmp_path))
+        fetcher = DocumentFetcher()
+        create = fetcher._create_crawler
+        monkeypatch.setattr(
+            fetcher, "_create_crawler",
+            lambda url, http_cache=None: ExternalDocCrawler(
+                url, delay=0, transport=FakeSite(pages, etags=True).transport(), http_cache=http_cache
+            ),
+        )
+        assert create(BASE).concurrency == settings.external_doc_max_concurrency
+        return fetcher
+
+    @pytest.mark.asyncio
+    async def test_fetcher_reports_counts_and_removed_pages(self, fetcher, pages):
+        """Test the fetcher's new, changed, unchanged and removed counts across runs."""
+        assert len(await fetcher.fetch_external_docs()) == 4
+        assert fetcher.external_stats["new"] == 4
+        fetcher.commit_external_docs()
+
+        # p2 is unlinked and deleted; p0 changes
+        pages[BASE] = pages[BASE].replace(f'href="{BASE}/p2/"', 'href="#"')
+        del pages[BASE + "/p2"]
+        pages[BASE + "/p0"] += "<p>new section</p>"
+        docs = await fetcher.fetch_external_docs()
+
+        assert sorted(doc.url for doc in docs) == [BASE, BASE + "/p0"]
+        assert fetcher.external_stats == {
+            "new": 0, "changed": 2, "unchanged": 1, "failed": 0, "removed": [BASE + "/p2"],
+        }
+        fetcher.commit_external_docs()
+
+        # An empty collection forces a full fetch
+        assert len(await fetcher.fetch_external_docs(force_refresh=True)) == 3
+
+    @pytest.mark.asyncio
+    async def test_pages_that_fail_to_embed_are_fetched_again(self, fetcher):
+        """Test that validators are only recorded once the indexer stored every page."""
+        indexer = MagicMock()
+        indexer.store.get_collection_stats.return_value = {"count": 1}
+        indexer.create_external_doc_metadata.return_value = {}
+        indexer.create_external_doc_id.side_effect = lambda url: url
+        indexer.index_external_docs = AsyncMock(return_value=0)
+        context_indexer = ContextIndexer(processor=DocumentProcessor(), fetcher=fetcher, indexer=indexer)
+
+        assert await context_indexer.index_external_docs() == 0
+        indexer.index_external_docs = AsyncMock(side_effect=lambda texts, metadatas, ids: len(texts))
+        assert await context_indexer.index_external_docs() == 4
+        assert fetcher.external_stats["new"] == 4
+
+        assert await context_indexer.index_external_docs() == 0
+        assert fetcher.external_stats["unchanged"] == 4
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    """Fake monotonic clock that asyncio.sleep in the crawler module advances."""
+    now = [0.0]
+    slept = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+        await real_sleep(0)
+
+    monkeypatch.setattr(external_doc_crawler.asyncio, "sleep", fake_sleep)
+    return now, slept
+
+
+class TestHostRateLimiter:
+    """Test token bucket pacing."""
+
+    @pytest.mark.asyncio
+    async def test_paces_after_burst(self, fake_time):
+        """Test that requests beyond the burst wait 1/rate each."""
+        now, slept = fake_time
+        limiter = HostRateLimiter(rate=50, burst=2, clock=lambda: now[0])
+
+        for _ in range(6):
+            await limiter.acquire("https://a.example.com/x")
+
+        # 2 burst tokens, then 4 more at 20ms each
+        assert slept == pytest.approx([0.02] * 4)
+
+    @pytest.mark.asyncio
+    async def test_tokens_refill_over_time(self, fake_time):
+        """Test that an idle host earns its burst back."""
+        now, slept = fake_time
+        limiter = HostRateLimiter(rate=10, burst=2, clock=lambda: now[0])
+        await limiter.acquire("https://a.example.com/x")
+        await limiter.acquire("https://a.example.com/x")
+
+        now[0] += 0.2
+        await limiter.acquire("https://a.example.com/x")
+        await limiter.acquire("https://a.example.com/x")
+
+        assert slept == []
+
+    @pytest.mark.asyncio
+    async def test_hosts_are_independent(self, fake_time):
+        """Test that each host has its own bucket."""
+        now, slept = fake_time
+        limiter = HostRateLimiter(rate=1, burst=1, clock=lambda: now[0])
+
+        await asyncio.gather(*(limiter.acquire(f"https://h{i}.example.com/") for i in range(5)))
+
+        assert slept == []
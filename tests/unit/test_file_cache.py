@@ -0,0 +1,82 @@
+"""
+Unit tests for the gzip file cache shared by the snapshot and search caches.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.utils.file_cache import GzipFileCache
+
+
+@pytest.fixture
+def cache(tmp_path) -> GzipFileCache:
+    return GzipFileCache(tmp_path, max_entries=3)
+
+
+def names(directory: Path) -> list:
+    return sorted(p.name for p in directory.glob("*.json.gz"))
+
+
+class TestGzipFileCache:
+    """Test round trips, expiry and LRU eviction."""
+
+    def test_round_trip_adds_save_time(self, cache):
+        cache.write("a", {"results": [1, 2]})
+
+        payload = cache.read("a", max_age_hours=1)
+
+        assert payload["results"] == [1, 2]
+        assert payload["saved_at"] <= time.time()
+        assert cache.read("missing", max_age_hours=1) is None
+
+    def test_age_comes_from_save_time_not_mtime(self, cache, monkeypatch):
+        cache.write("a", {})
+        cache.touch("a")
+        monkeypatch.setattr(time, "time", lambda real=time.time(): real + 2 * 3600)
+
+        assert cache.read("a", max_age_hours=1) is None
+        assert cache.read("a", max_age_hours=3) is not None
+
+    def test_evicts_least_recently_used(self, cache, tmp_path):
+        for name in ("a", "b", "c"):
+            cache.write(name, {})
+        cache.touch("a")
+
+        cache.write("d", {})
+
+        assert names(tmp_path) == ["a.json.gz", "c.json.gz", "d.json.gz"]
+
+    def test_directory_is_scanned_once(self, cache, tmp_path, monkeypatch):
+        scans = []
+        real_glob = Path.glob
+        monkeypatch.setattr(Path, "glob", lambda self, pattern: scans.append(pattern) or real_glob(self, pattern))
+
+        for i in range(10):
+            cache.write(str(i), {})
+
+        assert len(scans) == 1
+        assert names(tmp_path) == ["7.json.gz", "8.json.gz", "9.json.gz"]
+
+    def test_new_instance_orders_existing_entries_by_mtime(self, cache, tmp_path):
+        for name in ("a", "b", "c"):
+            cache.write(name, {})
+        past = time.time() - 60
+        os.utime(cache.path("a"), (past, past))
+        os.utime(cache.path("b"), (past - 60, past - 60))
+
+        GzipFileCache(tmp_path, max_entries=3).write("d", {})
+
+        assert names(tmp_path) == ["a.json.gz", "c.json.gz", "d.json.gz"]
+
+    def test_delete_and_clear(self, cache, tmp_path):
+        for name in ("a", "b", "c"):
+            cache.write(name, {})
+
+        assert cache.delete(["a", "missing"]) == 1
+        cache.write("d", {})
+        assert names(tmp_path) == ["b.json.gz", "c.json.gz", "d.json.gz"]
+        assert cache.clear() == 3
+        assert names(tmp_path) == []
@@ -0,0 +1,181 @@
+"""
+Unit tests for concurrent, cached GitLab fallback searches.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.ai.gitlab_fallback_extractor import GitLabFallbackExtractor
+from src.ai.gitlab_search_cache import GitLabSearchCache
+from src.config.settings import settings
+
+
+class FakeMCPClient:
+    """Stands in for GitLabMCPClient, counting calls and peak concurrency."""
+
+    mcp_available = True
+
+    def __init__(self, latency: float = 0.0, mr_sha: str = "aaa111"):
+        self.latency = latency
+        self.mr_sha = mr_sha
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _call(self, record):
+        self.calls.append(record)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    async def semantic_code_search(self, project_id, semantic_query, limit=20, directory_path=None):
+        await self._call(("semantic", project_id, semantic_query))
+        return [{"file_path": f"{project_id}/{semantic_query}", "content": "@GetMapping(\"/policies\")"}]
+
+    async def gitlab_search(self, scope, search, project_id=None, group_id=None, per_page=20):
+        await self._call(("search", scope, search))
+        if scope == "merge_requests":
+            return [{"project_id": 7, "source_branch": f"feature/{search}", "sha": self.mr_sha, "title": search}]
+        if scope == "blobs" and search.startswith("PROJ-"):
+            return [{"project_id": 9, "path": "src/app.py", "ref": "main"}]
+        return [{"path": f"{group_id}/{search}"}]
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    """Fallback extractor with a temp search cache and a fake MCP client."""
+    monkeypatch.setattr(settings, "gitlab_search_cache_dir", str(tmp_path / "search_cache"))
+    monkeypatch.setattr(settings, "gitlab_fallback_max_concurrency", 4)
+    monkeypatch.setattr(settings, "gitlab_group_path", "org")
+    extractor = GitLabFallbackExtractor()
+    extractor.mcp_client = FakeMCPClient(latency=0.01)
+    return extractor
+
+
+async def search_once(extractor):
+    """Run the branch lookup and code searches of one story."""
+    branches = await extractor._find_branches_for_story("PROJ-1")
+    return await extractor._search_codebase_via_mcp(
+        "PROJ-1", "Policy by application endpoint", ["policy service"], branches
+    )
+
+
+class TestGitLabSearchCache:
+    """Test entry keys, expiry and eviction."""
+
+    def test_round_trip_and_ref_keying(self, tmp_path):
+        """Test that entries are keyed by tool, parameters and ref."""
+        cache = GitLabSearchCache(str(tmp_path), max_entries=10, ttl_hours=1)
+        params = {"project_id": "7", "semantic_query": "policy controller", "limit": 10}
+        cache.put("semantic_code_search", params, [{"path": "a.py"}], ref="aaa111")
+
+        assert cache.get("semantic_code_search", params, ref="aaa111") == [{"path": "a.py"}]
+        assert cache.get("semantic_code_search", params, ref="bbb222") is None
+        assert cache.get("semantic_code_search", {**params, "limit": 20}, ref="aaa111") is None
+
+    def test_expiry_and_max_age(self, tmp_path, monkeypatch):
+        """Test the TTL and the shorter per-lookup max age."""
+        cache = GitLabSearchCache(str(tmp_path), max_entries=10, ttl_hours=1)
+        cache.put("gitlab_search", {"search": "x"}, [{"path": "a"}])
+
+        assert cache.get("gitlab_search", {"search": "x"}, max_age_hours=0.5) is not None
+        monkeypatch.setattr(time, "time", lambda real=time.time(): real + 1800 + 60)
+        assert cache.get("gitlab_search", {"search": "x"}, max_age_hours=0.5) is None
+        assert cache.get("gitlab_search", {"search": "x"}) is not None
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        """Test that puts beyond max_entries evict the oldest entries."""
+        cache = GitLabSearchCache(str(tmp_path), max_entries=2, ttl_hours=1)
+        for i in range(3):
+            cache.put("gitlab_search", {"search": str(i)}, [{"i": i}])
+
+        assert len(list(tmp_path.glob("*.json.gz"))) == 2
+        assert cache.clear() == 2
+
+
+class TestConcurrentCachedSearches:
+    """Test fan-out order, bounds and cache reuse across runs."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_is_bounded_and_keeps_order(self, extractor):
+        """Test that searches overlap up to the limit and results keep the serial order."""
+        results = await search_once(extractor)
+
+        fake = extractor.mcp_client
+        assert 1 < fake.peak <= 4
+        # Results follow the serial order: project searches first, then group-wide blobs
+        assert results[0]["file_path"] == "7/API endpoint for PROJ-1"
+        assert results[-1]["path"] == "org/interface PolicyDto"
+        assert len(results) == len({r.get("file_path") or r.get("path") for r in results})
+
+    @pytest.mark.asyncio
+    async def test_repeat_run_is_served_from_cache(self, extractor):
+        """Test that a second run makes no MCP calls."""
+        first = await search_once(extractor)
+        calls = len(extractor.mcp_client.calls)
+
+        second = await search_once(extractor)
+
+        assert second == first
+        assert len(extractor.mcp_client.calls) == calls
+
+    @pytest.mark.asyncio
+    async def test_new_mr_commit_misses_project_searches(self, extractor, monkeypatch):
+        """Test that a new MR head SHA re-runs the project searches only."""
+        await search_once(extractor)
+        extractor.mcp_client = FakeMCPClient(mr_sha="bbb222")
+        monkeypatch.setattr(settings, "gitlab_branch_lookup_ttl_minutes", 0)
+
+        await search_once(extractor)
+
+        # Branch lookups refresh and see the new SHA; group-wide searches still hit
+        calls = extractor.mcp_client.calls
+        assert [c for c in calls if c[0] == "search"] == [("search", "merge_requests", "PROJ-1"), ("search", "blobs", "PROJ-1")]
+        assert len([c for c in calls if c[0] == "semantic"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_branch_lookups_expire_sooner(self, extractor, monkeypatch):
+        """Test that branch lookups use their own, shorter TTL."""
+        await extractor._find_branches_for_story("PROJ-1")
+        monkeypatch.setattr(settings, "gitlab_branch_lookup_ttl_minutes", 0)
+
+        branches = await extractor._find_branches_for_story("PROJ-1")
+
+        assert [b["sha"] for b in branches if "sha" in b] == ["aaa111"]
+        assert len(extractor.mcp_client.calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_identical_searches_in_flight_share_one_call(self, extractor):
+        """Test that concurrent identical searches make one MCP call."""
+        results = await asyncio.gather(*(extractor._semantic_search("7", "policy", limit=10) for _ in range(5)))
+
+        assert all(r == results[0] for r in results)
+        assert len(extractor.mcp_client.calls) == 1
+
+
+
+@pytest.mark.asyncio
+async def test_concurrent_search_matches_serial_search(tmp_path, monkeypatch):
+    """Test that the bounded fan-out returns exactly what the serial, uncached searches return."""
+    monkeypatch.setattr(settings, "gitlab_group_path", "org")
+    monkeypatch.setattr(settings, "gitlab_search_cache_dir", str(tmp_path))
+
+    monkeypatch.setattr(settings, "gitlab_fallback_max_concurrency", 1)
+    monkeypatch.setattr(settings, "gitlab_search_cache_enabled", False)
+    serial = GitLabFallbackExtractor()
+    serial.mcp_client = FakeMCPClient(latency=0.001)
+    expected = await search_once(serial)
+
+    monkeypatch.setattr(settings, "gitlab_fallback_max_concurrency", 8)
+    monkeypatch.setattr(settings, "gitlab_search_cache_enabled", True)
+    extractor = GitLabFallbackExtractor()
+    extractor.mcp_client = FakeMCPClient(latency=0.001)
+
+    assert await search_once(extractor) == expected
+    assert serial.mcp_client.peak == 1 and extractor.mcp_client.peak > 1
+    assert sorted(extractor.mcp_client.calls) == sorted(serial.mcp_client.calls)
@@ -0,0 +1,211 @@
+"""
+Unit tests for the incremental async GitLab Swagger fetcher.
+"""
+
+import asyncio
+import hashlib
+from collections import Counter
+from typing import Dict
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from src.ai.context_indexer import ContextIndexer
+from src.ai.indexing import document_fetcher
+from src.ai.indexing.document_fetcher import DocumentFetcher
+from src.ai.indexing.document_processor import DocumentProcessor
+from src.config.settings import settings
+from src.external.gitlab_swagger_fetcher import SPEC_DIR, AsyncGitLabSwaggerFetcher
+
+def spec(title: str, version: str = "1.0") -> str:
+    """Minimal OpenAPI document with one endpoint."""
+    return f"openapi: 3.0.0\ninfo:\n  title: {title}\n  version: '{version}'\npaths:\n  /{title}:\n    get:\n      summary: Get {title}\n"
+
+
+class FakeGitLab:
+    """httpx transport serving the openapi project's spec directory (paged, with latency), counting requests."""
+
+    def __init__(self, specs: Dict[str, str], latency: float = 0.0, page_size: int = 100):
+        self.specs = specs
+        self.latency = latency
+        self.page_size = page_size
+        self.requests: Counter = Counter()
+        self.failing: set = set()
+        self.in_flight = 0
+        self.peak = 0
+
+    @staticmethod
+    def sha(content: str) -> str:
+        """Blob id of a spec (SHA-1 of its content)."""
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.raw_path.decode().split("?")[0].removeprefix("/api/v4")
+        self.requests["blobs" if "/blobs/" in path else path] += 1
+        if self.latency:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                await asyncio.sleep(self.latency)
+            finally:
+                self.in_flight -= 1
+        if request.headers.get("private-token") != "token":
+            return httpx.Response(401)
+        if path == "/groups/org%2Fservices/projects":
+            return httpx.Response(200, json=[
+                {"id": 1, "name": "openapi-tools", "path": "openapi-tools", "web_url": "https://gitlab.example.com/org/openapi-tools"},
+                {"id": 42, "name": "openapi", "path": "openapi", "web_url": "https://gitlab.example.com/org/openapi"},
+            ])
+        if path == "/projects/42/repository/tree":
+            items = [{"id": self.sha(c), "name": n, "type": "blob", "path": f"{SPEC_DIR}/{n}", "mode": "100644"}
+                     for n, c in self.specs.items()]
+            items.append({"id": "t", "name": "README.md", "type": "blob", "path": f"{SPEC_DIR}/README.md", "mode": "100644"})
+            page = int(request.url.params.get("page", "1"))
+            chunk = items[(page - 1) * self.page_size:page * self.page_size]
+            more = page * self.page_size < len(items)
+            return httpx.Response(200, json=chunk, headers={"X-Next-Page": str(page + 1) if more else ""})
+        if "/repository/blobs/" in path:
+            sha = path.split("/")[-2]
+            for name, content in self.specs.items():
+                if self.sha(content) == sha and name not in self.failing:
+                    return httpx.Response(200, content=content.encode("utf-8"))
+            return httpx.Response(404)
+        return httpx.Response(404)
+
+    @property
+    def downloads(self) -> int:
+        return self.requests["blobs"]
+
+    def fetcher(self, tmp_path, **kwargs) -> AsyncGitLabSwaggerFetcher:
+        """Fetcher talking to this fake, with its manifest in tmp_path."""
+        return AsyncGitLabSwaggerFetcher(
+            token="token",
+            base_url="https://gitlab.example.com",
+            group_path="org/services",
+            manifest_path=str(tmp_path / "manifest.json"),
+            transport=httpx.MockTransport(self.handle),
+            **kwargs,
+        )
+
+
+def make_specs(count: int) -> Dict[str, str]:
+    """Spec files by name."""
+    return {f"service-{i}.yaml": spec(f"service{i}") for i in range(count)}
+
+
+class TestIncrementalFetch:
+    """Test SHA-based skipping, removal and retry of failed downloads."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_specs_are_not_downloaded(self, tmp_path):
+        """Test that a second run lists the tree but downloads nothing."""
+        gitlab = FakeGitLab(make_specs(5), page_size=2)
+        fetcher = gitlab.fetcher(tmp_path)
+
+        docs = await fetcher.fetch_changed()
+        fetcher.save_manifest()
+        again = await gitlab.fetcher(tmp_path).fetch_changed()
+
+        assert sorted(doc.service_name for doc in docs) == [f"service-{i}" for i in range(5)]
+        assert docs[0].content == spec("service0") and docs[0].blob_sha == FakeGitLab.sha(spec("service0"))
+        assert docs[0].file_path == f"{SPEC_DIR}/service-0.yaml" and docs[0].project_id == 42
+        assert again == []
+        assert gitlab.downloads == 5
+        assert gitlab.requests["/projects/42/repository/tree"] == 6  # 3 pages per listing
+
+    @pytest.mark.asyncio
+    async def test_changed_and_removed_specs(self, tmp_path):
+        """Test new, changed, unchanged and removed counts."""
+        gitlab = FakeGitLab(make_specs(3))
+        fetcher = gitlab.fetcher(tmp_path)
+        await fetcher.fetch_changed()
+        fetcher.save_manifest()
+
+        gitlab.specs["service-1.yaml"] = spec("service1", version="2.0")
+        del gitlab.specs["service-2.yaml"]
+        gitlab.specs["service-3.yaml"] = spec("service3")
+        fetcher = gitlab.fetcher(tmp_path)
+        docs = await fetcher.fetch_changed()
+
+        assert sorted(doc.service_name for doc in docs) == ["service-1", "service-3"]
+        assert fetcher.stats["new"] == 1 and fetcher.stats["changed"] == 1 and fetcher.stats["unchanged"] == 1
+        assert fetcher.stats["removed"] == [{"service_name": "service-2", "file_path": f"{SPEC_DIR}/service-2.yaml"}]
+
+    @pytest.mark.asyncio
+    async def test_manifest_waits_for_save_and_failures_are_retried(self, tmp_path):
+        """Test that only saved, successful downloads are skipped next time."""
+        gitlab = FakeGitLab(make_specs(3))
+        gitlab.failing.add("service-2.yaml")
+        fetcher = gitlab.fetcher(tmp_path)
+
+        await fetcher.fetch_changed()
+        assert fetcher.stats["failed"] == 1
+        # Not indexed yet: the next run still fetches everything
+        assert len(await gitlab.fetcher(tmp_path).fetch_changed()) == 2
+        fetcher.save_manifest()
+
+        gitlab.failing.clear()
+        retried = await gitlab.fetcher(tmp_path).fetch_changed()
+
+        assert [doc.service_name for doc in retried] == ["service-2"]
+
+    @pytest.mark.asyncio
+    async def test_listing_errors_raise_instead_of_removing(self, tmp_path):
+        """Test that a failed listing raises rather than reporting every spec as removed."""
+        gitlab = FakeGitLab(make_specs(2))
+        fetcher = gitlab.fetcher(tmp_path)
+        await fetcher.fetch_changed()
+        fetcher.save_manifest()
+
+        broken = AsyncGitLabSwaggerFetcher(
+            token="wrong", base_url="https://gitlab.example.com", group_path="org/services",
+            manifest_path=str(tmp_path / "manifest.json"), transport=httpx.MockTransport(gitlab.handle),
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            await broken.fetch_changed()
+
+
+    @pytest.mark.asyncio
+    async def test_downloads_are_concurrent_and_bounded(self, tmp_path):
+        """Test that spec downloads overlap up to max_concurrency."""
+        gitlab = FakeGitLab(make_specs(20), latency=0.001)
+
+        docs = await gitlab.fetcher(tmp_path, max_concurrency=4).fetch_changed()
+
+        assert len(docs) == 20 and gitlab.downloads == 20
+        assert 1 < gitlab.peak <= 4
+
+
+@pytest.mark.asyncio
+async def test_context_indexer_embeds_only_changed_specs(tmp_path, monkeypatch):
+    """Test that re-indexing embeds changed specs and removes deleted ones."""
+    gitlab = FakeGitLab(make_specs(4))
+    monkeypatch.setattr(settings, "gitlab_token", "token")
+    monkeypatch.setattr(settings, "gitlab_swagger_enabled", True)
+    monkeypatch.setattr(settings, "swagger_endpoint_index_path", str(tmp_path / "endpoints.json.gz"))
+    monkeypatch.setattr(settings, "swagger_endpoint_embeddings_enabled", False)
+    monkeypatch.setattr(document_fetcher, "AsyncGitLabSwaggerFetcher", lambda: gitlab.fetcher(tmp_path))
+
+    indexer = MagicMock()
+    indexer.store.get_collection_stats.return_value = {"count": 4}
+    indexer.create_swagger_metadata.side_effect = lambda doc, key: {"doc_hash": doc.service_name}
+    indexer.index_swagger_docs = AsyncMock(side_effect=lambda texts, metadatas, ids: len(texts))
+    indexer.remove_swagger_docs.return_value = 1
+    context_indexer = ContextIndexer(processor=DocumentProcessor(), fetcher=DocumentFetcher(), indexer=indexer)
+
+    assert await context_indexer.index_gitlab_swagger_docs() == 4
+    texts = indexer.index_swagger_docs.call_args.args[0]
+    assert "API Title: service0" in texts[0]
+
+    assert await context_indexer.index_gitlab_swagger_docs() == 0
+    assert indexer.index_swagger_docs.call_count == 1
+
+    del gitlab.specs["service-3.yaml"]
+    gitlab.specs["service-0.yaml"] = spec("service0", version="2.0")
+    assert await context_indexer.index_gitlab_swagger_docs() == 1
+    indexer.remove_swagger_docs.assert_called_once_with(
+        [{"service_name": "service-3", "file_path": f"{SPEC_DIR}/service-3.yaml"}]
+    )
+    assert gitlab.downloads == 5
+
@@ -0,0 +1,87 @@
+"""
+Unit tests for parse-once HTML extraction.
+"""
+
+import pytest
+
+from src.aggregator.confluence_client import ConfluenceClient
+from src.infrastructure.html_parser import HTMLParser, ParsedHTML, strip_html_batch, strip_html_tags
+
+PAGE = (
+    "<html><head><title> Orders API </title><style>p {}</style><script>var a = 1;</script></head>"
+    "<body><nav>Menu</nav><header>Top</header><h1>Orders</h1>"
+    "<p>Create &amp; list <b>orders</b>.</p><!-- internal note -->"
+    '<pre>{"id": "abc-123"}</pre><p>Call <code>GET /orders</code> first.</p>'
+    '<a href="/docs/items">Items</a><a href="#top">Top</a><a href="javascript:void(0)">JS</a>'
+    '<a href="https://other.example.com/x">Other</a><footer>Footer</footer>Closing text</body></html>'
+)
+
+CONFLUENCE_STORAGE = (
+    "<p>Export uses <strong>async</strong> jobs.</p>"
+    '<ac:structured-macro ac:name="code"><ac:plain-text-body>'
+    "<![CDATA[curl -X POST /v1/exports]]></ac:plain-text-body></ac:structured-macro>"
+    "<table><tr><td>limit</td><td>10k rows</td></tr></table>"
+)
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+class TestParsedHTML:
+    """Test that both backends extract the same content from one parse."""
+
+    def test_extracts_everything_from_one_parse(self, parser):
+        """Test text, title, links and code blocks of one parsed page."""
+        parsed = ParsedHTML(PAGE, parser)
+
+        assert parsed.use_lxml == (parser == "lxml")
+        assert parsed.text == (
+            "Orders API \nOrders\nCreate & list \norders\n.\n"
+            '{"id": "abc-123"}\nCall \nGET /orders\n first.\nItems\nTop\nJS\nOther\nClosing text'
+        )
+        assert parsed.title == "Orders API"
+        assert parsed.links == ["/docs/items", "https://other.example.com/x"]
+        assert parsed.code_blocks == ['{"id": "abc-123"}', "GET /orders"]
+
+    def test_matches_html_parser_service(self, parser):
+        """Test that the HTMLParser service gives the same results with either backend."""
+        service = HTMLParser(parser)
+
+        assert service.strip_html_tags(PAGE) == HTMLParser("html.parser").strip_html_tags(PAGE)
+        assert service.extract_links(PAGE, "https://docs.example.com/docs/")[0] == "https://docs.example.com/docs/items"
+        assert service.extract_title("<h1><span>Heading</span></h1>") == "Heading"
+        assert service.extract_title("<h1>Mixed <b>heading</b></h1>", "Untitled") == "Untitled"
+
+    def test_cdata_and_empty_documents(self, parser):
+        """Test CDATA content and documents without any text."""
+        assert "curl -X POST /v1/exports" in ParsedHTML(CONFLUENCE_STORAGE, parser).text
+
+        for html in ("", "   ", "<!-- only a comment -->"):
+            parsed = ParsedHTML(html, parser)
+            assert parsed.text == ""
+            assert parsed.title is None
+            assert parsed.links == [] and parsed.code_blocks == []
+
+
+class TestBatchCleaning:
+    """Test bulk cleaning in the process pool."""
+
+    def test_pool_matches_in_process(self):
+        """Test that the process pool returns the same texts in the same order."""
+        htmls = [PAGE.replace("Orders", f"Orders {i}") for i in range(12)] + ["", CONFLUENCE_STORAGE]
+
+        assert strip_html_batch(htmls, max_workers=2, min_batch=1) == [strip_html_tags(html) for html in htmls]
+
+    def test_confluence_batch_matches_single_page(self):
+        """Test that batch extraction of Confluence pages matches page by page."""
+        client = ConfluenceClient(base_url="https://wiki.example.com", email="qa@example.com", api_token="token")
+        pages = [
+            {"body": {"storage": {"value": CONFLUENCE_STORAGE}}},
+            {"body": {"storage": {"value": ""}}},
+            {"body": {}},
+        ]
+
+        contents = client.extract_page_contents(pages)
+
+        assert contents == [client.extract_page_content(page) for page in pages]
+        assert contents[0] == "Export uses async jobs. curl -X POST /v1/exports limit 10k rows"
+        assert contents[1:] == ["", ""]
+
@@ -0,0 +1,311 @@
+"""
+Unit tests for concurrent index-all phases and the shared embedding pipeline.
+"""
+
+import asyncio
+
+import pytest
+
+from src.ai.context_indexer import ContextIndexer
+from src.ai.indexing import embedding_pipeline
+from src.ai.indexing.embedding_pipeline import EmbeddingPipeline, TokenRateLimiter
+from src.cli import rag_commands
+from src.cli.rag_commands import IndexPhase, index_all_data, run_index_phases
+from src.cli.rag_refresh import RAGRefreshManager
+
+
+class FakeStore:
+    """Stands in for RAGVectorStore, counting stored documents and peak concurrency."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.stored = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def add_documents(self, collection_name, documents, metadatas, ids):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if collection_name == "broken":
+                raise RuntimeError("embedding failed")
+            self.stored.append((collection_name, list(ids)))
+        finally:
+            self.in_flight -= 1
+
+    def get_collection_stats(self, collection_name):
+        return {"count": len(self.stored)}
+
+
+class PeakCounter:
+    """Counts phases running at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    def enter(self):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def exit(self):
+        self.in_flight -= 1
+
+
+def phase(number, key, run, depends_on=()):
+    """IndexPhase with placeholder display fields."""
+    return IndexPhase(number, key, "•", f"Phase {key}", key, run, depends_on)
+
+
+def sleeper(seconds, count, log=None, name=None):
+    """Phase body that sleeps, optionally logging its start and end, and returns count."""
+
+    async def run():
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(seconds)
+        if log is not None:
+            log.append(("end", name))
+        return count
+    return run
+
+
+class TestRunIndexPhases:
+    """Test concurrency, isolation and dependency ordering of phases."""
+
+    @pytest.mark.asyncio
+    async def test_all_phases_run_at_once(self):
+        """Test that phases overlap: each only returns once all four are running."""
+        counter = PeakCounter()
+        all_running = asyncio.Event()
+
+        def gated(count):
+            async def run():
+                counter.enter()
+                if counter.in_flight == 4:
+                    all_running.set()
+                await all_running.wait()
+                counter.exit()
+                return count
+            return run
+
+        phases = [phase(i + 1, f"p{i}", gated(i)) for i in range(4)]
+
+        results = await asyncio.wait_for(run_index_phases(phases, max_concurrency=4), timeout=10)
+
+        assert results == {"p0": 0, "p1": 1, "p2": 2, "p3": 3}
+        assert counter.peak == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency phases run at once."""
+        counter = PeakCounter()
+
+        def counted(count):
+            async def run():
+                counter.enter()
+                for _ in range(3):
+                    await asyncio.sleep(0)
+                counter.exit()
+                return count
+            return run
+
+        results = await run_index_phases([phase(i + 1, f"p{i}", counted(i)) for i in range(5)], max_concurrency=2)
+
+        assert results == {f"p{i}": i for i in range(5)}
+        assert counter.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_phase_is_isolated(self, capsys):
+        """Test that a failing phase reports 0 while the others complete."""
+        async def boom():
+            raise RuntimeError("jira down")
+
+        results = await run_index_phases(
+            [phase(1, "tests", sleeper(0.01, 7)), phase(2, "stories", boom), phase(3, "docs", sleeper(0.01, 3))],
+            max_concurrency=3,
+        )
+
+        assert results == {"tests": 7, "stories": 0, "docs": 3}
+        output = capsys.readouterr().out
+        assert "❌ Phase 2 failed: jira down" in output
+        assert "✅ Phase 1 complete" in output and "7 tests indexed" in output
+
+    @pytest.mark.asyncio
+    async def test_concurrency_one_runs_in_list_order(self):
+        """Test that max_concurrency=1 runs phases one after another in list order."""
+        log = []
+        phases = [phase(i + 1, f"p{i}", sleeper(0.01, 1, log, f"p{i}")) for i in range(3)]
+
+        await run_index_phases(phases, max_concurrency=1)
+
+        assert log == [("start", "p0"), ("end", "p0"), ("start", "p1"), ("end", "p1"), ("start", "p2"), ("end", "p2")]
+
+    @pytest.mark.asyncio
+    async def test_dependent_phase_waits_even_when_dependency_fails(self):
+        """Test that a phase starts only after its dependency finishes, even by failing."""
+        log = []
+
+        async def failing():
+            log.append(("start", "a"))
+            await asyncio.sleep(0.02)
+            raise RuntimeError("boom")
+
+        results = await run_index_phases(
+            [phase(1, "b", sleeper(0.0, 2, log, "b"), depends_on=("a",)), phase(2, "a", failing)],
+            max_concurrency=2,
+        )
+
+        assert log == [("start", "a"), ("start", "b"), ("end", "b")]
+        assert results == {"a": 0, "b": 2}
+
+    @pytest.mark.asyncio
+    async def test_unknown_dependency_is_rejected(self):
+        """Test that depending on a phase not in the list raises ValueError."""
+        with pytest.raises(ValueError, match="unknown phases: missing"):
+            await run_index_phases([phase(1, "a", sleeper(0, 0), depends_on=("missing",))], max_concurrency=1)
+
+
+class TestEmbeddingPipeline:
+    """Test the global concurrency bound, backpressure, errors and delegation."""
+
+    @pytest.mark.asyncio
+    async def test_workers_bound_store_concurrency_across_submitters(self):
+        """Test that the worker count bounds store calls across all submitters."""
+        store = FakeStore(latency=0.01)
+        async with EmbeddingPipeline(store, workers=2, queue_size=3, tokens_per_minute=0) as pipeline:
+            await asyncio.gather(*(
+                pipeline.add_documents("docs", [f"doc {i}"], [{}], [f"id-{i}"]) for i in range(12)
+            ))
+
+        assert store.peak == 2
+        assert sorted(ids[0] for _, ids in store.stored) == sorted(f"id-{i}" for i in range(12))
+        assert pipeline.stats["batches"] == 12 and pipeline.stats["documents"] == 12
+        assert pipeline.stats["queue_peak"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_the_submitting_phase_only(self):
+        """Test that a failed batch raises in its submitter without affecting others."""
+        store = FakeStore()
+        async with EmbeddingPipeline(store, workers=1, queue_size=2, tokens_per_minute=0) as pipeline:
+            results = await asyncio.gather(
+                pipeline.add_documents("broken", ["x"], [{}], ["a"]),
+                pipeline.add_documents("docs", ["y"], [{}], ["b"]),
+                return_exceptions=True,
+            )
+
+        assert isinstance(results[0], RuntimeError) and results[1] is None
+        assert store.stored == [("docs", ["b"])]
+        assert pipeline.stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_delegates_to_store_and_passes_through_when_stopped(self):
+        """Test that a stopped pipeline writes straight to the store."""
+        store = FakeStore()
+        pipeline = EmbeddingPipeline(store, workers=1, queue_size=1, tokens_per_minute=0)
+
+        await pipeline.add_documents("docs", ["x"], [{}], ["a"])
+
+        assert store.stored == [("docs", ["a"])]
+        assert pipeline.get_collection_stats("docs") == {"count": 1}
+        assert pipeline.stats["batches"] == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_waits_for_the_window(monkeypatch):
+    """Test that the limiter sleeps until enough of the minute's budget expires."""
+    now = [0.0]
+    slept = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+        await real_sleep(0)
+
+    monkeypatch.setattr(embedding_pipeline.asyncio, "sleep", fake_sleep)
+    limiter = TokenRateLimiter(100, clock=lambda: now[0])
+
+    await limiter.acquire(60)
+    now[0] = 10.0
+    await limiter.acquire(40)
+    assert slept == []
+
+    await limiter.acquire(500)  # clamped to the full budget: waits for both earlier requests to expire
+
+    assert slept == [50.0, 10.0]
+    assert now[0] == 70.0
+
+
+def patch_phases(monkeypatch, latencies, batches=3) -> PeakCounter:
+    """
+    Replace every phase with a fake that fetches with latency and submits through the indexer's store.
+
+    Returns:
+        Counter of phases running at once
+    """
+    counter = PeakCounter()
+
+    def fake_phase(key, latency):
+        async def run(*args):
+            counter.enter()
+            try:
+                indexer = next(arg for arg in args if isinstance(arg, ContextIndexer))
+                store = indexer.indexer.store
+                for batch in range(batches):
+                    await asyncio.sleep(latency / batches)
+                    await store.add_documents(key, [f"{key} {batch}"], [{}], [f"{key}-{batch}"])
+                return batches
+            finally:
+                counter.exit()
+        return run
+
+    monkeypatch.setattr(rag_commands, "fetch_and_index_zephyr_tests", fake_phase("tests", latencies[0]))
+    monkeypatch.setattr(rag_commands, "fetch_and_index_jira_stories", fake_phase("stories", latencies[1]))
+    monkeypatch.setattr(rag_commands, "fetch_and_index_confluence_docs", fake_phase("docs", latencies[2]))
+    external = fake_phase("external_docs", latencies[3])
+    swagger = fake_phase("swagger_docs", latencies[4])
+    monkeypatch.setattr(ContextIndexer, "index_external_docs", lambda self: external(self))
+    monkeypatch.setattr(ContextIndexer, "index_gitlab_swagger_docs", lambda self: swagger(self))
+    return counter
+
+
+@pytest.fixture
+def fake_store(monkeypatch):
+    """FakeStore returned by every RAGVectorStore construction."""
+    store = FakeStore(latency=0.005)
+    monkeypatch.setattr(rag_commands, "RAGVectorStore", lambda: store)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_index_all_routes_every_phase_through_one_pipeline(fake_store, monkeypatch, tmp_path, capsys):
+    """Test that concurrent phases share one embedding pipeline bounded by its worker count."""
+    patch_phases(monkeypatch, [0.02, 0.06, 0.02, 0.01, 0.03])
+    manager = RAGRefreshManager(tmp_path / "refresh.json")
+
+    results = await index_all_data("PROJ", refresh_manager=manager, max_concurrency=5)
+
+    assert results == {"tests": 3, "stories": 3, "docs": 3, "external_docs": 3, "swagger_docs": 3, "total": 15}
+    assert len(fake_store.stored) == 15
+    assert fake_store.peak <= 2  # settings.embedding_pipeline_workers
+    assert manager.get_last_refresh("PROJ", "index_all") is not None
+    assert "🎯 TOTAL INDEXED:     15 documents" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_concurrent_phases_match_sequential_phases(fake_store, monkeypatch, tmp_path):
+    """Test that running phases concurrently overlaps them without changing what is indexed."""
+    counter = patch_phases(monkeypatch, [0.0] * 5)
+    manager = RAGRefreshManager(tmp_path / "refresh.json")
+
+    sequential = await index_all_data("PROJ", refresh_manager=manager, max_concurrency=1)
+    sequential_peak, counter.peak = counter.peak, 0
+    sequential_stored = sorted(fake_store.stored)
+    fake_store.stored.clear()
+    concurrent = await index_all_data("PROJ", refresh_manager=manager, max_concurrency=5)
+
+    assert sequential == concurrent
+    assert sorted(fake_store.stored) == sequential_stored
+    assert sequential_peak == 1 and counter.peak > 1
@@ -0,0 +1,258 @@
+"""
+Unit tests for the index-all checkpoint journal and resumable runs.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from src.cli.index_checkpoint import IndexRunJournal
+from src.cli.rag_commands import IndexPhase, _zephyr_pages, run_index_phases
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+class TestIndexRunJournal:
+    """Test replay, crash tolerance and pruning of run journals."""
+
+    def test_replay_rebuilds_phase_state(self, tmp_path):
+        journal = IndexRunJournal.start("PROJ", ["tests", "docs"], directory=tmp_path)
+        checkpoint = journal.checkpoint("tests")
+        journal.phase_started("tests")
+        checkpoint.commit_batch(0, 500, {"start_at": 500})
+        checkpoint.commit_batch(1, 200, {"start_at": 700})
+        journal.phase_started("docs")
+        journal.phase_failed("docs", "confluence down")
+
+        loaded = IndexRunJournal.latest("PROJ", directory=tmp_path)
+
+        assert loaded.run_id == journal.run_id and loaded.project_key == "PROJ"
+        assert not loaded.completed
+        tests = loaded.phases["tests"]
+        assert (tests.status, tests.last_batch_id, tests.cursor, tests.committed) == ("running", 1, {"start_at": 700}, 700)
+        assert loaded.checkpoint("tests").next_batch_id == 2
+        assert (loaded.phases["docs"].status, loaded.phases["docs"].error) == ("failed", "confluence down")
+
+    def test_torn_last_record_is_ignored(self, tmp_path):
+        journal = IndexRunJournal.start("PROJ", ["tests"], directory=tmp_path)
+        journal.checkpoint("tests").commit_batch(0, 500, {"start_at": 500})
+        with open(journal.path, "a", encoding="utf-8") as f:
+            f.write('{"event": "batch_committed", "phase": "tests", "batch_')
+
+        loaded = IndexRunJournal.load(journal.path)
+
+        assert loaded.phases["tests"].cursor == {"start_at": 500}
+        assert loaded.phases["tests"].committed == 500
+
+    def test_completed_run_prunes_old_journals(self, tmp_path):
+        for _ in range(4):
+            journal = IndexRunJournal.start("PROJ", ["tests"], directory=tmp_path)
+        journal.phase_completed("tests", 3)
+        journal.run_completed(keep_runs=2)
+
+        assert len(list((tmp_path / "PROJ").glob("*.jsonl"))) == 2
+        latest = IndexRunJournal.latest("PROJ", directory=tmp_path)
+        assert latest.completed and latest.phases["tests"].count == 3
+        assert IndexRunJournal.latest("OTHER", directory=tmp_path) is None
+
+
+@pytest.mark.asyncio
+async def test_phase_runner_skips_completed_phases_and_records_failures(tmp_path):
+    journal = IndexRunJournal.start("PROJ", ["tests", "stories", "docs"], directory=tmp_path)
+    journal.phase_completed("tests", 42)
+    ran = []
+
+    async def run(key):
+        ran.append(key)
+        if key == "docs":
+            raise RuntimeError("confluence down")
+        return 7
+
+    results = await run_index_phases(
+        [IndexPhase(i, key, "•", key, key, lambda key=key: run(key)) for i, key in enumerate(["tests", "stories", "docs"], 1)],
+        max_concurrency=3,
+        journal=journal,
+    )
+
+    assert ran == ["stories", "docs"]
+    assert results == {"tests": 42, "stories": 7, "docs": 0}
+    loaded = IndexRunJournal.load(journal.path)
+    assert [loaded.phases[key].status for key in ("tests", "stories", "docs")] == ["completed", "completed", "failed"]
+
+
+class FakeZephyr:
+    """Serves test case pages of a mutable key list, recording requested offsets."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.requested = []
+
+    async def iter_test_case_pages(self, project_key, start_at=0):
+        self.requested.append(start_at)
+        for offset in range(start_at, len(self.keys), 100):
+            yield [{"key": key} for key in self.keys[offset:offset + 100]]
+
+
+async def stream(zephyr, cursor):
+    return [(offset, [test["key"] for test in page]) async for offset, page in _zephyr_pages(zephyr, "PROJ", cursor)]
+
+
+class TestZephyrResumeCursor:
+    """Test that resuming continues after the last committed key, not a raw offset."""
+
+    CURSOR = {"start_at": 700, "last_key": "T-699"}
+
+    @pytest.mark.asyncio
+    async def test_deleted_tests_before_the_cursor_are_not_skipped(self):
+        keys = [f"T-{i}" for i in range(1200)]
+        zephyr = FakeZephyr([f"T-{i}" for i in range(1200) if not 100 <= i < 150])
+
+        pages = await stream(zephyr, self.CURSOR)
+
+        streamed = [key for _, page in pages for key in page]
+        assert streamed == keys[700:]
+        assert pages[0][0] == zephyr.keys.index("T-700")
+        assert zephyr.requested == [200]
+
+    @pytest.mark.asyncio
+    async def test_added_tests_before_the_cursor_are_not_reindexed(self):
+        keys = [f"T-{i}" for i in range(1200)]
+        zephyr = FakeZephyr(keys[:300] + [f"N-{i}" for i in range(40)] + keys[300:])
+
+        streamed = [key for _, page in await stream(zephyr, self.CURSOR) for key in page]
+
+        assert streamed == keys[700:]
+
+    @pytest.mark.asyncio
+    async def test_missing_last_key_streams_everything_again(self):
+        keys = [f"T-{i}" for i in range(1200) if i != 699]
+        zephyr = FakeZephyr(keys)
+
+        pages = await stream(zephyr, self.CURSOR)
+
+        assert pages[0][0] == 0
+        assert [key for _, page in pages for key in page] == keys
+        assert zephyr.requested == [200, 0]
+
+
+RUN_SCRIPT = textwrap.dedent('''
+    import asyncio, os, signal, sys
+    from unittest.mock import MagicMock
+
+    from src.ai.context_indexer import ContextIndexer
+    from src.cli import rag_commands
+    from src.config.settings import settings
+
+    work_dir, kill_at, resume = sys.argv[1], int(sys.argv[2]), sys.argv[3] == "resume"
+    settings.index_checkpoint_dir = os.path.join(work_dir, "index_runs")
+    settings.embedding_pipeline_workers = 1
+    settings.embedding_tokens_per_minute = 0
+    calls = 0
+
+    class FakeStore:
+        async def add_documents(self, collection_name, documents, metadatas, ids):
+            global calls
+            calls += 1
+            if calls == kill_at:
+                os.kill(os.getpid(), signal.SIGKILL)
+            await asyncio.sleep(0.001)
+            with open(os.path.join(work_dir, "embedded.txt"), "a") as f:
+                f.write("".join(f"{doc_id}\\n" for doc_id in ids))
+
+    class FakeZephyr:
+        async def iter_test_case_pages(self, project_key, start_at=0):
+            for offset in range(start_at, 1200, 100):
+                await asyncio.sleep(0)
+                yield [{"key": f"T-{i}"} for i in range(offset, min(offset + 100, 1200))]
+
+    class Story:
+        def __init__(self, number):
+            self.key = f"PROJ-{number}"
+
+    class FakeJira:
+        def search_all_issues(self, jql):
+            after = int(jql.split("key > PROJ-")[1].split()[0]) if "key >" in jql else 0
+            return [Story(n) for n in range(after + 1, 1101)]
+
+    class FakeConfluence:
+        async def search_all_pages(self, limit=250):
+            return [{"id": str(n), "title": f"Page {n}", "body": {}} for n in range(700, 0, -1)]
+
+        def extract_page_contents(self, pages):
+            return [f"Content {page['id']}" for page in pages]
+
+    def storing(collection, key):
+        async def index(self, items, project_key=None):
+            ids = [key(item) for item in items]
+            await self.indexer.store.add_documents(collection, ids, [{}] * len(ids), ids)
+            return len(ids)
+        return index
+
+    async def nothing(self):
+        return 0
+
+    ContextIndexer.index_existing_tests = storing("tests", lambda test: test["key"])
+    ContextIndexer.index_jira_stories = storing("stories", lambda story: story.key)
+    ContextIndexer.index_confluence_docs = storing("docs", lambda doc: f"page-{doc['id']}")
+    ContextIndexer.index_external_docs = nothing
+    ContextIndexer.index_gitlab_swagger_docs = nothing
+    rag_commands.RAGVectorStore = FakeStore
+    rag_commands.ZephyrIntegration = FakeZephyr
+    rag_commands.JiraClient = FakeJira
+    rag_commands.ConfluenceClient = FakeConfluence
+
+    asyncio.run(rag_commands.index_all_data("PROJ", refresh_manager=MagicMock(), resume=resume))
+''')
+
+
+def run_index_all(work_dir: Path, kill_at: int = 0, resume: bool = False) -> int:
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-test")}
+    process = subprocess.run(
+        [sys.executable, "-c", RUN_SCRIPT, str(work_dir), str(kill_at), "resume" if resume else "fresh"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    return process.returncode
+
+
+def embedded(work_dir: Path) -> list:
+    path = work_dir / "embedded.txt"
+    return path.read_text().split() if path.exists() else []
+
+
+def committed_ids(journal: IndexRunJournal) -> set:
+    """Document ids covered by each source's last committed cursor."""
+    tests = journal.phases["tests"].cursor.get("start_at", 0)
+    stories = int(journal.phases["stories"].cursor.get("last_key", "PROJ-0").split("-")[1])
+    docs = int(journal.phases["docs"].cursor.get("last_id", "0"))
+    return (
+        {f"T-{i}" for i in range(tests)}
+        | {f"PROJ-{n}" for n in range(1, stories + 1)}
+        | {f"page-{n}" for n in range(1, docs + 1)}
+    )
+
+
+def test_killed_run_resumes_without_reembedding_committed_batches(tmp_path):
+    everything = {f"T-{i}" for i in range(1200)} | {f"PROJ-{n}" for n in range(1, 1101)} | {f"page-{n}" for n in range(1, 701)}
+
+    assert run_index_all(tmp_path, kill_at=5) == -signal.SIGKILL
+    first_run = embedded(tmp_path)
+    interrupted = IndexRunJournal.latest("PROJ", directory=tmp_path / "index_runs")
+    committed = committed_ids(interrupted)
+    assert not interrupted.completed
+    assert committed and committed <= set(first_run)
+
+    assert run_index_all(tmp_path, resume=True) == 0
+    second_run = embedded(tmp_path)[len(first_run):]
+
+    assert not committed & set(second_run)
+    assert set(first_run) | set(second_run) == everything
+    assert len(second_run) < len(everything)
+    resumed = IndexRunJournal.latest("PROJ", directory=tmp_path / "index_runs")
+    assert resumed.run_id == interrupted.run_id and resumed.completed
+    assert resumed.phases["tests"].count == 1200 and resumed.phases["stories"].count == 1100
+    assert resumed.phases["docs"].count == 700
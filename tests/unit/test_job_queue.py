@@ -0,0 +1,254 @@
+"""
+Unit tests for the background generation job store and queue.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.routes import jobs
+from src.models.job import Job, JobStatus
+from src.storage.job_store import JobStore
+from src.workflows.job_queue import GenerationJobQueue
+
+
+async def wait_for_status(store, job_id, status, timeout=2.0):
+    """Poll the store until the job reaches a status."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        job = store.get(job_id)
+        if job.status == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Job {job_id} is {store.get(job_id).status}, expected {status}")
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a JobStore in a temporary directory."""
+    return JobStore(db_path=str(tmp_path / "jobs.db"))
+
+
+class TestJobStore:
+    """Test job persistence."""
+
+    def test_create_and_get(self, store):
+        """Jobs round-trip with request payload and events."""
+        store.create(Job(id="j1", tenant="PROJ", issue_key="PROJ-1", request={"issue_key": "PROJ-1"}))
+        store.add_event("j1", "collecting_context", "started")
+
+        job = store.get("j1")
+        assert job.status == JobStatus.QUEUED
+        assert job.request == {"issue_key": "PROJ-1"}
+        assert job.stage == "collecting_context"
+        assert [(e.stage, e.event) for e in job.events] == [("collecting_context", "started")]
+
+    def test_transition_only_from_expected_state(self, store):
+        """A transition from the wrong state is a no-op."""
+        store.create(Job(id="j1", tenant="PROJ", issue_key="PROJ-1"))
+
+        assert store.transition("j1", [JobStatus.QUEUED], status=JobStatus.CANCELLED) is True
+        assert store.transition("j1", [JobStatus.QUEUED], status=JobStatus.RUNNING) is False
+        assert store.get("j1").status == JobStatus.CANCELLED
+
+    def test_unknown_field_rejected(self, store):
+        """Updates only accept known columns."""
+        store.create(Job(id="j1", tenant="PROJ", issue_key="PROJ-1"))
+
+        with pytest.raises(ValueError):
+            store.update("j1", nonsense=1)
+
+
+class TestGenerationJobQueue:
+    """Test job scheduling, cancellation and recovery."""
+
+    @pytest.mark.asyncio
+    async def test_job_succeeds_with_progress_events(self, store):
+        """Stage events reported by the pipeline are recorded on the job."""
+        async def pipeline(request, on_stage):
+            on_stage("stage2_generation", "started")
+            on_stage("stage2_generation", "completed")
+            return {"issue_key": request["issue_key"]}
+
+        queue = GenerationJobQueue(pipeline, store=store, workers=1)
+        await queue.start()
+        try:
+            job = await queue.submit({"issue_key": "PROJ-1"}, tenant="PROJ")
+            done = await wait_for_status(store, job.id, JobStatus.SUCCEEDED)
+        finally:
+            await queue.stop()
+
+        assert done.result == {"issue_key": "PROJ-1"}
+        assert done.finished_at is not None
+        assert [(e.stage, e.event) for e in done.events] == [
+            ("stage2_generation", "started"),
+            ("stage2_generation", "completed"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_error_fails_job(self, store):
+        """Pipeline exceptions are stored as the job error."""
+        async def pipeline(request, on_stage):
+            raise RuntimeError("model unavailable")
+
+        queue = GenerationJobQueue(pipeline, store=store, workers=1)
+        await queue.start()
+        try:
+            job = await queue.submit({"issue_key": "PROJ-1"}, tenant="PROJ")
+            failed = await wait_for_status(store, job.id, JobStatus.FAILED)
+        finally:
+            await queue.stop()
+
+        assert failed.error == "model unavailable"
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_tenants(self, store):
+        """A burst from one tenant does not delay another tenant's job."""
+        order = []
+
+        async def pipeline(request, on_stage):
+            order.append(request["issue_key"])
+            await asyncio.sleep(0.01)
+            return {}
+
+        queue = GenerationJobQueue(pipeline, store=store, workers=1)
+        await queue.start()
+        try:
+            burst = [await queue.submit({"issue_key": f"BIG-{i}"}, tenant="BIG") for i in range(4)]
+            small = await queue.submit({"issue_key": "SMALL-1"}, tenant="SMALL")
+            await wait_for_status(store, burst[-1].id, JobStatus.SUCCEEDED)
+            await wait_for_status(store, small.id, JobStatus.SUCCEEDED)
+        finally:
+            await queue.stop()
+
+        assert order.index("SMALL-1") <= 2
+
+    @pytest.mark.asyncio
+    async def test_per_tenant_running_cap(self, store):
+        """A tenant never has more running jobs than the cap, even with idle workers."""
+        running = {"BIG": 0}
+        peak = {"BIG": 0}
+
+        async def pipeline(request, on_stage):
+            running["BIG"] += 1
+            peak["BIG"] = max(peak["BIG"], running["BIG"])
+            await asyncio.sleep(0.02)
+            running["BIG"] -= 1
+            return {}
+
+        queue = GenerationJobQueue(pipeline, store=store, workers=3, max_running_per_tenant=1)
+        await queue.start()
+        try:
+            jobs = [await queue.submit({"issue_key": f"BIG-{i}"}, tenant="BIG") for i in range(3)]
+            for job in jobs:
+                await wait_for_status(store, job.id, JobStatus.SUCCEEDED)
+        finally:
+            await queue.stop()
+
+        assert peak["BIG"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_and_running(self, store):
+        """Queued jobs never start; running jobs are interrupted."""
+        started = asyncio.Event()
+        ran = []
+
+        async def pipeline(request, on_stage):
+            ran.append(request["issue_key"])
+            started.set()
+            await asyncio.sleep(10)
+            return {}
+
+        queue = GenerationJobQueue(pipeline, store=store, workers=1)
+        await queue.start()
+        try:
+            first = await queue.submit({"issue_key": "PROJ-1"}, tenant="PROJ")
+            second = await queue.submit({"issue_key": "PROJ-2"}, tenant="PROJ")
+            await asyncio.wait_for(started.wait(), timeout=2.0)
+
+            cancelled_queued = await queue.cancel(second.id)
+            cancelled_running = await queue.cancel(first.id)
+            await asyncio.sleep(0.05)
+        finally:
+            await queue.stop()
+
+        assert cancelled_queued.status == JobStatus.CANCELLED
+        assert cancelled_running.status == JobStatus.CANCELLED
+        assert store.get(first.id).status == JobStatus.CANCELLED
+        assert ran == ["PROJ-1"]
+
+    @pytest.mark.asyncio
+    async def test_unfinished_jobs_resume_after_restart(self, store):
+        """Jobs queued or running when the process stopped are run on next start."""
+        store.create(Job(id="queued", tenant="PROJ", issue_key="PROJ-1", request={"issue_key": "PROJ-1"}))
+        store.create(Job(
+            id="interrupted", tenant="PROJ", issue_key="PROJ-2",
+            status=JobStatus.RUNNING, request={"issue_key": "PROJ-2"},
+        ))
+
+        async def pipeline(request, on_stage):
+            return {"issue_key": request["issue_key"]}
+
+        queue = GenerationJobQueue(pipeline, store=store, workers=2)
+        await queue.start()
+        try:
+            await wait_for_status(store, "queued", JobStatus.SUCCEEDED)
+            resumed = await wait_for_status(store, "interrupted", JobStatus.SUCCEEDED)
+        finally:
+            await queue.stop()
+
+        assert resumed.result == {"issue_key": "PROJ-2"}
+
+
+def http_request(client_key=None) -> SimpleNamespace:
+    """Request stand-in, authenticated as a Connect installation when client_key is given."""
+    jira_context = SimpleNamespace(client_key=client_key) if client_key else None
+    return SimpleNamespace(state=SimpleNamespace(jira_context=jira_context))
+
+
+class TestJobRoutes:
+    """Test that job routes only expose jobs of the caller's tenant."""
+
+    @pytest.fixture
+    async def queue(self, store, monkeypatch):
+        """Started job queue used by the routes; its jobs run until cancelled."""
+        async def pipeline(request, on_stage):
+            await asyncio.Event().wait()
+
+        queue = GenerationJobQueue(pipeline, store=store, workers=1)
+        monkeypatch.setattr(jobs, "_job_queue", queue)
+        await queue.start()
+        yield queue
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_owner_reads_and_cancels(self, queue):
+        """Test that the submitting tenant can poll and cancel its job."""
+        job = await queue.submit({"issue_key": "PROJ-1"}, tenant="install-a")
+
+        status = await jobs.get_job(job.id, http_request("install-a"))
+        cancelled = await jobs.cancel_job(job.id, http_request("install-a"))
+
+        assert status.issue_key == "PROJ-1"
+        assert cancelled.status == JobStatus.CANCELLED
+
+    @pytest.mark.asyncio
+    async def test_other_tenants_get_404(self, queue, store):
+        """Test that another installation or project cannot read or cancel a job."""
+        connect_job = await queue.submit({"issue_key": "PROJ-1"}, tenant="install-a")
+        project_job = store.create(Job(
+            id="done", tenant="OTHER", issue_key="OTHER-1", status=JobStatus.SUCCEEDED, result={"test_plan": {}},
+        ))
+
+        for route in (jobs.get_job, jobs.get_job_result, jobs.cancel_job):
+            with pytest.raises(HTTPException) as error:
+                await route(connect_job.id, http_request("install-b"))
+            assert error.value.status_code == 404
+        with pytest.raises(HTTPException) as error:
+            await jobs.get_job_result(project_job.id, http_request("install-b"))
+        assert error.value.status_code == 404
+
+        assert store.get(connect_job.id).status != JobStatus.CANCELLED
+        assert await jobs.get_job_result(project_job.id, http_request()) == {"test_plan": {}}
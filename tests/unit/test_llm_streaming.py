@@ -0,0 +1,115 @@
+"""
+Unit tests for the async completion and streaming helpers.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.ai.generation.llm_streaming import complete_anthropic_text, emit_streamed_test_cases, stream_anthropic_text
+from src.ai.generation.response_parser import ResponseParser
+
+RESPONSE = "<json>" + json.dumps({
+    "summary": "Plan",
+    "test_cases": [
+        {"title": "Login works", "description": "d", "expected_result": "ok", "steps": []},
+        {"title": "Logout works", "description": "d", "expected_result": "ok", "steps": []},
+    ],
+}) + "</json>"
+
+
+class FakeAnthropicStream:
+    """Async iterator of Anthropic-style stream events."""
+
+    def __init__(self, events):
+        self._events = iter(events)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            event = next(self._events)
+        except StopIteration:
+            raise StopAsyncIteration
+        await asyncio.sleep(0)
+        return event
+
+
+def text_events(text: str, size: int = 20) -> list:
+    """Stream events carrying a text in fixed-size deltas, with usage at start and end."""
+    usage = SimpleNamespace(input_tokens=50, cache_read_input_tokens=1500, output_tokens=1)
+    events = [SimpleNamespace(type="message_start", message=SimpleNamespace(usage=usage))]
+    events += [
+        SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text=text[i:i + size]))
+        for i in range(0, len(text), size)
+    ]
+    events.append(SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=30)))
+    return events
+
+
+class TestAnthropicCompletion:
+    """Test that Claude calls await the async client and never block the loop."""
+
+    CALLS = 5
+
+    @pytest.fixture
+    def client(self):
+        """Async client whose calls only return once all of them are in flight."""
+        client = MagicMock()
+        client.in_flight = client.peak = 0
+        all_in_flight = asyncio.Event()
+
+        async def create(**kwargs):
+            if kwargs.get("stream"):
+                return FakeAnthropicStream(text_events(RESPONSE))
+            client.in_flight += 1
+            client.peak = max(client.peak, client.in_flight)
+            if client.in_flight == self.CALLS:
+                all_in_flight.set()
+            await all_in_flight.wait()
+            client.in_flight -= 1
+            return SimpleNamespace(content=[SimpleNamespace(text=RESPONSE)], usage=SimpleNamespace(input_tokens=7))
+
+        client.messages.create = create
+        return client
+
+    @pytest.mark.asyncio
+    async def test_parallel_completions_share_one_loop(self, client):
+        """Test that completions overlap on one loop: a blocking call would never see the others in flight."""
+        usages = []
+
+        responses = await asyncio.wait_for(
+            asyncio.gather(*(
+                complete_anthropic_text(client, on_usage=usages.append, model="claude", messages=[])
+                for _ in range(self.CALLS)
+            )),
+            timeout=10,
+        )
+
+        assert responses == [RESPONSE] * self.CALLS
+        assert client.peak == self.CALLS
+        assert [usage.input_tokens for usage in usages] == [7] * self.CALLS
+
+    @pytest.mark.asyncio
+    async def test_streaming_emits_test_cases(self, client):
+        """Test that streaming passes each TestCase on and reports the message usage at the end."""
+        emitted = []
+        usages = []
+
+        async def on_test_case(test_case):
+            emitted.append(test_case.title)
+
+        text = await emit_streamed_test_cases(
+            stream_anthropic_text(client, on_usage=usages.append, model="claude", messages=[]),
+            ResponseParser(),
+            on_test_case,
+        )
+
+        assert text == RESPONSE
+        assert emitted == ["Login works", "Logout works"]
+        (usage,) = usages
+        assert (usage.input_tokens, usage.cache_read_input_tokens, usage.output_tokens) == (50, 1500, 30)
@@ -0,0 +1,121 @@
+"""
+Unit tests for the MCP session pool, against a local stub server.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.ai.gitlab_fallback_extractor import GitLabMCPClient
+from src.mcp import session_pool
+from src.mcp.session_pool import MCPSessionPool, run_and_close_pools
+
+STUB_SERVER = str(Path(__file__).parent.parent / "fixtures" / "stub_mcp_server.py")
+
+
+def pids(result) -> set:
+    """Server process ids reported by the stub's tool results."""
+    return {item["pid"] for item in json.loads(result.content[0].text)}
+
+
+@pytest.fixture
+async def pool():
+    """Single-session pool of stub servers without health checks."""
+    pool = MCPSessionPool(sys.executable, [STUB_SERVER], health_interval=0, call_timeout=20, start_timeout=30)
+    yield pool
+    await pool.close()
+
+
+class TestMCPSessionPool:
+    """Test session reuse, multiplexing and recovery."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_warm_session(self, pool):
+        """Test that concurrent calls are multiplexed over one server process."""
+        results = await asyncio.gather(*(
+            pool.call_tool("semantic_code_search", {"project_id": "42", "semantic_query": f"query {i}"})
+            for i in range(10)
+        ))
+        results.append(await pool.call_tool("gitlab_search", {"scope": "blobs", "search": "PolicyController"}))
+
+        assert len(set().union(*map(pids, results))) == 1
+        assert json.loads(results[3].content[0].text)[0]["path"] == "42/query 3.py"
+        assert pool._slots[0].starts == 1
+        assert "semantic_code_search" in pool._slots[0].tools
+
+    @pytest.mark.asyncio
+    async def test_dead_session_is_restarted(self, pool):
+        """Test that a call after the server died runs on a new process."""
+        before = pids(await pool.call_tool("semantic_code_search", {"project_id": "1", "semantic_query": "q"}))
+
+        with pytest.raises(Exception):
+            await pool.call_tool("crash", {})
+        after = pids(await pool.call_tool("semantic_code_search", {"project_id": "1", "semantic_query": "q"}))
+
+        assert before != after
+        assert pool.restarts >= 1
+
+    @pytest.mark.asyncio
+    async def test_health_check_restarts_in_background(self):
+        """Test that the health checker replaces a dead session without a call."""
+        pool = MCPSessionPool(sys.executable, [STUB_SERVER], health_interval=0.2, call_timeout=0.5, start_timeout=30)
+        try:
+            await pool.start()
+            first = pool._slots[0].session
+            # Kill the server without going through the pool
+            with pytest.raises(Exception):
+                await first.call_tool("crash", {})
+            deadline = time.monotonic() + 15
+            while not (pool._slots[0].alive and pool._slots[0].session is not first) and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+
+            assert pool._slots[0].alive
+            assert pool._slots[0].session is not first
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_tool_errors_do_not_restart(self, pool):
+        """Test that a tool error keeps the session."""
+        await pool.call_tool("semantic_code_search", {"project_id": "1", "semantic_query": "q"})
+
+        result = await pool.call_tool("no_such_tool", {})
+
+        assert result.is_error if hasattr(result, "is_error") else result.isError
+        assert pool.restarts == 0
+
+
+@pytest.mark.asyncio
+async def test_gitlab_client_uses_pool(pool):
+    """Test that GitLabMCPClient searches go through the pool."""
+    client = GitLabMCPClient()
+    client.mcp_available = True
+    client.pool = pool
+
+    code = await client.semantic_code_search(project_id="42", semantic_query="policy endpoint", limit=5)
+    blobs = await client.gitlab_search(scope="blobs", search="PolicyDto", group_id="org/services")
+
+    assert code[0]["path"] == "42/policy endpoint.py"
+    assert blobs[0]["path"] == "org/services/blobs/PolicyDto"
+    assert pool._slots[0].starts == 1
+
+
+def test_cli_runner_stops_shared_pools_before_the_loop_closes(monkeypatch):
+    """Test that run_and_close_pools() terminates the server processes it started."""
+    pool = MCPSessionPool(sys.executable, [STUB_SERVER], health_interval=0, call_timeout=20, start_timeout=30)
+    monkeypatch.setitem(session_pool._pools, (sys.executable, (STUB_SERVER,)), pool)
+
+    async def command():
+        return pids(await pool.call_tool("semantic_code_search", {"project_id": "1", "semantic_query": "q"}))
+
+    (server_pid,) = run_and_close_pools(command())
+
+    assert not pool._slots[0].alive
+    with pytest.raises(ProcessLookupError):
+        os.kill(server_pid, 0)
+
@@ -0,0 +1,164 @@
+"""
+Unit tests for batched near-duplicate detection.
+"""
+
+import random
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.ai.api_context_builder import APIContextBuilder
+from src.utils import near_duplicates
+from src.utils.near_duplicates import find_text_duplicates, jaccard, max_cosine_similarity, word_set
+
+
+# ============================================================================
+# REFERENCE IMPLEMENTATIONS (the original per-pair loops)
+# ============================================================================
+
+def reference_text_similarity(text1: str, text2: str) -> float:
+    if not text1 or not text2:
+        return 0.0
+    words1 = set(text1.lower().split())
+    words2 = set(text2.lower().split())
+    if not words1 or not words2:
+        return 0.0
+    intersection = len(words1 & words2)
+    union = len(words1 | words2)
+    return intersection / union if union > 0 else 0.0
+
+
+def reference_text_duplicates(texts: List[str], threshold: float) -> List[bool]:
+    flags, seen = [], []
+    for text in texts:
+        is_duplicate = any(reference_text_similarity(text, s) > threshold for s in seen)
+        flags.append(is_duplicate)
+        if not is_duplicate:
+            seen.append(text)
+    return flags
+
+
+def reference_duplicate_scenarios(code_embeddings, story_embeddings, threshold: float = 0.85) -> List[bool]:
+    flags = []
+    for code_embedding in code_embeddings:
+        is_duplicate = False
+        for story_embedding in story_embeddings:
+            similarity = np.dot(code_embedding, story_embedding) / (
+                np.linalg.norm(code_embedding) * np.linalg.norm(story_embedding)
+            )
+            if similarity > threshold:
+                is_duplicate = True
+                break
+        flags.append(is_duplicate)
+    return flags
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+VOCABULARY = [f"term{i}" for i in range(3000)]
+
+
+def build_docs(count: int, seed: int = 3) -> List[str]:
+    """Random docs where about a third are light edits of an earlier doc."""
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(count):
+        if docs and rng.random() < 0.35:
+            words = rng.choice(docs).split()
+            for _ in range(rng.randint(0, 8)):
+                words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            docs.append(" ".join(words))
+        else:
+            docs.append(" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(40, 120))))
+    return docs
+
+
+def build_embeddings(count: int, dim: int, seed: int) -> np.ndarray:
+    """Random float32 embeddings."""
+    return np.random.RandomState(seed).normal(size=(count, dim)).astype(np.float32)
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestTextDuplicates:
+    """Test MinHash-bucketed dedup against all-pairs Jaccard."""
+
+    def test_matches_reference(self):
+        """Test that bucketed candidates flag exactly the all-pairs duplicates."""
+        docs = build_docs(300)
+
+        assert find_text_duplicates(docs, 0.80) == reference_text_duplicates(docs, 0.80)
+
+    def test_edge_cases(self):
+        """Test empty texts and case-insensitive matches."""
+        docs = ["", "", "Same Text here", "same text HERE", "other words entirely"]
+
+        assert find_text_duplicates(docs, 0.80) == [False, False, False, True, False]
+        assert jaccard(word_set(""), word_set("a")) == 0.0
+
+    def test_low_threshold_compares_all_pairs(self, monkeypatch):
+        """Test that thresholds below the banding's exact range skip MinHash and match all pairs."""
+        rng = random.Random(5)
+        docs = []
+        for _ in range(60):
+            words = [rng.choice(VOCABULARY) for _ in range(60)]
+            docs.append(" ".join(words))
+            for _ in range(20):  # Jaccard with the original around 0.5
+                words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            docs.append(" ".join(words))
+
+        def no_minhash(self, words):
+            raise AssertionError("MinHash used below MINHASH_MIN_THRESHOLD")
+
+        monkeypatch.setattr(near_duplicates.MinHasher, "signature", no_minhash)
+        flags = find_text_duplicates(docs, 0.45)
+
+        assert flags == reference_text_duplicates(docs, 0.45)
+        assert sum(flags) > 30
+
+
+class TestEmbeddingDuplicates:
+    """Test the matrix-product cosine similarity."""
+
+    def test_matches_reference(self):
+        """Test that the matrix product flags the same scenarios as the per-pair loop."""
+        story = build_embeddings(20, 64, seed=1)
+        code = np.vstack([build_embeddings(10, 64, seed=2), story[:5] + 0.01])
+
+        flags = [bool(s > 0.85) for s in max_cosine_similarity(code, story)]
+
+        assert flags == reference_duplicate_scenarios(code, story)
+        assert flags[-5:] == [True] * 5
+
+
+class FakeEmbeddingService:
+    """Embeds each text as a one-hot vector of its first word."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        return [[1.0 if text.split()[0] == word else 0.0 for word in ("Verify", "Test", "Check")] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_scenario_dedup_reuses_story_embeddings():
+    """Test that precomputed story embeddings are not embedded again."""
+    builder = APIContextBuilder.__new__(APIContextBuilder)
+    service = FakeEmbeddingService()
+    story = ["Verify audit export", "Test login"]
+    story_embeddings = await service.embed_texts(story)
+
+    unique = await builder._deduplicate_scenarios(
+        story, ["Verify audit again", "Check rate limits"],
+        story_embeddings=story_embeddings, embedding_service=service,
+    )
+
+    assert unique == ["Check rate limits"]
+    assert service.calls == [story, ["Verify audit again", "Check rate limits"]]
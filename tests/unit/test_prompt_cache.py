@@ -0,0 +1,159 @@
+"""
+Unit tests for the cache-friendly prompt layout and token usage accounting.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.ai.generation.prompt_cache import PromptParts, TokenUsage, anthropic_content
+from src.ai.prompts_analysis import build_analysis_prompt
+from src.ai.prompts_compact import build_compact_prompt, build_stage2_prompt
+from src.ai.two_stage_generator import TwoStageGenerator
+
+
+def _story(key: str, ac: str) -> dict:
+    return {
+        "story_key": key,
+        "story_title": f"{key} title",
+        "story_description": f"{key} description",
+        "acceptance_criteria": [ac],
+    }
+
+
+COVERAGE_PLAN = {"test_plan": [{"title": "Planned test", "ac_reference": "AC #1"}]}
+
+
+class TestCacheLayout:
+    """Test that static sections form an identical prefix across stories."""
+
+    @pytest.mark.parametrize("build, extra", [
+        (build_analysis_prompt, {}),
+        (build_stage2_prompt, {"coverage_plan": COVERAGE_PLAN}),
+        (build_compact_prompt, {}),
+    ])
+    def test_static_prefix_is_story_independent(self, build, extra):
+        """Two stories share the static prefix; story content only appears after it."""
+        first = build(**_story("PROJ-1", "Admins can export audit logs"), **extra, cache_layout=True)
+        second = build(**_story("PROJ-2", "Users see a 403 error"), **extra, cache_layout=True)
+
+        assert isinstance(first, PromptParts)
+        assert first.static == second.static
+        assert "PROJ-1" not in first.static
+        assert "PROJ-1" in first.dynamic
+        assert first.text.startswith(first.static)
+
+    def test_legacy_layout_unchanged(self):
+        """Without cache_layout the builder still returns the interleaved string."""
+        prompt = build_stage2_prompt(**_story("PROJ-1", "AC"), coverage_plan=COVERAGE_PLAN)
+        parts = build_stage2_prompt(**_story("PROJ-1", "AC"), coverage_plan=COVERAGE_PLAN, cache_layout=True)
+
+        assert isinstance(prompt, str)
+        assert prompt.index("PROJ-1") < prompt.index("--- OUTPUT FORMAT ---")
+        assert parts.text.index("--- OUTPUT FORMAT ---") < parts.text.index("PROJ-1")
+
+    def test_anthropic_content_marks_breakpoint(self):
+        """Only the static block carries cache_control."""
+        content = anthropic_content(PromptParts(static="rules", dynamic="story"))
+
+        assert content[0] == {"type": "text", "text": "rules", "cache_control": {"type": "ephemeral"}}
+        assert content[1] == {"type": "text", "text": "story"}
+        assert anthropic_content("plain") == "plain"
+
+
+class TestTokenUsage:
+    """Test that provider usage fields are normalized."""
+
+    def test_openai_and_anthropic_usage(self):
+        """Cached tokens are part of input_tokens for both providers."""
+        usage = TokenUsage()
+        usage.record_openai(SimpleNamespace(
+            prompt_tokens=3000, completion_tokens=500,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=2048),
+        ), "stage1")
+        usage.record_anthropic(SimpleNamespace(
+            input_tokens=400, cache_read_input_tokens=2500, cache_creation_input_tokens=100, output_tokens=700,
+        ), "stage2")
+
+        totals = usage.as_dict()
+        assert totals["calls"] == 2
+        assert totals["input_tokens"] == 6000
+        assert totals["cached_input_tokens"] == 4548
+        assert totals["uncached_input_tokens"] == 1452
+        assert totals["cache_write_tokens"] == 100
+        assert totals["output_tokens"] == 1200
+        assert totals["by_stage"]["stage2"] == {"input_tokens": 3000, "cached_input_tokens": 2500}
+
+    def test_missing_fields_count_as_zero(self):
+        """Older SDKs omit cache fields; usage is still recorded."""
+        usage = TokenUsage()
+        usage.record_openai(SimpleNamespace(prompt_tokens=100, completion_tokens=10))
+        usage.record_anthropic(None)
+
+        assert usage.calls == 1
+        assert usage.cached_input_tokens == 0
+        assert usage.as_dict()["cache_hit_ratio"] == 0.0
+
+
+class TestGeneratorUsage:
+    """Test that TwoStageGenerator sends cacheable requests and records usage."""
+
+    def _generator(self, use_openai: bool) -> TwoStageGenerator:
+        with patch(
+            "src.ai.two_stage_generator.AIClientFactory.create_client",
+            return_value=(MagicMock(), "model", use_openai),
+        ), patch("src.ai.story_enricher.RAGVectorStore"), patch("src.ai.swagger_extractor.RAGVectorStore"), \
+                patch("src.ai.api_context_builder.RAGVectorStore"):
+            return TwoStageGenerator()
+
+    @pytest.mark.asyncio
+    async def test_anthropic_call_uses_breakpoint_and_records_usage(self):
+        generator = self._generator(use_openai=False)
+        requests = []
+
+        async def create(**kwargs):
+            requests.append(kwargs)
+            return SimpleNamespace(
+                content=[SimpleNamespace(text="{}")],
+                usage=SimpleNamespace(input_tokens=50, cache_read_input_tokens=1500, output_tokens=20),
+            )
+
+        generator.client.messages.create = create
+        await generator._call_ai_api(PromptParts("rules", "story"), stage="stage1_analysis")
+
+        assert requests[0]["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert generator.token_usage.as_dict()["by_stage"]["stage1_analysis"] == {
+            "input_tokens": 1550, "cached_input_tokens": 1500,
+        }
+
+    @pytest.mark.asyncio
+    async def test_openai_stream_requests_and_records_usage(self):
+        generator = self._generator(use_openai=True)
+        requests = []
+
+        async def create(**kwargs):
+            requests.append(kwargs)
+
+            async def chunks():
+                delta = SimpleNamespace(content='{"test_cases": []}')
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+                yield SimpleNamespace(choices=[], usage=SimpleNamespace(
+                    prompt_tokens=2000, completion_tokens=30,
+                    prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+                ))
+
+            return chunks()
+
+        async def on_test_case(test_case):
+            pass
+
+        generator.client.chat.completions.create = create
+        await generator._call_ai_api_streaming(
+            PromptParts("rules", "story"), on_test_case, stage="stage2_generation"
+        )
+
+        assert requests[0]["extra_body"]["stream_options"] == {"include_usage": True}
+        assert requests[0]["messages"][0]["content"] == "rules\n\nstory"
+        assert generator.token_usage.cached_input_tokens == 1024
+        assert generator.token_usage.output_tokens == 30
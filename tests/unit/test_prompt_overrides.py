@@ -0,0 +1,97 @@
+"""
+Unit tests for the shared prompt overrides registry.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.ai.generation import prompt_overrides
+from src.ai.generation.prompt_overrides import PromptOverridesRegistry
+from src.api.routes import prompts as prompts_routes
+from src.api.routes.prompts import UpdateSectionRequest
+
+
+@pytest.fixture
+def overrides_file(tmp_path):
+    """Create an overrides file with one customized section."""
+    path = tmp_path / "prompt_overrides.json"
+    path.write_text(json.dumps({"reasoning_framework": "custom reasoning"}), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def shared_registry(overrides_file, monkeypatch):
+    """Point the shared registry (used by the API routes) at a temp file."""
+    registry = PromptOverridesRegistry(overrides_file)
+    monkeypatch.setattr(prompt_overrides, "_registry", registry)
+    return registry
+
+
+class TestPromptOverridesRegistry:
+    """Test caching and revalidation."""
+
+    def test_parses_file_once(self, overrides_file, monkeypatch):
+        """Test that repeated lookups do not re-read an unchanged file."""
+        registry = PromptOverridesRegistry(overrides_file)
+        loads = []
+        real_load = json.load
+        monkeypatch.setattr(prompt_overrides.json, "load", lambda f: loads.append(1) or real_load(f))
+
+        for _ in range(50):
+            assert registry.get("reasoning_framework", "default") == "custom reasoning"
+            assert registry.get("generation_guidelines", "default") == "default"
+
+        assert len(loads) == 1
+
+    def test_external_edit_is_picked_up(self, overrides_file):
+        """Test that a write by another process changes the file signature and is re-read."""
+        registry = PromptOverridesRegistry(overrides_file)
+        assert registry.get("reasoning_framework", "default") == "custom reasoning"
+
+        overrides_file.write_text(json.dumps({"reasoning_framework": "edited elsewhere!"}), encoding="utf-8")
+        stat = overrides_file.stat()
+        os.utime(overrides_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert registry.get("reasoning_framework", "default") == "edited elsewhere!"
+
+    def test_missing_and_corrupt_files_use_defaults(self, tmp_path):
+        """Test that unreadable overrides fall back to the defaults."""
+        registry = PromptOverridesRegistry(tmp_path / "missing.json")
+        assert registry.get("section", "default") == "default"
+
+        corrupt = tmp_path / "corrupt.json"
+        corrupt.write_text("{not json", encoding="utf-8")
+        assert PromptOverridesRegistry(corrupt).get("section", "default") == "default"
+
+    def test_load_returns_copy(self, overrides_file):
+        """Test that callers cannot mutate the cached overrides."""
+        registry = PromptOverridesRegistry(overrides_file)
+        registry.load()["reasoning_framework"] = "mutated"
+
+        assert registry.get("reasoning_framework", "default") == "custom reasoning"
+
+
+class TestPromptRoutesInvalidate:
+    """Test that the API handlers keep the shared registry current."""
+
+    @pytest.mark.asyncio
+    async def test_update_section_is_visible_immediately(self, shared_registry):
+        """Test that an updated section is visible through the shared registry at once."""
+        await prompts_routes.update_section("output_format", UpdateSectionRequest(content="new format"))
+
+        assert shared_registry.get("output_format", "default") == "new format"
+        assert shared_registry.get("reasoning_framework", "default") == "custom reasoning"
+        assert json.loads(shared_registry.path.read_text())["output_format"] == "new format"
+
+    @pytest.mark.asyncio
+    async def test_reset_restores_defaults(self, shared_registry):
+        """Test that resetting drops every cached override."""
+        assert shared_registry.get("reasoning_framework", "default") == "custom reasoning"
+
+        await prompts_routes.reset_prompts()
+
+        assert not shared_registry.path.exists()
+        assert shared_registry.get("reasoning_framework", "default") == "default"
+
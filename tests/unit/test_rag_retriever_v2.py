@@ -340,7 +340,8 @@ class TestKeywordExtraction:
 class TestOptimizationPipeline:
     """Tests for the full optimization pipeline."""
     
-    def test_optimize_docs_applies_all_steps(
+    @pytest.mark.asyncio
+    async def test_optimize_docs_applies_all_steps(
         self,
         rag_retriever: RAGRetriever,
         sample_docs: List[Dict[str, Any]],
@@ -348,7 +349,7 @@ class TestOptimizationPipeline:
         """Test that optimization applies all steps."""
         keywords = ["audit", "logging"]
         
-        optimized = rag_retriever._optimize_docs(
+        optimized = await rag_retriever._optimize_docs(
             docs=sample_docs,
             keywords=keywords,
             max_docs=2,
@@ -362,9 +363,10 @@ class TestOptimizationPipeline:
         for doc in optimized:
             assert doc.get('similarity', 0) >= rag_retriever.min_similarity
     
-    def test_optimize_docs_empty_input(self, rag_retriever: RAGRetriever):
+    @pytest.mark.asyncio
+    async def test_optimize_docs_empty_input(self, rag_retriever: RAGRetriever):
         """Test optimization with empty input."""
-        optimized = rag_retriever._optimize_docs(
+        optimized = await rag_retriever._optimize_docs(
             docs=[],
             keywords=["test"],
             max_docs=5,
@@ -373,7 +375,8 @@ class TestOptimizationPipeline:
         
         assert optimized == []
     
-    def test_optimize_docs_respects_max_docs(
+    @pytest.mark.asyncio
+    async def test_optimize_docs_respects_max_docs(
         self,
         rag_retriever: RAGRetriever,
     ):
@@ -384,7 +387,7 @@ class TestOptimizationPipeline:
             for i in range(10)
         ]
         
-        optimized = rag_retriever._optimize_docs(
+        optimized = await rag_retriever._optimize_docs(
             docs=docs,
             keywords=["audit"],
             max_docs=3,
@@ -394,6 +397,97 @@ class TestOptimizationPipeline:
         assert len(optimized) <= 3
 
 
+class TestConcurrentExtraction:
+    """Tests for query-focused extraction on a running event loop."""
+    
+    @pytest.mark.asyncio
+    async def test_retrieve_optimized_extracts_on_live_loop(
+        self,
+        rag_retriever: RAGRetriever,
+    ):
+        """Extraction runs (not the truncation fallback) and overlaps across collections."""
+        import asyncio
+        from datetime import datetime
+        
+        story = JiraStory(
+            key="TEST-123",
+            summary="Implement tenant-level audit logging",
+            issue_type="Story",
+            status="In Progress",
+            priority="High",
+            reporter="qa@example.com",
+            created=datetime(2024, 1, 1),
+            updated=datetime(2024, 1, 2),
+            acceptance_criteria="Audit records are created for login sessions",
+        )
+        long_text = "Audit logging requirement for tenant login sessions. " * 10
+        raw_context = RetrievedContext(
+            similar_test_plans=[{"document": long_text, "similarity": 0.9}],
+            similar_confluence_docs=[{"document": long_text, "similarity": 0.9}],
+            similar_jira_stories=[{"document": long_text, "similarity": 0.9}],
+            similar_existing_tests=[{"document": long_text, "similarity": 0.9}],
+            similar_external_docs=[{"document": long_text, "similarity": 0.9}],
+        )
+        rag_retriever.retrieve_for_story = AsyncMock(return_value=raw_context)
+        
+        in_flight = 0
+        peak = 0
+        
+        async def fake_extract(content, source_type, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return f"extracted {source_type}"
+        
+        with patch('src.ai.context_extractor.extract_relevant_from_any_source', side_effect=fake_extract):
+            context = await rag_retriever.retrieve_optimized(story)
+        
+        collections = [
+            context.similar_test_plans,
+            context.similar_confluence_docs,
+            context.similar_jira_stories,
+            context.similar_existing_tests,
+            context.similar_external_docs,
+        ]
+        for docs in collections:
+            assert len(docs) == 1
+            assert docs[0]['was_extracted'] is True
+            assert docs[0]['document'].startswith("extracted ")
+        assert peak == 5
+    
+    @pytest.mark.asyncio
+    async def test_extraction_respects_semaphore(self, rag_retriever: RAGRetriever):
+        """No more than the semaphore's limit of extractions run at once."""
+        import asyncio
+        
+        docs = [{"document": f"Document {i} about audit logging. " * 5} for i in range(6)]
+        in_flight = 0
+        peak = 0
+        
+        async def fake_extract(content, source_type, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return content[:20]
+        
+        with patch('src.ai.context_extractor.extract_relevant_from_any_source', side_effect=fake_extract):
+            extracted = await rag_retriever._apply_query_focused_extraction(
+                docs=docs,
+                collection_name="confluence",
+                keywords=["audit"],
+                story_acs=[],
+                story_summary="",
+                semaphore=asyncio.Semaphore(2),
+            )
+        
+        assert peak == 2
+        assert [d['document'] for d in extracted] == [d['document'][:20] for d in docs]
+
+
 # ============================================================================
 # RETRIEVED CONTEXT TESTS
 # ============================================================================
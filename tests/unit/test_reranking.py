@@ -0,0 +1,124 @@
+"""
+Unit tests for vectorized re-ranking (keyword token sets, MMR).
+"""
+
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.ai.rag_retriever import RAGRetriever
+from src.ai.rag_store import RAGVectorStore
+from src.utils.reranking import keyword_match_counts, keyword_tokens, mmr_select
+
+
+# ============================================================================
+# REFERENCE IMPLEMENTATION (per-step Python loops)
+# ============================================================================
+
+def reference_mmr(relevance, embeddings, k: int, lambda_mult: float) -> List[int]:
+    def cosine(a, b):
+        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+    selected, candidates = [], list(range(len(relevance)))
+    while candidates and len(selected) < k:
+        best = max(
+            candidates,
+            key=lambda i: lambda_mult * relevance[i]
+            - (1 - lambda_mult) * max((cosine(embeddings[i], embeddings[j]) for j in selected), default=0.0),
+        )
+        selected.append(best)
+        candidates.remove(best)
+    return selected
+
+
+@pytest.fixture
+def rag_retriever() -> RAGRetriever:
+    with patch('src.ai.rag_retriever.RAGVectorStore'):
+        return RAGRetriever()
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestKeywordTokens:
+    """Test keyword matching against precomputed token sets."""
+
+    def test_tokens_strip_punctuation(self):
+        """Test that token sets are lowercased and free of punctuation."""
+        assert keyword_tokens("Audit-log, exported (CSV).") == {"audit", "log", "exported", "csv"}
+        assert keyword_tokens("") == frozenset()
+
+    def test_multi_word_keywords_match_once(self):
+        """Test that a keyword matches when all of its words are in the document."""
+        docs = [keyword_tokens("Audit logging for tenants"), keyword_tokens("Logging only")]
+
+        assert keyword_match_counts(docs, ["audit logging", "tenants", "Logging", ""]) == [3, 1]
+
+
+class TestMMR:
+    """Test MMR selection over stored embeddings."""
+
+    def test_near_duplicate_gives_way_to_other_topic(self):
+        """Test that diversity pushes a near-duplicate below another topic."""
+        embeddings = [[1.0, 0.0], [0.99, 0.05], [0.0, 1.0]]
+        relevance = [0.90, 0.89, 0.80]
+
+        assert mmr_select(relevance, embeddings, 2, lambda_mult=0.7) == [0, 2]
+        assert mmr_select(relevance, embeddings, 2, lambda_mult=1.0) == [0, 1]
+
+    def test_matches_reference(self):
+        """Test that the vectorized selection matches the per-step loop."""
+        rng = np.random.RandomState(4)
+        embeddings = rng.normal(size=(60, 32))
+        relevance = rng.uniform(0.7, 1.0, size=60)
+
+        assert mmr_select(relevance, embeddings, 10, 0.6) == reference_mmr(relevance, embeddings, 10, 0.6)
+        assert mmr_select(relevance, embeddings, 0) == []
+
+
+class TestRetrieverReranking:
+    """Test the retriever's use of stored vectors."""
+
+    @pytest.mark.asyncio
+    async def test_optimize_docs_diversifies_and_strips_vectors(self, rag_retriever: RAGRetriever):
+        """Test that optimized docs are diverse and no longer carry their vectors."""
+        docs = [
+            {"document": "Export audit records as CSV", "similarity": 0.90, "embedding": [1.0, 0.0]},
+            {"document": "Audit export to CSV files", "similarity": 0.89, "embedding": [0.99, 0.05]},
+            {"document": "Rate limits for the audit API", "similarity": 0.86, "embedding": [0.0, 1.0]},
+        ]
+
+        optimized = await rag_retriever._optimize_docs(
+            docs=docs, keywords=["audit"], max_docs=2, collection_name="test"
+        )
+
+        assert [doc["document"] for doc in optimized] == [docs[0]["document"], docs[2]["document"]]
+        assert all("embedding" not in doc for doc in optimized)
+        assert "embedding" in docs[0]
+
+    def test_select_diverse_without_vectors_is_top_n(self, rag_retriever: RAGRetriever):
+        """Test that docs without vectors keep their ranking."""
+        docs = [{"document": str(i)} for i in range(5)]
+
+        assert rag_retriever.select_diverse(docs, [1.0] * 5, 3) == docs[:3]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_similar_returns_stored_embeddings():
+    """Test that include_embeddings asks Chroma for the vectors and attaches them."""
+    store = RAGVectorStore.__new__(RAGVectorStore)
+    store.embedding_service = MagicMock(embed_single=AsyncMock(return_value=[0.1, 0.2]))
+    collection = MagicMock()
+    collection.query.return_value = {
+        'ids': [["a"]], 'documents': [["doc"]], 'metadatas': [[{}]],
+        'distances': [[0.1]], 'embeddings': [[[0.3, 0.4]]],
+    }
+    store.get_or_create_collection = MagicMock(return_value=collection)
+
+    results = await store.retrieve_similar("docs", "query", include_embeddings=True)
+
+    assert results[0]['embedding'] == [0.3, 0.4]
+    assert "embeddings" in collection.query.call_args.kwargs['include']
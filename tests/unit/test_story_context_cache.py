@@ -0,0 +1,135 @@
+"""
+Unit tests for the StoryContext snapshot cache.
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.aggregator.story_collector import StoryCollector, StoryContext
+from src.aggregator.story_context_cache import StoryContextCache, snapshot_version
+
+
+def make_context(story, subtask_updated: datetime) -> StoryContext:
+    subtask = story.model_copy(update={"key": "PROJ-124", "updated": subtask_updated})
+    context = StoryContext(story)
+    context["subtasks"] = [subtask]
+    context["story_comments"] = [{"author": "Dev", "body": "Uses the v2 endpoint", "created": "2024-01-02"}]
+    context["context_graph"] = {"main": story.key, "relates_to": []}
+    context["full_context_text"] = "=== MAIN STORY ===\n" * 200
+    return context
+
+
+@pytest.fixture
+def cache(tmp_path) -> StoryContextCache:
+    return StoryContextCache(cache_dir=str(tmp_path), max_entries=2, ttl_hours=24)
+
+
+@pytest.fixture
+def collector(cache, sample_jira_story):
+    """Collector whose full collection is counted and Jira probe is stubbed."""
+    collector = StoryCollector(jira_client=MagicMock(), confluence_client=MagicMock(), context_cache=cache)
+    collector._collect_story_context = AsyncMock(
+        return_value=make_context(sample_jira_story, datetime(2024, 1, 6, 9, 0, 0))
+    )
+    return collector
+
+
+class TestStoryContextCache:
+    """Test snapshot storage, expiry and eviction."""
+
+    def test_round_trip_restores_stories(self, cache, sample_jira_story):
+        context = make_context(sample_jira_story, datetime(2024, 1, 6, 9, 0, 0))
+        cache.save("PROJ-123", context)
+
+        snapshot = cache.load("PROJ-123")
+
+        assert snapshot["keys"] == ["PROJ-123", "PROJ-124"]
+        assert snapshot["version"] == datetime(2024, 1, 6, 9, 0, 0)
+        assert snapshot["context"]["main_story"] == sample_jira_story
+        assert snapshot["context"]["subtasks"][0].key == "PROJ-124"
+        assert snapshot["context"]["story_comments"] == context["story_comments"]
+        # Compressed well below the raw context text
+        assert cache._get_cache_path("PROJ-123").stat().st_size < len(context["full_context_text"]) // 4
+
+    def test_version_compares_naive_and_aware(self, cache, sample_jira_story):
+        context = make_context(sample_jira_story, datetime(2024, 1, 6, 9, 0, tzinfo=timezone.utc))
+        snapshot = {"version": snapshot_version(context)}
+
+        assert cache.is_current(snapshot, datetime(2024, 1, 6, 9, 0))
+        assert not cache.is_current(snapshot, datetime(2024, 1, 6, 9, 1, tzinfo=timezone.utc))
+        assert not cache.is_current(snapshot, None)
+
+    def test_expired_snapshot_is_ignored(self, cache, sample_jira_story, monkeypatch):
+        cache.save("PROJ-123", make_context(sample_jira_story, datetime(2024, 1, 6)))
+        monkeypatch.setattr(time, "time", lambda real=time.time(): real + 25 * 3600)
+
+        assert cache.load("PROJ-123") is None
+
+    def test_least_recently_used_is_evicted(self, cache, sample_jira_story, tmp_path):
+        for key in ("PROJ-1", "PROJ-2"):
+            cache.save(key, make_context(sample_jira_story, datetime(2024, 1, 6)))
+        past = time.time() - 60
+        os.utime(cache._get_cache_path("PROJ-1"), (past, past))
+        os.utime(cache._get_cache_path("PROJ-2"), (past - 60, past - 60))
+        # A new instance rebuilds the LRU order from the file mtimes
+        cache = StoryContextCache(cache_dir=str(tmp_path), max_entries=2, ttl_hours=24)
+        cache.touch("PROJ-2")
+
+        cache.save("PROJ-3", make_context(sample_jira_story, datetime(2024, 1, 6)))
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["PROJ-2.json.gz", "PROJ-3.json.gz"]
+
+
+class TestCollectorUsesSnapshots:
+    """Test that collection is skipped while the probe shows no updates."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_story_skips_collection(self, collector):
+        collector.jira_client.get_latest_update.return_value = datetime(2024, 1, 6, 9, 0, 0)
+
+        first = await collector.collect_story_context("PROJ-123")
+        second = await collector.collect_story_context("PROJ-123")
+
+        assert collector._collect_story_context.await_count == 1
+        assert isinstance(second, StoryContext)
+        assert second.main_story == first.main_story
+        assert second["subtasks"][0].key == "PROJ-124"
+        collector.jira_client.get_latest_update.assert_called_once_with(["PROJ-123", "PROJ-124"])
+
+    @pytest.mark.asyncio
+    async def test_updated_subtask_recollects(self, collector):
+        collector.jira_client.get_latest_update.return_value = datetime(2024, 1, 7)
+
+        await collector.collect_story_context("PROJ-123")
+        await collector.collect_story_context("PROJ-123")
+
+        assert collector._collect_story_context.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_snapshot(self, collector):
+        collector.jira_client.get_latest_update.return_value = datetime(2024, 1, 6, 9, 0, 0)
+
+        await collector.collect_story_context("PROJ-123")
+        await collector.collect_story_context("PROJ-123", use_cache=False)
+
+        assert collector._collect_story_context.await_count == 2
+        collector.jira_client.get_latest_update.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_is_a_cache_miss(self, collector):
+        """Test that a probe error or unusable probe result re-collects instead of failing."""
+        collector.jira_client.get_latest_update.return_value = datetime(2024, 1, 6, 9, 0, 0)
+        await collector.collect_story_context("PROJ-123")
+
+        collector.jira_client.get_latest_update.side_effect = RuntimeError("jira down")
+        await collector.collect_story_context("PROJ-123")
+        collector.jira_client.get_latest_update.side_effect = None
+        collector.jira_client.get_latest_update.return_value = MagicMock()
+        context = await collector.collect_story_context("PROJ-123")
+
+        assert collector._collect_story_context.await_count == 3
+        assert context.main_story.key == "PROJ-123"
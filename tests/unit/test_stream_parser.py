@@ -0,0 +1,65 @@
+"""
+Unit tests for IncrementalTestCaseParser.
+"""
+
+import json
+
+import pytest
+
+from src.ai.generation.stream_parser import IncrementalTestCaseParser
+
+
+RESPONSE = {
+    "reasoning": "Story mentions \"test_cases\" and braces { ] in prose",
+    "summary": "test_cases",
+    "test_cases": [
+        {"title": "First", "steps": [{"step_number": 1, "action": "Open {page}"}]},
+        {"title": 'Second "quoted"', "tags": ["a", "b"]},
+        {"title": "Third", "test_data": {"nested": [1, 2, {"x": "]"}]}},
+    ],
+    "suggested_folder": "Auth/Login",
+}
+
+
+def _feed_in_chunks(parser, text, size):
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted.extend(parser.feed(text[i:i + size]))
+    return emitted
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 17, 10_000])
+def test_emits_each_test_case_once(chunk_size):
+    text = json.dumps(RESPONSE, indent=2)
+    parser = IncrementalTestCaseParser()
+
+    emitted = _feed_in_chunks(parser, text, chunk_size)
+
+    assert emitted == RESPONSE["test_cases"]
+    assert parser.text == text
+
+
+def test_emits_before_response_completes():
+    text = json.dumps(RESPONSE)
+    first_end = text.index('"Second') - 2
+    parser = IncrementalTestCaseParser()
+
+    emitted = parser.feed(text[:first_end])
+
+    assert [tc["title"] for tc in emitted] == ["First"]
+
+
+def test_handles_claude_xml_wrapper():
+    text = "Here is the plan with a stray { brace.\n<json>\n" + json.dumps(RESPONSE) + "\n</json>"
+    parser = IncrementalTestCaseParser()
+
+    emitted = _feed_in_chunks(parser, text, 5)
+
+    assert [tc["title"] for tc in emitted] == ["First", 'Second "quoted"', "Third"]
+
+
+def test_ignores_nested_test_cases_keys():
+    text = json.dumps({"meta": {"test_cases": [{"title": "nested"}]}, "test_cases": [{"title": "top"}]})
+    parser = IncrementalTestCaseParser()
+
+    assert parser.feed(text) == [{"title": "top"}]
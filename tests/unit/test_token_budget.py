@@ -0,0 +1,99 @@
+"""
+Unit tests for tokenizer-backed token counting and budget packing.
+"""
+
+from src.ai.generation import token_budget
+from src.ai.generation.token_budget import BudgetItem, TokenBudgetAllocator, TokenCounter
+from src.ai.prompts_compact import _truncate_to_tokens
+
+
+class WordEncoding:
+    """Stand-in tokenizer: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded += 1
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def word_counter() -> TokenCounter:
+    counter = TokenCounter("gpt-4o")
+    counter._encoding = WordEncoding()
+    return counter
+
+
+class TestTokenCounter:
+    """Test counting, truncation and memoization."""
+
+    def test_counts_are_memoized(self):
+        """A repeated document is tokenized once."""
+        counter = word_counter()
+        doc = "audit records are exported as CSV " * 100
+
+        for _ in range(5):
+            assert counter.count(doc) == 600
+
+        assert counter._encoding.encoded == 1
+        assert counter.count.cache_info().hits == 4
+
+    def test_truncate_to_exact_tokens(self):
+        counter = word_counter()
+
+        assert counter.truncate("one two three four", 2) == "one two"
+        assert counter.truncate("one two", 5) == "one two"
+        assert counter.truncate("one two", 0) == ""
+
+    def test_falls_back_to_estimate_without_tiktoken(self, monkeypatch):
+        monkeypatch.setattr(token_budget, "tiktoken", None)
+        counter = TokenCounter("claude-sonnet")
+
+        assert not counter.exact
+        assert counter.count("x" * 40) == 10
+        assert counter.truncate("x" * 40, 5) == "x" * 20
+
+    def test_compact_truncation_respects_budget(self, monkeypatch):
+        counter = word_counter()
+        monkeypatch.setattr("src.ai.prompts_compact.get_token_counter", lambda: counter)
+
+        result = _truncate_to_tokens("word " * 50, 10)
+
+        assert result.startswith("word " * 9 + "word")
+        assert "[truncated to ~10 tokens]" in result
+
+
+class TestTokenBudgetAllocator:
+    """Test greedy value-per-token packing."""
+
+    def test_prefers_value_per_token(self):
+        """Two short relevant docs beat one long, slightly more relevant doc."""
+        allocator = TokenBudgetAllocator(100, word_counter())
+        items = [
+            BudgetItem(key="long", text="w " * 90, value=0.9),
+            BudgetItem(key="short_a", text="w " * 40, value=0.8),
+            BudgetItem(key="short_b", text="w " * 40, value=0.7),
+        ]
+
+        selected = allocator.pack(items)
+
+        assert [item.key for item in selected] == ["short_a", "short_b"]
+        assert allocator.remaining == 20
+
+    def test_reserve_and_original_order(self):
+        """Reserved text reduces the budget; selection keeps input order."""
+        allocator = TokenBudgetAllocator(50, word_counter())
+        allocator.reserve("header " * 10)
+        items = [
+            BudgetItem(key="a", text="w " * 20, value=0.2),
+            BudgetItem(key="b", text="w " * 15, value=0.9),
+            BudgetItem(key="c", text="w " * 30, value=0.5),
+        ]
+
+        selected = allocator.pack(items)
+
+        assert [item.key for item in selected] == ["a", "b"]
+        assert allocator.used == 45
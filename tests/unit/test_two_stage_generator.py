@@ -0,0 +1,226 @@
+"""
+Unit tests for TwoStageGenerator orchestration.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.aggregator.story_collector import StoryContext
+from src.ai.two_stage_generator import TwoStageGenerator
+
+
+@pytest.fixture
+def generator():
+    """Generator with a mocked AI client and mocked RAG stores (no embedding service)."""
+    with patch(
+        "src.ai.two_stage_generator.AIClientFactory.create_client",
+        return_value=(MagicMock(), "gpt-4o-mini", True),
+    ), patch("src.ai.story_enricher.RAGVectorStore"), patch("src.ai.swagger_extractor.RAGVectorStore"), \
+            patch("src.ai.api_context_builder.RAGVectorStore"):
+        return TwoStageGenerator()
+
+
+@pytest.mark.asyncio
+async def test_enrichment_and_rag_run_concurrently(generator, sample_jira_story, sample_test_plan):
+    """Enrichment and RAG retrieval overlap, and API context waits for both."""
+    events = []
+    both_started = asyncio.Event()
+
+    async def started(event):
+        # Each branch only finishes once the other has started, so a sequential run would hang
+        events.append(event)
+        if {"enrich_start", "rag_start"} <= set(events):
+            both_started.set()
+        await both_started.wait()
+
+    async def fake_enrich(main_story, story_context):
+        await started("enrich_start")
+        events.append("enrich_end")
+        enriched = MagicMock()
+        enriched.acceptance_criteria = []
+        enriched.confluence_docs = []
+        return enriched
+
+    async def fake_retrieve(main_story, story_context):
+        await started("rag_start")
+        events.append("rag_end")
+        retrieved = MagicMock()
+        retrieved.similar_swagger_docs = [{"id": "swagger-1"}]
+        retrieved.similar_existing_tests = []
+        return retrieved
+
+    async def fake_api_context(**kwargs):
+        events.append("api_context")
+        assert kwargs["swagger_rag_docs"] == [{"id": "swagger-1"}]
+        api_context = MagicMock()
+        api_context.api_specifications = []
+        return api_context
+
+    generator._enrich_story = fake_enrich
+    generator._retrieve_rag_context = fake_retrieve
+    generator.api_context_builder.build_api_context = fake_api_context
+    generator._run_stage1_analysis = AsyncMock(
+        return_value=generator._create_empty_coverage_plan("PROJ-123", "title")
+    )
+    generator._run_stage2_generation = AsyncMock(return_value=sample_test_plan)
+    generator._save_debug_file = MagicMock()
+
+    validation = MagicMock(is_valid=True, gaps=[])
+    with patch("src.ai.coverage_validator.validate_test_coverage", return_value=validation), \
+         patch("src.ai.two_stage_generator.settings.enable_story_enrichment", True):
+        test_plan = await asyncio.wait_for(
+            generator.generate_test_plan(StoryContext(sample_jira_story), use_rag=True), timeout=10
+        )
+
+    # Both branches start before either finishes, and API context joins them
+    assert set(events[:2]) == {"enrich_start", "rag_start"}
+    assert events[-1] == "api_context"
+
+    timings = test_plan.metadata.stage_timings
+    for stage in ("enrichment", "rag_retrieval", "api_context", "stage1_analysis", "stage2_generation", "total"):
+        assert stage in timings
+
+
+class _FakeChunkStream:
+    """Async iterator of OpenAI-style chat completion chunks."""
+
+    def __init__(self, pieces):
+        self._pieces = iter(pieces)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            piece = next(self._pieces)
+        except StopIteration:
+            raise StopAsyncIteration
+        await asyncio.sleep(0)
+        delta = MagicMock(content=piece)
+        return MagicMock(choices=[MagicMock(delta=delta)])
+
+
+@pytest.mark.asyncio
+async def test_streaming_emits_test_cases_before_completion(generator):
+    """Test cases reach the callback while the completion is still streaming."""
+    response = json.dumps({
+        "summary": "Plan",
+        "test_cases": [
+            {"title": "Login works", "description": "d", "expected_result": "ok", "steps": []},
+            {"title": "Logout works", "description": "d", "expected_result": "ok", "steps": []},
+        ],
+    })
+    pieces = [response[i:i + 7] for i in range(0, len(response), 7)]
+    consumed = []
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+
+        async def tracking():
+            async for chunk in _FakeChunkStream(pieces):
+                consumed.append(chunk)
+                yield chunk
+
+        return tracking()
+
+    generator.client.chat.completions.create = create
+    emitted = []
+
+    async def on_test_case(test_case):
+        emitted.append((test_case.title, len(consumed)))
+
+    text = await generator._call_ai_api_streaming("prompt", on_test_case, use_json_schema=True)
+
+    assert text == response
+    assert [title for title, _ in emitted] == ["Login works", "Logout works"]
+    # The first test case arrived before the stream was fully consumed
+    assert emitted[0][1] < len(pieces)
+
+
+def _gap(gap_type, description):
+    return MagicMock(gap_type=gap_type, description=description, severity="high")
+
+
+def _gap_response(*titles):
+    return json.dumps({"test_cases": [
+        {"title": title, "description": f"{title} description", "steps": []} for title in titles
+    ]})
+
+
+@pytest.mark.asyncio
+async def test_gap_filling_shards_run_concurrently_and_merge_in_order(generator, sample_test_plan):
+    """Gaps are split by type into concurrent shards, merged in shard order without duplicates."""
+    gaps = [
+        _gap("pattern", "P1"), _gap("prd", "R1"), _gap("pattern", "P2"),
+        _gap("pattern", "P3"), _gap("pattern", "P4"), _gap("api", "A1"),
+    ]
+    existing_title = sample_test_plan.test_cases[0].title
+    in_flight = 0
+    peak = 0
+
+    async def fake_call(prompt, use_json_schema=False, stage="other"):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        shard = [d for d in ("P1", "P4", "R1", "A1") if f"HIGH: {d}" in prompt][0]
+        # Later shards finish first; the merge order must not depend on it
+        await asyncio.sleep({"P1": 0.04, "P4": 0.03, "R1": 0.02, "A1": 0.01}[shard])
+        in_flight -= 1
+        if shard == "R1":
+            return _gap_response("Requirement test", existing_title.upper())
+        if shard == "A1":
+            return _gap_response("API test", "pattern test  one")
+        return _gap_response(f"Pattern test {'one' if shard == 'P1' else 'four'}")
+
+    generator._call_ai_api = fake_call
+    generator._save_debug_file = MagicMock()
+
+    with patch("src.ai.two_stage_generator.settings.gap_fill_shard_size", 3), \
+         patch("src.ai.two_stage_generator.settings.gap_fill_max_concurrency", 4):
+        tests = await generator._reprompt_for_gaps(
+            story_key="PROJ-123",
+            story_title="title",
+            story_description="",
+            acceptance_criteria=["AC"],
+            coverage_plan=generator._create_empty_coverage_plan("PROJ-123", "title"),
+            validation_result=MagicMock(gaps=gaps),
+            confluence_docs=[],
+            swagger_docs=[],
+            api_specifications=[],
+            existing_tests=sample_test_plan.test_cases,
+        )
+
+    # pattern[P1-P3], pattern[P4], prd[R1], api[A1]
+    assert peak == 4
+    assert [tc.title for tc in tests] == [
+        "Pattern test one", "Pattern test four", "Requirement test", "API test"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_gap_shard_does_not_drop_others(generator):
+    """One failing shard only loses its own tests."""
+    async def fake_call(prompt, use_json_schema=False, stage="other"):
+        if "HIGH: R1" in prompt:
+            raise RuntimeError("timeout")
+        return _gap_response("Pattern test")
+
+    generator._call_ai_api = fake_call
+    generator._save_debug_file = MagicMock()
+
+    tests = await generator._reprompt_for_gaps(
+        story_key="PROJ-123",
+        story_title="title",
+        story_description="",
+        acceptance_criteria=[],
+        coverage_plan=generator._create_empty_coverage_plan("PROJ-123", "title"),
+        validation_result=MagicMock(gaps=[_gap("pattern", "P1"), _gap("prd", "R1")]),
+        confluence_docs=[],
+        swagger_docs=[],
+        api_specifications=[],
+    )
+
+    assert [tc.title for tc in tests] == ["Pattern test"]
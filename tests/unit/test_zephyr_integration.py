@@ -2,6 +2,7 @@
 Unit tests for ZephyrIntegration.
 """
 
+import httpx
 import pytest
 from httpx import Response
 
@@ -151,3 +152,101 @@ async def test_ensure_folder_creates_missing(monkeypatch):
     assert folder_id == '20'
     assert created == [('NewChild', '10')]
 
+
+
+class _FakePagedClient:
+    """Stand-in for httpx.AsyncClient serving paged /testcases responses."""
+
+    def __init__(self, total, report_total=True):
+        self.total = total
+        self.report_total = report_total
+        self.requested = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, url, headers=None, params=None, **kwargs):
+        import asyncio
+
+        start_at = params["startAt"]
+        page_size = params["maxResults"]
+        self.requested.append(start_at)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        end = min(start_at + page_size, self.total)
+        body = {
+            "values": [{"key": f"T-{i}"} for i in range(start_at, end)],
+            "isLast": end >= self.total,
+        }
+        if self.report_total:
+            body["total"] = self.total
+        return Response(200, json=body, request=httpx.Request("GET", url))
+
+
+@pytest.mark.asyncio
+async def test_iter_test_case_pages_fetches_concurrently_in_order(monkeypatch):
+    fake = _FakePagedClient(total=950)
+    monkeypatch.setattr("src.integrations.zephyr_integration.httpx.AsyncClient", fake)
+    integration = ZephyrIntegration(api_key="test", base_url="https://api.example.com")
+
+    keys = []
+    async for page in integration.iter_test_case_pages("PROJ", concurrency=4):
+        keys.extend(t["key"] for t in page)
+
+    assert keys == [f"T-{i}" for i in range(950)]
+    assert sorted(fake.requested) == list(range(0, 950, 100))
+    assert 1 < fake.max_in_flight <= 4
+
+
+@pytest.mark.asyncio
+async def test_iter_test_case_pages_respects_max_results(monkeypatch):
+    fake = _FakePagedClient(total=950)
+    monkeypatch.setattr("src.integrations.zephyr_integration.httpx.AsyncClient", fake)
+    integration = ZephyrIntegration(api_key="test", base_url="https://api.example.com")
+
+    keys = []
+    async for page in integration.iter_test_case_pages("PROJ", max_results=250):
+        keys.extend(t["key"] for t in page)
+
+    assert keys == [f"T-{i}" for i in range(250)]
+    assert sorted(fake.requested) == [0, 100, 200]
+
+
+@pytest.mark.asyncio
+async def test_iter_test_case_pages_without_total_pages_sequentially(monkeypatch):
+    fake = _FakePagedClient(total=230, report_total=False)
+    monkeypatch.setattr("src.integrations.zephyr_integration.httpx.AsyncClient", fake)
+    integration = ZephyrIntegration(api_key="test", base_url="https://api.example.com")
+
+    keys = []
+    async for page in integration.iter_test_case_pages("PROJ"):
+        keys.extend(t["key"] for t in page)
+
+    assert len(keys) == 230
+    assert fake.requested == [0, 100, 200]
+    assert fake.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_test_case_pages_resumes_from_offset(monkeypatch):
+    fake = _FakePagedClient(total=950)
+    monkeypatch.setattr("src.integrations.zephyr_integration.httpx.AsyncClient", fake)
+    integration = ZephyrIntegration(api_key="test", base_url="https://api.example.com")
+
+    keys = []
+    async for page in integration.iter_test_case_pages("PROJ", start_at=500, max_results=300):
+        keys.extend(t["key"] for t in page)
+
+    assert keys == [f"T-{i}" for i in range(500, 800)]
+    assert sorted(fake.requested) == [500, 600, 700]
@@ -10,6 +10,7 @@ from loguru import logger
 
 from src.config.settings import settings
 from src.cli.rag_refresh import RAGRefreshManager
+from src.mcp.session_pool import run_and_close_pools
 
 
 def main():
@@ -41,6 +42,7 @@ Examples:
   # RAG (Retrieval-Augmented Generation) management:
   womba index PROJ-12345                 # Index a story's context
   womba index-all                        # Index all available data (batch)
+  womba index-all --resume               # Continue an interrupted index-all run
   womba rag-stats                        # Show RAG statistics
   womba rag-clear                        # Clear RAG database
   womba generate PROJ-12345 --upload --folder "Regression/UI"   # Generate + upload into folder
@@ -148,6 +150,18 @@ Examples:
         type=float,
         help='Override RAG refresh interval (hours) for this command'
     )
+
+    parser.add_argument(
+        '--max-concurrency',
+        type=int,
+        help='Index-all phases to run at once (default from settings, 1 = sequential)'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue the last interrupted index-all run from its last committed batch'
+    )
     
     args = parser.parse_args()
     
@@ -187,13 +201,12 @@ Examples:
         return
     
     if args.command == 'enrich':
-        import asyncio
         from src.cli.enrich_commands import enrich_story_command
         
         if not args.story_key:
             parser.error("Story key is required for 'enrich' command")
         
-        asyncio.run(enrich_story_command(
+        run_and_close_pools(enrich_story_command(
             story_key=args.story_key,
             use_cache=not args.no_cache,
             export_path=args.export_path
@@ -201,7 +214,6 @@ Examples:
         return
     
     if args.command == 'index-all':
-        import asyncio
         from src.config.config_manager import ConfigManager
         from src.cli.rag_commands import index_all_data
 
@@ -226,7 +238,7 @@ Examples:
 
             refresh_manager = RAGRefreshManager()
             refresh_hours = args.refresh_hours if args.refresh_hours is not None else getattr(settings, 'rag_refresh_hours', None)
-            if not args.force_refresh and refresh_hours is not None and not refresh_manager.should_refresh(project_key, 'index_all', refresh_hours):
+            if not args.force_refresh and not args.resume and refresh_hours is not None and not refresh_manager.should_refresh(project_key, 'index_all', refresh_hours):
                 last = refresh_manager.get_last_refresh(project_key, 'index_all')
                 hours_since = refresh_manager.hours_since_refresh(project_key, 'index_all') or 0.0
                 remaining = max(refresh_hours - hours_since, 0.0)
@@ -241,11 +253,13 @@ Examples:
             print("\nThis will index all available data from your project.")
             print("This may take several minutes.\n")
 
-            results = asyncio.run(index_all_data(
+            results = run_and_close_pools(index_all_data(
                 project_key,
                 refresh_manager=refresh_manager,
                 refresh_hours=refresh_hours,
-                force=args.force_refresh
+                force=args.force_refresh,
+                max_concurrency=args.max_concurrency,
+                resume=args.resume
             ))
 
             print("\n✅ Batch indexing complete!")
@@ -263,7 +277,6 @@ Examples:
         return
     
     if args.command == 'index-source':
-        import asyncio
         from src.config.config_manager import ConfigManager
         from src.cli.rag_commands import index_specific_sources
 
@@ -323,7 +336,7 @@ Examples:
                 return
 
         try:
-            asyncio.run(index_specific_sources(due_sources, project_key, refresh_manager=refresh_manager))
+            run_and_close_pools(index_specific_sources(due_sources, project_key, refresh_manager=refresh_manager))
         except ValueError as e:
             print(f"\n❌ {e}")
             return
@@ -336,7 +349,6 @@ Examples:
     if args.command == 'upload-plan':
         from src.models.test_plan import TestPlan
         from src.integrations.zephyr_integration import ZephyrIntegration
-        import asyncio
 
         if not args.file_path:
             parser.error("--file is required for 'upload-plan'")
@@ -367,7 +379,7 @@ Examples:
             print(f"📁 Using folder: {effective_folder}")
         else:
             effective_folder = None
-        results = asyncio.run(zephyr.upload_test_plan(
+        results = run_and_close_pools(zephyr.upload_test_plan(
             test_plan=test_plan,
             project_key=project_key,
             folder_path=effective_folder
@@ -398,11 +410,10 @@ Examples:
     
     # Route to appropriate handler
     if args.command == 'index':
-        import asyncio
         from src.cli.rag_commands import index_story_context
         
         try:
-            asyncio.run(index_story_context(args.story_key))
+            run_and_close_pools(index_story_context(args.story_key))
         except ValueError as e:
             print(f"\n❌ Configuration Error: {e}")
             print("💡 Run 'womba configure' to set up your API keys")
@@ -413,7 +424,6 @@ Examples:
             return
     
     elif args.command == 'generate':
-        import asyncio
         import json
         from src.workflows.full_workflow import FullWorkflowOrchestrator
         from src.cli.rag_commands import index_all_data
@@ -427,7 +437,7 @@ Examples:
                 print("\n⚙️ Force refreshing RAG before generation...")
             else:
                 print(f"\n⏳ RAG refresh is due (>{refresh_hours}h). Running index-all before generation...")
-            asyncio.run(index_all_data(
+            run_and_close_pools(index_all_data(
                 project_key,
                 refresh_manager=refresh_manager,
                 refresh_hours=refresh_hours,
@@ -437,7 +447,7 @@ Examples:
         orchestrator = FullWorkflowOrchestrator(config)
         orchestrator.story_key = args.story_key
         orchestrator.folder_path = args.folder_path
-        result = asyncio.run(orchestrator._generate_test_plan())
+        result = run_and_close_pools(orchestrator._generate_test_plan())
         # If no explicit folder provided, use suggested folder from generated plan
         if not orchestrator.folder_path and getattr(orchestrator.test_plan, 'suggested_folder', None):
             sf = orchestrator.test_plan.suggested_folder
@@ -474,7 +484,7 @@ Examples:
         
         if args.upload:
             print("\n🚀 Uploading to Zephyr...")
-            upload_result = asyncio.run(orchestrator._upload_to_zephyr(force=True))
+            upload_result = run_and_close_pools(orchestrator._upload_to_zephyr(force=True))
             
             # Print ONLY Zephyr URLs
             project_key = args.story_key.split('-')[0]
@@ -489,41 +499,37 @@ Examples:
                     print(f"ERROR: {test_title} - {zephyr_key}")
     
     elif args.command == 'upload':
-        import asyncio
         from src.workflows.full_workflow import FullWorkflowOrchestrator
         
         orchestrator = FullWorkflowOrchestrator(config)
         orchestrator.story_key = args.story_key
         orchestrator.folder_path = args.folder_path
         # First generate test plan, then upload
-        asyncio.run(orchestrator._generate_test_plan())
+        run_and_close_pools(orchestrator._generate_test_plan())
         if not orchestrator.folder_path and getattr(orchestrator.test_plan, 'suggested_folder', None):
             sf = orchestrator.test_plan.suggested_folder
             if sf and sf.lower() != 'unknown':
                 orchestrator.folder_path = sf
                 print(f"📁 Selected suggested folder: {sf}")
-        result = asyncio.run(orchestrator._upload_to_zephyr(force=True))
+        result = run_and_close_pools(orchestrator._upload_to_zephyr(force=True))
         print(f"✅ Uploaded to Zephyr: {len(result)}")
     
     elif args.command == 'evaluate':
-        import asyncio
         from src.ai.quality_scorer import QualityScorer
         
         scorer = QualityScorer()
-        result = asyncio.run(scorer.evaluate_test_plan(args.story_key))
+        result = run_and_close_pools(scorer.evaluate_test_plan(args.story_key))
         print(f"✅ Quality evaluation: {result}")
     
     elif args.command == 'automate':
         # Validate requirements
         if not args.repo:
             parser.error("--repo is required for 'automate' command")
-        
-        import asyncio
         from src.workflows.full_workflow import FullWorkflowOrchestrator
         
         orchestrator = FullWorkflowOrchestrator(config)
         orchestrator.folder_path = args.folder_path
-        result = asyncio.run(orchestrator.run(
+        result = run_and_close_pools(orchestrator.run(
             args.story_key,
             args.repo
         ))
@@ -533,11 +539,9 @@ Examples:
         # Full end-to-end workflow
         print(f"\n🚀 Running full Womba workflow for {args.story_key}")
         print("=" * 80)
-        
-        import asyncio
         from src.workflows.full_workflow import run_full_workflow
         
-        result = asyncio.run(run_full_workflow(
+        result = run_and_close_pools(run_full_workflow(
             story_key=args.story_key,
             config=config,
             repo_path=args.repo,